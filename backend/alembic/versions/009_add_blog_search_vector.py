@@ -0,0 +1,49 @@
+"""Add full-text and trigram search indexes to blog_articles
+
+Revision ID: 009_add_blog_search_vector
+Revises: 008_create_blog_images_table
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '009_add_blog_search_vector'
+down_revision = '008_create_blog_images_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Generated column: PostgreSQL keeps it current on every insert/update
+    op.execute("""
+        ALTER TABLE blog_articles
+        ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(subtitle, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(content, '')), 'C')
+        ) STORED
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_blog_articles_search_vector "
+        "ON blog_articles USING gin (search_vector)"
+    )
+
+    # Substring search for text the English parser can't split (e.g. Chinese)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_blog_articles_title_trgm "
+        "ON blog_articles USING gin (title gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_blog_articles_content_trgm "
+        "ON blog_articles USING gin (content gin_trgm_ops)"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_blog_articles_content_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_blog_articles_title_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_blog_articles_search_vector")
+    op.execute("ALTER TABLE blog_articles DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,33 @@
+"""Add processing status and responsive variants to blog_images
+
+Revision ID: 010_add_blog_image_variants
+Revises: 009_add_blog_search_vector
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '010_add_blog_image_variants'
+down_revision = '009_add_blog_search_vector'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing images were processed synchronously, so they are ready
+    op.add_column(
+        'blog_images',
+        sa.Column('status', sa.String(20), nullable=False, server_default='ready'),
+    )
+    op.add_column(
+        'blog_images',
+        sa.Column('variants', postgresql.JSONB(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_column('blog_images', 'variants')
+    op.drop_column('blog_images', 'status')
@@ -74,12 +74,14 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = "CHANGE_ME_IN_PRODUCTION"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30  # Cached (id, is_active, role) per user; 0 disables
 
     # ===== internal worker auth =====
     WORKER_API_TOKEN: str = ""
 
     # ===== background jobs =====
     ENABLE_PRESENCE_CLEANUP: bool = False
+    WORKSPACE_EVENT_DELIVERY: str = "outbox"  # "outbox" (async, batched) or "inline"
 
     # ===== email (Resend) =====
     RESEND_API_KEY: str = ""
@@ -8,6 +8,7 @@ Orchestration module - coordinates rule engine and PGN recording.
 from .core_facade import *
 from .core_session import *
 from .policies import *
+from .session_store import *
 
 __all__ = [
     "CoreFacade",
@@ -16,4 +17,9 @@ __all__ = [
     "GamePolicy",
     "StandardGamePolicy",
     "AnalysisPolicy",
+    "SessionStore",
+    "InMemorySessionStore",
+    "RedisSessionStore",
+    "SessionConflictError",
+    "create_session_store_from_env",
 ]
@@ -5,7 +5,8 @@ core 对外唯一调用门面
 Core facade - single external interface to core module.
 """
 
-from typing import Optional
+from collections import OrderedDict
+from typing import Callable, Optional, TypeVar
 from ..chess_basic.types import Move, BoardState
 from ..chess_basic.constants import GameResult, TerminationReason
 from ..chess_basic.utils.uci import parse_uci_move
@@ -13,6 +14,15 @@ from ..chess_basic.utils.fen import parse_fen
 from ..chess_basic.errors import ChessError
 from .core_session import CoreSession
 from .policies import SessionMode, GamePolicy, get_policy_for_mode
+from .session_store import (
+    SessionConflictError,
+    SessionStore,
+    create_session_store_from_env,
+    restore_session,
+    snapshot_session,
+)
+
+T = TypeVar("T")
 
 
 class CoreFacade:
@@ -27,10 +37,74 @@ class CoreFacade:
     - Frontend/network code MUST NOT import from chess_basic or rule modules directly
     - All interactions MUST go through this facade
     - This facade ensures proper orchestration of rule validation and PGN recording
+
+    Sessions live in a SessionStore as compact snapshots (shared across workers
+    when Redis-backed). ``_active_sessions`` is only an LRU hot tier of rebuilt
+    CoreSession objects; a stale or evicted entry is rehydrated from the store.
+    Mutations must go through this facade so the snapshot is written back;
+    each write is a compare-and-set on the snapshot version, and a mutation
+    that loses a race with another worker is replayed on the newer state.
     """
 
-    def __init__(self):
-        self._active_sessions: dict[str, CoreSession] = {}
+    DEFAULT_HOT_CAPACITY = 256
+    MAX_WRITE_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        store: Optional[SessionStore] = None,
+        hot_capacity: int = DEFAULT_HOT_CAPACITY,
+    ):
+        """
+        Args:
+            store: Session store (defaults to create_session_store_from_env():
+                Redis when REDIS_URL is set, otherwise process-local)
+            hot_capacity: Maximum number of live sessions kept in this process
+        """
+        self._store = store or create_session_store_from_env()
+        self._hot_capacity = max(1, hot_capacity)
+        self._active_sessions: OrderedDict[str, CoreSession] = OrderedDict()
+        self._versions: dict[str, int] = {}
+
+    def _cache(self, session_id: str, session: CoreSession, version: int) -> None:
+        """放入热层 Put session into the LRU hot tier"""
+        self._active_sessions[session_id] = session
+        self._active_sessions.move_to_end(session_id)
+        self._versions[session_id] = version
+        while len(self._active_sessions) > self._hot_capacity:
+            evicted_id, _ = self._active_sessions.popitem(last=False)
+            self._versions.pop(evicted_id, None)
+
+    def _drop(self, session_id: str) -> None:
+        self._active_sessions.pop(session_id, None)
+        self._versions.pop(session_id, None)
+
+    def _mutate(self, session_id: str, mutate: Callable[[CoreSession], T]) -> T:
+        """
+        修改并写回快照
+        Apply ``mutate`` to the session and write the snapshot back
+
+        The write only succeeds if the stored version is still the one the
+        session was loaded at. Otherwise another worker changed the session
+        in between: the local copy is discarded and ``mutate`` runs again on
+        the rehydrated state.
+
+        Raises:
+            SessionConflictError: If every attempt lost the race
+        """
+        for _ in range(self.MAX_WRITE_ATTEMPTS):
+            session = self.get_session(session_id)
+            loaded_version = self._versions[session_id]
+            result = mutate(session)
+            version = loaded_version + 1
+            if self._store.put(
+                session_id,
+                snapshot_session(session, version=version),
+                expected_version=loaded_version,
+            ):
+                self._cache(session_id, session, version)
+                return result
+            self._drop(session_id)
+        raise SessionConflictError(f"Session {session_id} is being modified concurrently")
 
     def create_session(
         self,
@@ -47,20 +121,21 @@ class CoreFacade:
             session_id: Unique session identifier
             mode: Session mode
             starting_fen: Starting position FEN
-            custom_policy: Custom game policy (overrides mode)
+            custom_policy: Custom game policy (overrides mode); its type must
+                be registered with register_policy_type()
 
         Returns:
             Session ID
 
         Raises:
-            ValueError: If session_id already exists
+            ValueError: If session_id already exists or the custom policy's
+                type is not registered
         """
-        if session_id in self._active_sessions:
-            raise ValueError(f"Session {session_id} already exists")
-
         policy = custom_policy or get_policy_for_mode(mode)
         session = CoreSession(policy=policy, starting_fen=starting_fen)
-        self._active_sessions[session_id] = session
+        if not self._store.add(session_id, snapshot_session(session, version=1)):
+            raise ValueError(f"Session {session_id} already exists")
+        self._cache(session_id, session, 1)
 
         return session_id
 
@@ -78,9 +153,24 @@ class CoreFacade:
         Raises:
             ValueError: If session not found
         """
-        if session_id not in self._active_sessions:
+        stored_version = self._store.get_version(session_id)
+        if stored_version is None:
+            self._drop(session_id)
             raise ValueError(f"Session {session_id} not found")
-        return self._active_sessions[session_id]
+
+        session = self._active_sessions.get(session_id)
+        if session is not None and self._versions.get(session_id) == stored_version:
+            self._active_sessions.move_to_end(session_id)
+            return session
+
+        # 惰性重建 Lazy rehydration (evicted, or changed by another worker)
+        snapshot = self._store.get(session_id)
+        if snapshot is None:
+            self._drop(session_id)
+            raise ValueError(f"Session {session_id} not found")
+        session = restore_session(snapshot)
+        self._cache(session_id, session, snapshot.version)
+        return session
 
     def close_session(self, session_id: str) -> None:
         """
@@ -90,8 +180,8 @@ class CoreFacade:
         Args:
             session_id: Session identifier
         """
-        if session_id in self._active_sessions:
-            del self._active_sessions[session_id]
+        self._store.delete(session_id)
+        self._drop(session_id)
 
     def submit_move_uci(self, session_id: str, uci: str) -> bool:
         """
@@ -108,9 +198,8 @@ class CoreFacade:
         Raises:
             ChessError: If move is illegal or session not found
         """
-        session = self.get_session(session_id)
         move = parse_uci_move(uci)
-        return session.submit_move(move)
+        return self._mutate(session_id, lambda session: session.submit_move(move))
 
     def submit_move(self, session_id: str, move: Move) -> bool:
         """
@@ -127,8 +216,7 @@ class CoreFacade:
         Raises:
             ChessError: If move is illegal or session not found
         """
-        session = self.get_session(session_id)
-        return session.submit_move(move)
+        return self._mutate(session_id, lambda session: session.submit_move(move))
 
     def get_legal_moves(self, session_id: str) -> list[str]:
         """
@@ -226,8 +314,7 @@ class CoreFacade:
         Returns:
             True if successful
         """
-        session = self.get_session(session_id)
-        return session.takeback()
+        return self._mutate(session_id, lambda session: session.takeback())
 
     def set_pgn_players(self, session_id: str, white: str, black: str) -> None:
         """
@@ -239,9 +326,11 @@ class CoreFacade:
             white: White player name
             black: Black player name
         """
-        session = self.get_session(session_id)
-        session.set_pgn_tag("White", white)
-        session.set_pgn_tag("Black", black)
+        def mutate(session: CoreSession) -> None:
+            session.set_pgn_tag("White", white)
+            session.set_pgn_tag("Black", black)
+
+        self._mutate(session_id, mutate)
 
     def set_pgn_event(self, session_id: str, event: str, site: str = "?") -> None:
         """
@@ -253,9 +342,11 @@ class CoreFacade:
             event: Event name
             site: Event location
         """
-        session = self.get_session(session_id)
-        session.set_pgn_tag("Event", event)
-        session.set_pgn_tag("Site", site)
+        def mutate(session: CoreSession) -> None:
+            session.set_pgn_tag("Event", event)
+            session.set_pgn_tag("Site", site)
+
+        self._mutate(session_id, mutate)
 
     def reset_session(self, session_id: str, starting_fen: Optional[str] = None) -> None:
         """
@@ -266,8 +357,7 @@ class CoreFacade:
             session_id: Session identifier
             starting_fen: New starting position
         """
-        session = self.get_session(session_id)
-        session.reset(starting_fen)
+        self._mutate(session_id, lambda session: session.reset(starting_fen))
 
     def list_sessions(self) -> list[str]:
         """
@@ -277,4 +367,4 @@ class CoreFacade:
         Returns:
             List of session IDs
         """
-        return list(self._active_sessions.keys())
+        return self._store.keys()
@@ -0,0 +1,418 @@
+"""
+orchestration.session_store
+会话快照与可插拔会话存储
+
+Session snapshots and pluggable session stores.
+
+A CoreSession is fully determined by its policy, starting FEN, the moves
+played and its PGN tags, so the store keeps that compact snapshot instead
+of the live object. Any worker can rebuild the session by replaying the
+moves, which makes sessions visible across processes and restarts.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ..chess_basic.utils.uci import parse_uci_move
+from .core_session import CoreSession
+from .policies import (
+    AnalysisPolicy,
+    GamePolicy,
+    PuzzlePolicy,
+    StandardGamePolicy,
+    StudyPolicy,
+)
+
+logger = logging.getLogger(__name__)
+
+# 可按名称重建的策略 Policies that can be rebuilt by name
+_POLICY_TYPES: dict[str, type[GamePolicy]] = {
+    cls.__name__: cls
+    for cls in (StandardGamePolicy, AnalysisPolicy, PuzzlePolicy, StudyPolicy)
+}
+
+
+class SessionConflictError(ValueError):
+    """
+    会话写冲突
+    Raised when a snapshot write loses a version race with another worker
+    """
+
+
+def register_policy_type(policy_cls: type[GamePolicy]) -> None:
+    """
+    注册自定义策略类型
+    Register a custom policy type for rehydration
+
+    Custom policies must be registered in every worker (e.g. at import time)
+    and must be constructible without arguments: snapshots store only the
+    policy name, and restore_session() rebuilds the policy as policy_cls().
+
+    Raises:
+        ValueError: If the policy cannot be constructed without arguments
+    """
+    try:
+        policy_cls()
+    except TypeError as e:
+        raise ValueError(
+            f"Policy type {policy_cls.__name__} must be constructible without arguments: {e}"
+        ) from e
+    _POLICY_TYPES[policy_cls.__name__] = policy_cls
+
+
+@dataclass
+class SessionSnapshot:
+    """
+    会话快照
+    Compact, serializable description of a CoreSession
+    """
+    policy: str
+    starting_fen: str
+    moves: list[str] = field(default_factory=list)
+    tags: dict[str, str] = field(default_factory=dict)
+    version: int = 0
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "v": self.version,
+                "p": self.policy,
+                "f": self.starting_fen,
+                "m": " ".join(self.moves),
+                "t": self.tags,
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, data: str) -> "SessionSnapshot":
+        raw = json.loads(data)
+        return cls(
+            policy=raw["p"],
+            starting_fen=raw["f"],
+            moves=raw["m"].split() if raw.get("m") else [],
+            tags=raw.get("t") or {},
+            version=raw.get("v", 0),
+        )
+
+
+def snapshot_session(session: CoreSession, version: int = 0) -> SessionSnapshot:
+    """
+    生成会话快照
+    Build a snapshot from a live session
+
+    Args:
+        session: Session to snapshot
+        version: Monotonic version of the snapshot
+
+    Returns:
+        SessionSnapshot
+
+    Raises:
+        ValueError: If the session's policy type is not registered, so it
+            could not be rebuilt from the snapshot
+    """
+    policy_name = type(session.policy).__name__
+    if _POLICY_TYPES.get(policy_name) is not type(session.policy):
+        raise ValueError(
+            f"Policy type {policy_name} is not registered; call register_policy_type() first"
+        )
+
+    tags = session._pgn_writer.tags.get_all() if session._pgn_writer else {}
+    return SessionSnapshot(
+        policy=policy_name,
+        starting_fen=session._starting_fen,
+        moves=[move.to_uci() for move, _ in session._move_history],
+        tags=tags,
+        version=version,
+    )
+
+
+def restore_session(snapshot: SessionSnapshot) -> CoreSession:
+    """
+    从快照重建会话
+    Rebuild a live session by replaying the snapshot's moves
+
+    Raises:
+        ValueError: If the snapshot's policy type is unknown in this process
+    """
+    policy_cls = _POLICY_TYPES.get(snapshot.policy)
+    if policy_cls is None:
+        raise ValueError(f"Unknown policy type {snapshot.policy}")
+
+    session = CoreSession(policy=policy_cls(), starting_fen=snapshot.starting_fen)
+    for key, value in snapshot.tags.items():
+        session.set_pgn_tag(key, value)
+    for uci in snapshot.moves:
+        session.submit_move(parse_uci_move(uci))
+    return session
+
+
+class SessionStore(ABC):
+    """
+    会话存储接口
+    Session store interface
+
+    Stores serialized snapshots keyed by session id. Entries expire after
+    ``idle_ttl`` seconds without a read or write.
+    """
+
+    def __init__(self, idle_ttl: int):
+        self.idle_ttl = idle_ttl
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[SessionSnapshot]:
+        """Load a snapshot and refresh its idle TTL."""
+
+    @abstractmethod
+    def get_version(self, session_id: str) -> Optional[int]:
+        """Return the stored version without loading the snapshot."""
+
+    @abstractmethod
+    def put(
+        self,
+        session_id: str,
+        snapshot: SessionSnapshot,
+        expected_version: Optional[int] = None,
+    ) -> bool:
+        """
+        Store a snapshot and reset its idle TTL.
+
+        With ``expected_version`` the write is a compare-and-set: it only
+        happens if the stored version still equals it (a missing session
+        never matches). Returns False if the check failed.
+        """
+
+    @abstractmethod
+    def add(self, session_id: str, snapshot: SessionSnapshot) -> bool:
+        """Store a snapshot only if the id is free. Returns False if taken."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Remove a snapshot."""
+
+    @abstractmethod
+    def keys(self) -> list[str]:
+        """List ids of all live sessions."""
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    进程内会话存储
+    Process-local store for single-worker deployments and tests
+    """
+
+    def __init__(self, idle_ttl: int = 3600, max_entries: int = 10000):
+        super().__init__(idle_ttl)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _live(self, session_id: str) -> Optional[tuple[str, int, float]]:
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return None
+        if entry[2] <= time.monotonic():
+            del self._entries[session_id]
+            return None
+        return entry
+
+    def _store(self, session_id: str, data: str, version: int) -> None:
+        self._entries[session_id] = (data, version, time.monotonic() + self.idle_ttl)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, session_id: str) -> Optional[SessionSnapshot]:
+        with self._lock:
+            entry = self._live(session_id)
+            if entry is None:
+                return None
+            self._store(session_id, entry[0], entry[1])
+        return SessionSnapshot.from_json(entry[0])
+
+    def get_version(self, session_id: str) -> Optional[int]:
+        with self._lock:
+            entry = self._live(session_id)
+            if entry is None:
+                return None
+            self._store(session_id, entry[0], entry[1])
+            return entry[1]
+
+    def put(
+        self,
+        session_id: str,
+        snapshot: SessionSnapshot,
+        expected_version: Optional[int] = None,
+    ) -> bool:
+        with self._lock:
+            if expected_version is not None:
+                entry = self._live(session_id)
+                if entry is None or entry[1] != expected_version:
+                    return False
+            self._store(session_id, snapshot.to_json(), snapshot.version)
+            return True
+
+    def add(self, session_id: str, snapshot: SessionSnapshot) -> bool:
+        with self._lock:
+            if self._live(session_id) is not None:
+                return False
+            self._store(session_id, snapshot.to_json(), snapshot.version)
+            return True
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            now = time.monotonic()
+            expired = [key for key, (_, _, exp) in self._entries.items() if exp <= now]
+            for key in expired:
+                del self._entries[key]
+            return list(self._entries.keys())
+
+
+# KEYS[1]: session hash; ARGV: expected version ("" = unconditional),
+# new version, snapshot JSON, idle TTL. Returns 1 if written.
+_PUT_LUA = """
+if ARGV[1] ~= '' and redis.call('HGET', KEYS[1], 'v') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'v', ARGV[2], 'data', ARGV[3])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+return 1
+"""
+
+# KEYS[1]: session hash; ARGV: version, snapshot JSON, idle TTL.
+# Returns 1 if the id was free and the session was created.
+_ADD_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'v', ARGV[1], 'data', ARGV[2])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return 1
+"""
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Redis 会话存储
+    Redis-backed store shared by all workers
+
+    Each session is a hash ``{prefix}{id}`` with the version and the JSON
+    snapshot, so version checks do not transfer the move list. Writes run
+    as Lua scripts, so the version check, both fields and the TTL are set
+    atomically.
+    """
+
+    def __init__(self, client, idle_ttl: int = 3600, prefix: str = "core:session:"):
+        super().__init__(idle_ttl)
+        self.client = client
+        self.prefix = prefix
+        self._put_script = client.register_script(_PUT_LUA)
+        self._add_script = client.register_script(_ADD_LUA)
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    def get(self, session_id: str) -> Optional[SessionSnapshot]:
+        pipe = self.client.pipeline()
+        pipe.hget(self._key(session_id), "data")
+        pipe.expire(self._key(session_id), self.idle_ttl)
+        data, _ = pipe.execute()
+        if data is None:
+            return None
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        return SessionSnapshot.from_json(data)
+
+    def get_version(self, session_id: str) -> Optional[int]:
+        pipe = self.client.pipeline()
+        pipe.hget(self._key(session_id), "v")
+        pipe.expire(self._key(session_id), self.idle_ttl)
+        version, _ = pipe.execute()
+        return int(version) if version is not None else None
+
+    def put(
+        self,
+        session_id: str,
+        snapshot: SessionSnapshot,
+        expected_version: Optional[int] = None,
+    ) -> bool:
+        written = self._put_script(
+            keys=[self._key(session_id)],
+            args=[
+                "" if expected_version is None else str(expected_version),
+                snapshot.version,
+                snapshot.to_json(),
+                self.idle_ttl,
+            ],
+        )
+        return bool(written)
+
+    def add(self, session_id: str, snapshot: SessionSnapshot) -> bool:
+        created = self._add_script(
+            keys=[self._key(session_id)],
+            args=[snapshot.version, snapshot.to_json(), self.idle_ttl],
+        )
+        return bool(created)
+
+    def delete(self, session_id: str) -> None:
+        self.client.delete(self._key(session_id))
+
+    def keys(self) -> list[str]:
+        prefix_len = len(self.prefix)
+        keys = []
+        for key in self.client.scan_iter(match=f"{self.prefix}*", count=500):
+            if isinstance(key, bytes):
+                key = key.decode("utf-8")
+            keys.append(key[prefix_len:])
+        return keys
+
+
+def create_session_store_from_env(idle_ttl: Optional[int] = None) -> SessionStore:
+    """
+    根据环境变量创建会话存储
+    Create a session store from environment
+
+    Uses Redis when REDIS_URL is set and reachable, otherwise falls back to
+    the process-local store.
+
+    Env:
+        REDIS_URL: Redis connection URL
+        CORE_SESSION_IDLE_TTL: Idle TTL in seconds (default: 3600)
+    """
+    ttl = idle_ttl or int(os.getenv("CORE_SESSION_IDLE_TTL", "3600"))
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        try:
+            import redis
+
+            client = redis.Redis.from_url(redis_url, socket_connect_timeout=5, socket_timeout=5)
+            client.ping()
+            return RedisSessionStore(client, idle_ttl=ttl)
+        except Exception as e:
+            logger.warning("Core session store falling back to memory: %s", e)
+    return InMemorySessionStore(idle_ttl=ttl)
+
+
+__all__ = [
+    "SessionSnapshot",
+    "SessionStore",
+    "SessionConflictError",
+    "InMemorySessionStore",
+    "RedisSessionStore",
+    "snapshot_session",
+    "restore_session",
+    "register_policy_type",
+    "create_session_store_from_env",
+]
@@ -13,8 +13,6 @@ def parse_pgn(pgn_text: str) -> NodeTree:
     """
     Parses a PGN string into a NodeTree structure using the python-chess library.
     """
-    tree = NodeTree()
-    
     # Use python-chess to handle the heavy lifting of PGN parsing
     try:
         pgn_game = chess.pgn.read_game(io.StringIO(pgn_text))
@@ -23,6 +21,15 @@ def parse_pgn(pgn_text: str) -> NodeTree:
     except Exception as e:
         raise ValueError(f"Failed to parse PGN: {e}")
 
+    return game_to_tree(pgn_game)
+
+
+def game_to_tree(pgn_game: chess.pgn.Game) -> NodeTree:
+    """
+    Build a NodeTree from a game already read by python-chess.
+    """
+    tree = NodeTree()
+
     # 1. Parse Headers and Meta
     tree.meta.headers = dict(pgn_game.headers)
     tree.meta.result = pgn_game.headers.get("Result", None)
@@ -52,67 +59,55 @@ def parse_pgn(pgn_text: str) -> NodeTree:
 
 def _traverse_and_build(game_node: chess.pgn.GameNode, parent_pgn_node: PgnNode, tree: NodeTree, board: chess.Board):
     """
-    Recursive helper to traverse python-chess's game node structure
-    and build our custom NodeTree.
+    Traverse python-chess's game node structure and build our custom NodeTree.
+
+    Uses an explicit stack instead of recursion (one frame per ply would
+    hit the recursion limit on long games). Nodes are created in the same
+    depth-first order as before: the main line, then each side line, with
+    `board` pushed on the way down and popped on the way back.
     """
-    
-    # The first variation is the main line
-    if not game_node.is_end():
-        next_game_node = game_node.variation(0)
-        san = board.san(next_game_node.move)
-        board.push(next_game_node.move)
-        
+    # ("visit", game_node, pgn_node) | ("child", game_node, pgn_node, child, is_main) | ("pop",)
+    stack: list[tuple] = [("visit", game_node, parent_pgn_node)]
+    while stack:
+        action = stack.pop()
+        kind = action[0]
+
+        if kind == "pop":
+            board.pop()
+            continue
+
+        if kind == "visit":
+            _, node, pgn_parent = action
+            # Pushed in reverse: main line first, then the side lines
+            for variation_node in reversed(node.variations[1:]):
+                stack.append(("child", node, pgn_parent, variation_node, False))
+            if not node.is_end():
+                stack.append(("child", node, pgn_parent, node.variation(0), True))
+            continue
+
+        _, node, pgn_parent, child, is_main = action
+        san = board.san(child.move)
+        board.push(child.move)
+
         node_id = str(ULID())
-        move_number = (board.ply() + 1) // 2
-        
         pgn_node = PgnNode(
             node_id=node_id,
-            parent_id=parent_pgn_node.node_id,
+            parent_id=pgn_parent.node_id,
             san=san,
-            uci=next_game_node.move.uci(),
-            ply=board.ply(),
-            move_number=move_number,
-            comment_before=game_node.comment or None,
-            comment_after=next_game_node.comment or None,
-            nags=[int(nag) for nag in next_game_node.nags],
-            fen=board.fen()
-        )
-        
-        parent_pgn_node.main_child = node_id
-        tree.nodes[node_id] = pgn_node
-        
-        # Recurse for the next move in the mainline
-        _traverse_and_build(next_game_node, pgn_node, tree, board)
-        
-        board.pop()
-
-    # Subsequent variations are the side lines
-    for variation_node in game_node.variations[1:]:
-        var_san = board.san(variation_node.move)
-        board.push(variation_node.move)
-        
-        var_node_id = str(ULID())
-        move_number = (board.ply() + 1) // 2
-
-        var_pgn_node = PgnNode(
-            node_id=var_node_id,
-            parent_id=parent_pgn_node.node_id,
-            san=var_san,
-            uci=variation_node.move.uci(),
+            uci=child.move.uci(),
             ply=board.ply(),
-            move_number=move_number,
-            comment_before=game_node.comment or None, 
-            comment_after=variation_node.comment or None,
-            nags=[int(nag) for nag in variation_node.nags],
+            move_number=(board.ply() + 1) // 2,
+            comment_before=node.comment or None,
+            comment_after=child.comment or None,
+            nags=[int(nag) for nag in child.nags],
             fen=board.fen()
         )
-        
-        parent_pgn_node.variations.append(var_node_id)
-        tree.nodes[var_node_id] = var_pgn_node
-
-        # Recurse for the variation
-        _traverse_and_build(variation_node, var_pgn_node, tree, board)
-        
-        board.pop()
 
+        if is_main:
+            pgn_parent.main_child = node_id
+        else:
+            pgn_parent.variations.append(node_id)
+        tree.nodes[node_id] = pgn_node
 
+        stack.append(("pop",))
+        stack.append(("visit", child, pgn_node))
@@ -12,11 +12,22 @@ Core Responsibility:
         3. Query database to get User object
         4. Return authenticated User
 
+    get_current_principal() -> Principal
+        Same checks, but returns (id, is_active, role) from the principal
+        cache and only queries the database on a miss. Use it when the
+        endpoint needs identity/role, not the User row.
+
+    get_current_principal_async(token, session_factory) -> Principal
+        Async variant for routers on the async engine: a cache hit touches
+        no connection pool, and the shared revocation check (Redis) runs
+        off the event loop.
+
 What This Module DOES:
     ✓ Parse Authorization header
     ✓ Decode JWT token
     ✓ Validate token signature and expiration
     ✓ Load user from database
+    ✓ Reject tokens revoked by logout
     ✓ Raise 401 if token invalid/expired/missing
 
 What This Module DOES NOT DO:
@@ -44,10 +55,12 @@ Key Principle:
 import uuid
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from core.db.deps import get_db
-from core.security.jwt import decode_token
+from core.security.jwt import decode_token_claims
+from core.security.principal_cache import Principal, principal_cache
 from core.log.log_auth import logger
 from core.errors import InvalidTokenError, UserInactiveError
 from models.user import User
@@ -87,29 +100,10 @@ def get_current_user(
     # SECURITY FIX: Removed token prefix logging to prevent token exposure in logs
     logger.debug("Authenticating request")
 
-    # Decode token to get user_id
-    user_id = decode_token(token)
-
-    if not user_id:
-        logger.warning("Token decode failed: invalid or expired token")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    user_uuid = authenticate_token(token)
 
     # Load user from database
     logger.debug("Loading user from database")
-    try:
-        user_uuid = uuid.UUID(user_id)
-    except ValueError:
-        # SECURITY FIX: Don't log the invalid user_id to prevent log injection
-        logger.warning("Invalid UUID format in token")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid user ID format",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
     user = db.get(User, user_uuid)
 
     if not user:
@@ -130,12 +124,133 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    principal_cache.put(Principal.from_user(user))
+
     # SECURITY FIX: Reduced logging - only log role for successful auth
     logger.info(f"User authenticated successfully: role={user.role}")
 
     return user
 
 
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _decode_or_reject(token: str) -> dict:
+    claims = decode_token_claims(token)
+    if not claims:
+        logger.warning("Token decode failed: invalid or expired token")
+        raise _unauthorized("Invalid authentication credentials")
+    return claims
+
+
+def _reject_revoked() -> HTTPException:
+    logger.warning("Revoked token used")
+    return _unauthorized("Token has been revoked")
+
+
+def _subject_uuid(claims: dict) -> uuid.UUID:
+    try:
+        return uuid.UUID(claims["sub"])
+    except ValueError:
+        # SECURITY FIX: Don't log the invalid user_id to prevent log injection
+        logger.warning("Invalid UUID format in token")
+        raise _unauthorized("Invalid user ID format")
+
+
+def authenticate_token(token: str) -> uuid.UUID:
+    """
+    Validate a token and return its user id, without touching the database.
+
+    For sync dependencies: the shared revocation check may block on Redis.
+    Async code uses authenticate_token_async().
+
+    Raises:
+        HTTPException: 401 if the token is invalid, expired, revoked by
+            logout, or carries a malformed user id
+    """
+    claims = _decode_or_reject(token)
+    if principal_cache.is_revoked(claims.get("jti")):
+        raise _reject_revoked()
+    return _subject_uuid(claims)
+
+
+async def authenticate_token_async(token: str) -> uuid.UUID:
+    """authenticate_token() for the event loop (revocation check off the loop)."""
+    claims = _decode_or_reject(token)
+    if await principal_cache.is_revoked_async(claims.get("jti")):
+        raise _reject_revoked()
+    return _subject_uuid(claims)
+
+
+def _principal_select(user_uuid: uuid.UUID):
+    return select(User.id, User.is_active, User.role).where(User.id == user_uuid)
+
+
+def _accept_principal(principal: Principal | None) -> Principal:
+    if principal is None:
+        # SECURITY FIX: Don't log user_id for missing users
+        logger.warning("User not found in database")
+        raise _unauthorized("User not found")
+    if not principal.is_active:
+        logger.warning(f"Inactive user authentication attempt: role={principal.role}")
+        raise _unauthorized("Inactive user")
+    return principal
+
+
+def _cache_row(row) -> Principal | None:
+    if row is None:
+        return None
+    principal = Principal(id=str(row.id), is_active=bool(row.is_active), role=row.role)
+    principal_cache.put(principal)
+    return principal
+
+
+def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """
+    Get the authenticated caller's identity, served from the principal cache.
+
+    The database is only queried on a cache miss (id, is_active, role
+    columns only). Inactive users are cached too, and rejected.
+
+    Raises:
+        HTTPException: 401 if token invalid/revoked or user not found/inactive
+    """
+    user_uuid = authenticate_token(token)
+    principal = principal_cache.get(str(user_uuid))
+    if principal is None:
+        principal = _cache_row(db.execute(_principal_select(user_uuid)).one_or_none())
+    return _accept_principal(principal)
+
+
+async def get_current_principal_async(token: str, session_factory) -> Principal:
+    """
+    Async variant of get_current_principal().
+
+    Args:
+        token: JWT token string
+        session_factory: Callable returning an AsyncSession context manager;
+            only opened on a cache miss
+
+    Raises:
+        HTTPException: 401 if token invalid/revoked or user not found/inactive
+    """
+    user_uuid = await authenticate_token_async(token)
+    principal = principal_cache.get(str(user_uuid))
+    if principal is None:
+        async with session_factory() as session:
+            result = await session.execute(_principal_select(user_uuid))
+            principal = _cache_row(result.one_or_none())
+    return _accept_principal(principal)
+
+
 # For testing without FastAPI (pure Python)
 def get_current_user_sync(token: str, db: Session) -> User:
     """
@@ -149,21 +264,13 @@ def get_current_user_sync(token: str, db: Session) -> User:
         Authenticated User object
 
     Raises:
-        InvalidTokenError: If token is invalid
+        InvalidTokenError: If token is invalid or revoked
         UserInactiveError: If user is inactive
     """
-    user_id = decode_token(token)
-
-    if not user_id:
-        logger.warning("Token decode failed")
-        raise InvalidTokenError()
-
     try:
-        user_uuid = uuid.UUID(user_id)
-    except ValueError:
-        # SECURITY FIX: Don't log the invalid user_id
-        logger.warning("Invalid UUID format in token")
-        raise InvalidTokenError("Invalid user ID format")
+        user_uuid = authenticate_token(token)
+    except HTTPException as e:
+        raise InvalidTokenError(e.detail)
 
     user = db.get(User, user_uuid)
 
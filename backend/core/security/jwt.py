@@ -17,9 +17,13 @@ Responsibilities:
        - Returns user_id (from 'sub' field)
        - Returns None if invalid/expired
 
+    3. decode_token_claims(token: str) -> dict | None
+       - Same checks as decode_token, returns the full payload
+
 Token Payload Contains:
     - sub: subject (user_id)
     - exp: expiration timestamp
+    - jti: token id (lets logout revoke a single token)
     - iat: issued at timestamp (automatic)
 
 Security Considerations:
@@ -32,6 +36,7 @@ Example Flow:
     Login success -> create_access_token(user_id) -> return to client
     Request -> extract token -> decode_token() -> get user_id
 """
+import uuid
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 
@@ -58,6 +63,7 @@ def create_access_token(user_id: str) -> str:
     payload = {
         "sub": user_id,
         "exp": expire,
+        "jti": uuid.uuid4().hex,
     }
 
     token = jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
@@ -67,18 +73,15 @@ def create_access_token(user_id: str) -> str:
     return token
 
 
-def decode_token(token: str) -> str | None:
+def decode_token_claims(token: str) -> dict | None:
     """
-    Decode and verify a JWT token.
+    Decode and verify a JWT token, returning its payload.
 
     Args:
         token: JWT token string
 
     Returns:
-        User ID (from 'sub' field) if valid, None otherwise
-
-    Example:
-        user_id = decode_token("eyJ0eXAiOiJKV1QiLCJhbGc...")
+        Payload dict (with a non-empty 'sub') if valid, None otherwise
     """
     try:
         payload = jwt.decode(
@@ -86,15 +89,34 @@ def decode_token(token: str) -> str | None:
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM]
         )
-        user_id = payload.get("sub")
+    except JWTError as e:
+        logger.warning(f"Token decode failed: {e}")
+        return None
 
-        if not user_id:
-            logger.warning("Token decoded but 'sub' field is missing")
-            return None
+    if not payload.get("sub"):
+        logger.warning("Token decoded but 'sub' field is missing")
+        return None
 
-        logger.debug(f"Token decoded successfully: user_id={user_id}")
-        return user_id
+    return payload
 
-    except JWTError as e:
-        logger.warning(f"Token decode failed: {e}")
+
+def decode_token(token: str) -> str | None:
+    """
+    Decode and verify a JWT token.
+
+    Args:
+        token: JWT token string
+
+    Returns:
+        User ID (from 'sub' field) if valid, None otherwise
+
+    Example:
+        user_id = decode_token("eyJ0eXAiOiJKV1QiLCJhbGc...")
+    """
+    payload = decode_token_claims(token)
+    if payload is None:
         return None
+
+    user_id = payload["sub"]
+    logger.debug(f"Token decoded successfully: user_id={user_id}")
+    return user_id
@@ -0,0 +1,193 @@
+"""
+Principal Cache Module - Short-lived cache of authenticated identities
+
+Purpose:
+    Avoid loading the full User row on every request just to learn that the
+    caller exists, is active and has a given role.
+
+Core Responsibility:
+    Principal                       -> (id, is_active, role) snapshot of a User
+    principal_cache.get(user_id)    -> cached Principal or None
+    invalidate_principal(user_id)   -> call on role change / deactivation
+    revoke_token(claims)            -> call on logout (token id until expiry)
+
+Consistency:
+    Entries live for PRINCIPAL_CACHE_TTL_SECONDS (default 30s) in each worker
+    process. Changes made through this app invalidate the entry immediately;
+    changes made elsewhere (SQL console, scripts, another worker) are picked
+    up once the TTL expires. Set the TTL to 0 to disable caching.
+
+    Revoked token ids are shared by every worker through Redis (REDIS_URL),
+    one key per token that expires with the token. Without Redis, or while
+    it is unreachable, revocations only reach the worker that handled the
+    logout.
+
+What This Module DOES NOT DO:
+    ✗ Decode tokens (that's jwt.py)
+    ✗ Load users from the database (that's current_user.py)
+"""
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from core.config import settings
+from core.log.log_auth import logger
+
+REVOKED_KEY_PREFIX = "auth:revoked:"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Identity of an authenticated caller, detached from any DB session."""
+
+    id: str
+    is_active: bool
+    role: str
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(id=str(user.id), is_active=bool(user.is_active), role=user.role)
+
+
+class PrincipalCache:
+    """
+    TTL + LRU cache of Principals keyed by user id, plus revoked token ids.
+
+    Thread-safe: sync dependencies run in the threadpool.
+
+    Args:
+        redis_client: Optional sync Redis client; revoked token ids are
+            written there so every worker rejects them
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 10000, redis_client=None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self._entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+        # token id -> token expiry (unix time), revocations seen by this worker
+        self._revoked: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Principal | None:
+        """Return the cached Principal for a user, or None if absent/expired."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def put(self, principal: Principal) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def revoke_token(self, token_id: str, expires_at: float) -> None:
+        """Reject a token id until it would have expired anyway."""
+        now = time.time()
+        with self._lock:
+            self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+            self._revoked[token_id] = expires_at
+
+        ttl = math.ceil(expires_at - now)
+        if self.redis is not None and ttl > 0:
+            try:
+                self.redis.set(REVOKED_KEY_PREFIX + token_id, "1", ex=ttl)
+            except Exception as e:
+                logger.warning(f"Token revocation not shared, Redis error: {e}")
+
+    def _revoked_locally(self, token_id: str) -> bool:
+        with self._lock:
+            expires_at = self._revoked.get(token_id)
+        return expires_at is not None and expires_at > time.time()
+
+    def _revoked_in_redis(self, token_id: str) -> bool:
+        try:
+            return bool(self.redis.exists(REVOKED_KEY_PREFIX + token_id))
+        except Exception as e:
+            logger.warning(f"Token revocation check skipped, Redis error: {e}")
+            return False
+
+    def is_revoked(self, token_id: str | None) -> bool:
+        """Revocation check for sync dependencies (blocks on Redis)."""
+        if not token_id:
+            return False
+        if self._revoked_locally(token_id):
+            return True
+        return self.redis is not None and self._revoked_in_redis(token_id)
+
+    async def is_revoked_async(self, token_id: str | None) -> bool:
+        """is_revoked() for the event loop: the Redis call runs in a worker thread."""
+        if not token_id:
+            return False
+        if self._revoked_locally(token_id):
+            return True
+        if self.redis is None:
+            return False
+        return await asyncio.to_thread(self._revoked_in_redis, token_id)
+
+    def clear(self) -> None:
+        """Drop this worker's entries and revocations (Redis keys expire on their own)."""
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def create_revocation_client_from_env():
+    """
+    Redis client for shared token revocation, or None.
+
+    Env:
+        REDIS_URL: Redis connection URL (same instance as the rate limiter)
+    """
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return None
+    try:
+        import redis
+
+        return redis.Redis.from_url(redis_url, socket_connect_timeout=2, socket_timeout=0.5)
+    except Exception as e:
+        logger.warning(f"Token revocation falling back to per-worker memory: {e}")
+        return None
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    redis_client=create_revocation_client_from_env(),
+)
+
+
+def invalidate_principal(user_id) -> None:
+    """Drop a user's cached Principal (role change, deactivation, profile edit)."""
+    principal_cache.invalidate(str(user_id))
+
+
+def revoke_token(claims: dict) -> None:
+    """Revoke a decoded token (logout) and drop its user's cached Principal."""
+    token_id = claims.get("jti")
+    if token_id:
+        principal_cache.revoke_token(token_id, float(claims.get("exp") or time.time()))
+    if claims.get("sub"):
+        invalidate_principal(claims["sub"])
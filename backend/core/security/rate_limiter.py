@@ -1,25 +1,63 @@
 """
-Rate Limiter for Authentication Endpoints
+Rate Limiter for Authentication, Engine and Workspace Endpoints
 
-Simple in-memory rate limiter to prevent brute-force attacks
-on authentication endpoints like login, register, etc.
+Prevents brute-force attacks on authentication endpoints (login, register,
+etc.) and caps engine / workspace request rates.
+
+Backends (all share the allow(key, limit, window_seconds) interface, and
+allow_async() for async endpoints):
+    RateLimiter         - per-process sliding window, bounded number of keys
+    RedisRateLimiter    - token bucket in Redis (atomic Lua script), shared by
+                          every worker on every host
+    SQLiteRateLimiter   - token bucket in a SQLite file, shared by the workers
+                          of a single host (stand-in when Redis is not available)
+
+create_rate_limiter_from_env() picks one:
+    REDIS_URL set and reachable     -> RedisRateLimiter
+    RATE_LIMIT_SQLITE_PATH set      -> SQLiteRateLimiter
+    otherwise                       -> RateLimiter (limits are per worker)
+
+Shared backends fall back to the per-process limiter if the store errors,
+so an outage degrades limits instead of failing requests. Their allow_async()
+runs the blocking store round trip in a worker thread, so async endpoints
+never stall the event loop on Redis or a SQLite lock.
+
+Env:
+    DISABLE_RATE_LIMIT=1        - allow everything (tests)
+    RATE_LIMIT_MAX_KEYS         - in-memory key bound (default: 10000)
 """
 
+import asyncio
+import math
+import os
+import sqlite3
+import threading
 import time
-from collections import deque
+from collections import OrderedDict, deque
 from typing import Callable
 from fastapi import Request, HTTPException, status
 
+from core.log.log_api import logger
+
+
+def _refill(tokens: float, elapsed: float, capacity: int, window_seconds: float) -> float:
+    """Token bucket refill: `capacity` tokens per `window_seconds`."""
+    return min(float(capacity), tokens + elapsed * capacity / window_seconds)
+
 
 class RateLimiter:
     """
     Simple in-memory sliding window rate limiter.
 
     Tracks requests per key (e.g., IP address) and enforces limits.
+    At most `max_keys` keys are tracked; the least recently used key is
+    dropped beyond that, and keys whose window has emptied are removed.
     """
 
-    def __init__(self) -> None:
-        self._buckets: dict[str, deque[float]] = {}
+    def __init__(self, max_keys: int | None = None) -> None:
+        self.max_keys = max_keys or int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
+        self._buckets: OrderedDict[str, deque[float]] = OrderedDict()
+        self._lock = threading.Lock()
 
     def allow(self, key: str, limit: int, window_seconds: int) -> bool:
         """
@@ -33,27 +71,51 @@ class RateLimiter:
         Returns:
             True if request is allowed, False if rate limit exceeded
         """
+        if os.getenv("DISABLE_RATE_LIMIT") == "1":
+            return True
         if limit <= 0:
             return True
+        return self._allow(key, limit, window_seconds)
+
+    async def allow_async(self, key: str, limit: int, window_seconds: int) -> bool:
+        """allow() for async endpoints: never blocks the event loop."""
+        if os.getenv("DISABLE_RATE_LIMIT") == "1":
+            return True
+        if limit <= 0:
+            return True
+        return await self._allow_async(key, limit, window_seconds)
+
+    def _allow(self, key: str, limit: int, window_seconds: int) -> bool:
+        return self._allow_local(key, limit, window_seconds)
+
+    async def _allow_async(self, key: str, limit: int, window_seconds: int) -> bool:
+        # In-memory check: no I/O, cheaper than a thread hop
+        return self._allow(key, limit, window_seconds)
 
+    def _allow_local(self, key: str, limit: int, window_seconds: int) -> bool:
         now = time.monotonic()
-        bucket = self._buckets.get(key)
-        if bucket is None:
-            bucket = deque()
-            self._buckets[key] = bucket
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = deque()
+                self._buckets[key] = bucket
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
 
-        # Remove old entries outside the window
-        cutoff = now - window_seconds
-        while bucket and bucket[0] <= cutoff:
-            bucket.popleft()
+            # Remove old entries outside the window
+            cutoff = now - window_seconds
+            while bucket and bucket[0] <= cutoff:
+                bucket.popleft()
 
-        # Check if limit exceeded
-        if len(bucket) >= limit:
-            return False
+            # Check if limit exceeded
+            if len(bucket) >= limit:
+                return False
 
-        # Record this request
-        bucket.append(now)
-        return True
+            # Record this request
+            bucket.append(now)
+            return True
 
     def reset(self, key: str | None = None) -> None:
         """
@@ -62,18 +124,209 @@ class RateLimiter:
         Args:
             key: If provided, reset only for this key. Otherwise, reset all.
         """
+        with self._lock:
+            if key is None:
+                self._buckets.clear()
+            else:
+                self._buckets.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._buckets)
+
+
+# KEYS[1] = bucket key; ARGV[1] = capacity, ARGV[2] = window in ms.
+# Uses the Redis server clock so every worker sees the same time.
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = capacity
+else
+  tokens = math.min(capacity, tokens + math.max(0, now - ts) * capacity / window)
+end
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], window)
+return allowed
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Token bucket rate limiter shared through Redis.
+
+    Each (limit, window, key) gets a bucket of `limit` tokens refilled at
+    limit / window_seconds per second. Check-and-take runs in one Lua
+    script, so concurrent workers cannot overspend a bucket. Buckets expire
+    after one idle window (they would be full again by then).
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:", max_keys: int | None = None) -> None:
+        super().__init__(max_keys=max_keys)
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_TOKEN_BUCKET_LUA)
+
+    def _key(self, key: str, limit: int, window_seconds: int) -> str:
+        return f"{self.prefix}{limit}:{window_seconds}:{key}"
+
+    def _allow(self, key: str, limit: int, window_seconds: int) -> bool:
+        window_ms = max(1, int(math.ceil(window_seconds * 1000)))
+        try:
+            allowed = self._script(
+                keys=[self._key(key, limit, window_seconds)], args=[limit, window_ms]
+            )
+        except Exception as e:
+            logger.warning(f"Redis rate limiter unavailable, using local limits: {e}")
+            return self._allow_local(key, limit, window_seconds)
+        return bool(int(allowed))
+
+    async def _allow_async(self, key: str, limit: int, window_seconds: int) -> bool:
+        return await asyncio.to_thread(self._allow, key, limit, window_seconds)
+
+    def reset(self, key: str | None = None) -> None:
+        super().reset(key)
+        pattern = f"{self.prefix}*" if key is None else f"{self.prefix}*:{key}"
+        for redis_key in self.client.scan_iter(match=pattern, count=500):
+            self.client.delete(redis_key)
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """
+    Token bucket rate limiter shared through a SQLite file.
+
+    For single-host deployments without Redis: every worker process opens
+    the same file (put it on tmpfs, e.g. /dev/shm, to keep it in memory).
+    Same bucket semantics as RedisRateLimiter; expired buckets are purged
+    periodically, so the table stays bounded by the active key count.
+    """
+
+    _PURGE_EVERY = 1000
+
+    def __init__(self, path: str, max_keys: int | None = None) -> None:
+        super().__init__(max_keys=max_keys)
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            " key TEXT PRIMARY KEY, tokens REAL NOT NULL,"
+            " updated_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _allow(self, key: str, limit: int, window_seconds: int) -> bool:
+        bucket_key = f"{limit}:{window_seconds}:{key}"
+        try:
+            return self._take(bucket_key, limit, window_seconds)
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite rate limiter unavailable, using local limits: {e}")
+            return self._allow_local(key, limit, window_seconds)
+
+    async def _allow_async(self, key: str, limit: int, window_seconds: int) -> bool:
+        # Connections are per thread (see _connection), so any worker thread works
+        return await asyncio.to_thread(self._allow, key, limit, window_seconds)
+
+    def _take(self, bucket_key: str, limit: int, window_seconds: int) -> bool:
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?",
+                (bucket_key,),
+            ).fetchone()
+            if row is None:
+                tokens = float(limit)
+            else:
+                tokens = _refill(row[0], max(0.0, now - row[1]), limit, window_seconds)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                "INSERT INTO rate_limit_buckets (key, tokens, updated_at, expires_at)"
+                " VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens,"
+                " updated_at = excluded.updated_at, expires_at = excluded.expires_at",
+                (bucket_key, tokens, now, now + window_seconds),
+            )
+            self._calls += 1
+            if self._calls % self._PURGE_EVERY == 0:
+                conn.execute("DELETE FROM rate_limit_buckets WHERE expires_at < ?", (now,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed
+
+    def reset(self, key: str | None = None) -> None:
+        super().reset(key)
+        conn = self._connection()
         if key is None:
-            self._buckets.clear()
+            conn.execute("DELETE FROM rate_limit_buckets")
         else:
-            self._buckets.pop(key, None)
+            conn.execute("DELETE FROM rate_limit_buckets WHERE key LIKE ?", (f"%:%:{key}",))
+
+
+def create_rate_limiter_from_env() -> RateLimiter:
+    """
+    Create the process-wide rate limiter from environment.
+
+    Env:
+        REDIS_URL: Redis connection URL (shared across hosts)
+        RATE_LIMIT_SQLITE_PATH: SQLite file shared by workers on one host
+    """
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        try:
+            import redis
+
+            client = redis.Redis.from_url(redis_url, socket_connect_timeout=2, socket_timeout=0.5)
+            client.ping()
+            return RedisRateLimiter(client)
+        except Exception as e:
+            logger.warning(f"Rate limiter falling back from Redis: {e}")
+
+    sqlite_path = os.getenv("RATE_LIMIT_SQLITE_PATH")
+    if sqlite_path:
+        try:
+            return SQLiteRateLimiter(sqlite_path)
+        except sqlite3.Error as e:
+            logger.warning(f"Rate limiter falling back from SQLite: {e}")
+
+    return RateLimiter()
 
 
-# Global rate limiter instance
-_rate_limiter = RateLimiter()
+# Global rate limiter instance (created on first use)
+_rate_limiter: RateLimiter | None = None
+_rate_limiter_lock = threading.Lock()
 
 
 def get_rate_limiter() -> RateLimiter:
     """Get the global rate limiter instance."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = create_rate_limiter_from_env()
     return _rate_limiter
 
 
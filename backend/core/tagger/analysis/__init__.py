@@ -8,6 +8,7 @@ tag occurrence percentages across games.
 from .pipeline import AnalysisPipeline
 from .tag_statistics import TagStatistics
 from .fen_processor import FenIndexProcessor, NodeFenEntry, process_fen_index_json
+from .scheduler import AdaptiveConcurrency
 
 __all__ = [
     "AnalysisPipeline",
@@ -15,4 +16,5 @@ __all__ = [
     "FenIndexProcessor",
     "NodeFenEntry",
     "process_fen_index_json",
+    "AdaptiveConcurrency",
 ]
@@ -21,6 +21,13 @@ class NodeFenEntry:
     fen: str
     uci: Optional[str] = None
     san: Optional[str] = None
+    ply: int = 0
+    variation_depth: int = 0
+
+    @property
+    def priority(self) -> tuple[int, int]:
+        """Scheduling key: mainline (depth 0) first, then shallower plies."""
+        return (self.variation_depth, self.ply)
 
 
 class FenIndexProcessor:
@@ -83,6 +90,8 @@ class FenIndexProcessor:
         Process a tree_json dict and extract nodes with FEN and moves.
 
         This provides more complete data including UCI moves for analysis.
+        Entries are ordered by priority: mainline moves first, then
+        variations by nesting depth, each group by ply.
 
         Args:
             tree_dict: Dict from chapters/{chapter_id}.tree.json
@@ -92,6 +101,7 @@ class FenIndexProcessor:
         """
         entries = []
         nodes = tree_dict.get("nodes", {})
+        variation_depths = _variation_depths(nodes)
 
         for node_id, node_data in nodes.items():
             # Skip virtual root
@@ -106,8 +116,11 @@ class FenIndexProcessor:
                 fen=fen_before_move,
                 uci=node_data.get("uci"),
                 san=node_data.get("san"),
+                ply=node_data.get("ply") or 0,
+                variation_depth=variation_depths.get(node_id, 0),
             ))
 
+        entries.sort(key=lambda entry: entry.priority)
         logger.debug(f"Processed {len(entries)} tree nodes")
         return entries
 
@@ -145,6 +158,34 @@ class FenIndexProcessor:
             return self.process_tree_with_moves(tree_dict)
 
 
+def _variation_depths(nodes: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Count how many side branches separate each node from the mainline.
+
+    A node is on its parent's mainline when it is the parent's ``main_child``
+    (or the parent has no ``main_child`` recorded). Walks parent chains
+    iteratively so very long games do not hit the recursion limit.
+    """
+    depths: Dict[str, int] = {}
+    for start_id in nodes:
+        chain = []
+        node_id: Optional[str] = start_id
+        while node_id is not None and node_id not in depths and node_id in nodes:
+            chain.append(node_id)
+            node_id = nodes[node_id].get("parent_id")
+            if len(chain) > len(nodes):
+                break
+        base = depths.get(node_id, 0) if node_id is not None else 0
+        for chain_id in reversed(chain):
+            parent_id = nodes[chain_id].get("parent_id")
+            parent = nodes.get(parent_id) if parent_id else None
+            main_child = parent.get("main_child") if parent else None
+            if main_child and main_child != chain_id:
+                base += 1
+            depths[chain_id] = base
+    return depths
+
+
 def process_fen_index_json(fen_index_json: str) -> List[NodeFenEntry]:
     """
     Convenience function to process a JSON string.
@@ -16,18 +16,21 @@ import json
 import logging
 import os
 import time
+from collections import deque
 from datetime import datetime
 from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Literal
+from typing import Any, Callable, Dict, List, Optional, Literal
 
 from modules.workspace.pgn_v2.repo import PgnV2Repo
+from modules.workspace.storage.async_r2_client import run_in_storage_executor
 from ..config.engine import DEFAULT_DEPTH, DEFAULT_MULTIPV, DEFAULT_STOCKFISH_PATH
 from ..facade import tag_position
 from ..tagging import get_primary_tags
 from .pgn_processor import PGNProcessor
 from .tag_statistics import TagStatistics
 from .fen_processor import FenIndexProcessor, NodeFenEntry
+from .scheduler import AdaptiveConcurrency
 from ..pipeline.predictor.node_predictor import NodePredictor, NodeTagResult
 
 logger = logging.getLogger(__name__)
@@ -214,6 +217,9 @@ class AnalysisPipeline:
     PER_NODE_TIMEOUT_MS = 50.0
     MAX_CONSECUTIVE_ERRORS = 5
     MAX_CONCURRENCY = 5
+    MIN_CONCURRENCY = 1
+    MAX_CONCURRENCY_CEILING = 12
+    CHECKPOINT_EVERY = 20
 
     async def _analyze_entry(self, entry: NodeFenEntry) -> tuple[NodeTagResult, float | None]:
         if not entry.uci:
@@ -273,14 +279,23 @@ class AnalysisPipeline:
         verbose: bool = True,
         max_positions: Optional[int] = None,
         batch_timeout: Optional[float] = None,
+        on_progress: Optional[Callable[[List[NodeTagResult]], None]] = None,
     ) -> List[NodeTagResult]:
         """
         Run analysis using FEN index data (v2 mode) with concurrency.
 
         Uses tag_position for full tag logic and returns NodeTagResult.
+        Nodes are scheduled mainline-first through a sliding window whose
+        size adapts to engine latency and errors (see AdaptiveConcurrency),
+        so a batch timeout still yields tags for the most important moves.
+
+        Args:
+            on_progress: Optional callback receiving the results collected so
+                far, invoked every CHECKPOINT_EVERY completed nodes
         """
         batch_timeout = batch_timeout or self.BATCH_TIMEOUT_SECONDS
         start_time = time.time()
+        last_checkpoint = 0
 
         if verbose:
             logger.info(f"Starting FEN index analysis (timeout={batch_timeout}s)")
@@ -311,62 +326,66 @@ class AnalysisPipeline:
         consecutive_errors = 0
         degraded_mode = False
         slow_nodes: list[tuple[str, float]] = []
+        controller = AdaptiveConcurrency(
+            initial=self.MAX_CONCURRENCY,
+            minimum=self.MIN_CONCURRENCY,
+            maximum=self.MAX_CONCURRENCY_CEILING,
+        )
 
-        for i in range(0, len(entries), self.MAX_CONCURRENCY):
-            elapsed = time.time() - start_time
-            if elapsed > batch_timeout:
-                if verbose:
-                    logger.warning(
-                        f"Batch timeout reached ({elapsed:.1f}s > {batch_timeout}s). "
-                        f"Processed {i}/{len(entries)} nodes, skipping remaining."
-                    )
-                for remaining_entry in entries[i:]:
-                    timeout_count += 1
-                    results.append(
-                        NodeTagResult(
-                            node_id=remaining_entry.node_id,
-                            fen=remaining_entry.fen,
-                            move_uci=remaining_entry.uci,
-                            error="batch_timeout",
-                        )
-                    )
-                break
+        pending = deque(entries)
+        in_flight: Dict[asyncio.Task, NodeFenEntry] = {}
 
-            chunk = entries[i : i + self.MAX_CONCURRENCY]
-            if degraded_mode:
-                for entry in chunk:
-                    results.append(
-                        NodeTagResult(
-                            node_id=entry.node_id,
-                            fen=entry.fen,
-                            move_uci=entry.uci,
-                            error="degraded_mode",
-                        )
-                    )
-                continue
+        def _skip(entry: NodeFenEntry, reason: str) -> None:
+            results.append(
+                NodeTagResult(
+                    node_id=entry.node_id,
+                    fen=entry.fen,
+                    move_uci=entry.uci,
+                    error=reason,
+                )
+            )
 
-            tasks = [self._analyze_entry(entry) for entry in chunk]
-            remaining_timeout = max(0.1, batch_timeout - (time.time() - start_time))
-            try:
-                chunk_results = await asyncio.wait_for(
-                    asyncio.gather(*tasks, return_exceptions=False),
+        # Sliding window: refill as soon as any node finishes instead of
+        # waiting for the slowest node of a fixed chunk.
+        while pending or in_flight:
+            while pending and not degraded_mode and len(in_flight) < controller.limit:
+                entry = pending.popleft()
+                in_flight[asyncio.ensure_future(self._analyze_entry(entry))] = entry
+
+            if degraded_mode and not in_flight:
+                while pending:
+                    _skip(pending.popleft(), "degraded_mode")
+                break
+
+            remaining_timeout = batch_timeout - (time.time() - start_time)
+            done: set[asyncio.Task] = set()
+            if remaining_timeout > 0:
+                done, _ = await asyncio.wait(
+                    in_flight.keys(),
                     timeout=remaining_timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
-            except asyncio.TimeoutError:
-                for entry in chunk:
-                    timeout_count += 1
-                    results.append(
-                        NodeTagResult(
-                            node_id=entry.node_id,
-                            fen=entry.fen,
-                            move_uci=entry.uci,
-                            error="batch_timeout",
-                        )
+            if not done:
+                if verbose:
+                    logger.warning(
+                        f"Batch timeout reached ({time.time() - start_time:.1f}s > {batch_timeout}s). "
+                        f"Processed {len(results)}/{len(entries)} nodes, skipping remaining."
                     )
+                for task, entry in in_flight.items():
+                    task.cancel()
+                    timeout_count += 1
+                    _skip(entry, "batch_timeout")
+                while pending:
+                    timeout_count += 1
+                    _skip(pending.popleft(), "batch_timeout")
+                in_flight.clear()
                 break
 
-            for (node_result, elapsed_ms) in chunk_results:
+            for task in done:
+                in_flight.pop(task)
+                node_result, elapsed_ms = task.result()
                 results.append(node_result)
+                controller.record(elapsed_ms, error=bool(node_result.error))
                 if node_result.error:
                     error_count += 1
                     consecutive_errors += 1
@@ -382,10 +401,15 @@ class AnalysisPipeline:
                         f"Switching to degraded mode after {consecutive_errors} consecutive errors"
                     )
 
-            if verbose and (i + len(chunk)) % 10 == 0:
-                rate = (i + len(chunk)) / max(0.001, time.time() - start_time)
+            if on_progress and len(results) - last_checkpoint >= self.CHECKPOINT_EVERY:
+                last_checkpoint = len(results)
+                on_progress(list(results))
+
+            if verbose:
                 logger.debug(
-                    f"Processed {i + len(chunk)}/{len(entries)} positions ({rate:.1f}/s)..."
+                    f"Processed {len(results)}/{len(entries)} positions "
+                    f"({len(results) / max(0.001, time.time() - start_time):.1f}/s, "
+                    f"window={controller.limit})..."
                 )
 
         total_time = time.time() - start_time
@@ -402,6 +426,10 @@ class AnalysisPipeline:
                 )
             if degraded_mode:
                 logger.warning("Ran in degraded mode - some nodes skipped engine analysis")
+            logger.info(
+                f"Concurrency: final={controller.limit}, peak={controller.stats.peak_limit}, "
+                f"increases={controller.stats.increases}, decreases={controller.stats.decreases}"
+            )
 
         return results
 
@@ -436,14 +464,56 @@ class AnalysisPipeline:
     ) -> Dict[str, Any]:
         """
         Run FEN index analysis and save results to output directory.
+
+        Partial results are checkpointed to the local tags file while the
+        analysis runs, so an interrupted or timed-out run still leaves the
+        mainline tags on disk.
         """
+        output_path = self.output_dir / f"{chapter_id}.tags.json"
+
+        def _checkpoint(partial_results: List[NodeTagResult]) -> None:
+            self._write_tags_output(
+                output_path,
+                self._build_tags_output(chapter_id, partial_results, complete=False),
+            )
+
         results = await self.run_fen_index(
             fen_index=fen_index,
             tree_data=tree_data,
             verbose=verbose,
             max_positions=max_positions,
+            on_progress=_checkpoint,
         )
 
+        tags_output = self._build_tags_output(chapter_id, results, complete=True)
+        self._write_tags_output(output_path, tags_output)
+
+        if verbose:
+            logger.info(f"Tags saved to: {output_path}")
+
+        if self.pgn_v2_repo:
+            try:
+                await run_in_storage_executor(
+                    self.pgn_v2_repo.save_tags_json,
+                    chapter_id=chapter_id,
+                    tags_data=tags_output,
+                    metadata={"chapter_id": chapter_id},
+                )
+                if verbose:
+                    logger.info(f"Tags also saved to R2 for chapter {chapter_id}")
+            except Exception as e:
+                logger.error(f"Failed to save tags to R2 for chapter {chapter_id}: {e}")
+        else:
+            logger.warning("PgnV2Repo not configured, skipping R2 tags save.")
+
+        return tags_output
+
+    def _build_tags_output(
+        self,
+        chapter_id: str,
+        results: List[NodeTagResult],
+        complete: bool,
+    ) -> Dict[str, Any]:
         tags_output: Dict[str, Any] = {
             "metadata": {
                 "chapter_id": chapter_id,
@@ -451,6 +521,7 @@ class AnalysisPipeline:
                 "total_nodes": len(results),
                 "depth": self.depth,
                 "multipv": self.multipv,
+                "complete": complete,
             },
             "nodes": {},
         }
@@ -461,29 +532,15 @@ class AnalysisPipeline:
                 "features": result.features,
                 "error": result.error,
             }
+        return tags_output
 
-        output_path = self.output_dir / f"{chapter_id}.tags.json"
-        with open(output_path, "w") as f:
+    @staticmethod
+    def _write_tags_output(output_path: Path, tags_output: Dict[str, Any]) -> None:
+        # Write then rename so readers never see a half-written checkpoint.
+        tmp_path = output_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
             json.dump(tags_output, f, indent=2)
-
-        if verbose:
-            logger.info(f"Tags saved to: {output_path}")
-
-        if self.pgn_v2_repo:
-            try:
-                self.pgn_v2_repo.save_tags_json(
-                    chapter_id=chapter_id,
-                    tags_data=tags_output,
-                    metadata={"chapter_id": chapter_id},
-                )
-                if verbose:
-                    logger.info(f"Tags also saved to R2 for chapter {chapter_id}")
-            except Exception as e:
-                logger.error(f"Failed to save tags to R2 for chapter {chapter_id}: {e}")
-        else:
-            logger.warning("PgnV2Repo not configured, skipping R2 tags save.")
-
-        return tags_output
+        os.replace(tmp_path, output_path)
 
 
 __all__ = ["AnalysisPipeline"]
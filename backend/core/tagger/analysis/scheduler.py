@@ -0,0 +1,105 @@
+"""
+Adaptive concurrency control for FEN index analysis.
+
+The engine is a shared remote service whose latency depends on load we
+cannot see. Instead of a fixed chunk size, the pipeline keeps a sliding
+window of in-flight nodes and lets this controller resize the window:
+
+- additive increase: +1 slot after a full window of healthy completions
+- multiplicative decrease: halve the window on errors or when latency
+  drifts well above the best latency observed in this run
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ConcurrencyStats:
+    """Counters reported by the controller at the end of a run."""
+    completed: int = 0
+    errors: int = 0
+    increases: int = 0
+    decreases: int = 0
+    peak_limit: int = 0
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD controller for the number of in-flight engine calls.
+
+    Usage:
+        controller = AdaptiveConcurrency(initial=5, minimum=1, maximum=12)
+        while pending:
+            while len(in_flight) < controller.limit: ...
+            controller.record(latency_ms, error=False)
+    """
+
+    EWMA_ALPHA = 0.3
+    LATENCY_TOLERANCE = 2.0
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: Optional[int] = None):
+        """
+        Initialize controller.
+
+        Args:
+            initial: Starting window size
+            minimum: Lower bound for the window (default: 1)
+            maximum: Upper bound for the window (default: 2 * initial)
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum if maximum is not None else initial * 2)
+        self.limit = min(self.maximum, max(self.minimum, initial))
+        self.latency_ewma_ms: Optional[float] = None
+        self.baseline_ms: Optional[float] = None
+        self.stats = ConcurrencyStats(peak_limit=self.limit)
+        self._healthy_streak = 0
+
+    def record(self, latency_ms: Optional[float], error: bool = False) -> None:
+        """
+        Feed one completed node into the controller.
+
+        Args:
+            latency_ms: Wall time of the engine call (None if no engine call was made)
+            error: Whether the node failed
+        """
+        self.stats.completed += 1
+        if error:
+            self.stats.errors += 1
+            self._decrease()
+            return
+
+        if latency_ms is None:
+            return
+
+        if self.latency_ewma_ms is None:
+            self.latency_ewma_ms = latency_ms
+        else:
+            self.latency_ewma_ms = (
+                self.EWMA_ALPHA * latency_ms + (1 - self.EWMA_ALPHA) * self.latency_ewma_ms
+            )
+        if self.baseline_ms is None or self.latency_ewma_ms < self.baseline_ms:
+            self.baseline_ms = self.latency_ewma_ms
+
+        if self.latency_ewma_ms > self.baseline_ms * self.LATENCY_TOLERANCE:
+            self._decrease()
+            # Re-anchor so a permanently slower engine does not keep shrinking us.
+            self.baseline_ms = self.latency_ewma_ms / self.LATENCY_TOLERANCE
+            return
+
+        self._healthy_streak += 1
+        if self._healthy_streak >= self.limit and self.limit < self.maximum:
+            self.limit += 1
+            self.stats.increases += 1
+            self.stats.peak_limit = max(self.stats.peak_limit, self.limit)
+            self._healthy_streak = 0
+
+    def _decrease(self) -> None:
+        self._healthy_streak = 0
+        new_limit = max(self.minimum, self.limit // 2)
+        if new_limit < self.limit:
+            self.limit = new_limit
+            self.stats.decreases += 1
+
+
+__all__ = ["AdaptiveConcurrency", "ConcurrencyStats"]
@@ -104,6 +104,9 @@ async def _init_blog_db() -> None:
             if 'is_hidden' not in col_names:
                 logger.info("blog_articles missing is_hidden field - migration needed")
                 needs_migration = True
+            elif 'search_vector' not in col_names:
+                logger.info("blog_articles missing search_vector - migration needed")
+                needs_migration = True
 
         # Check if blog_images has new fields
         if 'blog_images' in tables and not needs_migration:
@@ -112,6 +115,9 @@ async def _init_blog_db() -> None:
             if 'is_orphan' not in col_names:
                 logger.info("blog_images missing new fields - migration needed")
                 needs_migration = True
+            elif 'variants' not in col_names:
+                logger.info("blog_images missing processing fields - migration needed")
+                needs_migration = True
 
         # Step 0: Create base tables if needed
         if needs_base_tables:
@@ -204,6 +210,27 @@ async def _init_blog_db() -> None:
                     CREATE INDEX IF NOT EXISTS ix_blog_articles_is_hidden ON blog_articles(is_hidden);
                 """))
 
+                # Step 0b: Search indexes (tsvector generated on every write, trigrams)
+                logger.info("  Adding search indexes to blog_articles...")
+                conn.execute(text("""
+                    ALTER TABLE blog_articles
+                    ADD COLUMN IF NOT EXISTS search_vector tsvector
+                    GENERATED ALWAYS AS (
+                        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                        setweight(to_tsvector('english', coalesce(subtitle, '')), 'B') ||
+                        setweight(to_tsvector('english', coalesce(content, '')), 'C')
+                    ) STORED;
+
+                    CREATE INDEX IF NOT EXISTS ix_blog_articles_search_vector
+                    ON blog_articles USING gin (search_vector);
+
+                    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                    CREATE INDEX IF NOT EXISTS ix_blog_articles_title_trgm
+                    ON blog_articles USING gin (title gin_trgm_ops);
+                    CREATE INDEX IF NOT EXISTS ix_blog_articles_content_trgm
+                    ON blog_articles USING gin (content gin_trgm_ops);
+                """))
+
                 # Step 1: Add new columns to blog_images
                 logger.info("  Adding columns to blog_images...")
                 conn.execute(text("""
@@ -213,6 +240,14 @@ async def _init_blog_db() -> None:
                     ADD COLUMN IF NOT EXISTS last_referenced_at TIMESTAMP;
                 """))
 
+                # Step 1b: Background processing status and responsive variants
+                logger.info("  Adding processing columns to blog_images...")
+                conn.execute(text("""
+                    ALTER TABLE blog_images
+                    ADD COLUMN IF NOT EXISTS status VARCHAR(20) NOT NULL DEFAULT 'ready',
+                    ADD COLUMN IF NOT EXISTS variants JSONB;
+                """))
+
                 # Step 2: Create blog_article_images table
                 logger.info("  Creating blog_article_images table...")
                 conn.execute(text("""
@@ -282,34 +317,58 @@ async def _init_blog_db() -> None:
         logger.warning("Blog module may not function correctly")
 
 
-async def _presence_cleanup_loop() -> None:
-    import os
-
+async def _presence_tick(sweep: bool, timeout_minutes: int = 10) -> None:
+    """
+    Flush live presence sessions changed since the last tick to the
+    database and, with `sweep`, apply idle transitions and expire sessions.
+    """
+    from modules.workspace.collaboration.presence_store import get_presence_store
     from modules.workspace.db.repos.presence_repo import PresenceRepository
     from modules.workspace.domain.services.presence_service import PresenceService
     from modules.workspace.events.bus import EventBus
     from modules.workspace.db.session import get_session
 
-    interval_seconds = int(os.getenv("PRESENCE_CLEANUP_INTERVAL_SECONDS", "300"))
+    store = get_presence_store()
+    if not sweep and not store.pending:
+        return
+    async for session in get_session():
+        service = PresenceService(
+            session=session,
+            presence_repo=PresenceRepository(session),
+            event_bus=EventBus(session),
+            store=store,
+        )
+        if sweep:
+            await service.update_all_statuses()
+            await service.cleanup_expired_sessions(timeout_minutes=timeout_minutes)
+            await session.commit()
+        await service.flush_presence()
+        break
+
+
+async def _presence_loop(cleanup: bool) -> None:
+    import os
+    import time
+
+    from modules.workspace.collaboration.presence_store import get_presence_store
+
+    flush_seconds = int(os.getenv("PRESENCE_FLUSH_INTERVAL_SECONDS", "10"))
+    interval_seconds = int(os.getenv("PRESENCE_CLEANUP_INTERVAL_SECONDS", "30"))
     timeout_minutes = int(os.getenv("PRESENCE_CLEANUP_TIMEOUT_MINUTES", "10"))
+    next_sweep = time.monotonic()
 
     while True:
         try:
-            async for session in get_session():
-                presence_repo = PresenceRepository(session)
-                event_bus = EventBus(session)
-                service = PresenceService(
-                    session=session,
-                    presence_repo=presence_repo,
-                    event_bus=event_bus,
-                )
-                await service.cleanup_expired_sessions(timeout_minutes=timeout_minutes)
-                break
+            sweep = cleanup and time.monotonic() >= next_sweep
+            if sweep:
+                next_sweep = time.monotonic() + interval_seconds
+                sweep = await get_presence_store().try_lock_sweep(interval_seconds)
+            await _presence_tick(sweep, timeout_minutes)
         except asyncio.CancelledError:
             raise
         except Exception as exc:
-            logger.error(f"Presence cleanup loop error: {exc}", exc_info=True)
-        await asyncio.sleep(interval_seconds)
+            logger.error(f"Presence loop error: {exc}", exc_info=True)
+        await asyncio.sleep(flush_seconds)
 
 
 @asynccontextmanager
@@ -338,11 +397,36 @@ async def lifespan(app: FastAPI):
     tasks: list[asyncio.Task] = []
     if settings.DEBUG:
         logger.info("Starting background tasks (non-blocking)")
-    if settings.ENABLE_PRESENCE_CLEANUP:
-        tasks.append(asyncio.create_task(_presence_cleanup_loop()))
+    tasks.append(asyncio.create_task(_presence_loop(settings.ENABLE_PRESENCE_CLEANUP)))
+    outbox_dispatcher = None
+    if settings.WORKSPACE_EVENT_DELIVERY == "outbox":
+        try:
+            from modules.workspace.db.session import get_db_config
+            from modules.workspace.events.outbox import OutboxDispatcher, set_outbox_dispatcher
+            outbox_dispatcher = OutboxDispatcher(get_db_config().async_session_maker)
+            outbox_dispatcher.start()
+            set_outbox_dispatcher(outbox_dispatcher)
+            logger.info("Workspace event outbox dispatcher started")
+        except Exception as e:
+            logger.warning(f"Event outbox dispatcher not started, delivering inline: {e}")
     try:
         yield
     finally:
+        # Cleanup: Stop event outbox dispatcher (undelivered events stay queued)
+        if outbox_dispatcher is not None:
+            from modules.workspace.events.outbox import set_outbox_dispatcher
+            set_outbox_dispatcher(None)
+            await outbox_dispatcher.stop()
+
+        # Cleanup: Let blog image uploads in progress finish, then stop the image workers
+        try:
+            from modules.blogs.api.router import drain_image_jobs
+            from modules.blogs.services.image_service import shutdown_image_process_pool
+            await drain_image_jobs(timeout=30)
+            shutdown_image_process_pool()
+        except Exception as e:
+            logger.error(f"Blog image worker cleanup failed: {e}")
+
         # Cleanup: Stop engine queue
         try:
             from core.chess_engine.queue import shutdown_engine_queue
@@ -351,6 +435,16 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Engine queue cleanup failed: {e}")
 
+        # Cleanup: Close WebSocket send queues and flush event fan-out
+        try:
+            from modules.workspace.api.websocket.presence_ws import manager as ws_manager
+            from modules.workspace.events.fanout import get_event_broker, set_event_broker
+            await ws_manager.close()
+            await get_event_broker().close()
+            set_event_broker(None)
+        except Exception as e:
+            logger.error(f"Event fan-out cleanup failed: {e}")
+
         # Cleanup: Stop background tasks
         for task in tasks:
             task.cancel()
@@ -360,6 +454,18 @@ async def lifespan(app: FastAPI):
             except asyncio.CancelledError:
                 pass
 
+        # Cleanup: Write presence changes from the last flush interval
+        try:
+            from modules.workspace.collaboration.presence_store import (
+                get_presence_store,
+                set_presence_store,
+            )
+            await _presence_tick(sweep=False)
+            await get_presence_store().close()
+            set_presence_store(None)
+        except Exception as e:
+            logger.error(f"Presence flush failed: {e}", exc_info=True)
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -484,6 +590,7 @@ async def performance_metrics():
         - Database connection pool stats
         - Engine queue statistics
         - MongoDB cache statistics
+        - Workspace event outbox lag
     """
     metrics = {
         "service": "Catachess API",
@@ -529,6 +636,15 @@ async def performance_metrics():
     except Exception as e:
         metrics["mongodb_cache"] = {"error": str(e)}
 
+    # Workspace event outbox metrics
+    try:
+        from modules.workspace.events.outbox import get_outbox_dispatcher
+        dispatcher = get_outbox_dispatcher()
+        if dispatcher is not None:
+            metrics["event_outbox"] = dispatcher.metrics()
+    except Exception as e:
+        metrics["event_outbox"] = {"error": str(e)}
+
     return metrics
 
 
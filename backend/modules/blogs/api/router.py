@@ -4,24 +4,27 @@ Blog API Router
 Public Endpoints:
 - GET /api/blogs/categories - Get all categories
 - GET /api/blogs/articles - Get article list with pagination
+- GET /api/blogs/articles/search - Ranked full-text search with snippets
 - GET /api/blogs/articles/pinned - Get pinned articles
 - GET /api/blogs/articles/:id - Get article detail
 
 Management Endpoints (Editor/Admin):
 - GET /api/blogs/articles/my-drafts - Get user's draft articles
 - GET /api/blogs/articles/my-published - Get user's published articles
-- POST /api/blogs/upload-image - Upload image
+- POST /api/blogs/upload-image - Upload image (processed in the background)
+- GET /api/blogs/images/:id - Image processing status and variants
 - POST /api/blogs/articles - Create article
 - PUT /api/blogs/articles/:id - Update article (author or admin)
 - DELETE /api/blogs/articles/:id - Delete article (author or admin)
 - POST /api/blogs/articles/:id/pin - Pin/unpin article (admin only)
 """
+import asyncio
 import os
 from typing import List, Optional
 from uuid import UUID, uuid4
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends, Query, UploadFile, File, Form
-from sqlalchemy import create_engine, select, func, and_, or_, text
+from sqlalchemy import create_engine, select, func, and_, text
 from sqlalchemy.orm import Session
 
 from modules.blogs.db.models import BlogArticle, BlogCategory
@@ -31,11 +34,19 @@ from modules.blogs.schemas import (
     ArticleListResponse,
     ArticleResponse,
     ArticleListItem,
+    ArticleSearchItem,
+    ArticleSearchResponse,
     ArticleCreate,
     ArticleUpdate
 )
 from modules.blogs.services.cache_service import get_blog_cache, BlogCacheService
 from modules.blogs.services.image_service import get_image_service
+from modules.blogs.services.search_service import (
+    normalize_query,
+    search_articles,
+    search_match,
+    search_rank,
+)
 from modules.blogs.auth import require_editor, require_admin
 from modules.blogs.utils.image_linker import sync_article_images
 
@@ -51,16 +62,20 @@ def get_blog_db():
     Blog articles, categories, and images use a separate database.
     User authentication queries the main database via auth.py::get_current_user.
     """
+    session = _open_blog_session()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _open_blog_session() -> Session:
     db_url = os.getenv("BLOG_DATABASE_URL")
     if not db_url:
         raise HTTPException(status_code=500, detail="BLOG_DATABASE_URL not configured")
 
     engine = create_engine(db_url)
-    session = Session(engine)
-    try:
-        yield session
-    finally:
-        session.close()
+    return Session(engine)
 
 
 # ==================== Categories ====================
@@ -75,36 +90,32 @@ async def get_categories(
 
     **Public endpoint** - No authentication required
     """
-    # Try cache first
-    cached = await cache.get_categories()
-    if cached:
-        return [CategoryResponse(**item) for item in cached]
-
-    # Query database
-    stmt = (
-        select(BlogCategory)
-        .where(BlogCategory.is_active == True)
-        .order_by(BlogCategory.order_index)
-    )
-    categories = db.execute(stmt).scalars().all()
-
-    # Convert to dict for caching
-    result = [
-        {
-            "id": str(cat.id),
-            "name": cat.name,
-            "display_name": cat.display_name,
-            "description": cat.description,
-            "icon": cat.icon,
-            "order_index": cat.order_index,
-            "is_active": cat.is_active,
-            "created_at": cat.created_at.isoformat(),
-        }
-        for cat in categories
-    ]
+    async def load() -> list:
+        # Query database
+        stmt = (
+            select(BlogCategory)
+            .where(BlogCategory.is_active == True)
+            .order_by(BlogCategory.order_index)
+        )
+        categories = db.execute(stmt).scalars().all()
+
+        # Convert to dict for caching
+        return [
+            {
+                "id": str(cat.id),
+                "name": cat.name,
+                "display_name": cat.display_name,
+                "description": cat.description,
+                "icon": cat.icon,
+                "order_index": cat.order_index,
+                "is_active": cat.is_active,
+                "created_at": cat.created_at.isoformat(),
+            }
+            for cat in categories
+        ]
 
-    # Cache for 1 hour
-    await cache.set_categories(result)
+    # Cached for 1 hour; concurrent misses share one query
+    result = await cache.load_categories(load)
 
     return [CategoryResponse(**item) for item in result]
 
@@ -116,7 +127,7 @@ async def get_articles(
     category: Optional[str] = Query(None, description="Filter by category (about/function/allblogs/user)"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=50, description="Items per page"),
-    search: Optional[str] = Query(None, description="Search in title/content"),
+    search: Optional[str] = Query(None, description="Full-text search in title/subtitle/content"),
     year: Optional[int] = Query(None, ge=2020, le=2100, description="Filter by year (e.g., 2024)"),
     month: Optional[int] = Query(None, ge=1, le=12, description="Filter by month (1-12, requires year)"),
     start_date: Optional[str] = Query(None, description="Filter from date (YYYY-MM-DD)"),
@@ -131,7 +142,7 @@ async def get_articles(
 
     **Filters:**
     - category: Filter by category name
-    - search: Full-text search in title and content
+    - search: Full-text search (indexed; results ordered by relevance)
     - year: Filter by publication year (e.g., 2024)
     - month: Filter by publication month (1-12, must specify year)
     - start_date: Filter from date (YYYY-MM-DD format)
@@ -145,142 +156,204 @@ async def get_articles(
     **Returns:**
     - Pinned articles appear first
     - Then sorted by published_at DESC
+    - With `search`, sorted by relevance instead
     - Hidden articles are excluded
     """
-    # Build cache key with time filters
-    cache_key_parts = [category or "all"]
+    search = normalize_query(search) if search else None
+
+    # Cache variant: time filters, search and page size (the category is the tag)
+    variant_parts = [f"n{page_size}"]
     if year:
-        cache_key_parts.append(f"y{year}")
+        variant_parts.append(f"y{year}")
     if month:
-        cache_key_parts.append(f"m{month}")
+        variant_parts.append(f"m{month}")
     if start_date:
-        cache_key_parts.append(f"s{start_date}")
+        variant_parts.append(f"s{start_date}")
     if end_date:
-        cache_key_parts.append(f"e{end_date}")
-    cache_key = "_".join(cache_key_parts)
-
-    # Try cache first (only for non-search queries)
-    if not search:
-        cached = await cache.get_article_list(cache_key, page)
-        if cached:
-            return ArticleListResponse(**cached)
-
-    # Build query - exclude hidden articles
-    stmt = select(BlogArticle).where(
-        and_(
-            BlogArticle.status == "published",
-            BlogArticle.is_hidden == False
+        variant_parts.append(f"e{end_date}")
+    if search:
+        variant_parts.append(f"q{cache.query_digest(search)}")
+    variant = "_".join(variant_parts)
+
+    async def load() -> dict:
+        # Build query - exclude hidden articles
+        stmt = select(BlogArticle).where(
+            and_(
+                BlogArticle.status == "published",
+                BlogArticle.is_hidden == False
+            )
         )
-    )
 
-    # Filter by category
-    if category and category != "allblogs":
-        stmt = stmt.where(BlogArticle.category == category)
+        # Filter by category
+        if category and category != "allblogs":
+            stmt = stmt.where(BlogArticle.category == category)
+
+        # Time filtering by year/month
+        if year:
+            if month:
+                # Specific month in year
+                import calendar
+                from datetime import datetime
+                _, last_day = calendar.monthrange(year, month)
+                month_start = datetime(year, month, 1)
+                month_end = datetime(year, month, last_day, 23, 59, 59)
+                stmt = stmt.where(
+                    and_(
+                        BlogArticle.published_at >= month_start,
+                        BlogArticle.published_at <= month_end
+                    )
+                )
+            else:
+                # Entire year
+                from datetime import datetime
+                year_start = datetime(year, 1, 1)
+                year_end = datetime(year, 12, 31, 23, 59, 59)
+                stmt = stmt.where(
+                    and_(
+                        BlogArticle.published_at >= year_start,
+                        BlogArticle.published_at <= year_end
+                    )
+                )
 
-    # Time filtering by year/month
-    if year:
-        if month:
-            # Specific month in year
-            import calendar
+        # Time filtering by custom date range
+        if start_date:
             from datetime import datetime
-            _, last_day = calendar.monthrange(year, month)
-            month_start = datetime(year, month, 1)
-            month_end = datetime(year, month, last_day, 23, 59, 59)
-            stmt = stmt.where(
-                and_(
-                    BlogArticle.published_at >= month_start,
-                    BlogArticle.published_at <= month_end
-                )
+            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+            stmt = stmt.where(BlogArticle.published_at >= start_dt)
+        if end_date:
+            from datetime import datetime
+            end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+            # Include the entire end date (23:59:59)
+            end_dt = end_dt.replace(hour=23, minute=59, second=59)
+            stmt = stmt.where(BlogArticle.published_at <= end_dt)
+
+        if search:
+            # Indexed full-text / substring search, best matches first
+            stmt = stmt.where(search_match(search)).order_by(
+                search_rank(search).desc(),
+                BlogArticle.published_at.desc()
             )
         else:
-            # Entire year
-            from datetime import datetime
-            year_start = datetime(year, 1, 1)
-            year_end = datetime(year, 12, 31, 23, 59, 59)
-            stmt = stmt.where(
-                and_(
-                    BlogArticle.published_at >= year_start,
-                    BlogArticle.published_at <= year_end
-                )
+            # Order by pinned first, then by published date
+            stmt = stmt.order_by(
+                BlogArticle.is_pinned.desc(),
+                BlogArticle.pin_order.desc(),
+                BlogArticle.published_at.desc()
             )
 
-    # Time filtering by custom date range
-    if start_date:
-        from datetime import datetime
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        stmt = stmt.where(BlogArticle.published_at >= start_dt)
-    if end_date:
-        from datetime import datetime
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-        # Include the entire end date (23:59:59)
-        end_dt = end_dt.replace(hour=23, minute=59, second=59)
-        stmt = stmt.where(BlogArticle.published_at <= end_dt)
-
-    # Search
-    if search:
-        search_pattern = f"%{search}%"
-        stmt = stmt.where(
-            or_(
-                BlogArticle.title.ilike(search_pattern),
-                BlogArticle.content.ilike(search_pattern)
+        # Count total
+        count_stmt = select(func.count()).select_from(stmt.subquery())
+        total = db.execute(count_stmt).scalar()
+
+        # Paginate
+        offset = (page - 1) * page_size
+        stmt = stmt.offset(offset).limit(page_size)
+
+        articles = db.execute(stmt).scalars().all()
+
+        # Build response
+        items = [
+            ArticleListItem(
+                id=article.id,
+                title=article.title,
+                subtitle=article.subtitle,
+                cover_image_url=article.cover_image_url,
+                author_name=article.author_name,
+                author_type=article.author_type,
+                category=article.category,
+                tags=article.tags,
+                is_pinned=article.is_pinned,
+                view_count=article.view_count,
+                like_count=article.like_count,
+                comment_count=article.comment_count,
+                created_at=article.created_at,
+                published_at=article.published_at,
             )
-        )
+            for article in articles
+        ]
+
+        total_pages = (total + page_size - 1) // page_size if total > 0 else 0
+
+        result = {
+            "items": [item.model_dump(mode="json") for item in items],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "has_next": page < total_pages,
+            "has_prev": page > 1,
+        }
+        return result
 
-    # Order by pinned first, then by published date
-    stmt = stmt.order_by(
-        BlogArticle.is_pinned.desc(),
-        BlogArticle.pin_order.desc(),
-        BlogArticle.published_at.desc()
-    )
+    # Cached for 5 minutes; concurrent misses share one query
+    result = await cache.load_article_list(category or "all", page, load, variant=variant)
 
-    # Count total
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = db.execute(count_stmt).scalar()
+    return ArticleListResponse(**result)
 
-    # Paginate
-    offset = (page - 1) * page_size
-    stmt = stmt.offset(offset).limit(page_size)
 
-    articles = db.execute(stmt).scalars().all()
+# ==================== Search ====================
 
-    # Build response
-    items = [
-        ArticleListItem(
-            id=article.id,
-            title=article.title,
-            subtitle=article.subtitle,
-            cover_image_url=article.cover_image_url,
-            author_name=article.author_name,
-            author_type=article.author_type,
-            category=article.category,
-            tags=article.tags,
-            is_pinned=article.is_pinned,
-            view_count=article.view_count,
-            like_count=article.like_count,
-            comment_count=article.comment_count,
-            created_at=article.created_at,
-            published_at=article.published_at,
-        )
-        for article in articles
-    ]
+@router.get("/articles/search", response_model=ArticleSearchResponse)
+async def search_blog_articles(
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    category: Optional[str] = Query(None, description="Restrict to a category"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(10, ge=1, le=50, description="Results per page"),
+    cache: BlogCacheService = Depends(get_blog_cache),
+    db: Session = Depends(get_blog_db)
+):
+    """
+    Ranked full-text search (cached for 2 minutes)
 
-    total_pages = (total + page_size - 1) // page_size if total > 0 else 0
+    **Public endpoint** - No authentication required
 
-    result = {
-        "items": [item.model_dump() for item in items],
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "total_pages": total_pages,
-        "has_next": page < total_pages,
-        "has_prev": page > 1,
-    }
+    - Supports "quoted phrases", `or` and -excluded words
+    - Title matches rank above subtitle and body matches
+    - `snippet` is HTML-escaped body text; matches are wrapped in <mark>
+    - Pass `next_cursor` back as `cursor` for the next page
+    """
+    query = normalize_query(q)
+    if not query:
+        raise HTTPException(status_code=400, detail="Empty search query")
+
+    async def load() -> dict:
+        try:
+            page = search_articles(db, query, category=category, cursor=cursor, limit=limit)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        items = [
+            ArticleSearchItem(
+                id=article.id,
+                title=article.title,
+                subtitle=article.subtitle,
+                cover_image_url=article.cover_image_url,
+                author_name=article.author_name,
+                author_type=article.author_type,
+                category=article.category,
+                tags=article.tags,
+                is_pinned=article.is_pinned,
+                view_count=article.view_count,
+                like_count=article.like_count,
+                comment_count=article.comment_count,
+                created_at=article.created_at,
+                published_at=article.published_at,
+                rank=rank,
+                snippet=snippet,
+            )
+            for article, rank, snippet in page["items"]
+        ]
 
-    # Cache result (only for non-search queries)
-    if not search:
-        await cache.set_article_list(cache_key, page, result)
+        return {
+            "items": [item.model_dump(mode="json") for item in items],
+            "query": query,
+            "next_cursor": page["next_cursor"],
+            "has_next": page["next_cursor"] is not None,
+        }
 
-    return ArticleListResponse(**result)
+    result = await cache.load_search_results(category, query, load, cursor=cursor, limit=limit)
+
+    return ArticleSearchResponse(**result)
 
 
 # ==================== Pinned Articles ====================
@@ -295,47 +368,43 @@ async def get_pinned_articles(
 
     **Public endpoint** - No authentication required
     """
-    # Try cache first
-    cached = await cache.get_pinned_articles()
-    if cached:
-        return [ArticleListItem(**item) for item in cached]
-
-    # Query database - exclude hidden articles
-    stmt = (
-        select(BlogArticle)
-        .where(and_(
-            BlogArticle.status == "published",
-            BlogArticle.is_pinned == True,
-            BlogArticle.is_hidden == False
-        ))
-        .order_by(BlogArticle.pin_order.desc(), BlogArticle.published_at.desc())
-    )
-
-    articles = db.execute(stmt).scalars().all()
+    async def load() -> list:
+        # Query database - exclude hidden articles
+        stmt = (
+            select(BlogArticle)
+            .where(and_(
+                BlogArticle.status == "published",
+                BlogArticle.is_pinned == True,
+                BlogArticle.is_hidden == False
+            ))
+            .order_by(BlogArticle.pin_order.desc(), BlogArticle.published_at.desc())
+        )
 
-    # Convert to list
-    result = [
-        {
-            "id": str(article.id),
-            "title": article.title,
-            "subtitle": article.subtitle,
-            "cover_image_url": article.cover_image_url,
-            "author_name": article.author_name,
-            "author_type": article.author_type,
-            "category": article.category,
-            "tags": article.tags,
-            "is_pinned": article.is_pinned,
-            "view_count": article.view_count,
-            "like_count": article.like_count,
-            "comment_count": article.comment_count,
-            "created_at": article.created_at.isoformat(),
-            "published_at": article.published_at.isoformat() if article.published_at else None,
-        }
-        for article in articles
-    ]
+        articles = db.execute(stmt).scalars().all()
+
+        # Convert to list
+        return [
+            {
+                "id": str(article.id),
+                "title": article.title,
+                "subtitle": article.subtitle,
+                "cover_image_url": article.cover_image_url,
+                "author_name": article.author_name,
+                "author_type": article.author_type,
+                "category": article.category,
+                "tags": article.tags,
+                "is_pinned": article.is_pinned,
+                "view_count": article.view_count,
+                "like_count": article.like_count,
+                "comment_count": article.comment_count,
+                "created_at": article.created_at.isoformat(),
+                "published_at": article.published_at.isoformat() if article.published_at else None,
+            }
+            for article in articles
+        ]
 
-    # Cache for 5 minutes
-    await cache.set_pinned_articles(result)
+    # Cached for 5 minutes; concurrent misses share one query
+    result = await cache.load_pinned_articles(load)
 
     return [ArticleListItem(**item) for item in result]
 
@@ -451,52 +520,46 @@ async def get_article(
 
     **Side effect:** Increments view count
     """
-    # Try cache first
-    cached = await cache.get_article(str(article_id))
-    if cached:
-        # Increment view count in background
-        await cache.increment_view(str(article_id))
-        return ArticleResponse(**cached)
+    async def load() -> dict:
+        # Query database
+        stmt = select(BlogArticle).where(BlogArticle.id == article_id)
+        article = db.execute(stmt).scalar_one_or_none()
 
-    # Query database
-    stmt = select(BlogArticle).where(BlogArticle.id == article_id)
-    article = db.execute(stmt).scalar_one_or_none()
+        if not article:
+            raise HTTPException(status_code=404, detail="Article not found")
 
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
-
-    if article.status != "published":
-        raise HTTPException(status_code=404, detail="Article not published")
+        if article.status != "published":
+            raise HTTPException(status_code=404, detail="Article not published")
 
-    if article.is_hidden:
-        raise HTTPException(status_code=404, detail="Article not found")
+        if article.is_hidden:
+            raise HTTPException(status_code=404, detail="Article not found")
 
-    # Convert to dict
-    result = {
-        "id": str(article.id),
-        "title": article.title,
-        "subtitle": article.subtitle,
-        "content": article.content,
-        "cover_image_url": article.cover_image_url,
-        "author_id": str(article.author_id) if article.author_id else None,
-        "author_name": article.author_name,
-        "author_type": article.author_type,
-        "category": article.category,
-        "sub_category": article.sub_category,
-        "tags": article.tags,
-        "status": article.status,
-        "is_pinned": article.is_pinned,
-        "pin_order": article.pin_order,
-        "view_count": article.view_count,
-        "like_count": article.like_count,
-        "comment_count": article.comment_count,
-        "created_at": article.created_at.isoformat(),
-        "updated_at": article.updated_at.isoformat(),
-        "published_at": article.published_at.isoformat() if article.published_at else None,
-    }
+        # Convert to dict
+        return {
+            "id": str(article.id),
+            "title": article.title,
+            "subtitle": article.subtitle,
+            "content": article.content,
+            "cover_image_url": article.cover_image_url,
+            "author_id": str(article.author_id) if article.author_id else None,
+            "author_name": article.author_name,
+            "author_type": article.author_type,
+            "category": article.category,
+            "sub_category": article.sub_category,
+            "tags": article.tags,
+            "status": article.status,
+            "is_pinned": article.is_pinned,
+            "pin_order": article.pin_order,
+            "view_count": article.view_count,
+            "like_count": article.like_count,
+            "comment_count": article.comment_count,
+            "created_at": article.created_at.isoformat(),
+            "updated_at": article.updated_at.isoformat(),
+            "published_at": article.published_at.isoformat() if article.published_at else None,
+        }
 
-    # Cache for 10 minutes
-    await cache.set_article(str(article_id), result)
+    # Cached for 10 minutes; concurrent misses share one query
+    result = await cache.load_article(str(article_id), load)
 
     # Increment view count
     await cache.increment_view(str(article_id))
@@ -514,6 +577,69 @@ async def get_cache_stats(cache: BlogCacheService = Depends(get_blog_cache)):
 
 # ==================== Image Upload (Editor/Admin) ====================
 
+# Background image jobs (kept referenced until they finish)
+_image_jobs: set = set()
+
+
+def _save_processed_image(image_id: UUID, status: str, processed: Optional[dict]) -> None:
+    """Record the outcome of a background image job (blocking; run in a thread)"""
+    db = _open_blog_session()
+    try:
+        blog_image = db.get(BlogImage, image_id)
+        if blog_image is None:
+            return
+        blog_image.status = status
+        if processed:
+            blog_image.size_bytes = processed["size_bytes"]
+            blog_image.width = processed["width"]
+            blog_image.height = processed["height"]
+            blog_image.variants = processed["variants"]
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _process_uploaded_image(image_id: UUID, file_data: bytes, plan: dict) -> None:
+    """Render and upload every rendition, then mark the image ready (or failed)"""
+    image_service = get_image_service()
+    try:
+        processed = await image_service.render_and_upload(file_data, plan)
+        status = "ready"
+        print(f"✅ [Upload] Image {image_id} processed: {len(processed['variants'])} variants")
+    except Exception as e:
+        import traceback
+        processed = None
+        status = "failed"
+        print(f"❌ [Upload] Processing image {image_id} failed: {type(e).__name__}: {e}")
+        print(f"❌ [Upload] Full traceback:\n{traceback.format_exc()}")
+
+    try:
+        await asyncio.to_thread(_save_processed_image, image_id, status, processed)
+    except Exception as e:
+        print(f"❌ [Upload] Failed to save status of image {image_id}: {e}")
+
+
+async def drain_image_jobs(timeout: float) -> None:
+    """Wait (up to `timeout` seconds) for background image jobs (app shutdown)"""
+    if _image_jobs:
+        await asyncio.wait(set(_image_jobs), timeout=timeout)
+
+
+def _image_payload(blog_image: BlogImage) -> dict:
+    return {
+        "id": str(blog_image.id),
+        "url": blog_image.url,
+        "filename": blog_image.filename,
+        "size_bytes": blog_image.size_bytes,
+        "width": blog_image.width,
+        "height": blog_image.height,
+        "resize_mode": blog_image.resize_mode,
+        "image_type": blog_image.image_type,
+        "status": blog_image.status,
+        "variants": blog_image.variants or [],
+    }
+
+
 @router.post("/upload-image")
 async def upload_image(
     file: UploadFile = File(...),
@@ -531,54 +657,54 @@ async def upload_image(
     - image_type: "cover" or "content"
 
     **Returns:**
-    - Image metadata with CDN URL
+    - Image metadata with CDN URL, status "pending"
+
+    The image is validated from its header and an integrity check
+    (corrupt or truncated files are rejected with 400) and the response is
+    returned right away; decoding, the responsive WebP/AVIF variants and the R2
+    uploads run in the background. The URL serves once GET
+    /api/blogs/images/{id} reports status "ready".
     """
     try:
-        # Step 1: Read file data
+        # Step 1: Read file data (bounded: reject oversized uploads early)
+        image_service = get_image_service()
         print(f"📤 [Upload] Starting upload for file: {file.filename}, size: {file.size if hasattr(file, 'size') else 'unknown'}")
-        file_data = await file.read()
+        file_data = await file.read(image_service.max_size_bytes + 1)
         print(f"📤 [Upload] File read successfully, data size: {len(file_data)} bytes")
 
-        # Step 2: Process and upload to R2
-        print(f"📤 [Upload] Processing image with resize_mode: {resize_mode}")
-        image_service = get_image_service()
-        result = image_service.process_and_upload(
-            file_data,
-            file.filename,
-            resize_mode
+        # Step 2: Validate (header + integrity) and choose R2 paths
+        plan = await asyncio.to_thread(
+            image_service.plan_upload, file_data, file.filename, resize_mode
         )
-        print(f"📤 [Upload] Image uploaded to R2: {result['url']}")
 
-        # Step 3: Save metadata to database
-        print(f"📤 [Upload] Saving metadata to database")
+        # Step 3: Save metadata to database (pending until processed)
         blog_image = BlogImage(
             id=uuid4(),
-            filename=result["filename"],
-            storage_path=result["storage_path"],
-            url=result["url"],
-            content_type=result["content_type"],
-            size_bytes=result["size_bytes"],
-            width=result["width"],
-            height=result["height"],
-            resize_mode=result["resize_mode"],
+            filename=plan["filename"],
+            storage_path=plan["storage_path"],
+            url=plan["url"],
+            content_type=plan["content_type"],
+            size_bytes=0,
+            width=plan["width"],
+            height=plan["height"],
+            resize_mode=plan["resize_mode"],
             image_type=image_type,
+            status="pending",
             uploaded_by=current_user.id if current_user else None,
             created_at=datetime.utcnow()
         )
         db.add(blog_image)
         db.commit()
-        print(f"✅ [Upload] Image saved successfully: {blog_image.id}")
 
-        return {
-            "id": str(blog_image.id),
-            "url": blog_image.url,
-            "filename": blog_image.filename,
-            "size_bytes": blog_image.size_bytes,
-            "width": blog_image.width,
-            "height": blog_image.height,
-            "resize_mode": blog_image.resize_mode,
-            "image_type": blog_image.image_type
-        }
+        # Step 4: Process and upload off the event loop
+        print(f"📤 [Upload] Processing image {blog_image.id} in the background (resize_mode: {resize_mode})")
+        job = asyncio.get_running_loop().create_task(
+            _process_uploaded_image(blog_image.id, file_data, plan)
+        )
+        _image_jobs.add(job)
+        job.add_done_callback(_image_jobs.discard)
+
+        return _image_payload(blog_image)
 
     except ValueError as e:
         import traceback
@@ -604,6 +730,23 @@ async def upload_image(
         )
 
 
+@router.get("/images/{image_id}")
+async def get_image_status(
+    image_id: UUID,
+    current_user = Depends(require_editor),
+    db: Session = Depends(get_blog_db)
+):
+    """
+    Get an uploaded image's processing status and variants (Editor/Admin only)
+
+    status: "pending" | "ready" | "failed"
+    """
+    blog_image = db.get(BlogImage, image_id)
+    if blog_image is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    return _image_payload(blog_image)
+
+
 # ==================== Article Management (Editor/Admin) ====================
 
 @router.post("/articles", response_model=ArticleResponse)
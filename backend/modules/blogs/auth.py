@@ -26,7 +26,7 @@ backend_dir = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 
 from models.user import User
-from core.security.jwt import decode_token
+from core.security.current_user import authenticate_token
 from core.db.deps import get_db
 
 # OAuth2 scheme for automatic token extraction
@@ -69,28 +69,12 @@ def get_current_user(
         Authenticated User object
 
     Raises:
-        HTTPException: 401 if token invalid or user not found/inactive
+        HTTPException: 401 if token invalid/revoked or user not found/inactive
     """
-    # Decode JWT token to get user_id
-    user_id = decode_token(token)
-
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    # Validate JWT token (signature, expiry, logout revocation)
+    user_uuid = authenticate_token(token)
 
     # Load user from main database
-    try:
-        user_uuid = uuid.UUID(user_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid user ID format",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
     user = db.get(User, user_uuid)
 
     if not user:
@@ -38,6 +38,10 @@ def create_blog_tables():
         # Create engine
         engine = create_engine(db_url, echo=True)
 
+        # Trigram operator classes used by the search indexes
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
         # Create all tables
         print("📋 Creating tables...")
         Base.metadata.create_all(engine)
@@ -6,7 +6,7 @@ from typing import Optional
 from uuid import uuid4
 from sqlalchemy import String, Integer, DateTime, Text, ForeignKey, Boolean
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 
 from core.db.base import Base
 
@@ -32,6 +32,11 @@ class BlogImage(Base):
     resize_mode: Mapped[str] = mapped_column(String(20), nullable=False)  # "original" | "adaptive_width"
     image_type: Mapped[str] = mapped_column(String(20), nullable=False)  # "cover" | "content"
 
+    # Background processing: "pending" until every rendition is in R2, then "ready" | "failed"
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="ready")
+    # Responsive renditions: [{"url", "storage_path", "width", "height", "content_type", "size_bytes"}]
+    variants: Mapped[Optional[list]] = mapped_column(JSONB, nullable=True)
+
     # Relationships
     uploaded_by: Mapped[Optional[uuid4]] = mapped_column(UUID(as_uuid=True), nullable=True)
     article_id: Mapped[Optional[uuid4]] = mapped_column(
@@ -7,12 +7,22 @@ import uuid
 from datetime import datetime
 from typing import List
 
-from sqlalchemy import String, Boolean, DateTime, Integer, Text, ARRAY, CheckConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import String, Boolean, DateTime, Integer, Text, ARRAY, CheckConstraint, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.db.base import Base
 
+# Text search configuration of blog_articles.search_vector
+SEARCH_CONFIG = "english"
+
+# Generated search_vector: title ranks above subtitle above body
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(subtitle, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'C')"
+)
+
 
 class BlogArticle(Base):
     """Blog article model."""
@@ -151,6 +161,15 @@ class BlogArticle(Base):
         index=True,
     )
 
+    # Full-text search (generated by PostgreSQL on every write; deferred so
+    # article loads don't fetch it)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_SQL, persisted=True),
+        nullable=True,
+        deferred=True,
+    )
+
     # Constraints
     __table_args__ = (
         CheckConstraint(
@@ -161,6 +180,24 @@ class BlogArticle(Base):
             "author_type IN ('official', 'user')",
             name="blog_articles_author_type_check"
         ),
+        Index(
+            "ix_blog_articles_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        # Substring search (pg_trgm) for text the English parser can't split
+        Index(
+            "ix_blog_articles_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_blog_articles_content_trgm",
+            "content",
+            postgresql_using="gin",
+            postgresql_ops={"content": "gin_trgm_ops"},
+        ),
     )
 
     def __repr__(self) -> str:
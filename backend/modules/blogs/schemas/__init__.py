@@ -8,6 +8,8 @@ from .article import (
     ArticleResponse,
     ArticleListResponse,
     ArticleListItem,
+    ArticleSearchItem,
+    ArticleSearchResponse,
     CategoryResponse,
 )
 
@@ -18,5 +20,7 @@ __all__ = [
     "ArticleResponse",
     "ArticleListResponse",
     "ArticleListItem",
+    "ArticleSearchItem",
+    "ArticleSearchResponse",
     "CategoryResponse",
 ]
@@ -127,3 +127,17 @@ class ArticleListResponse(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+
+
+class ArticleSearchItem(ArticleListItem):
+    """Search hit: list item with its rank and a highlighted snippet"""
+    rank: float
+    snippet: Optional[str] = None
+
+
+class ArticleSearchResponse(BaseModel):
+    """Search results page (keyset pagination)"""
+    items: List[ArticleSearchItem]
+    query: str
+    next_cursor: Optional[str] = None
+    has_next: bool
@@ -6,13 +6,42 @@ Caching strategy:
 - Article detail: 10 minutes
 - Categories: 1 hour
 - Pinned articles: 5 minutes
+- Search results: 2 minutes (frequent queries stay warm, rare ones expire)
+
+Invalidation:
+- Every cached key is added to tags when it is written: the article lists
+  of a category to blog:tags:list:{category}, and every key to
+  blog:tags:all. A tag is a sorted set scored by the expiry of each key;
+  every write also drops the members that have already expired, so a tag
+  holds at most the keys that are still live. Invalidating a tag takes its
+  live members and drops the set in one MULTI, then removes the members
+  with UNLINK in batches - no keyspace scans.
+- Lists without a category filter ("all", "allblogs") share one tag.
+- Search results are tagged like the article lists of their category.
+
+Misses:
+- load_* methods coalesce concurrent misses of the same key in this
+  process (single-flight), and across workers through a short Redis
+  lock: only the lock holder queries the database, the others wait
+  briefly for its result.
 """
+import asyncio
+import hashlib
 import json
 import os
-from typing import Optional, Any, List
+import time
+from typing import Optional, Any, Awaitable, Callable, Iterable, List
 import redis.asyncio as redis
 from redis.asyncio import Redis
 
+TAG_PREFIX = "blog:tags:"
+ALL_TAG = f"{TAG_PREFIX}all"
+
+# Keys per UNLINK when invalidating a tag
+UNLINK_BATCH = 500
+
+Loader = Callable[[], Awaitable[Any]]
+
 
 class BlogCacheService:
     """Redis cache service for blog module"""
@@ -24,7 +53,13 @@ class BlogCacheService:
             "article_detail": 600,    # 10 minutes
             "categories": 3600,       # 1 hour
             "pinned_articles": 300,   # 5 minutes
+            "search": 120,            # 2 minutes
         }
+        # Misses being loaded in this process, by cache key
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._lock_ttl_ms = 5000
+        self._lock_wait_seconds = 2.0
+        self._lock_poll_seconds = 0.05
 
     async def connect(self):
         """Connect to Redis"""
@@ -59,15 +94,32 @@ class BlogCacheService:
         """Check if Redis is available"""
         return self.redis_client is not None
 
-    # ==================== Article List ====================
+    # ==================== Keys, Tags and Loading ====================
 
-    async def get_article_list(self, category: str, page: int) -> Optional[dict]:
-        """Get cached article list"""
+    @staticmethod
+    def _list_namespace(category: Optional[str]) -> str:
+        """Tag namespace of a list: unfiltered lists ("all", "allblogs") share one."""
+        if not category or category in ("all", "allblogs"):
+            return "all"
+        return category
+
+    def _list_key(self, category: str, page: int, variant: str = "") -> str:
+        suffix = f"{variant}:" if variant else ""
+        return f"blog:articles:list:{self._list_namespace(category)}:{suffix}{page}"
+
+    def _list_tag(self, category: str) -> str:
+        return f"{TAG_PREFIX}list:{self._list_namespace(category)}"
+
+    @staticmethod
+    def query_digest(query: str) -> str:
+        """Short stable digest of a (normalized) search query for cache keys."""
+        return hashlib.sha1(query.encode("utf-8")).hexdigest()[:16]
+
+    async def _cache_get(self, key: str) -> Any:
         if not self._is_available():
             return None
 
         try:
-            key = f"blog:articles:list:{category}:{page}"
             data = await self.redis_client.get(key)
             if data:
                 return json.loads(data)
@@ -75,159 +127,225 @@ class BlogCacheService:
             print(f"Cache get error: {e}")
         return None
 
-    async def set_article_list(self, category: str, page: int, data: dict):
-        """Cache article list"""
+    async def _cache_set(self, key: str, ttl: int, data: Any, tags: Iterable[str] = ()):
+        """
+        SETEX the value and add the key to its tags, in one round trip.
+
+        Members are scored by their expiry; expired members are pruned on
+        every write, which keeps each tag bounded by its live keys.
+        """
         if not self._is_available():
             return
 
         try:
-            key = f"blog:articles:list:{category}:{page}"
-            await self.redis_client.setex(
-                key,
-                self._ttl["article_list"],
-                json.dumps(data, ensure_ascii=False)
-            )
+            now = time.time()
+            tag_ttl = max(self._ttl.values())
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.setex(key, ttl, json.dumps(data, ensure_ascii=False))
+                for tag in (*tags, ALL_TAG):
+                    pipe.zadd(tag, {key: now + ttl})
+                    pipe.zremrangebyscore(tag, "-inf", now)
+                    pipe.expire(tag, tag_ttl)
+                await pipe.execute()
         except Exception as e:
             print(f"Cache set error: {e}")
 
-    async def invalidate_article_list(self, category: str):
-        """Invalidate article list cache for a category"""
+    async def _invalidate_tag(self, tag: str) -> int:
+        """Delete every key tagged with `tag` (and the tag set itself)."""
+        if not self._is_available():
+            return 0
+
+        try:
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.zrangebyscore(tag, time.time(), "+inf")
+                pipe.unlink(tag)
+                members, _ = await pipe.execute()
+            for start in range(0, len(members), UNLINK_BATCH):
+                await self.redis_client.unlink(*members[start:start + UNLINK_BATCH])
+            return len(members)
+        except Exception as e:
+            print(f"Cache invalidate error: {e}")
+            return 0
+
+    async def _unlink(self, *keys: str):
         if not self._is_available():
             return
 
         try:
-            # Delete all pages for this category
-            pattern = f"blog:articles:list:{category}:*"
-            async for key in self.redis_client.scan_iter(match=pattern):
-                await self.redis_client.delete(key)
+            await self.redis_client.unlink(*keys)
         except Exception as e:
             print(f"Cache invalidate error: {e}")
 
+    async def _load(self, key: str, ttl: int, loader: Loader, tags: Iterable[str] = ()) -> Any:
+        """
+        Cached value of `key`, loading and caching it on a miss.
+
+        Concurrent misses of the same key in this process share one
+        loader call; an exception from the loader is raised to all of them.
+        """
+        cached = await self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The loading request went away; load for ourselves
+                return await self._load(key, ttl, loader, tags)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load_locked(key, ttl, loader, tags)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: waiters re-raise it
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _load_locked(self, key: str, ttl: int, loader: Loader, tags: Iterable[str]) -> Any:
+        """Load under a cross-worker lock; waiters poll for the holder's result."""
+        lock_key = f"blog:lock:{key}"
+        locked = False
+        if self._is_available():
+            try:
+                locked = bool(
+                    await self.redis_client.set(lock_key, "1", nx=True, px=self._lock_ttl_ms)
+                )
+            except Exception as e:
+                print(f"Cache lock error: {e}")
+            if not locked:
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + self._lock_wait_seconds
+                while loop.time() < deadline:
+                    await asyncio.sleep(self._lock_poll_seconds)
+                    cached = await self._cache_get(key)
+                    if cached is not None:
+                        return cached
+
+        try:
+            value = await loader()
+            await self._cache_set(key, ttl, value, tags)
+            return value
+        finally:
+            if locked:
+                await self._unlink(lock_key)
+
+    # ==================== Article List ====================
+
+    async def get_article_list(self, category: str, page: int, variant: str = "") -> Optional[dict]:
+        """Get cached article list"""
+        return await self._cache_get(self._list_key(category, page, variant))
+
+    async def set_article_list(self, category: str, page: int, data: dict, variant: str = ""):
+        """Cache article list"""
+        await self._cache_set(
+            self._list_key(category, page, variant),
+            self._ttl["article_list"],
+            data,
+            tags=[self._list_tag(category)],
+        )
+
+    async def load_article_list(
+        self, category: str, page: int, loader: Loader, variant: str = ""
+    ) -> dict:
+        """Cached article list, loaded with `loader` on a miss (single-flight)"""
+        return await self._load(
+            self._list_key(category, page, variant),
+            self._ttl["article_list"],
+            loader,
+            tags=[self._list_tag(category)],
+        )
+
+    async def invalidate_article_list(self, category: str):
+        """Invalidate article list cache for a category (all pages and filters)"""
+        await self._invalidate_tag(self._list_tag(category))
+
+    # ==================== Search ====================
+
+    async def load_search_results(
+        self,
+        category: Optional[str],
+        query: str,
+        loader: Loader,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+    ) -> dict:
+        """Cached search results page, loaded with `loader` on a miss (single-flight)"""
+        digest = self.query_digest(f"{query}\0{cursor or ''}\0{limit}")
+        return await self._load(
+            f"blog:search:{self._list_namespace(category)}:{digest}",
+            self._ttl["search"],
+            loader,
+            tags=[self._list_tag(category)],
+        )
+
     # ==================== Article Detail ====================
 
     async def get_article(self, article_id: str) -> Optional[dict]:
         """Get cached article detail"""
-        if not self._is_available():
-            return None
-
-        try:
-            key = f"blog:article:{article_id}"
-            data = await self.redis_client.get(key)
-            if data:
-                return json.loads(data)
-        except Exception as e:
-            print(f"Cache get error: {e}")
-        return None
+        return await self._cache_get(f"blog:article:{article_id}")
 
     async def set_article(self, article_id: str, data: dict):
         """Cache article detail"""
-        if not self._is_available():
-            return
+        await self._cache_set(f"blog:article:{article_id}", self._ttl["article_detail"], data)
 
-        try:
-            key = f"blog:article:{article_id}"
-            await self.redis_client.setex(
-                key,
-                self._ttl["article_detail"],
-                json.dumps(data, ensure_ascii=False)
-            )
-        except Exception as e:
-            print(f"Cache set error: {e}")
+    async def load_article(self, article_id: str, loader: Loader) -> dict:
+        """Cached article detail, loaded with `loader` on a miss (single-flight)"""
+        return await self._load(
+            f"blog:article:{article_id}", self._ttl["article_detail"], loader
+        )
 
     async def invalidate_article(self, article_id: str):
         """Invalidate article detail cache"""
-        if not self._is_available():
-            return
-
-        try:
-            key = f"blog:article:{article_id}"
-            await self.redis_client.delete(key)
-        except Exception as e:
-            print(f"Cache invalidate error: {e}")
+        await self._unlink(f"blog:article:{article_id}")
 
     # ==================== Pinned Articles ====================
 
     async def get_pinned_articles(self) -> Optional[List[dict]]:
         """Get cached pinned articles"""
-        if not self._is_available():
-            return None
-
-        try:
-            key = "blog:articles:pinned"
-            data = await self.redis_client.get(key)
-            if data:
-                return json.loads(data)
-        except Exception as e:
-            print(f"Cache get error: {e}")
-        return None
+        return await self._cache_get("blog:articles:pinned")
 
     async def set_pinned_articles(self, data: List[dict]):
         """Cache pinned articles"""
-        if not self._is_available():
-            return
+        await self._cache_set("blog:articles:pinned", self._ttl["pinned_articles"], data)
 
-        try:
-            key = "blog:articles:pinned"
-            await self.redis_client.setex(
-                key,
-                self._ttl["pinned_articles"],
-                json.dumps(data, ensure_ascii=False)
-            )
-        except Exception as e:
-            print(f"Cache set error: {e}")
+    async def load_pinned_articles(self, loader: Loader) -> List[dict]:
+        """Cached pinned articles, loaded with `loader` on a miss (single-flight)"""
+        return await self._load("blog:articles:pinned", self._ttl["pinned_articles"], loader)
 
     async def invalidate_pinned_articles(self):
         """Invalidate pinned articles cache"""
-        if not self._is_available():
-            return
-
-        try:
-            key = "blog:articles:pinned"
-            await self.redis_client.delete(key)
-        except Exception as e:
-            print(f"Cache invalidate error: {e}")
+        await self._unlink("blog:articles:pinned")
 
     # ==================== Categories ====================
 
     async def get_categories(self) -> Optional[List[dict]]:
         """Get cached categories"""
-        if not self._is_available():
-            return None
-
-        try:
-            key = "blog:categories"
-            data = await self.redis_client.get(key)
-            if data:
-                return json.loads(data)
-        except Exception as e:
-            print(f"Cache get error: {e}")
-        return None
+        return await self._cache_get("blog:categories")
 
     async def set_categories(self, data: List[dict]):
         """Cache categories"""
-        if not self._is_available():
-            return
+        await self._cache_set("blog:categories", self._ttl["categories"], data)
 
-        try:
-            key = "blog:categories"
-            await self.redis_client.setex(
-                key,
-                self._ttl["categories"],
-                json.dumps(data, ensure_ascii=False)
-            )
-        except Exception as e:
-            print(f"Cache set error: {e}")
+    async def load_categories(self, loader: Loader) -> List[dict]:
+        """Cached categories, loaded with `loader` on a miss (single-flight)"""
+        return await self._load("blog:categories", self._ttl["categories"], loader)
 
     async def invalidate_categories(self):
         """Invalidate categories cache"""
-        if not self._is_available():
-            return
-
-        try:
-            key = "blog:categories"
-            await self.redis_client.delete(key)
-        except Exception as e:
-            print(f"Cache invalidate error: {e}")
+        await self._unlink("blog:categories")
 
     # ==================== View Count (Real-time tracking) ====================
 
@@ -277,19 +395,16 @@ class BlogCacheService:
     # ==================== Cache Management ====================
 
     async def clear_all_blog_cache(self):
-        """Clear all blog-related cache (emergency use)"""
+        """
+        Clear all cached blog responses (emergency use)
+
+        View counters (blog:views:*) are pending data, not cache, and are kept.
+        """
         if not self._is_available():
             return
 
-        try:
-            pattern = "blog:*"
-            keys_deleted = 0
-            async for key in self.redis_client.scan_iter(match=pattern):
-                await self.redis_client.delete(key)
-                keys_deleted += 1
-            print(f"✅ Cleared {keys_deleted} blog cache keys")
-        except Exception as e:
-            print(f"Cache clear error: {e}")
+        keys_deleted = await self._invalidate_tag(ALL_TAG)
+        print(f"✅ Cleared {keys_deleted} blog cache keys")
 
     async def get_cache_stats(self) -> dict:
         """Get cache statistics"""
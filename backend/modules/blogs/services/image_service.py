@@ -2,16 +2,239 @@
 Blog Image Upload Service
 
 Handles image upload, compression, and storage to Cloudflare R2
+
+Uploads are processed off the event loop:
+- plan_upload() reads the image header and verifies the file's integrity
+  (Image.verify(), no full decode), so the endpoint rejects a corrupt or
+  truncated file and returns the final URL and dimensions right away
+  (status "pending"; the URL serves once the image is "ready").
+- render_image() decodes the image once in a worker process and encodes the
+  main rendition plus responsive variants (RESPONSIVE_WIDTHS, in WebP and,
+  when Pillow supports it, AVIF).
+- render_and_upload() runs render_image() on the process pool and uploads
+  every rendition to R2 in parallel threads. A pool whose worker died
+  (BrokenProcessPool) is replaced and the render retried once.
 """
+import asyncio
+import multiprocessing
 import os
 import io
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 from uuid import uuid4
-from PIL import Image
+from PIL import Image, features
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+CONTENT_TYPES = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "GIF": "image/gif",
+    "WEBP": "image/webp",
+    "AVIF": "image/avif",
+}
+
+EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "GIF": ".gif", "WEBP": ".webp", "AVIF": ".avif"}
+
+# Widths of the responsive variants (never wider than the main rendition)
+RESPONSIVE_WIDTHS = (480, 960, 1440, 1920)
+
+MAX_WIDTH_ADAPTIVE = 1920
+
+
+def variant_formats() -> Tuple[str, ...]:
+    """Formats of the responsive variants (AVIF only if Pillow can encode it)"""
+    return ("WEBP", "AVIF") if features.check("avif") else ("WEBP",)
+
+
+def output_format(original_format: str, resize_mode: str) -> str:
+    """Format of the main rendition"""
+    if resize_mode == "adaptive_width":
+        return "WEBP"
+    return original_format if original_format in ("JPEG", "PNG", "GIF") else "WEBP"
+
+
+def _jpeg_truncated(file_data: bytes) -> bool:
+    """
+    Whether a JPEG ends before its last scan does (Image.verify() does not
+    check JPEG data). Entropy-coded data cannot contain an EOI marker, so a
+    complete file has one after its last SOS.
+    """
+    return file_data.rfind(b"\xff\xd9") < file_data.rfind(b"\xff\xda")
+
+
+def _scaled_size(width: int, height: int, max_width: int) -> Tuple[int, int]:
+    if width <= max_width:
+        return width, height
+    return max_width, int(height * max_width / width)
+
+
+def _render_main(
+    img: Image.Image,
+    resize_mode: str,
+    max_width: int = MAX_WIDTH_ADAPTIVE,
+) -> Tuple[Image.Image, bytes, str]:
+    """Resize/compress the main rendition; returns (image, bytes, format)"""
+    original_format = img.format
+
+    # Convert RGBA to RGB for JPEG
+    if img.mode == "RGBA" and resize_mode == "adaptive_width":
+        # Create white background
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[3])  # Use alpha channel as mask
+        img = background
+
+    if resize_mode == "adaptive_width" and img.width > max_width:
+        # Resize with high-quality resampling
+        img = img.resize(_scaled_size(img.width, img.height, max_width), Image.Resampling.LANCZOS)
+
+    # Compress and save
+    output = io.BytesIO()
+    fmt = output_format(original_format, resize_mode)
+
+    if fmt == "JPEG":
+        img.save(output, format="JPEG", quality=90, optimize=True)
+    elif fmt in ("PNG", "GIF"):
+        img.save(output, format=fmt, optimize=True)
+    elif resize_mode == "adaptive_width":
+        # Convert to WebP for better compression
+        img.save(output, format="WEBP", quality=85, method=6)
+    else:
+        img.save(output, format="WEBP", quality=90)
+
+    return img, output.getvalue(), fmt
+
+
+def _encode_variant(img: Image.Image, fmt: str) -> bytes:
+    output = io.BytesIO()
+    if fmt == "AVIF":
+        img.save(output, format="AVIF", quality=60, speed=6)
+    else:
+        img.save(output, format="WEBP", quality=80, method=4)
+    return output.getvalue()
+
+
+def render_image(
+    file_data: bytes,
+    resize_mode: str,
+    widths: Tuple[int, ...] = RESPONSIVE_WIDTHS,
+    formats: Optional[Tuple[str, ...]] = None,
+) -> dict:
+    """
+    Decode once and encode every rendition (runs in a worker process)
+
+    Returns:
+        {
+            "main": {"data": bytes, "width": int, "height": int, "format": str},
+            "variants": [{"data": bytes, "width": int, "height": int, "format": str}, ...]
+        }
+    Animated images get no variants.
+    """
+    img = Image.open(io.BytesIO(file_data))
+    animated = getattr(img, "is_animated", False)
+    img.load()
+
+    main_img, main_data, main_format = _render_main(img, resize_mode)
+    result = {
+        "main": {
+            "data": main_data,
+            "width": main_img.width,
+            "height": main_img.height,
+            "format": main_format,
+        },
+        "variants": [],
+    }
+    if animated:
+        return result
+
+    source = main_img
+    if source.mode not in ("RGB", "RGBA"):
+        has_alpha = source.mode in ("LA", "PA") or "transparency" in source.info
+        source = source.convert("RGBA" if has_alpha else "RGB")
+
+    sizes = [w for w in widths if w < source.width] + [source.width]
+    for width in sorted(sizes, reverse=True):
+        resized = source
+        if width < source.width:
+            resized = source.resize(
+                _scaled_size(source.width, source.height, width),
+                Image.Resampling.LANCZOS,
+                reducing_gap=3.0,
+            )
+        for fmt in formats or variant_formats():
+            if width == source.width and fmt == main_format:
+                continue  # Same as the main rendition
+            result["variants"].append({
+                "data": _encode_variant(resized, fmt),
+                "width": resized.width,
+                "height": resized.height,
+                "format": fmt,
+            })
+    return result
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_image_process_pool() -> ProcessPoolExecutor:
+    """
+    Return the process pool used for image decoding/encoding
+
+    Env:
+        BLOG_IMAGE_WORKERS: Worker processes (default: 2)
+    """
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                # spawn: forking a threaded server process is unsafe
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=int(os.getenv("BLOG_IMAGE_WORKERS", "2")),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _process_pool
+
+
+def _discard_broken_process_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next get_image_process_pool() starts a new one"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_render_image(file_data: bytes, resize_mode: str) -> dict:
+    """
+    render_image() on the process pool
+
+    A worker that dies (e.g. killed for memory) breaks the whole pool;
+    it is replaced and the render retried once.
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = get_image_process_pool()
+        try:
+            return await loop.run_in_executor(pool, render_image, file_data, resize_mode)
+        except BrokenProcessPool:
+            _discard_broken_process_pool(pool)
+            if attempt:
+                raise
+
+
+def shutdown_image_process_pool() -> None:
+    """Stop the worker processes (app shutdown)"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
 
 class ImageUploadService:
     """Service for uploading and processing blog images"""
@@ -27,17 +250,25 @@ class ImageUploadService:
         # Image constraints
         self.max_size_bytes = 5 * 1024 * 1024  # 5MB
         self.allowed_formats = {"JPEG", "PNG", "GIF", "WEBP"}
-        self.max_width_adaptive = 1920  # Max width for adaptive mode
+        self.max_width_adaptive = MAX_WIDTH_ADAPTIVE  # Max width for adaptive mode
+
+        self._s3_client = None
+        self._s3_client_lock = threading.Lock()
 
     def _get_s3_client(self):
-        """Get boto3 S3 client for R2"""
-        return boto3.client(
-            "s3",
-            endpoint_url=self.r2_endpoint,
-            aws_access_key_id=self.r2_access_key,
-            aws_secret_access_key=self.r2_secret_key,
-            region_name="auto",
-        )
+        """Get the boto3 S3 client for R2 (shared; boto3 clients are thread-safe)"""
+        if self._s3_client is None:
+            with self._s3_client_lock:
+                if self._s3_client is None:
+                    self._s3_client = boto3.client(
+                        "s3",
+                        endpoint_url=self.r2_endpoint,
+                        aws_access_key_id=self.r2_access_key,
+                        aws_secret_access_key=self.r2_secret_key,
+                        region_name="auto",
+                        config=Config(max_pool_connections=16),
+                    )
+        return self._s3_client
 
     def validate_image(self, file_data: bytes, filename: str) -> Tuple[bool, Optional[str]]:
         """
@@ -74,50 +305,8 @@ class ImageUploadService:
             (processed_bytes, width, height, format)
         """
         img = Image.open(io.BytesIO(file_data))
-        original_format = img.format
-        width, height = img.size
-
-        # Convert RGBA to RGB for JPEG
-        if img.mode == "RGBA" and resize_mode == "adaptive_width":
-            # Create white background
-            background = Image.new("RGB", img.size, (255, 255, 255))
-            background.paste(img, mask=img.split()[3])  # Use alpha channel as mask
-            img = background
-
-        if resize_mode == "adaptive_width" and width > self.max_width_adaptive:
-            # Calculate new dimensions
-            ratio = self.max_width_adaptive / width
-            new_width = self.max_width_adaptive
-            new_height = int(height * ratio)
-
-            # Resize with high-quality resampling
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            width, height = new_width, new_height
-
-        # Compress and save
-        output = io.BytesIO()
-
-        if resize_mode == "adaptive_width":
-            # Convert to WebP for better compression
-            img.save(output, format="WEBP", quality=85, method=6)
-            output_format = "WEBP"
-        else:
-            # Keep original format with light compression
-            if original_format == "JPEG":
-                img.save(output, format="JPEG", quality=90, optimize=True)
-                output_format = "JPEG"
-            elif original_format == "PNG":
-                img.save(output, format="PNG", optimize=True)
-                output_format = "PNG"
-            elif original_format == "GIF":
-                img.save(output, format="GIF", optimize=True)
-                output_format = "GIF"
-            else:
-                img.save(output, format="WEBP", quality=90)
-                output_format = "WEBP"
-
-        processed_data = output.getvalue()
-        return processed_data, width, height, output_format
+        img, processed_data, fmt = _render_main(img, resize_mode, self.max_width_adaptive)
+        return processed_data, img.width, img.height, fmt
 
     def upload_to_r2(
         self,
@@ -131,11 +320,21 @@ class ImageUploadService:
         Returns:
             (storage_path, cdn_url)
         """
-        # Generate unique storage path
+        storage_path = self.make_storage_path(filename)
+        return storage_path, self.upload_object(storage_path, file_data, content_type)
+
+    @staticmethod
+    def make_storage_path(filename: str) -> str:
+        """Unique R2 key for a new upload"""
         now = datetime.utcnow()
         unique_id = str(uuid4())[:8]
-        storage_path = f"blog/{now.year}/{now.month:02d}/{unique_id}_{filename}"
+        return f"blog/{now.year}/{now.month:02d}/{unique_id}_{filename}"
 
+    def public_url(self, storage_path: str) -> str:
+        return f"{self.cdn_base_url}/{storage_path}"
+
+    def upload_object(self, storage_path: str, file_data: bytes, content_type: str) -> str:
+        """Upload bytes to a given R2 key; returns the CDN URL"""
         try:
             s3_client = self._get_s3_client()
             s3_client.put_object(
@@ -147,8 +346,7 @@ class ImageUploadService:
             )
 
             # Generate CDN URL
-            cdn_url = f"{self.cdn_base_url}/{storage_path}"
-            return storage_path, cdn_url
+            return self.public_url(storage_path)
 
         except ClientError as e:
             raise Exception(f"Failed to upload to R2: {str(e)}")
@@ -196,18 +394,11 @@ class ImageUploadService:
         processed_data, width, height, output_format = self.process_image(file_data, resize_mode)
 
         # Determine content type and filename
-        content_type_map = {
-            "JPEG": "image/jpeg",
-            "PNG": "image/png",
-            "GIF": "image/gif",
-            "WEBP": "image/webp"
-        }
-        content_type = content_type_map.get(output_format, "image/jpeg")
+        content_type = CONTENT_TYPES.get(output_format, "image/jpeg")
 
         # Update filename extension if format changed
         name_without_ext = os.path.splitext(filename)[0]
-        ext_map = {"JPEG": ".jpg", "PNG": ".png", "GIF": ".gif", "WEBP": ".webp"}
-        final_filename = f"{name_without_ext}{ext_map.get(output_format, '.jpg')}"
+        final_filename = f"{name_without_ext}{EXTENSIONS.get(output_format, '.jpg')}"
 
         # Upload to R2
         storage_path, cdn_url = self.upload_to_r2(processed_data, final_filename, content_type)
@@ -223,6 +414,103 @@ class ImageUploadService:
             "resize_mode": resize_mode
         }
 
+    def plan_upload(self, file_data: bytes, filename: str, resize_mode: str = "original") -> dict:
+        """
+        Validate an upload and decide where its renditions go, from the
+        image header plus an integrity check (no full decode)
+
+        Returns:
+            {
+                "storage_path": str,   # main rendition
+                "url": str,
+                "filename": str,
+                "content_type": str,
+                "width": int,          # of the main rendition
+                "height": int,
+                "resize_mode": str
+            }
+        Raises ValueError for an invalid, corrupt or truncated image.
+        """
+        is_valid, error = self.validate_image(file_data, filename)
+        if not is_valid:
+            raise ValueError(error)
+
+        img = Image.open(io.BytesIO(file_data))
+        fmt = output_format(img.format, resize_mode)
+        width, height = img.size
+        try:
+            # verify() consumes the image object, so it runs on a fresh one
+            Image.open(io.BytesIO(file_data)).verify()
+        except Exception as e:
+            raise ValueError(f"Corrupt image file: {e}")
+        if img.format == "JPEG" and _jpeg_truncated(file_data):
+            raise ValueError("Corrupt image file: truncated JPEG data")
+        if resize_mode == "adaptive_width":
+            width, height = _scaled_size(width, height, self.max_width_adaptive)
+
+        final_filename = f"{os.path.splitext(filename)[0]}{EXTENSIONS[fmt]}"
+        storage_path = self.make_storage_path(final_filename)
+        return {
+            "storage_path": storage_path,
+            "url": self.public_url(storage_path),
+            "filename": final_filename,
+            "content_type": CONTENT_TYPES[fmt],
+            "width": width,
+            "height": height,
+            "resize_mode": resize_mode,
+        }
+
+    @staticmethod
+    def variant_storage_path(storage_path: str, width: int, fmt: str) -> str:
+        """R2 key of a variant next to its main rendition, e.g. x_photo-960w.avif"""
+        return f"{os.path.splitext(storage_path)[0]}-{width}w{EXTENSIONS[fmt]}"
+
+    async def render_and_upload(self, file_data: bytes, plan: dict) -> dict:
+        """
+        Render all renditions on the process pool, then upload them to R2
+        in parallel (to the paths chosen by plan_upload())
+
+        Returns:
+            {
+                "size_bytes": int,
+                "width": int,
+                "height": int,
+                "variants": [{"url", "storage_path", "width", "height",
+                              "content_type", "size_bytes"}, ...]
+            }
+        """
+        rendered = await run_render_image(file_data, plan["resize_mode"])
+
+        main = rendered["main"]
+        uploads = [(plan["storage_path"], main["data"], plan["content_type"])]
+        variants: List[dict] = []
+        for variant in rendered["variants"]:
+            storage_path = self.variant_storage_path(
+                plan["storage_path"], variant["width"], variant["format"]
+            )
+            content_type = CONTENT_TYPES[variant["format"]]
+            uploads.append((storage_path, variant["data"], content_type))
+            variants.append({
+                "url": self.public_url(storage_path),
+                "storage_path": storage_path,
+                "width": variant["width"],
+                "height": variant["height"],
+                "content_type": content_type,
+                "size_bytes": len(variant["data"]),
+            })
+
+        await asyncio.gather(*(
+            asyncio.to_thread(self.upload_object, path, data, content_type)
+            for path, data, content_type in uploads
+        ))
+
+        return {
+            "size_bytes": len(main["data"]),
+            "width": main["width"],
+            "height": main["height"],
+            "variants": variants,
+        }
+
 
 # Global instance
 _image_service: Optional[ImageUploadService] = None
@@ -0,0 +1,162 @@
+"""
+Blog Full-Text Search
+
+Articles match through two GIN indexes instead of an ILIKE scan over every
+article body:
+- search_vector, a tsvector generated by PostgreSQL from title (weight A),
+  subtitle (B) and content (C). Queries use websearch_to_tsquery syntax:
+  words, "quoted phrases", `or`, and -excluded words.
+- Trigram indexes on title and content, for substring matches the English
+  parser cannot split into words (e.g. Chinese text).
+
+Results are ranked by ts_rank_cd (normalized by document length) plus how
+well the query matches the title, and paged with a keyset cursor on
+(rank, id): later pages cost the same as the first one. The rank is cast
+to double precision before it is compared or returned, so the value in the
+cursor round-trips exactly and no row is repeated or skipped at a page
+boundary. Snippets are built with ts_headline for the returned page only,
+over HTML-escaped content: the only markup in a snippet is <mark>.
+"""
+import base64
+import binascii
+import json
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import and_, cast, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
+from sqlalchemy.orm import Session
+
+from modules.blogs.db.models import SEARCH_CONFIG, BlogArticle
+
+# ts_rank normalization 1: divide the rank by 1 + log(document length)
+RANK_NORMALIZATION = 1
+
+HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, "
+    "MaxFragments=2, MaxWords=30, MinWords=10, FragmentDelimiter=\" … \""
+)
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and case so equivalent queries share a cache entry."""
+    return " ".join(query.lower().split())
+
+
+def encode_cursor(rank: float, article_id: UUID) -> str:
+    """Opaque cursor pointing after the result (rank, article_id)."""
+    raw = json.dumps({"r": rank, "id": str(article_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, UUID]:
+    """Inverse of encode_cursor(); raises ValueError for a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return float(data["r"]), UUID(data["id"])
+    except (binascii.Error, UnicodeDecodeError, TypeError, KeyError, ValueError) as e:
+        raise ValueError("Invalid search cursor") from e
+
+
+def ts_query(query: str):
+    return func.websearch_to_tsquery(SEARCH_CONFIG, query)
+
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def search_match(query: str):
+    """WHERE clause: full-text match or substring match (each index-backed)."""
+    pattern = _like_pattern(query)
+    return or_(
+        BlogArticle.search_vector.op("@@")(ts_query(query)),
+        BlogArticle.title.ilike(pattern, escape="\\"),
+        BlogArticle.content.ilike(pattern, escape="\\"),
+    )
+
+
+def search_rank(query: str):
+    """
+    Relevance: text rank plus title word similarity (1.0 when contained).
+
+    Both are real (float4); the sum is cast to double precision, which a
+    Python float and the cursor represent exactly.
+    """
+    return cast(
+        func.ts_rank_cd(BlogArticle.search_vector, ts_query(query), RANK_NORMALIZATION)
+        + func.word_similarity(query, BlogArticle.title),
+        DOUBLE_PRECISION,
+    )
+
+
+def escaped_content():
+    """Article body with &, < and > escaped, for snippets safe to render as HTML."""
+    content = BlogArticle.content
+    for char, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;")):
+        content = func.replace(content, char, entity)
+    return content
+
+
+def search_articles(
+    db: Session,
+    query: str,
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+) -> dict:
+    """
+    One page of published, visible articles matching `query`, best first.
+
+    Returns {"items": [(article, rank, snippet), ...], "next_cursor": str | None}.
+    Raises ValueError for a malformed cursor.
+    """
+    rank = search_rank(query)
+
+    ranked = select(BlogArticle.id, rank.label("rank")).where(
+        BlogArticle.status == "published",
+        BlogArticle.is_hidden == False,
+        search_match(query),
+    )
+    if category and category not in ("all", "allblogs"):
+        ranked = ranked.where(BlogArticle.category == category)
+    if cursor:
+        after_rank, after_id = decode_cursor(cursor)
+        after_rank = literal(after_rank, DOUBLE_PRECISION)
+        ranked = ranked.where(
+            or_(
+                rank < after_rank,
+                and_(rank == after_rank, BlogArticle.id < after_id),
+            )
+        )
+    # One extra row tells whether there is a next page
+    ranked = (
+        ranked.order_by(rank.desc(), BlogArticle.id.desc())
+        .limit(limit + 1)
+        .subquery()
+    )
+
+    # Snippets only for the rows of this page
+    stmt = (
+        select(
+            BlogArticle,
+            ranked.c.rank,
+            func.ts_headline(SEARCH_CONFIG, escaped_content(), ts_query(query), HEADLINE_OPTIONS),
+        )
+        .join(ranked, BlogArticle.id == ranked.c.id)
+        .order_by(ranked.c.rank.desc(), BlogArticle.id.desc())
+    )
+    rows = db.execute(stmt).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_article, last_rank, _ = rows[-1]
+        next_cursor = encode_cursor(last_rank, last_article.id)
+
+    return {
+        "items": [(article, rank_value, snippet) for article, rank_value, snippet in rows],
+        "next_cursor": next_cursor,
+    }
@@ -134,8 +134,9 @@ def delete_marked_images(grace_period_days: int = 7, verbose: bool = True) -> di
 
         for img in images_to_delete:
             try:
-                # Delete from R2
-                success = image_service.delete_from_r2(img.storage_path)
+                # Delete from R2 (main rendition and responsive variants)
+                paths = [img.storage_path] + [v["storage_path"] for v in img.variants or []]
+                success = all(image_service.delete_from_r2(path) for path in paths)
 
                 if success:
                     # Delete from database
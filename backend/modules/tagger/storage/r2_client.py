@@ -9,6 +9,7 @@ import json
 import uuid
 import hashlib
 from datetime import datetime
+from functools import lru_cache
 from typing import TypedDict, Optional
 
 from storage.core.client import StorageClient
@@ -89,13 +90,18 @@ class TaggerStorageConfig:
         )
 
 
+@lru_cache(maxsize=4)
+def _shared_client(config: StorageConfig) -> StorageClient:
+    """按配置复用客户端及其连接池 Reuse one pooled client per config"""
+    return StorageClient(config)
+
+
 class TaggerStorage:
     """Tagger 存储操作"""
 
     def __init__(self, client: Optional[StorageClient] = None):
         if client is None:
-            config = TaggerStorageConfig.get_config()
-            client = StorageClient(config)
+            client = _shared_client(TaggerStorageConfig.get_config())
         self._client = client
         self._keys = TaggerKeyBuilder
 
@@ -0,0 +1,66 @@
+"""
+HTTP conditional GET helpers (ETag / If-None-Match / 304).
+
+ETags are strong validators derived from data we already store (chapter
+ETags and hashes, node versions, row timestamps), so they can be computed
+and compared before loading R2 content or building large responses.
+"""
+
+import hashlib
+from datetime import datetime
+
+from fastapi import Response, status
+
+# Cache-Control per endpoint. Responses depend on the caller's permissions,
+# so they are private; clients must revalidate (cheap via If-None-Match).
+CACHE_CONTROL_STUDY = "private, no-cache"
+CACHE_CONTROL_CHAPTER_SHOW = "private, no-cache"
+CACHE_CONTROL_CHAPTER_PGN = "private, max-age=0, must-revalidate"
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Build a quoted strong ETag from validator parts.
+
+    Args:
+        parts: Values identifying the representation (versions, hashes, ...)
+
+    Returns:
+        ETag header value, e.g. '"3f2a..."'
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, datetime):
+            part = part.isoformat()
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+
+    Uses weak comparison as RFC 9110 requires for If-None-Match, so a
+    W/-prefixed copy of our tag (e.g. after proxy compression) matches.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Return an empty 304 response carrying the validators."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    """Attach validators to a full (200) response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
@@ -11,7 +11,8 @@ backend_dir = Path(__file__).parent.parent.parent.parent
 if str(backend_dir) not in sys.path:
     sys.path.insert(0, str(backend_dir))
 
-from core.security.jwt import decode_token
+from core.security.current_user import authenticate_token, get_current_principal_async
+from core.security.principal_cache import Principal
 from core.db.deps import get_db
 from models.user import User
 
@@ -23,12 +24,13 @@ from modules.workspace.api.deps_core import (
     get_event_repo,
     get_node_repo,
     get_node_service,
+    get_position_index_service,
     get_presence_service,
     get_rate_limiter,
     get_search_service,
     get_share_service,
 )
-from modules.workspace.db.session import get_session
+from modules.workspace.db.session import get_db_config, get_session
 from modules.workspace.db.repos.study_repo import StudyRepository
 from modules.workspace.db.repos.variation_repo import VariationRepository
 from modules.workspace.db.repos.event_repo import EventRepository
@@ -73,27 +75,8 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Decode and validate JWT token
-    user_id = decode_token(token)
-
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    # Validate UUID format
-    try:
-        user_uuid = uuid.UUID(user_id)
-    except ValueError:
-        if os.getenv("WORKSPACE_TEST_AUTH") == "1":
-            return _build_test_user(user_id)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid user ID format",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    # Validate JWT token (signature, expiry, logout revocation)
+    user_uuid = authenticate_token(token)
 
     # Load user from database
     user = db.get(User, user_uuid)
@@ -115,16 +98,44 @@ def get_current_user(
     return user
 
 
+async def get_current_principal(
+    token: str | None = Depends(oauth2_scheme),
+    x_user_id: str | None = Header(None, alias="X-User-ID"),
+) -> Principal:
+    """
+    Get the authenticated caller's identity without a sync DB session.
+
+    Served from the principal cache; on a miss the user's id, active flag
+    and role are read through the async engine.
+    """
+    if os.getenv("WORKSPACE_TEST_AUTH") == "1":
+        if x_user_id:
+            return Principal(id=x_user_id, is_active=True, role="student")
+        if token:
+            return Principal(id=token, is_active=True, role="student")
+
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return await get_current_principal_async(
+        token, lambda: get_db_config().async_session_maker()
+    )
+
+
 async def get_current_user_id(
-    user: User = Depends(get_current_user)
+    principal: Principal = Depends(get_current_principal)
 ) -> str:
     """
-    Get current user ID from authenticated user.
+    Get current user ID from the authenticated principal.
 
     This is a convenience wrapper that maintains backward compatibility
     with existing code that expects user_id as a string.
     """
-    return str(user.id)
+    return principal.id
 
 
 def _build_test_user(user_id: str) -> User:
@@ -8,19 +8,20 @@ from modules.workspace.db.repos.discussion_reply_repo import DiscussionReplyRepo
 from modules.workspace.db.repos.discussion_thread_repo import DiscussionThreadRepository
 from modules.workspace.db.repos.event_repo import EventRepository
 from modules.workspace.db.repos.node_repo import NodeRepository
+from modules.workspace.db.repos.position_index_repo import PositionIndexRepository
 from modules.workspace.db.repos.presence_repo import PresenceRepository
 from modules.workspace.db.repos.search_index_repo import SearchIndexRepository
 from modules.workspace.db.session import get_session
 from modules.workspace.domain.services.discussion_service import DiscussionService
 from modules.workspace.domain.services.node_service import NodeService
+from modules.workspace.domain.services.position_index_service import PositionIndexService
 from modules.workspace.domain.services.presence_service import PresenceService
 from modules.workspace.domain.services.search_service import SearchService
 from modules.workspace.domain.services.share_service import ShareService
 from modules.workspace.events.bus import EventBus
+from modules.workspace.events.outbox import outbox_delivery_active
 from modules.workspace.events.subscribers.registry import register_all_subscribers
-from modules.workspace.api.rate_limit import RateLimiter
-
-_rate_limiter = RateLimiter()
+from modules.workspace.api.rate_limit import RateLimiter, get_shared_rate_limiter
 
 async def get_node_repo(
     session: AsyncSession = Depends(get_session),
@@ -49,13 +50,16 @@ async def get_event_repo(
 async def get_event_bus(
     session: AsyncSession = Depends(get_session),
 ) -> EventBus:
+    # With the outbox dispatcher running, subscribers run off the request path
+    if outbox_delivery_active():
+        return EventBus(session, outbox=True)
     bus = EventBus(session)
     register_all_subscribers(bus, session)
     return bus
 
 
 async def get_rate_limiter() -> RateLimiter:
-    return _rate_limiter
+    return get_shared_rate_limiter()
 
 
 async def get_node_service(
@@ -101,3 +105,9 @@ async def get_search_service(
 ) -> SearchService:
     search_repo = SearchIndexRepository(session)
     return SearchService(search_repo, node_repo, acl_repo)
+
+
+async def get_position_index_service(
+    session: AsyncSession = Depends(get_session),
+) -> PositionIndexService:
+    return PositionIndexService(PositionIndexRepository(session))
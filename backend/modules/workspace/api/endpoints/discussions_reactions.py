@@ -66,7 +66,7 @@ async def add_reaction(
                 )
             target_id = thread.target_id
         await require_commenter_access(node_repo, acl_repo, target_id, user_id)
-        if not rate_limiter.allow(
+        if not await rate_limiter.allow_async(
             f"discussion:reaction:{user_id}",
             DiscussionLimits.MAX_REACTIONS_PER_MINUTE,
             60,
@@ -49,7 +49,7 @@ async def add_reply(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Thread not found"
             )
         await require_commenter_access(node_repo, acl_repo, thread.target_id, user_id)
-        if not rate_limiter.allow(
+        if not await rate_limiter.allow_async(
             f"discussion:reply:{user_id}",
             DiscussionLimits.MAX_REPLIES_PER_MINUTE,
             60,
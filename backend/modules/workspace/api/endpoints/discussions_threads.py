@@ -40,7 +40,7 @@ async def create_thread(
 ) -> ThreadResponse:
     try:
         await require_commenter_access(node_repo, acl_repo, data.target_id, user_id)
-        if not rate_limiter.allow(
+        if not await rate_limiter.allow_async(
             f"discussion:thread:{user_id}",
             DiscussionLimits.MAX_THREADS_PER_MINUTE,
             60,
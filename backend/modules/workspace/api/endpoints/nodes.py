@@ -2,6 +2,7 @@
 Node endpoints.
 """
 
+import asyncio
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -35,7 +36,8 @@ from modules.workspace.domain.services.node_service import (
 from modules.workspace.db.repos.study_repo import StudyRepository
 from modules.workspace.domain.models.types import NodeType, Visibility
 from modules.workspace.db.tables.study_versions import StudyVersionTable, VersionSnapshotTable
-from modules.workspace.storage.r2_client import create_r2_client_from_env
+from modules.workspace.storage.async_r2_client import AsyncR2Client, create_async_r2_client_from_env
+from modules.workspace.storage.snapshot_store import is_manifest, manifest_blob_keys
 from modules.workspace.domain.policies.permissions import PermissionPolicy
 
 router = APIRouter(prefix="/nodes", tags=["nodes"])
@@ -53,34 +55,32 @@ async def _fetch_study_ids(node_service: NodeService, root: str) -> list[str]:
 
 async def _fetch_snapshot_keys(node_service: NodeService, study_id: str) -> list[str]:
     result = await node_service.session.execute(
-        select(VersionSnapshotTable.r2_key).join(
+        select(VersionSnapshotTable.r2_key, VersionSnapshotTable.meta_data).join(
             StudyVersionTable,
             VersionSnapshotTable.version_id == StudyVersionTable.id,
         ).where(StudyVersionTable.study_id == study_id)
     )
-    return [row[0] for row in result.all()]
+    keys: set[str] = set()
+    for r2_key, meta_data in result.all():
+        keys.add(r2_key)
+        # Manifest snapshots also reference shared, content-addressed blobs.
+        manifest = (meta_data or {}).get("manifest")
+        if is_manifest(manifest):
+            keys.update(manifest_blob_keys(manifest))
+    return list(keys)
 
 async def _delete_r2_objects(
     node_service: NodeService,
     study_repo: StudyRepository,
     study_id: str,
-    r2_client,
+    r2_client: AsyncR2Client,
 ) -> None:
     chapters = await study_repo.get_chapters_for_study(study_id, order_by_order=False)
-    for chapter in chapters:
-        if not chapter.r2_key:
-            continue
-        try:
-            r2_client.delete(chapter.r2_key)
-        except Exception:
-            pass
+    keys = [chapter.r2_key for chapter in chapters if chapter.r2_key]
+    keys.extend(await _fetch_snapshot_keys(node_service, study_id))
 
-    snapshot_keys = await _fetch_snapshot_keys(node_service, study_id)
-    for key in snapshot_keys:
-        try:
-            r2_client.delete(key)
-        except Exception:
-            pass
+    # Deletes are independent; failures are ignored like before.
+    await asyncio.gather(*(r2_client.delete(key) for key in keys), return_exceptions=True)
 
 
 @router.get("", response_model=NodeListResponse)
@@ -296,8 +296,8 @@ async def purge_node(
     if node is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Node not found")
 
-    acl = await node_service.acl_repo.get_acl(node_id, user_id)
     if not node.owner_id == user_id:
+        acl = await node_service.acl_repo.get_effective_acl(node, user_id)
         if acl is None or not PermissionPolicy.can_delete(
             node_service._node_to_model(node), user_id, node_service._acl_to_model(acl)
         ):
@@ -311,7 +311,7 @@ async def purge_node(
 
     r2_client = None
     try:
-        r2_client = create_r2_client_from_env()
+        r2_client = create_async_r2_client_from_env()
     except ValueError:
         r2_client = None
 
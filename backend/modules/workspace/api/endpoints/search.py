@@ -1,15 +1,22 @@
 """Search endpoints for content and metadata search."""
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from modules.workspace.api.deps import get_current_user_id, get_search_service
+from modules.workspace.api.deps import (
+    get_current_user_id,
+    get_position_index_service,
+    get_search_service,
+)
 from modules.workspace.api.schemas.search import (
     ContentSearchResponse,
     MetadataSearchResponse,
+    PositionHitItem,
+    PositionSearchResponse,
     SearchQuery,
     SearchResponse,
     SearchResultItem,
 )
+from modules.workspace.domain.services.position_index_service import PositionIndexService
 from modules.workspace.domain.services.search_service import SearchService
 
 router = APIRouter(prefix="/search", tags=["search"])
@@ -202,3 +209,58 @@ async def search_content(
         has_more=results.has_more,
         query=q,
     )
+
+
+@router.get("/positions", response_model=PositionSearchResponse)
+async def search_positions(
+    fen: str = Query(..., min_length=1, max_length=100, description="Position to find (FEN)"),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(50, ge=1, le=200, description="Results per page"),
+    user_id: str = Depends(get_current_user_id),
+    service: PositionIndexService = Depends(get_position_index_service),
+) -> PositionSearchResponse:
+    """
+    Find a chess position in the user's studies.
+
+    Matches every chapter node that reaches the position, including by
+    transposition. Move counters in the FEN are ignored. Results are
+    limited to studies the user can read.
+
+    Args:
+        fen: Position to look up
+        page: Page number
+        page_size: Results per page
+        user_id: Current user ID
+        service: Position index service
+
+    Returns:
+        PositionSearchResponse with matching chapter nodes
+    """
+    try:
+        results = await service.find_position(
+            fen=fen,
+            user_id=user_id,
+            page=page,
+            page_size=page_size,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid FEN: {e}")
+
+    return PositionSearchResponse(
+        results=[
+            PositionHitItem(
+                study_id=hit.study_id,
+                study_title=hit.study_title,
+                chapter_id=hit.chapter_id,
+                chapter_title=hit.chapter_title,
+                node_id=hit.node_id,
+                ply=hit.ply,
+            )
+            for hit in results.results
+        ],
+        total=results.total,
+        page=results.page,
+        page_size=results.page_size,
+        has_more=results.has_more,
+        fen=fen,
+    )
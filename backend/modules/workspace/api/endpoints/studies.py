@@ -8,6 +8,15 @@ import logging
 from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from modules.workspace.api.conditional import (
+    CACHE_CONTROL_CHAPTER_PGN,
+    CACHE_CONTROL_CHAPTER_SHOW,
+    CACHE_CONTROL_STUDY,
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
 from modules.workspace.api.deps import (
     get_current_user_id,
     get_event_bus,
@@ -64,6 +73,7 @@ from modules.workspace.domain.models.variation import (
 )
 from modules.workspace.db.repos.event_repo import EventRepository
 from modules.workspace.db.repos.node_repo import NodeRepository
+from modules.workspace.db.repos.position_index_repo import PositionIndexRepository
 from modules.workspace.db.repos.study_repo import StudyRepository
 from modules.workspace.db.tables.studies import Chapter as ChapterTable
 from modules.workspace.db.repos.variation_repo import VariationRepository
@@ -72,6 +82,7 @@ from modules.workspace.domain.services.chapter_import_service import ChapterImpo
 from modules.workspace.domain.services.node_service import NodeNotFoundError, NodeService, NodeServiceError, PermissionDeniedError
 from modules.workspace.domain.services.pgn_clip_service import PgnClipService
 from modules.workspace.domain.services.pgn_sync_service import PgnSyncService
+from modules.workspace.domain.services.position_index_service import PositionIndexService
 from modules.workspace.domain.services.study_service import (
     AnnotationAlreadyExistsError,
     AnnotationNotFoundError,
@@ -87,7 +98,14 @@ from modules.workspace.domain.services.variation_service import (
 )
 from modules.workspace.events.bus import EventBus, publish_chapter_created
 from modules.workspace.storage.keys import R2Keys
-from modules.workspace.storage.r2_client import R2Client, create_r2_client_from_env
+from modules.workspace.storage.r2_client import create_r2_client_from_env
+from modules.workspace.storage.async_r2_client import AsyncR2Client, create_async_r2_client_from_env
+from modules.workspace.domain.services.chapter_content_cache import (
+    chapter_content_cache,
+    content_token,
+    header_key,
+    load_chapter_content,
+)
 from backend.core.real_pgn.parser import parse_pgn
 from patch.backend.study.converter import convert_nodetree_to_dto
 from modules.workspace.pgn.serializer.from_variations import build_mainline_moves
@@ -139,7 +157,12 @@ async def get_study_service(
     study_repo: StudyRepository = Depends(get_study_repository),
 ) -> StudyService:
     r2_client = create_r2_client_from_env()
-    pgn_sync = PgnSyncService(study_repo, variation_repo, r2_client)
+    pgn_sync = PgnSyncService(
+        study_repo,
+        variation_repo,
+        r2_client,
+        position_index=PositionIndexService(PositionIndexRepository(session)),
+    )
     return StudyService(
         session,
         variation_repo,
@@ -236,8 +259,8 @@ async def create_study(
                 },
             }
 
-            r2_client = create_r2_client_from_env()
-            upload_result = r2_client.upload_json(
+            r2_client = create_async_r2_client_from_env()
+            upload_result = await r2_client.upload_json(
                 key=r2_key,
                 content=json.dumps(tree_content),
                 metadata={
@@ -404,11 +427,19 @@ async def import_pgn_into_study(
 @router.get("/{study_id}", response_model=StudyWithChaptersResponse)
 async def get_study(
     study_id: str,
+    response: Response,
     user_id: str = Depends(get_current_user_id),
     node_service: NodeService = Depends(get_node_service),
     study_repo: StudyRepository = Depends(get_study_repository),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
 ) -> StudyWithChaptersResponse:
-    """Get study with all chapters."""
+    """
+    Get study with all chapters.
+
+    Supports If-None-Match: the ETag is derived from the node and study
+    rows plus a chapter count/updated_at aggregate, so a 304 is returned
+    without loading chapters.
+    """
     try:
         # Get node to check permissions
         node = await node_service.get_node(study_id, actor_id=user_id)
@@ -427,8 +458,27 @@ async def get_study(
             tags=None,
         )
 
+        chapter_count, chapters_updated_at = await study_repo.get_chapters_fingerprint(study_id)
+        etag = make_etag(
+            "study",
+            study_id,
+            node.version,
+            node.updated_at,
+            node.title,
+            node.visibility,
+            node.parent_id,
+            node.path,
+            study.updated_at,
+            study.chapter_count,
+            chapter_count,
+            chapters_updated_at,
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, CACHE_CONTROL_STUDY)
+
         # Get chapters for study
         chapters = await study_repo.get_chapters_for_study(study_id, order_by_order=True)
+        set_cache_headers(response, etag, CACHE_CONTROL_STUDY)
 
         # Build response
         study_response = StudyResponse(
@@ -588,8 +638,8 @@ async def create_chapter(
             },
         }
 
-        r2_client = create_r2_client_from_env()
-        upload_result = r2_client.upload_json(
+        r2_client = create_async_r2_client_from_env()
+        upload_result = await r2_client.upload_json(
             key=r2_key,
             content=json.dumps(tree_content),
             metadata={
@@ -938,8 +988,23 @@ async def export_clean_pgn_endpoint(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-async def get_r2_client() -> R2Client:
-    return create_r2_client_from_env()
+async def get_r2_client() -> AsyncR2Client:
+    return create_async_r2_client_from_env()
+
+
+def _chapter_pgn_etag(chapter: ChapterTable, r2_key: str) -> str | None:
+    """ETag for a chapter's PGN, or None if the stored tree has no token."""
+    if chapter.r2_key != r2_key or not content_token(chapter):
+        return None
+    return make_etag(
+        "chapter-pgn",
+        chapter.id,
+        r2_key,
+        content_token(chapter),
+        chapter.pgn_size,
+        chapter.last_synced_at,
+        header_key(chapter),
+    )
 
 
 @router.get(
@@ -950,12 +1015,19 @@ async def get_r2_client() -> R2Client:
 async def get_chapter_pgn(
     study_id: str,
     chapter_id: str,
+    response: Response,
     user_id: str = Depends(get_current_user_id),
     study_repo: StudyRepository = Depends(get_study_repository),
     node_service: NodeService = Depends(get_node_service),
-    r2_client: R2Client = Depends(get_r2_client),
+    r2_client: AsyncR2Client = Depends(get_r2_client),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
 ) -> ChapterPgnResponse:
-    """Get PGN text and metadata for a chapter."""
+    """
+    Get PGN text and metadata for a chapter.
+
+    Supports If-None-Match for chapters whose tree.json ETag/hash is
+    recorded; a matching request gets a 304 without touching R2.
+    """
     try:
         # Check permissions by getting the parent study node
         await node_service.get_node(study_id, actor_id=user_id)
@@ -976,15 +1048,19 @@ async def get_chapter_pgn(
                 detail=f"PGN key could not be determined for chapter {chapter_id}",
             )
 
+        etag = _chapter_pgn_etag(chapter, r2_key)
+        if etag and etag_matches(if_none_match, etag):
+            return not_modified(etag, CACHE_CONTROL_CHAPTER_PGN)
+
         pgn_text = ""
         try:
             # Stage 10+: Tree JSON is the canonical storage.
             if r2_key.endswith(".pgn"):
                 # Lazy migrate legacy PGN -> tree.json
-                pgn_text = r2_client.download_pgn(r2_key)
+                pgn_text = await r2_client.download_pgn(r2_key)
                 node_tree = parse_pgn(pgn_text)
                 tree_dto = convert_nodetree_to_dto(node_tree)
-                upload = r2_client.upload_json(
+                upload = await r2_client.upload_json(
                     key=tree_key,
                     content=tree_dto.model_dump_json(),
                     metadata={"chapter_id": chapter_id},
@@ -1000,16 +1076,9 @@ async def get_chapter_pgn(
             if not r2_key.endswith(".json"):
                 raise ValueError(f"Unsupported r2_key format: {r2_key}")
 
-            if not r2_client.exists(r2_key):
-                raise ValueError(f"Tree not found in R2 for chapter {chapter_id}")
-
-            from patch.backend.study.models import StudyTreeDTO
-            from patch.backend.study.api import _tree_to_pgn
-
-            json_content = r2_client.download_json(r2_key)
-            tree_data = json.loads(json_content)
-            tree_dto = StudyTreeDTO(**tree_data)
-            pgn_text = _tree_to_pgn(tree_dto, chapter)
+            # Served from memory while chapter.r2_etag is unchanged.
+            content = await load_chapter_content(chapter, r2_client, r2_key)
+            pgn_text = content.pgn(chapter)
                 
         except Exception as e:  # Assuming a client error if download fails
             logger.error(f"Failed to retrieve PGN for chapter {chapter_id}: {e}")
@@ -1018,6 +1087,11 @@ async def get_chapter_pgn(
                 detail=f"Content not found or invalid in R2 for chapter {chapter_id} with key {r2_key}",
             )
 
+        # Legacy .pgn chapters were just migrated; their ETag is now known.
+        etag = _chapter_pgn_etag(chapter, r2_key)
+        if etag:
+            set_cache_headers(response, etag, CACHE_CONTROL_CHAPTER_PGN)
+
         return ChapterPgnResponse(
             pgn_text=pgn_text,
             pgn_hash=chapter.pgn_hash,
@@ -1057,12 +1131,13 @@ async def delete_chapter(
                 detail=f"Chapter {chapter_id} not found in study {study_id}",
             )
 
-        r2_client = create_r2_client_from_env()
+        r2_client = create_async_r2_client_from_env()
         r2_key = chapter.r2_key or R2Keys.chapter_tree_json(chapter_id)
         try:
-            r2_client.delete(r2_key)
+            await r2_client.delete(r2_key)
         except Exception:
             pass
+        chapter_content_cache.invalidate(chapter_id)
 
         await study_repo.delete_chapter(chapter)
         await study_repo.update_chapter_count(study_id)
@@ -1432,9 +1507,11 @@ async def promote_variation(
 async def get_chapter_show(
     study_id: str,
     chapter_id: str,
+    response: Response,
     user_id: str = Depends(get_current_user_id),
     variation_repo: VariationRepository = Depends(get_variation_repo),
     study_repo: StudyRepository = Depends(get_study_repository),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
 ):
     """
     Get ShowDTO for chapter rendering.
@@ -1447,6 +1524,10 @@ async def get_chapter_show(
     - result: Game result
 
     This is the new v2 endpoint for frontend rendering.
+
+    Supports If-None-Match: the ETag comes from the chapter row and an
+    aggregate over its variations/annotations, checked before the tree
+    is loaded and rendered.
     """
     # Always allow ShowDTO for rendering; frontend relies on it for variations.
     r2_key = None
@@ -1459,6 +1540,17 @@ async def get_chapter_show(
             )
         r2_key = chapter.r2_key
 
+        fingerprint = await variation_repo.get_chapter_fingerprint(chapter_id)
+        etag = make_etag(
+            "chapter-show",
+            chapter.id,
+            chapter.updated_at,
+            header_key(chapter),
+            fingerprint,
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, CACHE_CONTROL_CHAPTER_SHOW)
+
         variations = await variation_repo.get_variations_for_chapter(chapter_id)
         annotations = await variation_repo.get_annotations_for_chapter(chapter_id)
 
@@ -1473,6 +1565,7 @@ async def get_chapter_show(
 
         # Build ShowDTO
         show_dto = build_show(tree)
+        set_cache_headers(response, etag, CACHE_CONTROL_CHAPTER_SHOW)
 
         return show_dto
 
@@ -1,7 +1,9 @@
 """Version management API endpoints."""
-from typing import Annotated
+import json
+from typing import Annotated, AsyncIterator
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from modules.workspace.api.schemas.version import (
@@ -234,6 +236,46 @@ async def compare_versions(
         )
 
 
+@router.get("/{study_id}/versions/{version_number}/diff/stream")
+async def stream_version_diff(
+    study_id: str,
+    version_number: int,
+    version_service: Annotated[VersionService, Depends(get_version_service)],
+    compare_with: int = Query(..., description="Version to compare with"),
+) -> StreamingResponse:
+    """
+    Stream the comparison of two versions as NDJSON.
+
+    One change record per line, as in the diff endpoint plus an "op" of
+    "add", "delete" or "modify", so large studies can be rendered
+    incrementally.
+
+    Raises:
+        HTTPException: If either version does not exist
+    """
+    changes = version_service.iter_version_changes(
+        study_id=study_id,
+        from_version=version_number,
+        to_version=compare_with,
+    )
+    try:
+        first = await anext(changes, None)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+
+    async def body() -> AsyncIterator[str]:
+        if first is None:
+            return
+        yield json.dumps(first, default=str) + "\n"
+        async for change in changes:
+            yield json.dumps(change, default=str) + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
 @router.post("/{study_id}/versions", response_model=StudyVersionResponse, status_code=status.HTTP_201_CREATED)
 async def create_manual_snapshot(
     study_id: str,
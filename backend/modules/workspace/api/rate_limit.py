@@ -1,44 +1,11 @@
 """
-Simple in-memory rate limiter for API endpoints.
-"""
-
-import os
-import time
-from collections import deque
-
-
-class RateLimiter:
-    def __init__(self) -> None:
-        self._buckets: dict[str, deque[float]] = {}
+Rate limiting for workspace API endpoints.
 
-    def allow(self, key: str, limit: int, window_seconds: int) -> bool:
-        if os.getenv("DISABLE_RATE_LIMIT") == "1":
-            print(f"DEBUG: RateLimiter disabled by env")
-            return True
-        if limit <= 0:
-            return True
-        now = time.monotonic()
-        bucket = self._buckets.get(key)
-        if bucket is None:
-            bucket = deque()
-            self._buckets[key] = bucket
-
-        cutoff = now - window_seconds
-        while bucket and bucket[0] <= cutoff:
-            bucket.popleft()
-
-        print(f"DEBUG: RateLimiter check key={key} limit={limit} current={len(bucket)}")
-
-        if len(bucket) >= limit:
-            print(f"DEBUG: RateLimiter REJECTED")
-            return False
+Uses the shared limiter from core.security.rate_limiter, so workspace
+limits are enforced across workers when Redis (or the single-host SQLite
+backend) is configured.
+"""
 
-        bucket.append(now)
-        print(f"DEBUG: RateLimiter ALLOWED")
-        return True
+from core.security.rate_limiter import RateLimiter, get_rate_limiter as get_shared_rate_limiter
 
-    def reset(self, key: str | None = None) -> None:
-        if key is None:
-            self._buckets.clear()
-        else:
-            self._buckets.pop(key, None)
+__all__ = ["RateLimiter", "get_shared_rate_limiter"]
@@ -66,3 +66,25 @@ class ContentSearchResponse(BaseModel):
     page_size: int
     has_more: bool
     query: str
+
+
+class PositionHitItem(BaseModel):
+    """A chapter node reaching the searched position."""
+
+    study_id: str = Field(..., description="Study ID")
+    study_title: str = Field(..., description="Study title")
+    chapter_id: str = Field(..., description="Chapter ID")
+    chapter_title: str = Field(..., description="Chapter title")
+    node_id: str = Field(..., description="Tree node ID of the move reaching the position")
+    ply: int = Field(..., description="Ply of the node within its chapter")
+
+
+class PositionSearchResponse(BaseModel):
+    """Position search results across the user's studies."""
+
+    results: list[PositionHitItem]
+    total: int
+    page: int
+    page_size: int
+    has_more: bool
+    fen: str
@@ -7,34 +7,91 @@ and maintaining active sessions through WebSocket keepalive.
 
 import asyncio
 import logging
+import os
 from datetime import datetime, UTC
-from typing import Dict, Set
+from typing import Any, Dict, Set
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query
 from fastapi.websockets import WebSocketState
 
 from modules.workspace.events.bus import EventBus
+from modules.workspace.events.fanout import EventBroker, get_event_broker
 from modules.workspace.events.types import EventType
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Messages buffered per socket before a client counts as too slow
+SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+
+
+class _SocketSender:
+    """
+    Per-socket send queue drained by its own task.
+
+    Broadcasting only enqueues, so a slow client delays nobody but itself.
+    """
+
+    def __init__(self, websocket: WebSocket, on_failure) -> None:
+        self.websocket = websocket
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._on_failure = on_failure
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    def offer(self, message: dict) -> bool:
+        """Queue a message; False if the client is too far behind."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            message = await self.queue.get()
+            try:
+                if self.websocket.client_state == WebSocketState.DISCONNECTED:
+                    raise ConnectionError("websocket disconnected")
+                await self.websocket.send_json(message)
+            except Exception as e:
+                logger.error(f"Error sending to websocket: {e}")
+                await self._on_failure(self.websocket)
+                return
+
+    def close(self) -> None:
+        self.task.cancel()
+
 
 class ConnectionManager:
     """
     Manages WebSocket connections for presence updates.
 
-    Tracks active connections per study and broadcasts presence events
-    to connected clients.
+    Tracks active connections per study on this worker and subscribes to
+    the event broker for each study it serves, so events published on any
+    worker reach every connected client.
     """
 
-    def __init__(self):
-        """Initialize connection manager."""
+    def __init__(self, broker: EventBroker | None = None):
+        """
+        Initialize connection manager.
+
+        Args:
+            broker: Event broker (defaults to the process-wide broker)
+        """
         # study_id -> set of websockets
         self.active_connections: Dict[str, Set[WebSocket]] = {}
+        self._senders: Dict[WebSocket, _SocketSender] = {}
+        self._studies: Dict[WebSocket, str] = {}
+        self._broker = broker
         self._lock = asyncio.Lock()
 
+    @property
+    def broker(self) -> EventBroker:
+        if self._broker is None:
+            self._broker = get_event_broker()
+        return self._broker
+
     async def connect(self, websocket: WebSocket, study_id: str):
         """
         Accept and register a new WebSocket connection.
@@ -46,9 +103,14 @@ class ConnectionManager:
         await websocket.accept()
 
         async with self._lock:
-            if study_id not in self.active_connections:
+            first = study_id not in self.active_connections
+            if first:
                 self.active_connections[study_id] = set()
             self.active_connections[study_id].add(websocket)
+            self._senders[websocket] = _SocketSender(websocket, self._drop)
+            self._studies[websocket] = study_id
+            if first:
+                await self.broker.subscribe(study_id, self._deliver_batch)
 
         logger.info(f"WebSocket connected for study {study_id}. "
                    f"Total connections: {len(self.active_connections.get(study_id, set()))}")
@@ -62,44 +124,67 @@ class ConnectionManager:
             study_id: Study ID
         """
         async with self._lock:
-            if study_id in self.active_connections:
-                self.active_connections[study_id].discard(websocket)
-                if not self.active_connections[study_id]:
-                    del self.active_connections[study_id]
+            await self._remove(websocket, study_id)
 
         logger.info(f"WebSocket disconnected for study {study_id}")
 
+    async def _remove(self, websocket: WebSocket, study_id: str) -> None:
+        """Unregister a socket (caller holds the lock)."""
+        sender = self._senders.pop(websocket, None)
+        if sender is not None and sender.task is not asyncio.current_task():
+            sender.close()
+        self._studies.pop(websocket, None)
+        if study_id in self.active_connections:
+            self.active_connections[study_id].discard(websocket)
+            if not self.active_connections[study_id]:
+                del self.active_connections[study_id]
+                await self.broker.unsubscribe(study_id, self._deliver_batch)
+
+    async def _drop(self, websocket: WebSocket) -> None:
+        """Drop a failed or too-slow socket."""
+        study_id = self._studies.get(websocket)
+        if study_id is None:
+            return
+        async with self._lock:
+            await self._remove(websocket, study_id)
+        try:
+            if websocket.client_state == WebSocketState.CONNECTED:
+                # 1013: try again later
+                await websocket.close(code=1013)
+        except Exception:
+            pass
+
+    def send_personal(self, websocket: WebSocket, message: dict) -> None:
+        """Queue a message for one socket (keeps ordering with broadcasts)."""
+        sender = self._senders.get(websocket)
+        if sender is not None and not sender.offer(message):
+            asyncio.get_running_loop().create_task(self._drop(websocket))
+
     async def broadcast_to_study(self, study_id: str, message: dict):
         """
-        Broadcast a message to all connections for a study.
+        Queue a message for every connection to a study on this worker.
+
+        Never waits on a client: messages go to per-socket queues, and
+        sockets whose queue is full are dropped.
 
         Args:
             study_id: Study ID
             message: Message to broadcast
         """
-        if study_id not in self.active_connections:
-            return
-
-        connections = self.active_connections[study_id].copy()
-        disconnected = set()
+        for websocket in list(self.active_connections.get(study_id, ())):
+            self.send_personal(websocket, message)
 
-        for websocket in connections:
-            try:
-                if websocket.client_state == WebSocketState.CONNECTED:
-                    await websocket.send_json(message)
-                else:
-                    disconnected.add(websocket)
-            except Exception as e:
-                logger.error(f"Error broadcasting to websocket: {e}")
-                disconnected.add(websocket)
+    async def close(self) -> None:
+        """Stop all send queues (app shutdown)."""
+        async with self._lock:
+            for websocket, study_id in list(self._studies.items()):
+                await self._remove(websocket, study_id)
+        await asyncio.sleep(0)
 
-        # Clean up disconnected websockets
-        if disconnected:
-            async with self._lock:
-                for ws in disconnected:
-                    self.active_connections[study_id].discard(ws)
-                if not self.active_connections[study_id]:
-                    del self.active_connections[study_id]
+    async def _deliver_batch(self, study_id: str, messages: list[dict[str, Any]]) -> None:
+        """Broker handler: fan a batch out to this worker's sockets."""
+        for message in messages:
+            await self.broadcast_to_study(study_id, message)
 
 
 # Global connection manager
@@ -110,16 +195,15 @@ async def subscribe_to_presence_events(event_bus: EventBus, study_id: str):
     """
     Subscribe to presence events for a study and broadcast them via WebSocket.
 
-    This is a simplified version. In production, you'd want a more
-    robust event subscription mechanism.
+    Kept for compatibility: events published through EventBus reach
+    sockets through the event broker once their session commits, so there
+    is nothing to register per bus.
 
     Args:
         event_bus: Event bus instance
         study_id: Study ID to subscribe to
     """
-    # This is a placeholder for event subscription
-    # In a real implementation, you'd register a callback with the event bus
-    pass
+    return None
 
 
 @router.websocket("/ws/presence")
@@ -161,7 +245,7 @@ async def presence_websocket(
 
     try:
         # Send initial connection success message
-        await websocket.send_json({
+        manager.send_personal(websocket, {
             "type": "connection.established",
             "data": {
                 "study_id": study_id,
@@ -180,14 +264,14 @@ async def presence_websocket(
 
                 # Handle client messages
                 if data.get("type") == "ping":
-                    await websocket.send_json({
+                    manager.send_personal(websocket, {
                         "type": "pong",
                         "data": {"timestamp": datetime.now(UTC).isoformat()}
                     })
 
             except asyncio.TimeoutError:
                 # No message received in 60s, send keepalive
-                await websocket.send_json({
+                manager.send_personal(websocket, {
                     "type": "keepalive",
                     "data": {"timestamp": datetime.now(UTC).isoformat()}
                 })
@@ -210,8 +294,7 @@ async def broadcast_presence_event(study_id: str, event_type: str, event_data: d
     """
     Broadcast a presence event to all WebSocket clients for a study.
 
-    This function should be called by event subscribers when presence
-    events are published to the event bus.
+    Goes through the event broker, so clients on every worker receive it.
 
     Args:
         study_id: Study ID
@@ -225,4 +308,4 @@ async def broadcast_presence_event(study_id: str, event_type: str, event_data: d
             "timestamp": datetime.now(UTC).isoformat()
         }
     }
-    await manager.broadcast_to_study(study_id, message)
+    await manager.broker.publish(study_id, message)
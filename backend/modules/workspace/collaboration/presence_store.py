@@ -0,0 +1,412 @@
+"""
+Live presence sessions, kept out of the database.
+
+Heartbeats only touch the store; the database copy in presence_sessions is
+written in batches by PresenceService.flush_presence() (see the presence
+loop in main.py). Each store remembers which sessions this process changed
+or removed since the last flush.
+
+Stores:
+- InMemoryPresenceStore: sessions live in this process (single worker, tests)
+- RedisPresenceStore: one hash per study with a TTL, shared by all workers
+- DatabasePresenceStore: reads and writes presence_sessions directly; the
+  fallback without Redis, since workers do not share memory
+
+A session whose last heartbeat is older than the store TTL is treated as
+gone even before the sweep removes it.
+"""
+
+import json
+import logging
+import os
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import select
+
+from modules.workspace.db.repos.presence_repo import PresenceRepository
+from modules.workspace.db.tables.presence_sessions import PresenceSessionTable
+from modules.workspace.domain.models.presence import PresenceSession
+from modules.workspace.domain.models.types import PresenceStatus
+
+logger = logging.getLogger(__name__)
+
+# (study_id, user_id)
+SessionKey = tuple[str, str]
+
+
+def session_key(session: PresenceSession) -> SessionKey:
+    return session.study_id, session.user_id
+
+
+def session_to_json(session: PresenceSession) -> str:
+    return json.dumps(
+        {
+            "id": session.id,
+            "user_id": session.user_id,
+            "study_id": session.study_id,
+            "chapter_id": session.chapter_id,
+            "move_path": session.move_path,
+            "status": session.status.value,
+            "last_heartbeat": session.last_heartbeat.isoformat(),
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+        }
+    )
+
+
+def session_from_json(raw: str | bytes) -> PresenceSession:
+    data = json.loads(raw)
+    return PresenceSession(
+        id=data["id"],
+        user_id=data["user_id"],
+        study_id=data["study_id"],
+        chapter_id=data["chapter_id"],
+        move_path=data["move_path"],
+        status=PresenceStatus(data["status"]),
+        last_heartbeat=datetime.fromisoformat(data["last_heartbeat"]),
+        created_at=datetime.fromisoformat(data["created_at"]),
+        updated_at=datetime.fromisoformat(data["updated_at"]),
+    )
+
+
+def session_to_row(session: PresenceSession) -> dict[str, Any]:
+    """presence_sessions column values of a session."""
+    return {
+        "id": session.id,
+        "user_id": session.user_id,
+        "study_id": session.study_id,
+        "chapter_id": session.chapter_id,
+        "move_path": session.move_path,
+        "status": session.status.value,
+        "last_heartbeat": session.last_heartbeat,
+        "created_at": session.created_at,
+        "updated_at": session.updated_at,
+    }
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite drops the timezone of stored timestamps
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+def session_from_row(row: PresenceSessionTable) -> PresenceSession:
+    return PresenceSession(
+        id=row.id,
+        user_id=row.user_id,
+        study_id=row.study_id,
+        chapter_id=row.chapter_id,
+        move_path=row.move_path,
+        status=PresenceStatus(row.status),
+        last_heartbeat=_aware(row.last_heartbeat),
+        created_at=_aware(row.created_at),
+        updated_at=_aware(row.updated_at),
+    )
+
+
+class PresenceStore:
+    """
+    Base store: live sessions keyed by (study_id, user_id).
+
+    Subclasses implement _get/_put/_remove/list_study/list_all. Sessions
+    are returned as copies; callers put() them back after changing them.
+    """
+
+    def __init__(self, ttl_seconds: int | None = None) -> None:
+        if ttl_seconds is None:
+            ttl_seconds = int(os.getenv("PRESENCE_SESSION_TTL_SECONDS", "600"))
+        self.ttl_seconds = ttl_seconds
+        # Changes since the last flush: session to upsert, or None to delete
+        self._dirty: dict[SessionKey, PresenceSession | None] = {}
+
+    def is_live(self, session: PresenceSession, now: datetime | None = None) -> bool:
+        now = now or datetime.now(UTC)
+        return now - session.last_heartbeat <= timedelta(seconds=self.ttl_seconds)
+
+    async def get(self, study_id: str, user_id: str) -> PresenceSession | None:
+        """Live session of a user in a study, if any."""
+        session = await self._get(study_id, user_id)
+        if session is None or not self.is_live(session):
+            return None
+        return session
+
+    async def put(self, session: PresenceSession) -> None:
+        """Store a session and queue it for the next flush."""
+        await self._put(session)
+        self._dirty[session_key(session)] = replace(session)
+
+    async def remove(self, study_id: str, user_id: str) -> PresenceSession | None:
+        """
+        Remove a session and queue its deletion.
+
+        Returns the removed session, or None if it was already gone (with
+        several workers sharing a store, only one of them gets it).
+        """
+        session = await self._remove(study_id, user_id)
+        if session is not None:
+            self._dirty[(study_id, user_id)] = None
+        return session
+
+    def drain_dirty(self) -> dict[SessionKey, PresenceSession | None]:
+        """Take the changes queued since the last flush."""
+        dirty, self._dirty = self._dirty, {}
+        return dirty
+
+    def requeue(self, dirty: dict[SessionKey, PresenceSession | None]) -> None:
+        """Put back changes of a failed flush (newer changes win)."""
+        for key, session in dirty.items():
+            self._dirty.setdefault(key, session)
+
+    @property
+    def pending(self) -> int:
+        return len(self._dirty)
+
+    async def try_lock_sweep(self, seconds: int) -> bool:
+        """Whether this process should run the sweep now (one per interval)."""
+        return True
+
+    async def list_study(self, study_id: str) -> list[PresenceSession]:
+        raise NotImplementedError
+
+    async def list_all(self) -> list[PresenceSession]:
+        raise NotImplementedError
+
+    async def _get(self, study_id: str, user_id: str) -> PresenceSession | None:
+        raise NotImplementedError
+
+    async def _put(self, session: PresenceSession) -> None:
+        raise NotImplementedError
+
+    async def _remove(self, study_id: str, user_id: str) -> PresenceSession | None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+
+class InMemoryPresenceStore(PresenceStore):
+    """Single-process store."""
+
+    def __init__(self, ttl_seconds: int | None = None) -> None:
+        super().__init__(ttl_seconds=ttl_seconds)
+        self._studies: dict[str, dict[str, PresenceSession]] = {}
+
+    async def _get(self, study_id: str, user_id: str) -> PresenceSession | None:
+        session = self._studies.get(study_id, {}).get(user_id)
+        return replace(session) if session is not None else None
+
+    async def _put(self, session: PresenceSession) -> None:
+        self._studies.setdefault(session.study_id, {})[session.user_id] = replace(session)
+
+    async def _remove(self, study_id: str, user_id: str) -> PresenceSession | None:
+        sessions = self._studies.get(study_id)
+        if not sessions:
+            return None
+        session = sessions.pop(user_id, None)
+        if not sessions:
+            del self._studies[study_id]
+        return session
+
+    async def list_study(self, study_id: str) -> list[PresenceSession]:
+        now = datetime.now(UTC)
+        return [
+            replace(session)
+            for session in self._studies.get(study_id, {}).values()
+            if self.is_live(session, now)
+        ]
+
+    async def list_all(self) -> list[PresenceSession]:
+        return [
+            replace(session)
+            for sessions in self._studies.values()
+            for session in sessions.values()
+        ]
+
+
+class RedisPresenceStore(PresenceStore):
+    """
+    Redis store shared by all workers.
+
+    Each study is a hash {user_id: session JSON} whose TTL is refreshed on
+    every heartbeat, so abandoned studies disappear on their own. A sorted
+    set of study ids (scored by last heartbeat) lets the sweep enumerate
+    studies without KEYS/SCAN.
+    """
+
+    def __init__(self, client, prefix: str = "workspace:presence:", ttl_seconds: int | None = None) -> None:
+        super().__init__(ttl_seconds=ttl_seconds)
+        self.client = client
+        self.prefix = prefix
+
+    def _study_key(self, study_id: str) -> str:
+        return f"{self.prefix}study:{study_id}"
+
+    @property
+    def _studies_key(self) -> str:
+        return f"{self.prefix}studies"
+
+    async def _get(self, study_id: str, user_id: str) -> PresenceSession | None:
+        raw = await self.client.hget(self._study_key(study_id), user_id)
+        return session_from_json(raw) if raw else None
+
+    async def _put(self, session: PresenceSession) -> None:
+        key = self._study_key(session.study_id)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, session.user_id, session_to_json(session))
+            pipe.expire(key, self.ttl_seconds)
+            pipe.zadd(self._studies_key, {session.study_id: session.last_heartbeat.timestamp()})
+            await pipe.execute()
+
+    async def _remove(self, study_id: str, user_id: str) -> PresenceSession | None:
+        key = self._study_key(study_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hget(key, user_id)
+            pipe.hdel(key, user_id)
+            raw, removed = await pipe.execute()
+        return session_from_json(raw) if raw and removed else None
+
+    async def list_study(self, study_id: str) -> list[PresenceSession]:
+        raw = await self.client.hgetall(self._study_key(study_id))
+        now = datetime.now(UTC)
+        sessions = [session_from_json(value) for value in raw.values()]
+        return [session for session in sessions if self.is_live(session, now)]
+
+    async def list_all(self) -> list[PresenceSession]:
+        study_ids = [
+            study_id.decode("utf-8") if isinstance(study_id, bytes) else study_id
+            for study_id in await self.client.zrange(self._studies_key, 0, -1)
+        ]
+        if not study_ids:
+            return []
+        async with self.client.pipeline(transaction=False) as pipe:
+            for study_id in study_ids:
+                pipe.hgetall(self._study_key(study_id))
+            hashes = await pipe.execute()
+
+        sessions: list[PresenceSession] = []
+        gone = []
+        for study_id, raw in zip(study_ids, hashes):
+            if not raw:
+                gone.append(study_id)
+                continue
+            sessions.extend(session_from_json(value) for value in raw.values())
+        if gone:
+            await self.client.zrem(self._studies_key, *gone)
+        return sessions
+
+    async def try_lock_sweep(self, seconds: int) -> bool:
+        return bool(
+            await self.client.set(f"{self.prefix}sweep", "1", nx=True, ex=max(1, seconds))
+        )
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class DatabasePresenceStore(PresenceStore):
+    """
+    Store backed by the presence_sessions table, shared by all workers.
+
+    Every heartbeat is a database write (one upsert), so nothing is queued
+    for the flush. Used when Redis is not available: an in-memory store
+    would give each worker its own view of who is online. Every worker
+    runs the sweep; remove() reports each expired session only once.
+    """
+
+    def __init__(self, session_factory=None, ttl_seconds: int | None = None) -> None:
+        """
+        Args:
+            session_factory: Callable returning an AsyncSession context
+                manager (default: the workspace database session maker)
+        """
+        super().__init__(ttl_seconds=ttl_seconds)
+        self._session_factory = session_factory
+
+    def _session(self):
+        if self._session_factory is None:
+            from modules.workspace.db.session import get_db_config
+
+            self._session_factory = get_db_config().async_session_maker
+        return self._session_factory()
+
+    async def put(self, session: PresenceSession) -> None:
+        await self._put(session)
+
+    async def remove(self, study_id: str, user_id: str) -> PresenceSession | None:
+        return await self._remove(study_id, user_id)
+
+    async def _get(self, study_id: str, user_id: str) -> PresenceSession | None:
+        async with self._session() as db:
+            row = await PresenceRepository(db).get_by_user_study(user_id, study_id)
+        return session_from_row(row) if row is not None else None
+
+    async def _put(self, session: PresenceSession) -> None:
+        async with self._session() as db:
+            await PresenceRepository(db).upsert_many([session_to_row(session)])
+            await db.commit()
+
+    async def _remove(self, study_id: str, user_id: str) -> PresenceSession | None:
+        async with self._session() as db:
+            repo = PresenceRepository(db)
+            row = await repo.get_by_user_study(user_id, study_id)
+            if row is None:
+                return None
+            session = session_from_row(row)
+            # Only the worker whose delete hit the row reports the removal
+            removed = await repo.delete_by_user_study([(user_id, study_id)])
+            await db.commit()
+        return session if removed else None
+
+    async def list_study(self, study_id: str) -> list[PresenceSession]:
+        async with self._session() as db:
+            rows = await PresenceRepository(db).get_by_study(study_id)
+        now = datetime.now(UTC)
+        sessions = [session_from_row(row) for row in rows]
+        return [session for session in sessions if self.is_live(session, now)]
+
+    async def list_all(self) -> list[PresenceSession]:
+        async with self._session() as db:
+            result = await db.execute(select(PresenceSessionTable))
+            return [session_from_row(row) for row in result.scalars().all()]
+
+
+def create_presence_store_from_env() -> PresenceStore:
+    """
+    Create the process-wide presence store.
+
+    Env:
+        REDIS_URL: Redis connection URL (shares presence across workers)
+        PRESENCE_STORE: "memory" keeps sessions in this process; only for a
+            single worker (without Redis the default is the database)
+        PRESENCE_SESSION_TTL_SECONDS: Session lifetime without heartbeats
+            (default: 600)
+    """
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        try:
+            import redis.asyncio as redis
+
+            return RedisPresenceStore(redis.from_url(redis_url))
+        except Exception as exc:
+            logger.warning("Presence falling back to database store: %s", exc)
+    if os.getenv("PRESENCE_STORE") == "memory":
+        return InMemoryPresenceStore()
+    return DatabasePresenceStore()
+
+
+_store: PresenceStore | None = None
+
+
+def get_presence_store() -> PresenceStore:
+    """Get the process-wide presence store."""
+    global _store
+    if _store is None:
+        _store = create_presence_store_from_env()
+    return _store
+
+
+def set_presence_store(store: PresenceStore | None) -> None:
+    """Replace the process-wide presence store (tests, app shutdown)."""
+    global _store
+    _store = store
@@ -0,0 +1,36 @@
+"""Add position index table
+
+Revision ID: 20260119_0019
+Revises: 20260118_0018
+Create Date: 2026-01-19 09:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20260119_0019"
+down_revision: Union[str, None] = "20260118_0018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "position_index",
+        sa.Column("chapter_id", sa.String(length=64), nullable=False),
+        sa.Column("node_id", sa.String(length=64), nullable=False),
+        sa.Column("study_id", sa.String(length=64), nullable=False),
+        sa.Column("position_key", sa.BigInteger(), nullable=False),
+        sa.Column("ply", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["chapter_id"], ["chapters.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("chapter_id", "node_id"),
+    )
+    op.create_index("ix_position_index_key", "position_index", ["position_key"])
+    op.create_index("ix_position_index_study", "position_index", ["study_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_position_index_study", table_name="position_index")
+    op.drop_index("ix_position_index_key", table_name="position_index")
+    op.drop_table("position_index")
@@ -0,0 +1,42 @@
+"""Make search_index (target_id, target_type) unique
+
+Revision ID: 20260121_0021
+Revises: 20260120_0020
+Create Date: 2026-01-21 09:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "20260121_0021"
+down_revision: Union[str, None] = "20260120_0020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the most recently updated entry per target
+    op.execute(
+        """
+        DELETE FROM search_index
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY target_id, target_type
+                    ORDER BY updated_at DESC, id DESC
+                ) AS rn
+                FROM search_index
+            ) ranked
+            WHERE rn > 1
+        )
+        """
+    )
+    op.drop_index("ix_search_index_target", table_name="search_index")
+    op.create_index(
+        "ix_search_index_target", "search_index", ["target_id", "target_type"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_search_index_target", table_name="search_index")
+    op.create_index("ix_search_index_target", "search_index", ["target_id", "target_type"])
@@ -0,0 +1,29 @@
+"""Add tree_ops_pending to chapters for journaled tree edits.
+
+Revision ID: 20260122_0022
+Revises: 20260121_0021
+Create Date: 2026-01-22 09:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260122_0022"
+down_revision: Union[str, None] = "20260121_0021"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add tree_ops_pending column to chapters table."""
+    op.add_column(
+        "chapters",
+        sa.Column("tree_ops_pending", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    """Remove tree_ops_pending column from chapters table."""
+    op.drop_column("chapters", "tree_ops_pending")
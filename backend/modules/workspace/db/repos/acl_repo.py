@@ -4,11 +4,90 @@ ACL repository for permission management.
 
 from typing import Sequence
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import ColumnElement, and_, case, exists, func, literal, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from modules.workspace.db.tables.acl import ACL, ShareLink
+from modules.workspace.domain.models.acl import ACLModel
 from modules.workspace.domain.models.types import Permission
+from modules.workspace.domain.policies.permission_cache import (
+    MISSING,
+    resolved_permission_cache,
+)
+from modules.workspace.domain.policies.permissions_inheritance import InheritancePolicy
+
+
+# Permission levels that grant read access (mirrors Permission.can_read).
+READ_PERMISSIONS = tuple(p.value for p in Permission if Permission.can_read(p))
+
+PERMISSION_HIERARCHY = {
+    "owner": 5,
+    "admin": 4,
+    "editor": 3,
+    "commenter": 2,
+    "viewer": 1,
+}
+
+
+def permission_allows(granted: Permission | str, required: Permission | str) -> bool:
+    """Check if a granted permission level meets a required level."""
+    granted_value = granted.value if isinstance(granted, Permission) else str(granted)
+    required_value = required.value if isinstance(required, Permission) else str(required)
+    return PERMISSION_HIERARCHY.get(granted_value, 0) >= PERMISSION_HIERARCHY.get(required_value, 0)
+
+
+def _to_model(acl: ACL) -> ACLModel:
+    """Detach an ACL row into a domain model safe to share across sessions."""
+    permission = (
+        acl.permission
+        if isinstance(acl.permission, Permission)
+        else Permission(str(acl.permission))
+    )
+    return ACLModel(
+        id=acl.id,
+        object_id=acl.object_id,
+        user_id=acl.user_id,
+        permission=permission,
+        inherit_to_children=acl.inherit_to_children,
+        is_inherited=acl.is_inherited,
+        inherited_from=acl.inherited_from,
+        granted_by=acl.granted_by,
+        created_at=acl.created_at,
+        updated_at=acl.updated_at,
+    )
+
+
+def readable_node_condition(user_id: str) -> ColumnElement[bool]:
+    """
+    SQL condition matching nodes the user can read.
+
+    Mirrors PermissionPolicy.can_read on the effective grant (owner, or a
+    readable grant on the node or an inheriting ancestor) so permission
+    filtering can run inside a query instead of one lookup per candidate.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Boolean clause over the nodes table
+    """
+    from modules.workspace.db.tables.nodes import Node
+
+    # Grants on ancestors apply through the materialized path.
+    inherited = and_(
+        ACL.inherit_to_children.is_(True),
+        Node.path.contains(literal("/") + ACL.object_id + literal("/")),
+    )
+    return or_(
+        Node.owner_id == user_id,
+        exists().where(
+            and_(
+                ACL.user_id == user_id,
+                ACL.permission.in_(READ_PERMISSIONS),
+                or_(ACL.object_id == Node.id, inherited),
+            )
+        ),
+    )
 
 
 class ACLRepository:
@@ -26,6 +105,14 @@ class ACLRepository:
             session: Database session
         """
         self.session = session
+        # Per-request memo (the repo lives for one request/session).
+        self._acl_versions: dict[str, tuple] = {}
+        self._effective: dict[tuple, ACLModel | None] = {}
+
+    def _invalidate_resolved(self) -> None:
+        """Forget memoized versions/permissions after an ACL write."""
+        self._acl_versions.clear()
+        self._effective.clear()
 
     # === ACL Operations ===
 
@@ -35,6 +122,7 @@ class ACLRepository:
             acl.granted_by = acl.user_id
         self.session.add(acl)
         await self.session.flush()
+        self._invalidate_resolved()
         return acl
 
     async def create(self, acl: ACL) -> ACL:
@@ -49,6 +137,69 @@ class ACLRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_acl_version(self, user_id: str) -> tuple:
+        """
+        Get a fingerprint of a user's ACL rows.
+
+        Row count, latest updated_at and sums over permission level and
+        inheritance flag change on every grant, role change or revoke, so
+        it versions resolved permissions for the user. Memoized for the
+        lifetime of this repository.
+        """
+        version = self._acl_versions.get(user_id)
+        if version is None:
+            stmt = select(
+                func.count(ACL.id),
+                func.max(ACL.updated_at),
+                func.coalesce(func.sum(case(PERMISSION_HIERARCHY, value=ACL.permission, else_=0)), 0),
+                func.coalesce(func.sum(case((ACL.inherit_to_children.is_(True), 1), else_=0)), 0),
+            ).where(ACL.user_id == user_id)
+            version = tuple((await self.session.execute(stmt)).one())
+            self._acl_versions[user_id] = version
+        return version
+
+    async def get_effective_acl(self, node, user_id: str) -> ACLModel | None:
+        """
+        Resolve the grant that applies to a user on a node.
+
+        Considers the node's own grant and inheriting grants on its
+        ancestors (from `node.path`); the nearest wins. Results are memoized
+        per request and cached process-wide under the user's ACL version.
+
+        Args:
+            node: Node (needs id and path)
+            user_id: User ID
+
+        Returns:
+            Effective grant as an ACLModel, or None
+        """
+        key = (user_id, node.id, node.path)
+        if key in self._effective:
+            return self._effective[key]
+
+        version = await self.get_acl_version(user_id)
+        if version[0] == 0:
+            # No grants at all: nothing to look up or cache.
+            self._effective[key] = None
+            return None
+
+        cached = resolved_permission_cache.get(key, version)
+        if cached is not MISSING:
+            self._effective[key] = cached
+            return cached
+
+        ancestor_ids = InheritancePolicy.ancestor_ids(node.path) or [node.id]
+        stmt = select(ACL).where(
+            and_(ACL.user_id == user_id, ACL.object_id.in_(ancestor_ids))
+        )
+        acls = (await self.session.execute(stmt)).scalars().all()
+        acl = InheritancePolicy.resolve_effective_acl(node.id, node.path, acls)
+        effective = _to_model(acl) if acl is not None else None
+
+        resolved_permission_cache.put(key, version, effective)
+        self._effective[key] = effective
+        return effective
+
     async def get_acls_for_object(self, object_id: str) -> Sequence[ACL]:
         """Get all ACL entries for an object."""
         stmt = select(ACL).where(ACL.object_id == object_id)
@@ -92,12 +243,14 @@ class ACLRepository:
         """Update an ACL entry."""
         await self.session.flush()
         await self.session.refresh(acl)
+        self._invalidate_resolved()
         return acl
 
     async def delete_acl(self, acl: ACL) -> None:
         """Delete an ACL entry."""
         await self.session.delete(acl)
         await self.session.flush()
+        self._invalidate_resolved()
 
     async def delete_by_object_and_user(self, object_id: str, user_id: str) -> None:
         """Delete ACL for a specific object/user pair."""
@@ -120,6 +273,7 @@ class ACLRepository:
             await self.session.delete(acl)
 
         await self.session.flush()
+        self._invalidate_resolved()
         return len(acls)
 
     async def check_permission(
@@ -139,30 +293,7 @@ class ACLRepository:
         acl = await self.get_acl(object_id, user_id)
         if acl is None:
             return False
-
-        permission_hierarchy = {
-            "owner": 5,
-            "admin": 4,
-            "editor": 3,
-            "commenter": 2,
-            "viewer": 1,
-        }
-
-        permission_value = (
-            acl.permission.value
-            if isinstance(acl.permission, Permission)
-            else str(acl.permission)
-        )
-        required_value = (
-            required_permission.value
-            if isinstance(required_permission, Permission)
-            else str(required_permission)
-        )
-
-        user_level = permission_hierarchy.get(permission_value, 0)
-        required_level = permission_hierarchy.get(required_value, 0)
-
-        return user_level >= required_level
+        return permission_allows(acl.permission, required_permission)
 
     # === Share Link Operations ===
 
@@ -0,0 +1,107 @@
+"""
+Event outbox repository: outbox rows and per-subscriber checkpoints.
+"""
+
+from typing import Sequence
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from modules.workspace.db.tables.event_outbox import EventOutbox, SubscriberCheckpoint
+from modules.workspace.db.tables.events import Event
+
+
+class EventOutboxRepository:
+    """
+    Repository for the event outbox.
+
+    Rows are appended by EventBus in outbox mode and read in seq order by
+    the OutboxDispatcher, which records progress per subscriber.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Initialize repository.
+
+        Args:
+            session: Database session
+        """
+        self.session = session
+
+    def enqueue(self, event_id: str) -> EventOutbox:
+        """Add an outbox row for an event (written with the session's next flush)."""
+        row = EventOutbox(event_id=event_id)
+        self.session.add(row)
+        return row
+
+    async def fetch_after(self, seq: int, limit: int) -> Sequence[tuple[int, Event]]:
+        """
+        Get up to `limit` (seq, event) pairs with seq greater than `seq`.
+
+        Returns:
+            Pairs in seq order
+        """
+        stmt = (
+            select(EventOutbox.seq, Event)
+            .join(Event, Event.id == EventOutbox.event_id)
+            .where(EventOutbox.seq > seq)
+            .order_by(EventOutbox.seq)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [(row_seq, event) for row_seq, event in result.all()]
+
+    async def head_seq(self) -> int:
+        """Highest seq in the outbox (0 if empty)."""
+        result = await self.session.execute(select(func.max(EventOutbox.seq)))
+        return result.scalar_one_or_none() or 0
+
+    async def tail_seq(self) -> int:
+        """Lowest seq in the outbox (0 if empty)."""
+        result = await self.session.execute(select(func.min(EventOutbox.seq)))
+        return result.scalar_one_or_none() or 0
+
+    async def get_checkpoint(self, subscriber: str) -> SubscriberCheckpoint | None:
+        """
+        Get and lock a subscriber's checkpoint row.
+
+        The row lock (SKIP LOCKED on PostgreSQL) ensures one worker at a
+        time consumes for a subscriber; another worker holding it yields
+        None, as does a subscriber without a checkpoint yet.
+        """
+        stmt = (
+            select(SubscriberCheckpoint)
+            .where(SubscriberCheckpoint.subscriber == subscriber)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def create_checkpoint(self, subscriber: str, last_seq: int) -> SubscriberCheckpoint:
+        """Create a subscriber's checkpoint row."""
+        checkpoint = SubscriberCheckpoint(subscriber=subscriber, last_seq=last_seq)
+        self.session.add(checkpoint)
+        await self.session.flush()
+        return checkpoint
+
+    async def get_checkpoints(self) -> dict[str, int]:
+        """Get subscriber -> last_seq for all subscribers."""
+        result = await self.session.execute(
+            select(SubscriberCheckpoint.subscriber, SubscriberCheckpoint.last_seq)
+        )
+        return {subscriber: last_seq for subscriber, last_seq in result.all()}
+
+    async def prune(self, up_to_seq: int) -> int:
+        """
+        Delete outbox rows every subscriber has processed.
+
+        Args:
+            up_to_seq: Lowest checkpoint across all subscribers
+
+        Returns:
+            Number of rows deleted
+        """
+        result = await self.session.execute(
+            delete(EventOutbox).where(EventOutbox.seq <= up_to_seq)
+        )
+        return result.rowcount or 0
@@ -2,9 +2,10 @@
 Node repository for database operations.
 """
 
+from datetime import datetime
 from typing import Sequence
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import and_, func, literal, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -138,6 +139,88 @@ class NodeRepository:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    def _strict_descendants(self, node_path: str):
+        """Condition matching nodes strictly below `node_path`."""
+        return and_(
+            Node.path.startswith(node_path, autoescape=True),
+            Node.path != node_path,
+        )
+
+    async def move_descendants(self, old_path: str, new_path: str, depth_delta: int) -> int:
+        """
+        Rewrite the paths of a moved node's descendants in one UPDATE.
+
+        Replaces the `old_path` prefix with `new_path` and shifts depth by
+        `depth_delta` for every descendant, including soft-deleted ones so
+        they restore into the right place. Runs in the caller's transaction;
+        descendant objects already loaded in the session are not refreshed.
+
+        Args:
+            old_path: Moved node's path before the move
+            new_path: Moved node's path after the move
+            depth_delta: New depth minus old depth of the moved node
+
+        Returns:
+            Number of descendants updated
+        """
+        stmt = (
+            update(Node)
+            .where(self._strict_descendants(old_path))
+            .values(
+                path=literal(new_path) + func.substr(Node.path, len(old_path) + 1),
+                depth=Node.depth + depth_delta,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
+
+    async def soft_delete_descendants(self, node_path: str, deleted_at: datetime) -> int:
+        """
+        Soft delete all live descendants of a node in one UPDATE.
+
+        Descendants are stamped with the parent's `deleted_at`, which lets
+        restore_descendants() tell them apart from nodes deleted earlier.
+
+        Args:
+            node_path: Path of the deleted node
+            deleted_at: The deleted node's deletion timestamp
+
+        Returns:
+            Number of descendants deleted
+        """
+        stmt = (
+            update(Node)
+            .where(self._strict_descendants(node_path), Node.deleted_at.is_(None))
+            .values(deleted_at=deleted_at)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
+
+    async def restore_descendants(self, node_path: str, deleted_at: datetime) -> int:
+        """
+        Restore descendants deleted together with their ancestor.
+
+        Only nodes carrying the ancestor's exact `deleted_at` are restored;
+        anything deleted separately stays deleted.
+
+        Args:
+            node_path: Path of the restored node
+            deleted_at: The restored node's deletion timestamp
+
+        Returns:
+            Number of descendants restored
+        """
+        stmt = (
+            update(Node)
+            .where(self._strict_descendants(node_path), Node.deleted_at == deleted_at)
+            .values(deleted_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
+
     async def get_by_owner(
         self, owner_id: str, node_type: NodeType | None = None, include_deleted: bool = False
     ) -> Sequence[Node]:
@@ -261,12 +344,44 @@ class NodeRepository:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    def _name_search_conditions(
+        self,
+        query: str,
+        node_type: str | None = None,
+        owner_id: str | None = None,
+        readable_by: str | None = None,
+        exclude_ids=None,
+    ) -> list:
+        conditions = [
+            Node.title.ilike(f"%{query}%"),
+            Node.deleted_at.is_(None),
+        ]
+
+        if node_type is not None:
+            conditions.append(Node.node_type == node_type)
+
+        if owner_id is not None:
+            conditions.append(Node.owner_id == owner_id)
+
+        if readable_by is not None:
+            from modules.workspace.db.repos.acl_repo import readable_node_condition
+
+            conditions.append(readable_node_condition(readable_by))
+
+        if exclude_ids is not None:
+            conditions.append(Node.id.not_in(exclude_ids))
+
+        return conditions
+
     async def search_by_name(
         self,
         query: str,
         node_type: str | None = None,
         owner_id: str | None = None,
         limit: int = 50,
+        offset: int = 0,
+        readable_by: str | None = None,
+        exclude_ids=None,
     ) -> Sequence[Node]:
         """
         Search nodes by name (title).
@@ -276,21 +391,43 @@ class NodeRepository:
             node_type: Optional node type filter
             owner_id: Optional owner filter
             limit: Maximum results
+            offset: Results to skip
+            readable_by: Only return nodes this user can read
+            exclude_ids: Node IDs (collection or subquery) to leave out
 
         Returns:
-            List of matching nodes
+            List of matching nodes, ordered by title
         """
-        conditions = [
-            Node.title.ilike(f"%{query}%"),
-            Node.deleted_at.is_(None),
-        ]
-
-        if node_type is not None:
-            conditions.append(Node.node_type == node_type)
+        conditions = self._name_search_conditions(
+            query, node_type, owner_id, readable_by, exclude_ids
+        )
+        stmt = (
+            select(Node)
+            .where(and_(*conditions))
+            .order_by(Node.title, Node.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
 
-        if owner_id is not None:
-            conditions.append(Node.owner_id == owner_id)
+    async def count_by_name(
+        self,
+        query: str,
+        node_type: str | None = None,
+        owner_id: str | None = None,
+        readable_by: str | None = None,
+        exclude_ids=None,
+    ) -> int:
+        """
+        Count nodes matching a name search (same filters as search_by_name).
 
-        stmt = select(Node).where(and_(*conditions)).limit(limit)
+        Returns:
+            Number of matching nodes
+        """
+        conditions = self._name_search_conditions(
+            query, node_type, owner_id, readable_by, exclude_ids
+        )
+        stmt = select(func.count()).select_from(Node).where(and_(*conditions))
         result = await self.session.execute(stmt)
-        return result.scalars().all()
+        return result.scalar_one()
@@ -0,0 +1,145 @@
+"""
+Position index repository for cross-study position lookup.
+"""
+
+from typing import Iterable, Sequence
+
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from modules.workspace.db.tables.nodes import Node
+from modules.workspace.db.tables.position_index import PositionIndex
+from modules.workspace.db.tables.studies import Chapter
+
+# Bound on rows per multi-row INSERT (keeps bind parameters under driver limits).
+_INSERT_BATCH = 1000
+
+
+class PositionIndexRepository:
+    """
+    Repository for position index entries.
+
+    Entries are maintained per chapter: sync_chapter() diffs the chapter's
+    current positions against the stored rows and only writes changes.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Initialize repository.
+
+        Args:
+            session: Database session
+        """
+        self.session = session
+
+    async def get_chapter_keys(self, chapter_id: str) -> dict[str, tuple[int, int]]:
+        """Get stored node_id -> (position_key, ply) for a chapter."""
+        stmt = select(
+            PositionIndex.node_id, PositionIndex.position_key, PositionIndex.ply
+        ).where(PositionIndex.chapter_id == chapter_id)
+        result = await self.session.execute(stmt)
+        return {node_id: (key, ply) for node_id, key, ply in result.all()}
+
+    async def sync_chapter(
+        self,
+        study_id: str,
+        chapter_id: str,
+        positions: Iterable[tuple[str, int, int]],
+    ) -> tuple[int, int]:
+        """
+        Bring a chapter's index rows in line with its tree.
+
+        Args:
+            study_id: Study ID
+            chapter_id: Chapter ID
+            positions: (node_id, position_key, ply) for every move node
+
+        Returns:
+            (rows inserted, rows deleted)
+        """
+        wanted = {node_id: (key, ply) for node_id, key, ply in positions}
+        stored = await self.get_chapter_keys(chapter_id)
+
+        stale = [node_id for node_id, value in stored.items() if wanted.get(node_id) != value]
+        fresh = [
+            {
+                "chapter_id": chapter_id,
+                "node_id": node_id,
+                "study_id": study_id,
+                "position_key": key,
+                "ply": ply,
+            }
+            for node_id, (key, ply) in wanted.items()
+            if stored.get(node_id) != (key, ply)
+        ]
+
+        for start in range(0, len(stale), _INSERT_BATCH):
+            await self.session.execute(
+                delete(PositionIndex).where(
+                    PositionIndex.chapter_id == chapter_id,
+                    PositionIndex.node_id.in_(stale[start:start + _INSERT_BATCH]),
+                )
+            )
+        for start in range(0, len(fresh), _INSERT_BATCH):
+            await self.session.execute(insert(PositionIndex), fresh[start:start + _INSERT_BATCH])
+        await self.session.flush()
+        return len(fresh), len(stale)
+
+    async def delete_for_chapter(self, chapter_id: str) -> None:
+        """Remove all index rows for a chapter."""
+        await self.session.execute(
+            delete(PositionIndex).where(PositionIndex.chapter_id == chapter_id)
+        )
+        await self.session.flush()
+
+    def _readable_hits(self, position_key: int, user_id: str):
+        from modules.workspace.db.repos.acl_repo import readable_node_condition
+
+        return (
+            select(PositionIndex, Chapter.title, Node.title)
+            .join(Chapter, Chapter.id == PositionIndex.chapter_id)
+            .join(Node, Node.id == PositionIndex.study_id)
+            .where(
+                and_(
+                    PositionIndex.position_key == position_key,
+                    Node.deleted_at.is_(None),
+                    readable_node_condition(user_id),
+                )
+            )
+        )
+
+    async def find_readable(
+        self,
+        position_key: int,
+        user_id: str,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Sequence[tuple[PositionIndex, str, str]]:
+        """
+        Find chapter nodes reaching a position in studies the user can read.
+
+        Args:
+            position_key: Zobrist key of the position
+            user_id: User whose read access filters the results
+            limit: Maximum results
+            offset: Results to skip
+
+        Returns:
+            (PositionIndex, chapter title, study title) rows
+        """
+        stmt = (
+            self._readable_hits(position_key, user_id)
+            .order_by(Node.title, Chapter.order, PositionIndex.ply, PositionIndex.node_id)
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def count_readable(self, position_key: int, user_id: str) -> int:
+        """Count the hits find_readable() would return without a limit."""
+        stmt = select(func.count()).select_from(
+            self._readable_hits(position_key, user_id).subquery()
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
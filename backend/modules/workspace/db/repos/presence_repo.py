@@ -5,13 +5,18 @@ Handles CRUD operations for presence sessions.
 """
 
 from datetime import datetime
-from typing import List
+from typing import Any, Iterable, List
 
-from sqlalchemy import select, delete
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from modules.workspace.db.tables.presence_sessions import PresenceSessionTable
 
+# Rows per multi-row statement (keeps bind parameters under driver limits).
+_BATCH = 500
+
 
 class PresenceRepository:
     """Repository for presence session database operations."""
@@ -135,6 +140,65 @@ class PresenceRepository:
             delete(PresenceSessionTable).where(PresenceSessionTable.id == session_id)
         )
 
+    async def upsert_many(self, rows: Iterable[dict[str, Any]]) -> int:
+        """
+        Insert or update sessions, _BATCH rows per statement.
+
+        Rows conflict on (user_id, study_id); the stored row takes the
+        incoming id, cursor, status and heartbeat.
+
+        Args:
+            rows: Dicts with the presence_sessions columns
+
+        Returns:
+            Number of rows written
+        """
+        rows = list(rows)
+        dialect = self.session.bind.dialect.name
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        for start in range(0, len(rows), _BATCH):
+            stmt = insert(PresenceSessionTable).values(rows[start:start + _BATCH])
+            await self.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[PresenceSessionTable.user_id, PresenceSessionTable.study_id],
+                    set_={
+                        "id": stmt.excluded.id,
+                        "chapter_id": stmt.excluded.chapter_id,
+                        "move_path": stmt.excluded.move_path,
+                        "status": stmt.excluded.status,
+                        "last_heartbeat": stmt.excluded.last_heartbeat,
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+        return len(rows)
+
+    async def delete_by_user_study(self, keys: Iterable[tuple[str, str]]) -> int:
+        """
+        Delete sessions by (user_id, study_id), _BATCH keys per statement.
+
+        Returns:
+            Number of deleted sessions
+        """
+        keys = list(keys)
+        count = 0
+        for start in range(0, len(keys), _BATCH):
+            result = await self.session.execute(
+                delete(PresenceSessionTable).where(
+                    or_(
+                        *(
+                            and_(
+                                PresenceSessionTable.user_id == user_id,
+                                PresenceSessionTable.study_id == study_id,
+                            )
+                            for user_id, study_id in keys[start:start + _BATCH]
+                        )
+                    )
+                )
+            )
+            count += result.rowcount or 0
+        return count
+
     async def delete_expired(self, before: datetime) -> int:
         """
         Delete sessions with last_heartbeat before the given time.
@@ -1,17 +1,65 @@
-from datetime import UTC, datetime
+from typing import Any, Iterable, Sequence
 
 from sqlalchemy import delete, desc, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from ulid import ULID
 
 from modules.workspace.db.tables.search_index import SearchIndex
 
+# Rows per multi-row upsert (keeps bind parameters under driver limits).
+_UPSERT_BATCH = 500
+
 
 class SearchIndexRepository:
-    """Repository for search index entries."""
+    """
+    Repository for search index entries.
+
+    There is at most one entry per (target_id, target_type); writes are
+    upserts on that key.
+    """
 
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
+    def _vector(self, content):
+        """search_vector value for `content` (tsvector on PostgreSQL, raw text otherwise)."""
+        if self.session.bind.dialect.name == "postgresql":
+            return func.to_tsvector("english", content)
+        return content
+
+    def _upsert_stmt(self, entries: Sequence[dict[str, Any]]):
+        """
+        Multi-row INSERT ... ON CONFLICT (target_id, target_type) DO UPDATE.
+
+        Existing entries keep their id and created_at.
+        """
+        dialect = self.session.bind.dialect.name
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(SearchIndex).values(
+            [
+                {
+                    "id": entry.get("id") or str(ULID()),
+                    "target_id": entry["target_id"],
+                    "target_type": entry["target_type"],
+                    "author_id": entry.get("author_id"),
+                    "content": entry["content"],
+                    "search_vector": self._vector(entry["content"]),
+                }
+                for entry in entries
+            ]
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[SearchIndex.target_id, SearchIndex.target_type],
+            set_={
+                "content": stmt.excluded.content,
+                "author_id": stmt.excluded.author_id,
+                "search_vector": stmt.excluded.search_vector,
+                "updated_at": func.now(),
+            },
+        )
+
     async def upsert(
         self,
         entry_id: str,
@@ -20,36 +68,62 @@ class SearchIndexRepository:
         content: str,
         author_id: str | None = None,
     ) -> SearchIndex:
-        dialect = self.session.bind.dialect.name
-        search_vector = (
-            func.to_tsvector("english", content)
-            if dialect == "postgresql"
-            else content
-        )
-        stmt = select(SearchIndex).where(
-            SearchIndex.target_id == target_id,
-            SearchIndex.target_type == target_type,
+        """Insert or update the entry for a target in a single statement."""
+        stmt = self._upsert_stmt(
+            [
+                {
+                    "id": entry_id,
+                    "target_id": target_id,
+                    "target_type": target_type,
+                    "content": content,
+                    "author_id": author_id,
+                }
+            ]
+        ).returning(SearchIndex)
+        result = await self.session.execute(
+            select(SearchIndex).from_statement(stmt),
+            execution_options={"populate_existing": True},
         )
-        result = await self.session.execute(stmt)
-        entry = result.scalar_one_or_none()
-        if entry:
-            entry.content = content
-            entry.author_id = author_id
-            entry.search_vector = search_vector
-            entry.updated_at = datetime.now(UTC)
-            await self.session.flush()
-            return entry
-        entry = SearchIndex(
-            id=entry_id,
-            target_id=target_id,
-            target_type=target_type,
-            author_id=author_id,
-            content=content,
-            search_vector=search_vector,
+        return result.scalar_one()
+
+    async def upsert_many(self, entries: Iterable[dict[str, Any]]) -> int:
+        """
+        Insert or update many entries, _UPSERT_BATCH rows per statement.
+
+        Args:
+            entries: Dicts with target_id, target_type, content and
+                optionally author_id and id (generated if missing). A
+                target appearing twice keeps its last entry.
+
+        Returns:
+            Number of entries written
+        """
+        latest: dict[tuple[str, str], dict[str, Any]] = {}
+        for entry in entries:
+            latest[(entry["target_id"], entry["target_type"])] = entry
+        rows = list(latest.values())
+        for start in range(0, len(rows), _UPSERT_BATCH):
+            await self.session.execute(self._upsert_stmt(rows[start:start + _UPSERT_BATCH]))
+        return len(rows)
+
+    async def delete_orphans(self, target_type: str, live_ids) -> int:
+        """
+        Delete entries of `target_type` whose target is not in `live_ids`.
+
+        Args:
+            target_type: Entry target type
+            live_ids: Subquery selecting the IDs of existing targets
+
+        Returns:
+            Number of entries deleted
+        """
+        result = await self.session.execute(
+            delete(SearchIndex).where(
+                SearchIndex.target_type == target_type,
+                SearchIndex.target_id.not_in(live_ids),
+            )
         )
-        self.session.add(entry)
-        await self.session.flush()
-        return entry
+        return result.rowcount or 0
 
     async def get_by_target(
         self, target_id: str, target_type: str
@@ -70,6 +144,24 @@ class SearchIndexRepository:
         )
         await self.session.execute(stmt)
 
+    def _match(self, stmt, query: str, rank: bool = True):
+        """Apply the full-text match (and ranking) for `query` to `stmt`."""
+        dialect = self.session.bind.dialect.name
+        if dialect == "postgresql":
+            ts_query = func.plainto_tsquery("english", query)
+            stmt = stmt.where(SearchIndex.search_vector.op("@@")(ts_query))
+            if rank:
+                stmt = stmt.order_by(
+                    desc(func.ts_rank(SearchIndex.search_vector, ts_query)),
+                    desc(SearchIndex.updated_at),
+                    SearchIndex.id,
+                )
+        else:
+            stmt = stmt.where(SearchIndex.content.ilike(f"%{query}%"))
+            if rank:
+                stmt = stmt.order_by(desc(SearchIndex.updated_at), SearchIndex.id)
+        return stmt
+
     async def search(
         self,
         query: str,
@@ -85,18 +177,82 @@ class SearchIndexRepository:
         if author_id:
             stmt = stmt.where(SearchIndex.author_id == author_id)
 
-        dialect = self.session.bind.dialect.name
-        if dialect == "postgresql":
-            ts_query = func.plainto_tsquery("english", query)
-            stmt = stmt.where(SearchIndex.search_vector.op("@@")(ts_query))
-            stmt = stmt.order_by(
-                desc(func.ts_rank(SearchIndex.search_vector, ts_query)),
-                desc(SearchIndex.updated_at),
+        stmt = self._match(stmt, query)
+        stmt = stmt.limit(limit).offset(offset)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    def _readable_node_entries(
+        self, user_id: str, target_types: Sequence[str], target_type: str | None
+    ):
+        """Entries for live nodes the user can read, joined in SQL."""
+        from modules.workspace.db.repos.acl_repo import readable_node_condition
+        from modules.workspace.db.tables.nodes import Node
+
+        stmt = (
+            select(SearchIndex)
+            .join(Node, Node.id == SearchIndex.target_id)
+            .where(
+                SearchIndex.target_type.in_(target_types),
+                Node.deleted_at.is_(None),
+                readable_node_condition(user_id),
             )
-        else:
-            stmt = stmt.where(SearchIndex.content.ilike(f"%{query}%"))
-            stmt = stmt.order_by(desc(SearchIndex.updated_at))
+        )
+        if target_type:
+            stmt = stmt.where(SearchIndex.target_type == target_type)
+        return stmt
 
-        stmt = stmt.limit(limit).offset(offset)
+    async def search_readable(
+        self,
+        query: str,
+        user_id: str,
+        target_types: Sequence[str],
+        target_type: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[SearchIndex]:
+        """
+        Search entries for nodes the user can read.
+
+        Permission filtering happens in the query, so `limit`/`offset`
+        paginate over visible results only.
+
+        Args:
+            query: Search query
+            user_id: User whose read access filters the results
+            target_types: Node target types that may be returned
+            target_type: Optional single target type filter
+            limit: Maximum results
+            offset: Visible results to skip
+        """
+        stmt = self._readable_node_entries(user_id, target_types, target_type)
+        stmt = self._match(stmt, query).limit(limit).offset(offset)
         result = await self.session.execute(stmt)
         return result.scalars().all()
+
+    async def count_readable(
+        self,
+        query: str,
+        user_id: str,
+        target_types: Sequence[str],
+        target_type: str | None = None,
+    ) -> int:
+        """Count entries search_readable() would return without a limit."""
+        stmt = self._readable_node_entries(user_id, target_types, target_type)
+        stmt = self._match(stmt, query, rank=False)
+        result = await self.session.execute(
+            select(func.count()).select_from(stmt.subquery())
+        )
+        return result.scalar_one()
+
+    def matching_target_ids(
+        self,
+        query: str,
+        target_types: Sequence[str],
+        target_type: str | None = None,
+    ):
+        """Subquery of target IDs with an entry matching `query`."""
+        stmt = select(SearchIndex.target_id).where(SearchIndex.target_type.in_(target_types))
+        if target_type:
+            stmt = stmt.where(SearchIndex.target_type == target_type)
+        return self._match(stmt, query, rank=False)
@@ -4,7 +4,7 @@ Study and Chapter repository for database operations.
 
 from typing import Sequence
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from modules.workspace.db.tables.studies import Chapter, Study
@@ -103,6 +103,12 @@ class StudyRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_chapter_for_update(self, chapter_id: str) -> Chapter | None:
+        """Get chapter by ID, locking the row until the transaction ends."""
+        stmt = select(Chapter).where(Chapter.id == chapter_id).with_for_update()
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
     async def get_chapter_by_r2_key(self, r2_key: str) -> Chapter | None:
         """Get chapter by R2 key."""
         stmt = select(Chapter).where(Chapter.r2_key == r2_key)
@@ -130,6 +136,25 @@ class StudyRepository:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def get_chapters_fingerprint(self, study_id: str) -> tuple[int, object]:
+        """
+        Get a cheap change fingerprint for a study's chapters.
+
+        Used to validate conditional GETs without loading chapter rows.
+
+        Args:
+            study_id: Study ID
+
+        Returns:
+            (chapter count, latest chapter updated_at)
+        """
+        stmt = select(func.count(Chapter.id), func.max(Chapter.updated_at)).where(
+            Chapter.study_id == study_id
+        )
+        result = await self.session.execute(stmt)
+        count, latest = result.one()
+        return count, latest
+
     async def get_all_chapters(self) -> Sequence[Chapter]:
         """
         Get all chapters across studies.
@@ -4,7 +4,7 @@ Variation and MoveAnnotation repository for database operations.
 
 from typing import List, Sequence
 
-from sqlalchemy import and_, select, update, case
+from sqlalchemy import and_, case, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from modules.workspace.db.tables.variations import MoveAnnotation, Variation
@@ -204,6 +204,39 @@ class VariationRepository:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def get_chapter_fingerprint(self, chapter_id: str) -> tuple:
+        """
+        Get a cheap change fingerprint for a chapter's variations and annotations.
+
+        Row count, latest updated_at and version sum change whenever a row is
+        added, removed or edited, so conditional GETs can be validated
+        without loading the tree.
+
+        Args:
+            chapter_id: Chapter ID
+
+        Returns:
+            (variation count, max updated_at, version sum,
+             annotation count, max updated_at, version sum)
+        """
+        variation_stmt = select(
+            func.count(Variation.id),
+            func.max(Variation.updated_at),
+            func.coalesce(func.sum(Variation.version), 0),
+        ).where(Variation.chapter_id == chapter_id)
+        annotation_stmt = (
+            select(
+                func.count(MoveAnnotation.id),
+                func.max(MoveAnnotation.updated_at),
+                func.coalesce(func.sum(MoveAnnotation.version), 0),
+            )
+            .join(Variation, MoveAnnotation.move_id == Variation.id)
+            .where(Variation.chapter_id == chapter_id)
+        )
+        variations = (await self.session.execute(variation_stmt)).one()
+        annotations = (await self.session.execute(annotation_stmt)).one()
+        return (*variations, *annotations)
+
     async def update_annotation(
         self, annotation: MoveAnnotation
     ) -> MoveAnnotation:
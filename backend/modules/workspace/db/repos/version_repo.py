@@ -87,7 +87,7 @@ class VersionRepository:
             r2_key=r2_key,
             size_bytes=size_bytes,
             content_hash=content_hash,
-            metadata=metadata,
+            meta_data=metadata,
         )
         self.session.add(snapshot)
         await self.session.flush()
@@ -3,6 +3,7 @@
 from modules.workspace.db.tables.acl import ACL, ShareLink
 from modules.workspace.db.tables.activity_log import ActivityLog
 from modules.workspace.db.tables.events import Event
+from modules.workspace.db.tables.event_outbox import EventOutbox, SubscriberCheckpoint
 from modules.workspace.db.tables.notifications import Notification
 from modules.workspace.db.tables.notification_preferences import NotificationPreference
 from modules.workspace.db.tables.nodes import Node
@@ -12,6 +13,7 @@ from modules.workspace.db.tables.discussion_threads import DiscussionThread, Thr
 from modules.workspace.db.tables.discussion_replies import DiscussionReply
 from modules.workspace.db.tables.discussion_reactions import DiscussionReaction
 from modules.workspace.db.tables.search_index import SearchIndex
+from modules.workspace.db.tables.position_index import PositionIndex
 from modules.workspace.db.tables.audit_log import AuditLog
 from modules.workspace.db.tables.users import User
 
@@ -20,6 +22,8 @@ __all__ = [
     "ACL",
     "ShareLink",
     "Event",
+    "EventOutbox",
+    "SubscriberCheckpoint",
     "Study",
     "Chapter",
     "Variation",
@@ -29,6 +33,7 @@ __all__ = [
     "DiscussionReaction",
     "ThreadType",
     "SearchIndex",
+    "PositionIndex",
     "Notification",
     "NotificationPreference",
 ]
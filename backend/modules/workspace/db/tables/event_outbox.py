@@ -0,0 +1,68 @@
+"""
+Event outbox tables.
+
+Events published in outbox mode get an outbox row in the same transaction
+as the write that produced them. Subscribers (search indexing,
+notifications, activity/audit logs) consume the outbox asynchronously,
+each tracking its own position in subscriber_checkpoints.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from modules.workspace.db.base import Base
+
+
+class EventOutbox(Base):
+    """
+    One row per event awaiting delivery to subscribers.
+
+    seq is a monotonically increasing sequence; subscribers consume rows in
+    seq order. Rows are pruned once every subscriber has passed them.
+    """
+
+    __tablename__ = "event_outbox"
+
+    seq: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    event_id: Mapped[str] = mapped_column(
+        String(64),
+        ForeignKey("events.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<EventOutbox(seq={self.seq}, event_id={self.event_id})>"
+
+
+class SubscriberCheckpoint(Base):
+    """
+    Last outbox seq a subscriber has processed.
+
+    Advanced in the same transaction as the subscriber's own writes, so a
+    crash before commit redelivers the batch (at-least-once delivery).
+    """
+
+    __tablename__ = "subscriber_checkpoints"
+
+    subscriber: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_seq: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<SubscriberCheckpoint(subscriber={self.subscriber}, last_seq={self.last_seq})>"
@@ -0,0 +1,46 @@
+"""
+Position index table.
+
+Maps chess positions to the chapter tree nodes that reach them, so a
+position can be looked up across all studies (including transpositions).
+"""
+
+from sqlalchemy import BigInteger, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from modules.workspace.db.base import Base
+
+
+class PositionIndex(Base):
+    """
+    One row per move node in a chapter tree.
+
+    position_key is the polyglot Zobrist hash of the position after the
+    move, stored as a signed 64-bit integer. Move counters are not part of
+    the hash, so transpositions share a key.
+    """
+
+    __tablename__ = "position_index"
+
+    chapter_id: Mapped[str] = mapped_column(
+        String(64),
+        ForeignKey("chapters.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    node_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    study_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    position_key: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ply: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_position_index_key", "position_key"),
+        Index("ix_position_index_study", "study_id"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<PositionIndex(chapter_id={self.chapter_id}, node_id={self.node_id}, "
+            f"position_key={self.position_key})>"
+        )
@@ -24,6 +24,6 @@ class SearchIndex(Base, TimestampMixin):
     )
 
     __table_args__ = (
-        Index("ix_search_index_target", "target_id", "target_type"),
+        Index("ix_search_index_target", "target_id", "target_type", unique=True),
         Index("ix_search_index_author", "author_id"),
     )
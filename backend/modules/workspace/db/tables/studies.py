@@ -94,6 +94,10 @@ class Chapter(Base, TimestampMixin):
 
     # R2 metadata
     r2_etag: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Op batches in the R2 journal not yet compacted into the tree JSON
+    tree_ops_pending: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     last_synced_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
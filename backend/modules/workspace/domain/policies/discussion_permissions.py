@@ -1,4 +1,4 @@
-from modules.workspace.db.repos.acl_repo import ACLRepository
+from modules.workspace.db.repos.acl_repo import ACLRepository, permission_allows
 from modules.workspace.db.repos.node_repo import NodeRepository
 from modules.workspace.domain.models.types import Permission
 
@@ -43,6 +43,6 @@ async def _require_permission(
         raise DiscussionPermissionError("Target not found")
     if node.owner_id == user_id:
         return
-    allowed = await acl_repo.check_permission(target_id, user_id, required)
-    if not allowed:
+    acl = await acl_repo.get_effective_acl(node, user_id)
+    if acl is None or not permission_allows(acl.permission, required):
         raise DiscussionPermissionError("Permission denied")
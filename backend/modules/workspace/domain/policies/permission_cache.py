@@ -0,0 +1,58 @@
+"""
+Process-wide cache of resolved (effective) permissions.
+
+Entries are keyed by (user, node, node path) and tagged with the user's
+ACL version, a fingerprint of their ACL rows read from the database. Any
+grant, role change or revoke for the user, made by any worker, changes
+the version and turns older entries into misses. Moving a node changes
+its path and so its key.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# Sentinel for cache misses (None is a valid cached value: "no grant").
+MISSING = object()
+
+
+class ResolvedPermissionCache:
+    """Bounded LRU of effective ACLs (or None for "no grant")."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[Hashable, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, version: Hashable) -> Any:
+        """Return the cached value for `key` at `version`, or MISSING."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            if entry[0] != version:
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple, version: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+resolved_permission_cache = ResolvedPermissionCache(
+    max_entries=int(os.getenv("PERMISSION_CACHE_MAX_ENTRIES", "10000"))
+)
@@ -65,7 +65,9 @@ async def can_read(acl_repo, node, user_id: str) -> bool:
     """
     if node is None:
         return False
-    acl = await acl_repo.get_acl(node.id, user_id)
+    if node.owner_id == user_id:
+        return True
+    acl = await acl_repo.get_effective_acl(node, user_id)
     acl_model = _acl_to_model(acl) if acl is not None else None
     return PermissionPolicy.can_read(_node_to_model(node), user_id, acl_model)
 
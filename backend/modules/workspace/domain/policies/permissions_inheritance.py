@@ -2,6 +2,14 @@ from modules.workspace.domain.models.acl import ACLModel
 
 
 class InheritancePolicy:
+    """
+    Permission inheritance along the node tree.
+
+    Grants are stored once, on the node they were made on. A grant with
+    inherit_to_children applies to every descendant; the effective grant
+    for a node is the nearest applicable one on its path.
+    """
+
     @staticmethod
     def should_inherit_to_children(acl: ACLModel) -> bool:
         return acl.inherit_to_children and not acl.is_inherited
@@ -25,3 +33,34 @@ class InheritancePolicy:
         if not acl.inherit_to_children:
             return False
         return changed_field in {"permission", "inherit_to_children"}
+
+    @staticmethod
+    def ancestor_ids(path: str) -> list[str]:
+        """Node IDs on a materialized path, root first (includes the node itself)."""
+        return [part for part in path.strip("/").split("/") if part]
+
+    @staticmethod
+    def resolve_effective_acl(node_id: str, path: str, acls):
+        """
+        Pick the grant that applies to a node from grants on its path.
+
+        A direct grant on the node always applies; grants on ancestors
+        apply only if they inherit to children. The nearest one wins, so a
+        grant on a subfolder overrides one made higher up.
+
+        Args:
+            node_id: Node being checked
+            path: The node's materialized path
+            acls: Candidate grants for one user on the path's nodes
+
+        Returns:
+            The effective grant, or None
+        """
+        by_object = {acl.object_id: acl for acl in acls}
+        for object_id in reversed(InheritancePolicy.ancestor_ids(path)):
+            acl = by_object.get(object_id)
+            if acl is None:
+                continue
+            if object_id == node_id or acl.inherit_to_children:
+                return acl
+        return by_object.get(node_id)
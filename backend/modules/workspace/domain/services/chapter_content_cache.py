@@ -0,0 +1,181 @@
+"""
+Chapter content cache - read-through cache for chapter tree JSON.
+
+Chapters record the ETag/hash of their stored tree.json (`r2_etag`,
+`pgn_hash`). Entries are keyed by chapter id and tagged with that content
+token, so a repeat read whose chapter row still carries the same token is
+served from memory with no R2 calls. A changed token (written by any
+worker) is a miss; writers in this process also invalidate explicitly.
+
+Trees edited through op batches (patch.backend.study.tree_ops) have a
+journal of edits not yet compacted into tree.json; for those chapters the
+token is the current tree hash and loads replay the journal.
+
+Each entry holds the parsed StudyTreeDTO plus lazily rendered variants
+(full PGN, no-comment, raw, clean, variation tree). Renders that depend on
+chapter headers are memoized per header set.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, TypeVar
+
+from botocore.exceptions import ClientError
+
+from modules.workspace.storage.keys import R2Keys
+
+T = TypeVar("T")
+
+
+def content_token(chapter: Any) -> str | None:
+    """
+    Return the token identifying a chapter's stored tree, if any.
+
+    Chapters without an ETag or hash cannot be validated and are not cached.
+    While op batches are pending, the tree.json ETag is unchanged, so the
+    current tree hash is used instead.
+    """
+    if getattr(chapter, "tree_ops_pending", 0):
+        return getattr(chapter, "pgn_hash", None)
+    return getattr(chapter, "r2_etag", None) or getattr(chapter, "pgn_hash", None)
+
+
+def header_key(chapter: Any) -> tuple:
+    """Chapter fields that feed PGN headers (see patch.backend.study.api._tree_to_pgn)."""
+    return tuple(
+        getattr(chapter, name, None)
+        for name in ("event", "title", "white", "black", "date", "result")
+    )
+
+
+@dataclass
+class ChapterContent:
+    """
+    Cached content for one chapter version.
+
+    Attributes:
+        chapter_id: Chapter ID
+        token: ETag/hash of the stored tree this entry was built from
+        tree: Parsed StudyTreeDTO (shared; callers must not mutate it)
+    """
+
+    chapter_id: str
+    token: str
+    tree: Any
+    _renders: dict[Hashable, Any] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def render(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Return the memoized render for `key`, building it once."""
+        with self._lock:
+            if key in self._renders:
+                return self._renders[key]
+        value = build()
+        with self._lock:
+            return self._renders.setdefault(key, value)
+
+    def pgn(self, chapter: Any) -> str:
+        """Full PGN with headers from the chapter row."""
+        from patch.backend.study.api import _tree_to_pgn
+
+        return self.render(("pgn", header_key(chapter)), lambda: _tree_to_pgn(self.tree, chapter))
+
+
+class ChapterContentCache:
+    """
+    Bounded LRU of ChapterContent keyed by chapter id.
+
+    Only one version per chapter is kept; storing a new token replaces it.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, ChapterContent] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, chapter_id: str, token: str | None) -> ChapterContent | None:
+        """Return the entry if it matches `token`; stale entries are dropped."""
+        if token is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(chapter_id)
+            if entry is None or entry.token != token:
+                if entry is not None:
+                    del self._entries[chapter_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(chapter_id)
+            self.hits += 1
+            return entry
+
+    def put(self, chapter_id: str, token: str | None, tree: Any) -> ChapterContent:
+        """Store a parsed tree for `token` and return its entry."""
+        entry = ChapterContent(chapter_id=chapter_id, token=token or "", tree=tree)
+        if token is None:
+            return entry
+        with self._lock:
+            self._entries[chapter_id] = entry
+            self._entries.move_to_end(chapter_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, chapter_id: str) -> None:
+        """Drop any cached content for a chapter (call after writing its tree)."""
+        with self._lock:
+            self._entries.pop(chapter_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+chapter_content_cache = ChapterContentCache(
+    max_entries=int(os.getenv("CHAPTER_CONTENT_CACHE_MAX_ENTRIES", "256"))
+)
+
+
+async def load_chapter_content(chapter: Any, storage, key: str) -> ChapterContent:
+    """
+    Read-through load of a chapter's tree.json (plus pending op journal).
+
+    Args:
+        chapter: Chapter row (provides id and content token)
+        storage: AsyncR2Client
+        key: tree.json key in R2
+
+    Returns:
+        Cached or freshly loaded ChapterContent
+
+    Raises:
+        ValueError: If the tree does not exist in storage
+    """
+    from patch.backend.study.models import StudyTreeDTO
+    from patch.backend.study.tree_ops import parse_journal, replay_journal
+
+    # The row's ETag only describes `key` if the row points at it.
+    token = content_token(chapter) if getattr(chapter, "r2_key", None) == key else None
+    cached = chapter_content_cache.get(chapter.id, token)
+    if cached is not None:
+        return cached
+
+    try:
+        json_content = await storage.download_json(key)
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") in {"404", "NoSuchKey"}:
+            raise ValueError(f"Tree not found in R2 for chapter {chapter.id}") from exc
+        raise
+    tree = StudyTreeDTO(**json.loads(json_content))
+    if getattr(chapter, "tree_ops_pending", 0):
+        journal = await storage.download_json(R2Keys.chapter_tree_ops_json(chapter.id))
+        tree = replay_journal(tree, parse_journal(journal), chapter.pgn_hash)
+    return chapter_content_cache.put(chapter.id, token, tree)
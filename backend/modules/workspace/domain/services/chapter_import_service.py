@@ -21,13 +21,16 @@ from modules.workspace.domain.models.node import CreateNodeCommand, NodeModel
 from modules.workspace.domain.models.study import CreateStudyCommand, ImportPGNCommand, ImportResult
 from modules.workspace.domain.models.types import NodeType, Visibility
 from modules.workspace.domain.services.node_service import NodeNotFoundError, NodeService
+from modules.workspace.domain.services.position_index_service import PositionIndexService
 from modules.workspace.events.bus import EventBus, publish_study_created, publish_chapter_imported
 from core.new_pgn import PGNGame, detect_games
 from modules.workspace.pgn.chapter_detector import detect_chapters, split_games_into_studies, suggest_study_names
 from modules.workspace.pgn.parser.normalize import normalize_pgn
 from modules.workspace.storage.integrity import calculate_sha256, calculate_size
+from modules.workspace.db.repos.position_index_repo import PositionIndexRepository
 from modules.workspace.storage.keys import R2Keys
 from modules.workspace.storage.r2_client import R2Client
+from modules.workspace.storage.async_r2_client import run_in_storage_executor
 from modules.workspace.db.session import get_db_config
 
 # New v2 imports
@@ -509,7 +512,8 @@ class ChapterImportService:
             # Build FEN index for analysis (not persisted)
             fen_index = build_fen_index(tree)
 
-            tree_upload = self.pgn_v2_repo.save_tree_json(
+            tree_upload = await run_in_storage_executor(
+                self.pgn_v2_repo.save_tree_json,
                 chapter_id=chapter_id,
                 tree=tree,
                 metadata={"chapter_id": chapter_id},
@@ -545,6 +549,9 @@ class ChapterImportService:
                     chapter.r2_etag = tree_upload.etag
                     chapter.last_synced_at = datetime.now(timezone.utc)
                     await study_repo.update_chapter(chapter)
+                    await PositionIndexService(PositionIndexRepository(session)).index_chapter(
+                        study_id, chapter_id, tree
+                    )
                     await session.commit()
                     logger.info(f"Finished post-import processing for chapter {chapter_id}")
 
@@ -103,8 +103,8 @@ class NodeService:
                 raise NodeNotFoundError(f"Parent node {command.parent_id} not found")
 
             # Check if actor can create children under parent
-            acl = await self.acl_repo.get_acl(command.parent_id, actor_id)
             if not parent.owner_id == actor_id:
+                acl = await self.acl_repo.get_effective_acl(parent, actor_id)
                 if acl is None or not PermissionPolicy.can_write(
                     self._node_to_model(parent), actor_id, self._acl_to_model(acl)
                 ):
@@ -175,8 +175,8 @@ class NodeService:
             raise NodeNotFoundError(f"Node {command.node_id} not found")
 
         # Check permissions
-        acl = await self.acl_repo.get_acl(command.node_id, actor_id)
         if not node.owner_id == actor_id:
+            acl = await self.acl_repo.get_effective_acl(node, actor_id)
             if acl is None or not PermissionPolicy.can_write(
                 self._node_to_model(node), actor_id, self._acl_to_model(acl)
             ):
@@ -252,8 +252,8 @@ class NodeService:
             raise NodeNotFoundError(f"Node {command.node_id} not found")
 
         # Check permissions on source
-        acl = await self.acl_repo.get_acl(command.node_id, actor_id)
         if not node.owner_id == actor_id:
+            acl = await self.acl_repo.get_effective_acl(node, actor_id)
             if acl is None or not PermissionPolicy.can_move(
                 self._node_to_model(node), actor_id, self._acl_to_model(acl)
             ):
@@ -277,8 +277,8 @@ class NodeService:
                 raise InvalidOperationError("Cannot move node to itself or descendant")
 
             # Check permissions on destination
-            parent_acl = await self.acl_repo.get_acl(command.new_parent_id, actor_id)
             if not new_parent.owner_id == actor_id:
+                parent_acl = await self.acl_repo.get_effective_acl(new_parent, actor_id)
                 if parent_acl is None or not PermissionPolicy.can_create_child(
                     self._node_to_model(new_parent), actor_id, self._acl_to_model(parent_acl)
                 ):
@@ -287,6 +287,7 @@ class NodeService:
         # Store old values
         old_parent_id = node.parent_id
         old_path = node.path
+        old_depth = node.depth
 
         # Update node
         node.parent_id = command.new_parent_id
@@ -299,8 +300,8 @@ class NodeService:
 
         node.version += 1
 
-        # Update descendants' paths
-        await self._update_descendant_paths(node, old_path)
+        # Update descendants' paths (single set-based UPDATE)
+        await self.node_repo.move_descendants(old_path, node.path, node.depth - old_depth)
 
         # Save
         node = await self.node_repo.update(node)
@@ -345,8 +346,8 @@ class NodeService:
             raise NodeNotFoundError(f"Node {command.node_id} not found")
 
         # Check permissions
-        acl = await self.acl_repo.get_acl(command.node_id, actor_id)
         if not node.owner_id == actor_id:
+            acl = await self.acl_repo.get_effective_acl(node, actor_id)
             if acl is None or not PermissionPolicy.can_delete(
                 self._node_to_model(node), actor_id, self._acl_to_model(acl)
             ):
@@ -358,9 +359,10 @@ class NodeService:
                 f"Version conflict: expected {command.version}, got {node.version}"
             )
 
-        # Soft delete
+        # Soft delete the node and its live subtree
         node.soft_delete()
         node.version += 1
+        await self.node_repo.soft_delete_descendants(node.path, node.deleted_at)
 
         # Save
         node = await self.node_repo.update(node)
@@ -401,6 +403,7 @@ class NodeService:
         if node.owner_id != actor_id:
             raise PermissionDeniedError("Only owner can restore node")
 
+        await self.node_repo.restore_descendants(node.path, node.deleted_at)
         node.restore()
         node.version += 1
 
@@ -414,8 +417,8 @@ class NodeService:
         if node is None:
             raise NodeNotFoundError(f"Node {node_id} not found")
 
-        acl = await self.acl_repo.get_acl(node_id, actor_id)
         if not node.owner_id == actor_id:
+            acl = await self.acl_repo.get_effective_acl(node, actor_id)
             if acl is None or not PermissionPolicy.can_read(
                 self._node_to_model(node), actor_id, self._acl_to_model(acl)
             ):
@@ -428,15 +431,6 @@ class NodeService:
         parent = await self.get_node(parent_id, actor_id)
         return await self.node_repo.get_children(parent_id)
 
-    async def _update_descendant_paths(self, node: Node, old_path: str) -> None:
-        """Update paths of all descendants after move."""
-        descendants = await self.node_repo.get_descendants(old_path)
-        for desc in descendants:
-            # Replace old path prefix with new path
-            desc.path = desc.path.replace(old_path, node.path, 1)
-            desc.depth = desc.path.count("/") - 2
-            await self.node_repo.update(desc)
-
     async def _get_workspace_id_for_node(self, node_id: str) -> str | None:
         """Get workspace ID for a node."""
         node = await self.node_repo.get_by_id(node_id)
@@ -13,6 +13,7 @@ import json
 import time
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from typing import Any, Callable
 
 from botocore.exceptions import (
     BotoCoreError,
@@ -41,10 +42,17 @@ from modules.workspace.pgn.cleaner.raw_pgn import (
     export_raw_pgn_to_clipboard,
     export_clean_mainline,
 )
+from modules.workspace.pgn.cleaner.variation_pruner import PathIndex
 from modules.workspace.pgn.serializer.to_tree import VariationNode, pgn_to_tree
 from modules.workspace.pgn.serializer.from_variations import variations_to_tree
 from modules.workspace.storage.keys import R2Keys
 from modules.workspace.storage.r2_client import R2Client
+from modules.workspace.storage.async_r2_client import AsyncR2Client, as_async_r2_client
+from modules.workspace.domain.services.chapter_content_cache import (
+    ChapterContent,
+    header_key,
+    load_chapter_content,
+)
 
 
 @dataclass
@@ -100,7 +108,7 @@ class PgnClipService:
         variation_repo: VariationRepository,
         event_repo: EventRepository,
         event_bus: EventBus,
-        r2_client: R2Client,
+        r2_client: R2Client | AsyncR2Client,
         cache_ttl_seconds: int = 600,
         max_retries: int = 3,
         backoff_base_seconds: float = 0.2,
@@ -119,10 +127,11 @@ class PgnClipService:
         self.event_bus = event_bus
         self.event_repo = event_repo
         self.r2_client = r2_client
+        self.storage = as_async_r2_client(r2_client)
         self._cache_ttl_seconds = cache_ttl_seconds
         self._max_retries = max_retries
         self._backoff_base_seconds = backoff_base_seconds
-        self._tree_cache: dict[str, tuple[float, VariationNode]] = {}
+        self._tree_cache: dict[str, tuple[float, VariationNode, PathIndex]] = {}
 
     async def clip_from_move(
         self,
@@ -147,21 +156,22 @@ class PgnClipService:
             ValueError: If chapter not found or move_path invalid
         """
         # Load chapter and build variation tree
-        tree = await self._load_variation_tree(chapter_id)
-        if tree is None:
+        loaded = await self._load_indexed_tree(chapter_id)
+        if loaded is None:
             raise ValueError(f"Chapter {chapter_id} not found or has no moves")
+        tree, path_index = loaded
 
         # Get preview to count removed items
-        preview = get_clip_preview(tree, move_path)
+        preview = get_clip_preview(tree, move_path, path_index=path_index)
 
         # Generate clipped PGN
         if for_clipboard:
-            pgn_text = clip_pgn_from_move_to_clipboard(tree, move_path)
+            pgn_text = clip_pgn_from_move_to_clipboard(tree, move_path, path_index=path_index)
         else:
             # Load chapter metadata for headers
             chapter = await self.study_repo.get_chapter_by_id(chapter_id)
             headers = self._build_headers(chapter) if chapter else None
-            pgn_text = clip_pgn_from_move(tree, move_path, headers=headers)
+            pgn_text = clip_pgn_from_move(tree, move_path, headers=headers, path_index=path_index)
 
         # Emit event
         await self._emit_clipboard_event(
@@ -199,18 +209,16 @@ class PgnClipService:
         Raises:
             ValueError: If chapter not found
         """
-        # Load variation tree
-        tree = await self._load_variation_tree(chapter_id)
-        if tree is None:
-            raise ValueError(f"Chapter {chapter_id} not found or has no moves")
-
-        # Generate PGN
-        if for_clipboard:
-            pgn_text = export_no_comment_pgn_to_clipboard(tree)
-        else:
-            chapter = await self.study_repo.get_chapter_by_id(chapter_id)
-            headers = self._build_headers(chapter) if chapter else None
-            pgn_text = export_no_comment_pgn(tree, headers=headers)
+        pgn_text = await self._render_export(
+            chapter_id,
+            "no_comment",
+            for_clipboard,
+            lambda tree, headers: (
+                export_no_comment_pgn(tree, headers=headers)
+                if headers
+                else export_no_comment_pgn_to_clipboard(tree)
+            ),
+        )
 
         # Emit event
         await self._emit_clipboard_event(
@@ -245,18 +253,16 @@ class PgnClipService:
         Raises:
             ValueError: If chapter not found
         """
-        # Load variation tree
-        tree = await self._load_variation_tree(chapter_id)
-        if tree is None:
-            raise ValueError(f"Chapter {chapter_id} not found or has no moves")
-
-        # Generate PGN
-        if for_clipboard:
-            pgn_text = export_raw_pgn_to_clipboard(tree)
-        else:
-            chapter = await self.study_repo.get_chapter_by_id(chapter_id)
-            headers = self._build_headers(chapter) if chapter else None
-            pgn_text = export_raw_pgn(tree, headers=headers)
+        pgn_text = await self._render_export(
+            chapter_id,
+            "raw",
+            for_clipboard,
+            lambda tree, headers: (
+                export_raw_pgn(tree, headers=headers)
+                if headers
+                else export_raw_pgn_to_clipboard(tree)
+            ),
+        )
 
         # Emit event
         await self._emit_clipboard_event(
@@ -289,15 +295,12 @@ class PgnClipService:
         Raises:
             ValueError: If chapter not found
         """
-        # Load variation tree
-        tree = await self._load_variation_tree(chapter_id)
-        if tree is None:
-            raise ValueError(f"Chapter {chapter_id} not found or has no moves")
-
-        # Generate PGN
-        chapter = await self.study_repo.get_chapter_by_id(chapter_id)
-        headers = self._build_headers(chapter) if chapter else None
-        pgn_text = export_clean_mainline(tree, headers=headers)
+        pgn_text = await self._render_export(
+            chapter_id,
+            "clean",
+            False,
+            lambda tree, headers: export_clean_mainline(tree, headers=headers),
+        )
 
         # Emit event
         await self._emit_clipboard_event(
@@ -330,11 +333,12 @@ class PgnClipService:
         Raises:
             ValueError: If chapter not found or move_path invalid
         """
-        tree = await self._load_variation_tree(chapter_id)
-        if tree is None:
+        loaded = await self._load_indexed_tree(chapter_id)
+        if loaded is None:
             raise ValueError(f"Chapter {chapter_id} not found or has no moves")
+        tree, path_index = loaded
 
-        return get_clip_preview(tree, move_path)
+        return get_clip_preview(tree, move_path, path_index=path_index)
 
     async def _load_variation_tree(self, chapter_id: str) -> VariationNode | None:
         """
@@ -345,42 +349,74 @@ class PgnClipService:
 
         Returns:
             Root VariationNode, or None if no moves
+        """
+        loaded = await self._load_indexed_tree(chapter_id)
+        return loaded[0] if loaded else None
+
+    async def _load_indexed_tree(
+        self, chapter_id: str
+    ) -> tuple[VariationNode, PathIndex] | None:
+        """
+        Load variation tree and its move path index.
+
+        Args:
+            chapter_id: Chapter ID
+
+        Returns:
+            (root VariationNode, PathIndex), or None if no moves
 
         Note:
-            Uses in-memory caching to avoid repeated R2 downloads.
+            Repeat reads are served from the shared chapter content cache
+            (keyed by the chapter's stored ETag) without R2 downloads; the
+            path index is built once per tree and cached with it.
         """
         cached = self._tree_cache.get(chapter_id)
         if cached:
-            expires_at, cached_tree = cached
+            expires_at, cached_tree, cached_index = cached
             if time.monotonic() < expires_at:
-                return cached_tree
+                return cached_tree, cached_index
             self._tree_cache.pop(chapter_id, None)
 
+        loaded = await self._load_chapter_content(chapter_id)
+        if loaded is None:
+            return None
+        chapter, content = loaded
+        tree = self._variation_tree(chapter, content)
+        path_index = content.render(
+            ("path_index", header_key(chapter)), lambda: PathIndex(tree)
+        )
+
+        if self._cache_ttl_seconds > 0:
+            self._tree_cache[chapter_id] = (
+                time.monotonic() + self._cache_ttl_seconds,
+                tree,
+                path_index,
+            )
+
+        return tree, path_index
+
+    async def _load_chapter_content(
+        self, chapter_id: str
+    ) -> tuple[Any, ChapterContent] | None:
+        """
+        Load chapter row and its tree.json through the shared content cache.
+
+        Retries transient storage errors with exponential backoff.
+
+        Returns:
+            (chapter, content), or None if the chapter does not exist
+        """
         chapter = await self.study_repo.get_chapter_by_id(chapter_id)
         if not chapter:
             return None
 
-        tree = None
         tree_key = R2Keys.chapter_tree_json(chapter_id)
 
         for attempt in range(1, self._max_retries + 1):
             try:
-                if not self.r2_client.exists(tree_key):
-                    raise ValueError(f"Tree not found for chapter {chapter_id}")
-                json_content = self.r2_client.download_json(tree_key)
-                tree_data = json.loads(json_content)
-                from patch.backend.study.models import StudyTreeDTO
-                from patch.backend.study.api import _tree_to_pgn
-                tree_dto = StudyTreeDTO(**tree_data)
-                pgn_text = _tree_to_pgn(tree_dto, chapter)
-                tree = pgn_to_tree(pgn_text)
-                break
+                content = await load_chapter_content(chapter, self.storage, tree_key)
+                return chapter, content
             except ClientError as exc:
-                error_code = exc.response.get("Error", {}).get("Code")
-                if error_code in {"404", "NoSuchKey"}:
-                    raise ValueError(
-                        f"Tree not found for chapter {chapter_id}"
-                    ) from exc
                 if attempt >= self._max_retries:
                     raise ValueError(
                         "Failed to load tree.json from storage"
@@ -399,16 +435,43 @@ class PgnClipService:
                     self._backoff_base_seconds * (2 ** (attempt - 1))
                 )
 
-        if tree is None:
-            raise ValueError("Failed to load tree data")
+        raise ValueError("Failed to load tree data")
 
-        if self._cache_ttl_seconds > 0:
-            self._tree_cache[chapter_id] = (
-                time.monotonic() + self._cache_ttl_seconds,
-                tree,
-            )
+    @staticmethod
+    def _variation_tree(chapter: Any, content: ChapterContent) -> VariationNode:
+        return content.render(
+            ("variation_tree", header_key(chapter)),
+            lambda: pgn_to_tree(content.pgn(chapter)),
+        )
+
+    async def _render_export(
+        self,
+        chapter_id: str,
+        export_mode: str,
+        for_clipboard: bool,
+        render: Callable[[VariationNode, dict[str, str] | None], str],
+    ) -> str:
+        """
+        Render an export variant, memoized in the chapter content cache.
 
-        return tree
+        Args:
+            chapter_id: Chapter ID
+            export_mode: Variant name (no_comment, raw, clean)
+            for_clipboard: If True, render without headers
+            render: Builds the PGN from (tree, headers)
+
+        Raises:
+            ValueError: If chapter not found
+        """
+        loaded = await self._load_chapter_content(chapter_id)
+        if loaded is None:
+            raise ValueError(f"Chapter {chapter_id} not found or has no moves")
+        chapter, content = loaded
+        headers = None if for_clipboard else self._build_headers(chapter)
+        key = (export_mode, header_key(chapter), tuple(sorted(headers.items())) if headers else None)
+        return content.render(
+            key, lambda: render(self._variation_tree(chapter, content), headers)
+        )
 
     async def _build_tree_from_db(self, chapter_id: str) -> VariationNode | None:
         variations = await self.variation_repo.get_variations_for_chapter(chapter_id)
@@ -10,8 +10,15 @@ from modules.workspace.db.repos.variation_repo import VariationRepository
 from modules.workspace.db.tables.variations import Variation, MoveAnnotation
 from modules.workspace.pgn.serializer.from_variations import variations_to_tree
 from modules.workspace.pgn.serializer.to_pgn import tree_to_pgn
+from modules.workspace.domain.services.chapter_content_cache import chapter_content_cache
+from modules.workspace.domain.services.position_index_service import PositionIndexService
 from modules.workspace.storage.keys import R2Keys
 from modules.workspace.storage.r2_client import R2Client
+from modules.workspace.storage.async_r2_client import (
+    AsyncR2Client,
+    as_async_r2_client,
+    run_in_storage_executor,
+)
 
 # New v2 imports
 from modules.workspace.pgn_v2.adapters import db_to_tree
@@ -36,12 +43,15 @@ class PgnSyncService:
         self,
         study_repo: StudyRepository,
         variation_repo: VariationRepository,
-        r2_client: R2Client,
+        r2_client: R2Client | AsyncR2Client,
+        position_index: PositionIndexService | None = None,
     ) -> None:
         self.study_repo = study_repo
         self.variation_repo = variation_repo
         self.r2_client = r2_client
-        self.pgn_v2_repo = PgnV2Repo(r2_client)
+        self.position_index = position_index
+        self.storage = as_async_r2_client(r2_client)
+        self.pgn_v2_repo = PgnV2Repo(self.storage.sync)
 
     async def sync_chapter_pgn(self, chapter_id: str) -> str | None:
         """
@@ -91,6 +101,8 @@ class PgnSyncService:
                 chapter.last_synced_at = datetime.now(timezone.utc)
                 chapter.pgn_status = PGN_STATUS_READY
                 await self.study_repo.update_chapter(chapter)
+                if self.position_index is not None:
+                    await self.position_index.clear_chapter(chapter_id)
                 return None
 
             # Populate headers from chapter metadata
@@ -127,11 +139,13 @@ class PgnSyncService:
             
             # Let's see:
             # 1. Upload tree JSON
-            tree_upload = self.pgn_v2_repo.save_tree_json(
+            tree_upload = await run_in_storage_executor(
+                self.pgn_v2_repo.save_tree_json,
                 chapter_id=chapter_id,
                 tree=tree,
                 metadata={"chapter_id": chapter_id},
             )
+            chapter_content_cache.invalidate(chapter_id)
 
             # 2. Skip FEN index persistence (Stage 12: tree.json only)
             # 3. Skip PGN upload (Export only)
@@ -146,6 +160,10 @@ class PgnSyncService:
             chapter.pgn_status = PGN_STATUS_READY
             await self.study_repo.update_chapter(chapter)
 
+            # Only nodes whose position changed are rewritten.
+            if self.position_index is not None:
+                await self.position_index.index_chapter(chapter.study_id, chapter_id, tree)
+
             logger.info(
                 "PGN sync ready (Tree JSON)",
                 extra={
@@ -212,11 +230,12 @@ class PgnSyncService:
             pgn_text = tree_to_pgn(root, headers=headers, result=chapter.result or "*")
 
             r2_key = chapter.r2_key or R2Keys.chapter_pgn(chapter_id)
-            upload = self.r2_client.upload_pgn(
+            upload = await self.storage.upload_pgn(
                 key=r2_key,
                 content=pgn_text,
                 metadata={"chapter_id": chapter_id},
             )
+            chapter_content_cache.invalidate(chapter_id)
 
             chapter.r2_key = r2_key
             chapter.pgn_hash = upload.content_hash
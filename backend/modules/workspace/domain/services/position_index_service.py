@@ -0,0 +1,141 @@
+"""
+Position index service - "find this position in my studies".
+
+Every move node of every chapter tree is indexed by the polyglot Zobrist
+hash of the position it reaches. Lookups are a single indexed equality
+match joined against study ACLs, so transpositions across thousands of
+chapters resolve without loading any tree from R2.
+"""
+
+from dataclasses import dataclass
+
+import chess
+import chess.polyglot
+
+from backend.core.real_pgn.fen import build_fen_index
+from backend.core.real_pgn.models import NodeTree
+from modules.workspace.db.repos.position_index_repo import PositionIndexRepository
+
+_SIGN_BIT = 1 << 63
+
+
+def position_key(fen: str) -> int:
+    """
+    Return the index key for a FEN.
+
+    The unsigned 64-bit polyglot hash is folded into the signed BIGINT
+    range. Halfmove/fullmove counters do not affect the key.
+
+    Raises:
+        ValueError: If the FEN is invalid
+    """
+    key = chess.polyglot.zobrist_hash(chess.Board(fen))
+    return key - (1 << 64) if key & _SIGN_BIT else key
+
+
+def tree_positions(tree: NodeTree) -> list[tuple[str, int, int]]:
+    """
+    Collect (node_id, position_key, ply) for every move node in a tree.
+
+    The root (starting position) is skipped: it is shared by nearly
+    every chapter and carries no move.
+    """
+    if tree.root_id is None:
+        return []
+    fens = {node_id: node.fen for node_id, node in tree.nodes.items()}
+    if not all(fens.values()):
+        fens = build_fen_index(tree)
+    return [
+        (node_id, position_key(fens[node_id]), node.ply)
+        for node_id, node in tree.nodes.items()
+        if node_id != tree.root_id and node_id in fens
+    ]
+
+
+@dataclass
+class PositionHit:
+    """A chapter node reaching the searched position."""
+
+    study_id: str
+    study_title: str
+    chapter_id: str
+    chapter_title: str
+    node_id: str
+    ply: int
+
+
+@dataclass
+class PositionSearchResults:
+    """Position hits with pagination."""
+
+    results: list[PositionHit]
+    total: int
+    page: int
+    page_size: int
+    has_more: bool
+
+
+class PositionIndexService:
+    """Maintains and queries the cross-study position index."""
+
+    def __init__(self, position_repo: PositionIndexRepository) -> None:
+        self.position_repo = position_repo
+
+    async def index_chapter(self, study_id: str, chapter_id: str, tree: NodeTree) -> tuple[int, int]:
+        """
+        Update a chapter's index rows from its tree (changed nodes only).
+
+        Returns:
+            (rows inserted, rows deleted)
+        """
+        return await self.position_repo.sync_chapter(study_id, chapter_id, tree_positions(tree))
+
+    async def clear_chapter(self, chapter_id: str) -> None:
+        """Drop a chapter from the index (e.g. when its tree becomes empty)."""
+        await self.position_repo.delete_for_chapter(chapter_id)
+
+    async def find_position(
+        self,
+        fen: str,
+        user_id: str,
+        page: int = 1,
+        page_size: int = 50,
+    ) -> PositionSearchResults:
+        """
+        Find nodes reaching `fen` in studies the user can read.
+
+        Args:
+            fen: Position to look up
+            user_id: Current user ID (for permission filtering)
+            page: Page number (1-indexed)
+            page_size: Results per page
+
+        Raises:
+            ValueError: If the FEN is invalid
+        """
+        key = position_key(fen)
+        offset = (page - 1) * page_size
+        total = await self.position_repo.count_readable(key, user_id)
+        rows = []
+        if offset < total:
+            rows = await self.position_repo.find_readable(
+                key, user_id, limit=page_size, offset=offset
+            )
+
+        return PositionSearchResults(
+            results=[
+                PositionHit(
+                    study_id=entry.study_id,
+                    study_title=study_title,
+                    chapter_id=entry.chapter_id,
+                    chapter_title=chapter_title,
+                    node_id=entry.node_id,
+                    ply=entry.ply,
+                )
+                for entry, chapter_title, study_title in rows
+            ],
+            total=total,
+            page=page,
+            page_size=page_size,
+            has_more=offset + len(rows) < total,
+        )
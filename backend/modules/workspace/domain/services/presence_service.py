@@ -3,6 +3,11 @@ Presence service for managing user presence in studies.
 
 This service provides high-level operations for managing user presence,
 including heartbeat processing, online user tracking, and cursor position updates.
+
+Live sessions are kept in the presence store (memory or Redis), not the
+database: a heartbeat is a store write, and only status transitions
+(joined, active again, idle, left) are published as events. The
+presence_sessions table is a copy written in batches by flush_presence().
 """
 
 import uuid
@@ -13,6 +18,12 @@ import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from modules.workspace.collaboration.presence_manager import PresenceManager
+from modules.workspace.collaboration.presence_store import (
+    PresenceStore,
+    get_presence_store,
+    session_from_row,
+    session_to_row,
+)
 from modules.workspace.db.repos.presence_repo import PresenceRepository
 from modules.workspace.db.tables.presence_sessions import PresenceSessionTable
 from modules.workspace.domain.models.presence import PresenceSession, CursorPosition
@@ -43,6 +54,7 @@ class PresenceService:
     - Processing heartbeat updates
     - Tracking online users
     - Cleaning up expired sessions
+    - Flushing live sessions to the database in batches
     """
 
     def __init__(
@@ -50,6 +62,7 @@ class PresenceService:
         session: AsyncSession,
         presence_repo: PresenceRepository,
         event_bus: EventBus,
+        store: PresenceStore | None = None,
     ) -> None:
         """
         Initialize service.
@@ -58,39 +71,45 @@ class PresenceService:
             session: Database session
             presence_repo: Presence repository
             event_bus: Event bus for publishing events
+            store: Live session store (default: the process-wide store)
         """
         self.session = session
         self.presence_repo = presence_repo
         self.event_bus = event_bus
+        self.store = store or get_presence_store()
         self.presence_manager = PresenceManager(event_bus)
 
     def _table_to_model(self, table: PresenceSessionTable) -> PresenceSession:
         """Convert table row to domain model."""
-        return PresenceSession(
-            id=table.id,
-            user_id=table.user_id,
-            study_id=table.study_id,
-            chapter_id=table.chapter_id,
-            move_path=table.move_path,
-            status=PresenceStatus(table.status),
-            last_heartbeat=table.last_heartbeat,
-            created_at=table.created_at,
-            updated_at=table.updated_at,
-        )
+        return session_from_row(table)
 
     def _model_to_table(self, model: PresenceSession) -> PresenceSessionTable:
         """Convert domain model to table row."""
-        return PresenceSessionTable(
-            id=model.id,
-            user_id=model.user_id,
-            study_id=model.study_id,
-            chapter_id=model.chapter_id,
-            move_path=model.move_path,
-            status=model.status.value,
-            last_heartbeat=model.last_heartbeat,
-            created_at=model.created_at,
-            updated_at=model.updated_at,
+        return PresenceSessionTable(**self._model_to_row(model))
+
+    @staticmethod
+    def _model_to_row(model: PresenceSession) -> dict:
+        """Column values of a session for bulk writes."""
+        return session_to_row(model)
+
+    async def _publish(
+        self, event_type: EventType, model: PresenceSession, **extra
+    ) -> None:
+        """Publish a presence event for a session."""
+        command = CreateEventCommand(
+            type=event_type,
+            actor_id=model.user_id,
+            target_id=model.study_id,
+            target_type="study",
+            version=1,
+            payload={
+                "session_id": model.id,
+                "user_id": model.user_id,
+                "study_id": model.study_id,
+                **extra,
+            },
         )
+        await self.event_bus.publish(command)
 
     async def heartbeat(
         self,
@@ -103,6 +122,8 @@ class PresenceService:
         Process a heartbeat update.
 
         Creates a new session if one doesn't exist, or updates existing session.
+        Only writes to the presence store; events are published when the
+        user joins or becomes active again after being idle.
 
         Args:
             user_id: User ID
@@ -113,14 +134,11 @@ class PresenceService:
         Returns:
             Updated presence session
         """
-        # Get or create session
-        table = await self.presence_repo.get_by_user_study(user_id, study_id)
+        model = await self.store.get(study_id, user_id)
 
-        if table is None:
-            # Create new session
-            session_id = str(uuid.uuid4())
+        if model is None:
             model = PresenceSession(
-                id=session_id,
+                id=str(uuid.uuid4()),
                 user_id=user_id,
                 study_id=study_id,
                 chapter_id=chapter_id,
@@ -128,47 +146,32 @@ class PresenceService:
                 status=PresenceStatus.ACTIVE,
                 last_heartbeat=datetime.now(UTC),
             )
-
-            table = self._model_to_table(model)
-            table = await self.presence_repo.create(table)
+            await self.store.put(model)
 
             # Publish user joined event
-            command = CreateEventCommand(
-                type=EventType.PRESENCE_USER_JOINED,
-                actor_id=user_id,
-                target_id=study_id,
-                target_type="study",
-                version=1,
-                payload={
-                    "session_id": session_id,
-                    "user_id": user_id,
-                    "study_id": study_id,
-                    "chapter_id": chapter_id,
-                    "move_path": move_path,
-                },
+            await self._publish(
+                EventType.PRESENCE_USER_JOINED,
+                model,
+                chapter_id=chapter_id,
+                move_path=move_path,
             )
-            await self.event_bus.publish(command)
 
             logger.info(f"New presence session created: user={user_id} study={study_id}")
-        else:
-            # Update existing session
-            model = self._table_to_model(table)
-
-        # Process heartbeat through presence manager
-        model = await self.presence_manager.process_heartbeat(
-            session=model,
-            chapter_id=chapter_id,
-            move_path=move_path,
-        )
-
-        # Update database
-        table.chapter_id = model.chapter_id
-        table.move_path = model.move_path
-        table.status = model.status.value
-        table.last_heartbeat = model.last_heartbeat
-        table.updated_at = model.updated_at
-
-        await self.presence_repo.update(table)
+            return model
+
+        old_status = model.status
+        model.update_heartbeat(chapter_id=chapter_id, move_path=move_path)
+        await self.store.put(model)
+
+        if old_status != PresenceStatus.ACTIVE:
+            await self._publish(
+                EventType.PRESENCE_USER_ACTIVE,
+                model,
+                old_status=old_status.value,
+                new_status=model.status.value,
+                chapter_id=model.chapter_id,
+                move_path=model.move_path,
+            )
 
         return model
 
@@ -182,8 +185,7 @@ class PresenceService:
         Returns:
             List of active presence sessions
         """
-        tables = await self.presence_repo.get_by_study(study_id)
-        return [self._table_to_model(t) for t in tables]
+        return await self.store.list_study(study_id)
 
     async def update_cursor_position(
         self,
@@ -207,40 +209,24 @@ class PresenceService:
         Raises:
             SessionNotFoundError: If session not found
         """
-        table = await self.presence_repo.get_by_user_study(user_id, study_id)
-        if table is None:
+        model = await self.store.get(study_id, user_id)
+        if model is None:
             raise SessionNotFoundError(
                 f"No active session found for user={user_id} study={study_id}"
             )
 
-        model = self._table_to_model(table)
         model.chapter_id = chapter_id
         model.move_path = move_path
         model.updated_at = datetime.now(UTC)
-
-        # Update database
-        table.chapter_id = chapter_id
-        table.move_path = move_path
-        table.updated_at = model.updated_at
-
-        await self.presence_repo.update(table)
+        await self.store.put(model)
 
         # Publish cursor move event
-        command = CreateEventCommand(
-            type=EventType.PRESENCE_CURSOR_MOVED,
-            actor_id=user_id,
-            target_id=study_id,
-            target_type="study",
-            version=1,
-            payload={
-                "session_id": model.id,
-                "user_id": user_id,
-                "study_id": study_id,
-                "chapter_id": chapter_id,
-                "move_path": move_path,
-            },
+        await self._publish(
+            EventType.PRESENCE_CURSOR_MOVED,
+            model,
+            chapter_id=chapter_id,
+            move_path=move_path,
         )
-        await self.event_bus.publish(command)
 
         return model
 
@@ -252,24 +238,10 @@ class PresenceService:
             user_id: User ID
             study_id: Study ID
         """
-        table = await self.presence_repo.get_by_user_study(user_id, study_id)
-        if table is not None:
-            await self.presence_repo.delete_by_id(table.id)
-
+        model = await self.store.remove(study_id, user_id)
+        if model is not None:
             # Publish user left event
-            command = CreateEventCommand(
-                type=EventType.PRESENCE_USER_LEFT,
-                actor_id=user_id,
-                target_id=study_id,
-                target_type="study",
-                version=1,
-                payload={
-                    "session_id": table.id,
-                    "user_id": user_id,
-                    "study_id": study_id,
-                },
-            )
-            await self.event_bus.publish(command)
+            await self._publish(EventType.PRESENCE_USER_LEFT, model)
 
             logger.info(f"User left study: user={user_id} study={study_id}")
 
@@ -279,6 +251,10 @@ class PresenceService:
         """
         Clean up expired sessions.
 
+        Live sessions without a heartbeat for `timeout_minutes` are removed
+        from the store (publishing user_left), and rows left in the table by
+        a process that stopped before flushing are deleted.
+
         Args:
             timeout_minutes: Timeout in minutes (default: 10)
 
@@ -287,31 +263,23 @@ class PresenceService:
         """
         threshold = datetime.now(UTC) - timedelta(minutes=timeout_minutes)
 
-        # Get expired sessions for event publishing
-        expired_tables = await self.presence_repo.list_expired(threshold)
-
-        # Publish user left events
-        for table in expired_tables:
-            command = CreateEventCommand(
-                type=EventType.PRESENCE_USER_LEFT,
-                actor_id=table.user_id,
-                target_id=table.study_id,
-                target_type="study",
-                version=1,
-                payload={
-                    "session_id": table.id,
-                    "user_id": table.user_id,
-                    "study_id": table.study_id,
-                    "reason": "timeout",
-                },
+        count = 0
+        for model in await self.store.list_all():
+            if model.last_heartbeat >= threshold:
+                continue
+            # With a shared store only the worker that removes it reports it
+            if await self.store.remove(model.study_id, model.user_id) is None:
+                continue
+            await self._publish(EventType.PRESENCE_USER_LEFT, model, reason="timeout")
+            count += 1
+
+        stale_rows = await self.presence_repo.delete_expired(threshold)
+
+        if count or stale_rows:
+            logger.info(
+                f"Cleaned up {count} expired presence sessions "
+                f"({stale_rows} stale rows)"
             )
-            await self.event_bus.publish(command)
-
-        # Delete expired sessions
-        count = await self.presence_repo.delete_expired(threshold)
-
-        if count > 0:
-            logger.info(f"Cleaned up {count} expired presence sessions")
 
         return count
 
@@ -320,18 +288,60 @@ class PresenceService:
         Update status for all sessions based on last heartbeat.
 
         Should be called periodically to transition sessions between
-        active/idle/away states.
+        active/idle/away states. Publishes user_idle when a session goes
+        idle; the away state is stored without an event.
 
         Returns:
             List of updated sessions
         """
-        # Get all sessions from all studies (this might need optimization for scale)
-        # For now, we'll implement a simple version
-        # In production, you might want to batch this or use a different approach
+        updated = []
+        for model in await self.store.list_all():
+            old_status = model.status
+            new_status = model.update_status(model.time_since_last_heartbeat())
+            if new_status == old_status:
+                continue
+            await self.store.put(model)
+            if new_status == PresenceStatus.IDLE:
+                await self._publish(
+                    EventType.PRESENCE_USER_IDLE,
+                    model,
+                    old_status=old_status.value,
+                    new_status=new_status.value,
+                    chapter_id=model.chapter_id,
+                    move_path=model.move_path,
+                )
+            updated.append(model)
+        return updated
+
+    async def flush_presence(self) -> int:
+        """
+        Write sessions changed since the last flush to the database.
 
-        # This is a placeholder - in a real implementation,
-        # you'd need a way to get all sessions efficiently
-        # For now, this method is primarily for the cleanup job
+        Upserts changed sessions and deletes removed ones, a few multi-row
+        statements per flush. Changes are requeued if the write fails.
 
-        logger.debug("Status update called - implement batching for production")
-        return []
+        Returns:
+            Number of sessions written or deleted
+        """
+        dirty = self.store.drain_dirty()
+        if not dirty:
+            return 0
+
+        upserts = [self._model_to_row(model) for model in dirty.values() if model is not None]
+        deletes = [
+            (user_id, study_id)
+            for (study_id, user_id), model in dirty.items()
+            if model is None
+        ]
+        try:
+            if deletes:
+                await self.presence_repo.delete_by_user_study(deletes)
+            if upserts:
+                await self.presence_repo.upsert_many(upserts)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            self.store.requeue(dirty)
+            raise
+
+        return len(dirty)
@@ -4,8 +4,11 @@ from dataclasses import dataclass
 from modules.workspace.db.repos.acl_repo import ACLRepository
 from modules.workspace.db.repos.node_repo import NodeRepository
 from modules.workspace.db.repos.search_index_repo import SearchIndexRepository
-from modules.workspace.db.tables.search_index import SearchIndex
-from modules.workspace.domain.policies.permissions import can_read
+
+# Index target types whose visibility is resolved by node ACLs in SQL.
+# Discussion, chapter and annotation entries need their parent study
+# resolved first; until that exists they are never returned.
+NODE_TARGET_TYPES = ("workspace", "folder", "study")
 
 
 @dataclass
@@ -55,6 +58,10 @@ class SearchService:
         """
         Search content with permission filtering.
 
+        Results are index hits followed by node title matches not already
+        covered by an index hit. Permission filtering runs in SQL, so
+        `total` and pagination count only results the user can see.
+
         Args:
             query: Search query string
             user_id: Current user ID (for permission filtering)
@@ -65,63 +72,62 @@ class SearchService:
         Returns:
             SearchResults with filtered results
         """
-        # Calculate offset
         offset = (page - 1) * page_size
 
-        fetch_limit = page_size * 3
-
-        index_results = await self.search_repo.search(
-            query=query,
-            target_type=target_type,
-            limit=fetch_limit,
-            offset=offset,
+        index_total = await self.search_repo.count_readable(
+            query, user_id, NODE_TARGET_TYPES, target_type=target_type
         )
-
-        filtered_results: list[SearchResult] = []
-        for entry in index_results:
-            # Check if user has permission to see this result
-            if await self._can_user_see_result(user_id, entry):
-                filtered_results.append(
-                    SearchResult(
-                        target_id=entry.target_id,
-                        target_type=entry.target_type,
-                        content=entry.content,
-                        author_id=entry.author_id,
-                        highlight=self._extract_highlight(entry.content, query),
-                    )
+        results: list[SearchResult] = []
+        if offset < index_total:
+            entries = await self.search_repo.search_readable(
+                query,
+                user_id,
+                NODE_TARGET_TYPES,
+                target_type=target_type,
+                limit=page_size,
+                offset=offset,
+            )
+            results = [
+                SearchResult(
+                    target_id=entry.target_id,
+                    target_type=entry.target_type,
+                    content=entry.content,
+                    author_id=entry.author_id,
+                    highlight=self._extract_highlight(entry.content, query),
                 )
-
-                # Stop once we have enough results
-                if len(filtered_results) >= page_size:
-                    break
+                for entry in entries
+            ]
+        total = index_total
 
         # Include metadata matches for nodes in "all" searches.
-        if target_type in (None, "workspace", "folder", "study"):
-            metadata = await self.search_metadata(
-                query=query,
-                user_id=user_id,
+        if target_type is None or target_type in NODE_TARGET_TYPES:
+            indexed_ids = self.search_repo.matching_target_ids(
+                query, NODE_TARGET_TYPES, target_type=target_type
+            )
+            total += await self.node_repo.count_by_name(
+                query,
                 node_type=target_type,
-                page=1,
-                page_size=page_size,
+                readable_by=user_id,
+                exclude_ids=indexed_ids,
             )
-            existing = {(r.target_id, r.target_type) for r in filtered_results}
-            for result in metadata.results:
-                key = (result.target_id, result.target_type)
-                if key in existing:
-                    continue
-                filtered_results.append(result)
-                if len(filtered_results) >= page_size:
-                    break
-
-        # Determine if there are more results
-        has_more = len(index_results) == fetch_limit
+            remaining = page_size - len(results)
+            if remaining > 0 and offset + len(results) < total:
+                nodes = await self.node_repo.search_by_name(
+                    query,
+                    node_type=target_type,
+                    limit=remaining,
+                    offset=max(0, offset - index_total),
+                    readable_by=user_id,
+                    exclude_ids=indexed_ids,
+                )
+                results.extend(self._node_result(node) for node in nodes)
 
         return SearchResults(
-            results=filtered_results[:page_size],
-            total=len(filtered_results),  # Approximate, filtered total
+            results=results,
+            total=total,
             page=page,
             page_size=page_size,
-            has_more=has_more,
+            has_more=offset + len(results) < total,
         )
 
     async def search_metadata(
@@ -145,36 +151,24 @@ class SearchService:
         Returns:
             SearchResults with matching nodes
         """
-        # Search nodes by name
+        offset = (page - 1) * page_size
+        total = await self.node_repo.count_by_name(
+            query, node_type=node_type, readable_by=user_id
+        )
         nodes = await self.node_repo.search_by_name(
-            query=query,
+            query,
             node_type=node_type,
-            limit=page_size * 3,  # Fetch extra for filtering
+            limit=page_size,
+            offset=offset,
+            readable_by=user_id,
         )
 
-        # Filter by permissions
-        filtered_results = []
-        for node in nodes:
-            if await can_read(self.acl_repo, node, user_id):
-                filtered_results.append(
-                    SearchResult(
-                        target_id=node.id,
-                        target_type=node.node_type,
-                        content=node.title,
-                        author_id=node.owner_id,
-                        highlight=node.title,
-                    )
-                )
-
-                if len(filtered_results) >= page_size:
-                    break
-
         return SearchResults(
-            results=filtered_results[:page_size],
-            total=len(filtered_results),
+            results=[self._node_result(node) for node in nodes],
+            total=total,
             page=page,
             page_size=page_size,
-            has_more=len(nodes) == page_size * 3,
+            has_more=offset + len(nodes) < total,
         )
 
     async def search_content(
@@ -202,54 +196,15 @@ class SearchService:
         """
         return await self.search(query, user_id, target_type, page, page_size)
 
-    async def _can_user_see_result(
-        self, user_id: str, entry: SearchIndex
-    ) -> bool:
-        """
-        Check if user has permission to see this search result.
-
-        SECURITY FIX: Changed default behavior to be more restrictive.
-        Previously, this method returned True for most cases, allowing
-        unauthorized access to search results.
-
-        Args:
-            user_id: User ID
-            entry: Search index entry
-
-        Returns:
-            True if user can see this result
-        """
-        # For nodes (workspace/folder/study), check ACL
-        if entry.target_type in ["workspace", "folder", "study"]:
-            node = await self.node_repo.get_by_id(entry.target_id)
-            return await can_read(self.acl_repo, node, user_id)
-
-        # SECURITY FIX: For discussion threads and replies, we need proper permission checking
-        # These need to resolve their parent object (study/chapter) and check ACL
-        if entry.target_type in ["discussion_thread", "discussion_reply"]:
-            # TODO: Implement proper permission check by:
-            # 1. Looking up the thread's target_id and target_type from discussion_threads table
-            # 2. If target is a study/chapter, check read permission on that resource
-            # 3. If target is a reply, recursively find the root thread
-            #
-            # For now, SECURITY FIX: Return False to prevent leaking unauthorized content
-            # This is safer than returning True, but will hide valid results
-            # Needs proper implementation before enabling
-            return False
-
-        # SECURITY FIX: For chapters and annotations, check parent study permission
-        if entry.target_type in ["chapter", "move_annotation"]:
-            # TODO: Implement proper permission check by:
-            # 1. Resolving the parent study ID from chapters table
-            # 2. Checking read permission on the parent study
-            #
-            # For now, SECURITY FIX: Return False to prevent leaking unauthorized content
-            return False
-
-        # SECURITY FIX: Changed default from True to False
-        # Better to hide results than leak unauthorized content
-        # Unknown types should be explicitly handled above
-        return False
+    @staticmethod
+    def _node_result(node) -> SearchResult:
+        return SearchResult(
+            target_id=node.id,
+            target_type=node.node_type,
+            content=node.title,
+            author_id=node.owner_id,
+            highlight=node.title,
+        )
 
     def _extract_highlight(self, content: str, query: str, context_size: int = 100) -> str:
         """
@@ -80,7 +80,7 @@ class ShareService:
             raise NodeNotFoundError(f"Node {command.object_id} not found")
 
         # Check if actor can manage ACL
-        actor_acl = await self.acl_repo.get_acl(command.object_id, actor_id)
+        actor_acl = await self.acl_repo.get_effective_acl(node, actor_id)
         from modules.workspace.domain.models.node import NodeModel
 
         node_model = NodeModel(
@@ -175,7 +175,7 @@ class ShareService:
 
         # Check permissions
         if node.owner_id != actor_id:
-            actor_acl = await self.acl_repo.get_acl(command.object_id, actor_id)
+            actor_acl = await self.acl_repo.get_effective_acl(node, actor_id)
             if actor_acl is None or actor_acl.permission not in {
                 Permission.OWNER,
                 Permission.ADMIN,
@@ -217,7 +217,7 @@ class ShareService:
 
         # Check permissions
         if node.owner_id != actor_id:
-            actor_acl = await self.acl_repo.get_acl(command.object_id, actor_id)
+            actor_acl = await self.acl_repo.get_effective_acl(node, actor_id)
             if actor_acl is None or actor_acl.permission not in {
                 Permission.OWNER,
                 Permission.ADMIN,
@@ -255,7 +255,7 @@ class ShareService:
 
         # Check permissions
         if node.owner_id != actor_id:
-            actor_acl = await self.acl_repo.get_acl(command.object_id, actor_id)
+            actor_acl = await self.acl_repo.get_effective_acl(node, actor_id)
             if actor_acl is None or actor_acl.permission not in {
                 Permission.OWNER,
                 Permission.ADMIN,
@@ -28,6 +28,7 @@ from modules.workspace.domain.services.pgn_sync_service import PgnSyncService
 from backend.core.tagger.analysis.pipeline import AnalysisPipeline # New Import
 from modules.workspace.pgn_v2.repo import PgnV2Repo # New Import
 from modules.workspace.storage.r2_client import create_r2_client_from_env # New Import
+from modules.workspace.storage.async_r2_client import run_in_storage_executor
 
 
 class InvalidMoveError(Exception):
@@ -141,11 +142,11 @@ class StudyService:
             pgn_v2_repo = PgnV2Repo(create_r2_client_from_env())
             
             try:
-                fen_index = pgn_v2_repo.load_fen_index(chapter_id)
+                fen_index = await run_in_storage_executor(pgn_v2_repo.load_fen_index, chapter_id)
             except Exception as exc:
                 self._logger.warning("FEN index missing for chapter %s: %s", chapter_id, exc)
                 return
-            tree_data = pgn_v2_repo.load_tree_json(chapter_id)
+            tree_data = await run_in_storage_executor(pgn_v2_repo.load_tree_json, chapter_id)
             if not _tree_data_has_fen(tree_data):
                 tree_data = None
 
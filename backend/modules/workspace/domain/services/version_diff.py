@@ -0,0 +1,145 @@
+"""
+Structural diff between two study snapshots.
+
+Each side's chapters, variations (move nodes) and annotations are indexed
+by id once, so a diff is linear in the size of both snapshots.
+
+Variations are compared as a tree (parent_id links):
+- A newly added or removed line is reported once, at the root of the
+  added/removed subtree, with its subtree_size, rather than once per move.
+- A move kept in both versions is a modification when any field differs;
+  `fields` names them, e.g. ["rank"] for a re-ranked line or
+  ["parent_id", "rank"] for a move that was re-attached.
+
+Annotation (comment / NAG) and chapter edits are reported the same way,
+with `fields` listing what changed.
+
+iter_changes() yields change records one by one so large diffs can be
+streamed; diff_snapshots() collects them into a VersionComparison.
+"""
+
+from typing import Any, Iterable, Iterator
+
+from modules.workspace.domain.models.version import SnapshotContent, VersionComparison
+
+# Volatile bookkeeping that does not make an item "modified" on its own
+IGNORED_FIELDS = frozenset({"updated_at", "version"})
+
+
+def _index(items: Iterable[dict[str, Any]]) -> dict[Any, dict[str, Any]]:
+    return {item["id"]: item for item in items}
+
+
+def changed_fields(old: dict[str, Any], new: dict[str, Any]) -> list[str]:
+    """Sorted keys whose values differ (missing keys count as None)."""
+    return sorted(
+        key
+        for key in old.keys() | new.keys()
+        if key not in IGNORED_FIELDS and old.get(key) != new.get(key)
+    )
+
+
+def _modifications(
+    kind: str, old: dict[Any, dict[str, Any]], new: dict[Any, dict[str, Any]]
+) -> Iterator[dict[str, Any]]:
+    for item_id, new_item in new.items():
+        old_item = old.get(item_id)
+        if old_item is None or old_item == new_item:
+            continue
+        fields = changed_fields(old_item, new_item)
+        if fields:
+            yield {
+                "op": "modify",
+                "type": kind,
+                "id": item_id,
+                "fields": fields,
+                "from": old_item,
+                "to": new_item,
+            }
+
+
+def _flat(
+    op: str, kind: str, items: dict[Any, dict[str, Any]], other: dict[Any, dict[str, Any]]
+) -> Iterator[dict[str, Any]]:
+    for item_id, item in items.items():
+        if item_id not in other:
+            yield {"op": op, "type": kind, "data": item}
+
+
+def _subtrees(
+    op: str, nodes: dict[Any, dict[str, Any]], other: dict[Any, dict[str, Any]]
+) -> Iterator[dict[str, Any]]:
+    """Variations in `nodes` but not `other`, one record per subtree root."""
+    only = {node_id for node_id in nodes if node_id not in other}
+    if not only:
+        return
+    children: dict[Any, list[Any]] = {}
+    roots = []
+    for node_id in nodes:
+        if node_id not in only:
+            continue
+        parent_id = nodes[node_id].get("parent_id")
+        if parent_id in only:
+            children.setdefault(parent_id, []).append(node_id)
+        else:
+            roots.append(node_id)
+
+    for root_id in roots:
+        size = 0
+        stack = [root_id]
+        while stack:
+            size += 1
+            stack.extend(children.get(stack.pop(), ()))
+        yield {"op": op, "type": "variation", "data": nodes[root_id], "subtree_size": size}
+
+
+def iter_changes(
+    from_snapshot: SnapshotContent, to_snapshot: SnapshotContent
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield change records from `from_snapshot` to `to_snapshot`.
+
+    Records have "op" ("add", "delete" or "modify") and "type" ("chapter",
+    "variation" or "annotation"). Additions and modifications follow the
+    order of `to_snapshot`, deletions the order of `from_snapshot`.
+    """
+    old_chapters, new_chapters = _index(from_snapshot.chapters), _index(to_snapshot.chapters)
+    yield from _flat("add", "chapter", new_chapters, old_chapters)
+    yield from _flat("delete", "chapter", old_chapters, new_chapters)
+    yield from _modifications("chapter", old_chapters, new_chapters)
+
+    old_moves, new_moves = _index(from_snapshot.variations), _index(to_snapshot.variations)
+    yield from _subtrees("add", new_moves, old_moves)
+    yield from _subtrees("delete", old_moves, new_moves)
+    yield from _modifications("variation", old_moves, new_moves)
+
+    old_notes, new_notes = _index(from_snapshot.annotations), _index(to_snapshot.annotations)
+    yield from _flat("add", "annotation", new_notes, old_notes)
+    yield from _flat("delete", "annotation", old_notes, new_notes)
+    yield from _modifications("annotation", old_notes, new_notes)
+
+
+def diff_snapshots(
+    from_version: int,
+    to_version: int,
+    from_snapshot: SnapshotContent,
+    to_snapshot: SnapshotContent,
+) -> VersionComparison:
+    """Collect iter_changes() into a VersionComparison."""
+    buckets: dict[str, list[dict[str, Any]]] = {"add": [], "delete": [], "modify": []}
+    for change in iter_changes(from_snapshot, to_snapshot):
+        record = dict(change)
+        buckets[record.pop("op")].append(record)
+
+    return VersionComparison(
+        from_version=from_version,
+        to_version=to_version,
+        changes={
+            "additions_count": len(buckets["add"]),
+            "deletions_count": len(buckets["delete"]),
+            "modifications_count": len(buckets["modify"]),
+        },
+        additions=buckets["add"],
+        deletions=buckets["delete"],
+        modifications=buckets["modify"],
+    )
@@ -1,8 +1,9 @@
 """Version service for managing study versions and snapshots."""
+import asyncio
 import json
 import uuid
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, AsyncIterator
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,10 +16,21 @@ from modules.workspace.domain.models.version import (
     VersionComparison,
     VersionSnapshot,
 )
+from modules.workspace.domain.services.version_diff import diff_snapshots, iter_changes
 from modules.workspace.events.bus import EventBus
 from modules.workspace.events.types import EventType
 from modules.workspace.storage.keys import R2Keys
 from modules.workspace.storage.r2_client import R2Client
+from modules.workspace.storage.async_r2_client import AsyncR2Client, as_async_r2_client
+from modules.workspace.storage.snapshot_store import (
+    DEFAULT_CODEC,
+    build_manifest,
+    is_manifest,
+    known_refs,
+    load_blobs,
+    load_snapshot,
+    upload_blobs,
+)
 
 
 class VersionService:
@@ -35,7 +47,7 @@ class VersionService:
     def __init__(
         self,
         session: AsyncSession,
-        r2_client: R2Client,
+        r2_client: R2Client | AsyncR2Client,
         event_bus: EventBus,
     ) -> None:
         """
@@ -48,6 +60,7 @@ class VersionService:
         """
         self.session = session
         self.r2_client = r2_client
+        self.storage = as_async_r2_client(r2_client)
         self.event_bus = event_bus
         self.repo = VersionRepository(session)
 
@@ -70,7 +83,8 @@ class VersionService:
             ValueError: If snapshot creation fails
         """
         # Get next version number
-        next_version = await self.repo.get_latest_version_number(command.study_id) + 1
+        latest_version = await self.repo.get_latest_version_number(command.study_id)
+        next_version = latest_version + 1
 
         # Generate IDs
         version_id = str(uuid.uuid4())
@@ -79,20 +93,25 @@ class VersionService:
         # Generate R2 key
         r2_key = R2Keys.version_snapshot(command.study_id, next_version)
 
-        # Serialize snapshot content
-        snapshot_dict = snapshot_content.to_dict()
-        snapshot_json = json.dumps(snapshot_dict, indent=2)
+        # Split into content-addressed blobs; only blobs the previous
+        # version does not already reference are compressed and uploaded.
+        known = known_refs(await self._stored_manifest(command.study_id, latest_version))
+        manifest, new_blobs = await asyncio.to_thread(
+            build_manifest, snapshot_content, next_version, known, DEFAULT_CODEC
+        )
+        blob_bytes = await upload_blobs(self.storage, command.study_id, new_blobs)
 
-        # Upload to R2
-        upload_result = self.r2_client.upload_json(
+        # Upload manifest to R2
+        upload_result = await self.storage.upload_json(
             key=r2_key,
-            content=snapshot_json,
+            content=json.dumps(manifest, separators=(",", ":")),
             metadata={
                 "version": str(next_version),
                 "study_id": command.study_id,
                 "created_by": command.created_by,
             },
         )
+        stored_bytes = upload_result.size + blob_bytes
 
         # Create version record
         version = await self.repo.create_version(
@@ -110,12 +129,14 @@ class VersionService:
             snapshot_id=snapshot_id,
             version_id=version_id,
             r2_key=r2_key,
-            size_bytes=upload_result.size,
+            size_bytes=stored_bytes,
             content_hash=upload_result.content_hash,
             metadata={
                 "chapter_count": len(snapshot_content.chapters),
                 "variation_count": len(snapshot_content.variations),
                 "annotation_count": len(snapshot_content.annotations),
+                "new_blob_count": len(new_blobs),
+                "manifest": manifest,
             },
         )
 
@@ -135,7 +156,7 @@ class VersionService:
                     "version_number": next_version,
                     "change_summary": command.change_summary,
                     "is_rollback": command.is_rollback,
-                    "snapshot_size": upload_result.size,
+                    "snapshot_size": stored_bytes,
                 },
                 workspace_id=None,  # Will be set by caller
             )
@@ -158,7 +179,7 @@ class VersionService:
                 created_at=snapshot.created_at,
                 size_bytes=snapshot.size_bytes,
                 content_hash=snapshot.content_hash,
-                metadata=snapshot.metadata or {},
+                metadata=snapshot.meta_data or {},
             ),
         )
 
@@ -194,7 +215,7 @@ class VersionService:
                 created_at=snapshot_table.created_at,
                 size_bytes=snapshot_table.size_bytes,
                 content_hash=snapshot_table.content_hash,
-                metadata=snapshot_table.metadata or {},
+                metadata=snapshot_table.meta_data or {},
             )
 
         return StudyVersion(
@@ -224,19 +245,26 @@ class VersionService:
         Returns:
             Snapshot content or None if not found
         """
-        version = await self.get_version(study_id, version_number)
-
-        if version is None or version.snapshot_key is None:
+        stored = await self._stored_snapshot(study_id, version_number)
+        if stored is None:
             return None
 
-        # Download from R2
+        # Download blobs from R2
         try:
-            snapshot_json = self.r2_client.download_json(version.snapshot_key)
-            snapshot_dict = json.loads(snapshot_json)
-            return SnapshotContent.from_dict(snapshot_dict)
+            return await self._as_content(stored)
         except Exception:
             return None
 
+    async def _stored_manifest(self, study_id: str, version_number: int) -> dict[str, Any] | None:
+        """Manifest recorded for a version, or None (no version / legacy snapshot)."""
+        if version_number < 1:
+            return None
+        version = await self.get_version(study_id, version_number)
+        if version is None or version.snapshot is None:
+            return None
+        manifest = version.snapshot.metadata.get("manifest")
+        return manifest if is_manifest(manifest) else None
+
     async def get_version_history(
         self,
         study_id: str,
@@ -274,7 +302,7 @@ class VersionService:
                     created_at=snapshot_table.created_at,
                     size_bytes=snapshot_table.size_bytes,
                     content_hash=snapshot_table.content_hash,
-                    metadata=snapshot_table.metadata or {},
+                    metadata=snapshot_table.meta_data or {},
                 )
 
             versions.append(
@@ -308,91 +336,134 @@ class VersionService:
             to_version: Ending version number
 
         Returns:
-            Comparison result
+            Comparison result (see version_diff for the change records)
 
         Raises:
             ValueError: If versions not found
         """
-        # Get both snapshots
-        from_snapshot = await self.get_snapshot_content(study_id, from_version)
-        to_snapshot = await self.get_snapshot_content(study_id, to_version)
+        from_snapshot, to_snapshot = await self._comparable_contents(
+            study_id, from_version, to_version
+        )
+        return diff_snapshots(from_version, to_version, from_snapshot, to_snapshot)
+
+    async def iter_version_changes(
+        self,
+        study_id: str,
+        from_version: int,
+        to_version: int,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Stream change records between two versions.
+
+        Same records as compare_versions, each with an "op" of "add",
+        "delete" or "modify", without building the full comparison.
 
-        if from_snapshot is None:
+        Raises:
+            ValueError: If versions not found (before the first record)
+        """
+        from_snapshot, to_snapshot = await self._comparable_contents(
+            study_id, from_version, to_version
+        )
+        for index, change in enumerate(iter_changes(from_snapshot, to_snapshot)):
+            yield change
+            if index % 500 == 499:
+                # Let other requests run while diffing very large studies.
+                await asyncio.sleep(0)
+
+    async def _comparable_contents(
+        self,
+        study_id: str,
+        from_version: int,
+        to_version: int,
+    ) -> tuple[SnapshotContent, SnapshotContent]:
+        # Get both snapshots (manifests where available)
+        from_stored = await self._stored_snapshot(study_id, from_version)
+        to_stored = await self._stored_snapshot(study_id, to_version)
+
+        if from_stored is None:
             raise ValueError(f"Version {from_version} not found")
-        if to_snapshot is None:
+        if to_stored is None:
             raise ValueError(f"Version {to_version} not found")
 
-        # Calculate differences
-        additions = []
-        deletions = []
-        modifications = []
-
-        # Compare chapters
-        from_chapter_ids = {ch["id"] for ch in from_snapshot.chapters}
-        to_chapter_ids = {ch["id"] for ch in to_snapshot.chapters}
-
-        # New chapters
-        for chapter in to_snapshot.chapters:
-            if chapter["id"] not in from_chapter_ids:
-                additions.append({"type": "chapter", "data": chapter})
-
-        # Deleted chapters
-        for chapter in from_snapshot.chapters:
-            if chapter["id"] not in to_chapter_ids:
-                deletions.append({"type": "chapter", "data": chapter})
-
-        # Modified chapters (simplified - compare titles)
-        for to_chapter in to_snapshot.chapters:
-            if to_chapter["id"] in from_chapter_ids:
-                from_chapter = next(
-                    ch for ch in from_snapshot.chapters if ch["id"] == to_chapter["id"]
+        if is_manifest(from_stored) and is_manifest(to_stored):
+            return await self._changed_content(from_stored, to_stored)
+        return await self._as_content(from_stored), await self._as_content(to_stored)
+
+    async def _stored_snapshot(
+        self, study_id: str, version_number: int
+    ) -> dict[str, Any] | SnapshotContent | None:
+        """
+        Manifest of a version without downloading it when the database has
+        a copy; legacy snapshots are returned as full content.
+        """
+        version = await self.get_version(study_id, version_number)
+        if version is None or version.snapshot_key is None:
+            return None
+        if version.snapshot is not None:
+            manifest = version.snapshot.metadata.get("manifest")
+            if is_manifest(manifest):
+                return manifest
+        try:
+            snapshot_dict = json.loads(await self.storage.download_json(version.snapshot_key))
+        except Exception:
+            return None
+        if is_manifest(snapshot_dict):
+            return snapshot_dict
+        return SnapshotContent.from_dict(snapshot_dict)
+
+    async def _as_content(self, stored: dict[str, Any] | SnapshotContent) -> SnapshotContent:
+        if isinstance(stored, SnapshotContent):
+            return stored
+        return await load_snapshot(self.storage, stored)
+
+    async def _changed_content(
+        self, from_manifest: dict[str, Any], to_manifest: dict[str, Any]
+    ) -> tuple[SnapshotContent, SnapshotContent]:
+        """
+        Load only the parts of two manifests whose blob hashes differ.
+
+        Unchanged chapters, and variation/annotation lists with equal
+        hashes, are left out of both sides, so they produce no differences
+        and are never downloaded.
+        """
+        from_chapters = {ref["id"]: ref for ref in from_manifest["chapters"]}
+        to_chapters = {ref["id"]: ref for ref in to_manifest["chapters"]}
+        unchanged = {
+            chapter_id
+            for chapter_id, ref in to_chapters.items()
+            if chapter_id in from_chapters and from_chapters[chapter_id]["hash"] == ref["hash"]
+        }
+        sides = []
+        for manifest, other in ((from_manifest, to_manifest), (to_manifest, from_manifest)):
+            refs = [ref for ref in manifest["chapters"] if ref["id"] not in unchanged]
+            lists = {
+                name: manifest[name]
+                for name in ("variations", "annotations")
+                if manifest[name]["hash"] != other[name]["hash"]
+            }
+            sides.append((manifest, refs, lists))
+
+        blobs: dict[str, Any] = {}
+        for manifest, refs, lists in sides:
+            blobs.update(
+                await load_blobs(self.storage, manifest["study_id"], [*refs, *lists.values()])
+            )
+
+        contents = []
+        for manifest, refs, lists in sides:
+            contents.append(
+                SnapshotContent(
+                    version_number=manifest["version_number"],
+                    study_id=manifest["study_id"],
+                    study_data={},
+                    chapters=[blobs[ref["hash"]] for ref in refs],
+                    variations=blobs[lists["variations"]["hash"]] if "variations" in lists else [],
+                    annotations=(
+                        blobs[lists["annotations"]["hash"]] if "annotations" in lists else []
+                    ),
                 )
-                if from_chapter != to_chapter:
-                    modifications.append(
-                        {
-                            "type": "chapter",
-                            "id": to_chapter["id"],
-                            "from": from_chapter,
-                            "to": to_chapter,
-                        }
-                    )
-
-        # Compare variations
-        from_var_ids = {v["id"] for v in from_snapshot.variations}
-        to_var_ids = {v["id"] for v in to_snapshot.variations}
-
-        for variation in to_snapshot.variations:
-            if variation["id"] not in from_var_ids:
-                additions.append({"type": "variation", "data": variation})
-
-        for variation in from_snapshot.variations:
-            if variation["id"] not in to_var_ids:
-                deletions.append({"type": "variation", "data": variation})
-
-        # Compare annotations
-        from_ann_ids = {a["id"] for a in from_snapshot.annotations}
-        to_ann_ids = {a["id"] for a in to_snapshot.annotations}
-
-        for annotation in to_snapshot.annotations:
-            if annotation["id"] not in from_ann_ids:
-                additions.append({"type": "annotation", "data": annotation})
-
-        for annotation in from_snapshot.annotations:
-            if annotation["id"] not in to_ann_ids:
-                deletions.append({"type": "annotation", "data": annotation})
-
-        return VersionComparison(
-            from_version=from_version,
-            to_version=to_version,
-            changes={
-                "additions_count": len(additions),
-                "deletions_count": len(deletions),
-                "modifications_count": len(modifications),
-            },
-            additions=additions,
-            deletions=deletions,
-            modifications=modifications,
-        )
+            )
+        return contents[0], contents[1]
 
     async def rollback(
         self,
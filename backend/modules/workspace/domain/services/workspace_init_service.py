@@ -19,6 +19,7 @@ from modules.workspace.db.tables.nodes import Node
 from modules.workspace.db.tables.studies import Chapter, Study
 from modules.workspace.domain.models.types import NodeType, Visibility
 from modules.workspace.storage.r2_client import R2Client
+from modules.workspace.storage.async_r2_client import AsyncR2Client, as_async_r2_client
 from modules.workspace.storage.keys import R2Keys
 from modules.workspace.events.bus import EventBus, publish_chapter_created
 
@@ -33,13 +34,14 @@ class WorkspaceInitService:
         session: AsyncSession,
         node_repo: NodeRepository,
         study_repo: StudyRepository,
-        r2_client: R2Client,
+        r2_client: R2Client | AsyncR2Client,
         event_bus: EventBus,
     ):
         self.session = session
         self.node_repo = node_repo
         self.study_repo = study_repo
         self.r2_client = r2_client
+        self.storage = as_async_r2_client(r2_client)
         self.event_bus = event_bus
 
     async def initialize_workspace_for_user(self, user_id: str) -> None:
@@ -186,7 +188,7 @@ class WorkspaceInitService:
         tree_content = self._get_sample_tree_json()
 
         # Upload to R2
-        upload_result = self.r2_client.upload_json(
+        upload_result = await self.storage.upload_json(
             key=r2_key,
             content=json.dumps(tree_content),
             metadata={
@@ -3,21 +3,31 @@ Event bus for publishing and subscribing to events.
 
 Simplified implementation for Phase 1:
 - Writes events to database
-- Provides hook points for future enhancements (WebSocket, notifications)
+- Notifies in-process subscribers, or (outbox mode) records the event in
+  the event outbox for the OutboxDispatcher to deliver asynchronously
+  (see events.outbox)
+- Fans study events out to WebSocket clients on every worker once the
+  session commits (see events.fanout)
 """
 
+import logging
 import uuid
 from datetime import UTC, datetime
 from typing import Any
 
+from sqlalchemy import event as sa_event
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from modules.workspace.db.tables.event_outbox import EventOutbox
 from modules.workspace.db.tables.events import Event as EventTable
 from modules.workspace.domain.models.event import CreateEventCommand
 from modules.workspace.domain.models.types import NodeType
+from modules.workspace.events.fanout import event_message, event_study_id, get_event_broker
 from modules.workspace.events.payloads import build_event_envelope
 from modules.workspace.events.types import EventType
 
+logger = logging.getLogger(__name__)
+
 
 class EventBus:
     """
@@ -27,15 +37,22 @@ class EventBus:
     Future: Add WebSocket broadcasting, notification triggers, etc.
     """
 
-    def __init__(self, session: AsyncSession | None = None) -> None:
+    def __init__(self, session: AsyncSession | None = None, outbox: bool = False) -> None:
         """
         Initialize event bus.
 
         Args:
             session: Database session (optional for tests)
+            outbox: Write an outbox row per event instead of calling
+                subscribers inline (requires a session)
         """
         self.session = session
+        self.outbox = outbox and session is not None
         self._subscribers: list[callable] = []
+        # (study_id, message) waiting for the session to commit
+        self._pending_fanout: list[tuple[str, dict[str, Any]]] = []
+        self._outbox_pending = False
+        self._session_hooked = False
 
     async def publish(
         self,
@@ -53,7 +70,8 @@ class EventBus:
         """
         Publish an event.
 
-        Writes event to database and notifies subscribers.
+        Writes event to database and notifies subscribers (inline, or via
+        the outbox in outbox mode).
         Supports idempotency: if event_id already exists, returns existing event.
 
         Args:
@@ -76,11 +94,11 @@ class EventBus:
                 workspace_id=workspace_id,
             )
 
-        # Generate or use provided event_id
+        # Generate or use provided event_id. A fresh UUID cannot collide,
+        # so only caller-supplied ids need the idempotency lookup.
         if event_id is None:
             event_id = str(uuid.uuid4())
-
-        if self.session is not None:
+        elif self.session is not None:
             # Check if event already exists (idempotency)
             from sqlalchemy import select
             existing_result = await self.session.execute(
@@ -119,13 +137,67 @@ class EventBus:
 
         if self.session is not None:
             self.session.add(event)
+            if self.outbox:
+                self.session.add(EventOutbox(event_id=event_id))
+                self._outbox_pending = True
+                self._hook_session()
             await self.session.flush()
 
-        # Notify subscribers (for WebSocket, notifications, etc.)
-        await self._notify_subscribers(event)
+        # Notify subscribers (notifications, search index, etc.)
+        if not self.outbox:
+            await self._notify_subscribers(event)
+
+        await self._fan_out(event)
 
         return event
 
+    async def _fan_out(self, event: EventTable) -> None:
+        """
+        Send a study event to WebSocket clients on all workers.
+
+        With a real session the event is held until the session commits,
+        so clients never see events from rolled-back transactions.
+        """
+        study_id = event_study_id(event)
+        if study_id is None:
+            return
+        message = event_message(event)
+        if not isinstance(self.session, AsyncSession):
+            await get_event_broker().publish(study_id, message)
+            return
+
+        self._pending_fanout.append((study_id, message))
+        self._hook_session()
+
+    def _hook_session(self) -> None:
+        if self._session_hooked or not isinstance(self.session, AsyncSession):
+            return
+        sync_session = self.session.sync_session
+        sa_event.listen(sync_session, "after_commit", self._on_commit)
+        sa_event.listen(sync_session, "after_soft_rollback", self._on_rollback)
+        self._session_hooked = True
+
+    def _on_commit(self, _session) -> None:
+        if self._outbox_pending:
+            self._outbox_pending = False
+            from modules.workspace.events.outbox import notify_dispatcher
+
+            notify_dispatcher()
+        pending, self._pending_fanout = self._pending_fanout, []
+        if not pending:
+            return
+        broker = get_event_broker()
+        try:
+            for study_id, message in pending:
+                broker.enqueue(study_id, message)
+        except RuntimeError:
+            logger.warning("Dropping %d fan-out events: no running event loop", len(pending))
+
+    def _on_rollback(self, _session, previous_transaction) -> None:
+        if not previous_transaction.nested:
+            self._pending_fanout.clear()
+            self._outbox_pending = False
+
     async def get_events_for_target(
         self,
         target_id: str,
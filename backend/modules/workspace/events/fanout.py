@@ -0,0 +1,229 @@
+"""
+Cross-worker fan-out of study events to WebSocket clients.
+
+EventBus.publish() hands committed events to the process-wide broker,
+which delivers them to every worker that has sockets open for the study.
+Each worker's ConnectionManager subscribes to the studies it serves.
+
+Brokers:
+- InMemoryBroker: delivers within this process (single worker, tests)
+- RedisBroker: Redis pub/sub, one channel per study
+
+Messages published for the same study within FANOUT_BATCH_MS are sent
+to the broker as one batch, so a burst of edits or cursor moves costs one
+pub/sub message instead of one per event.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import defaultdict
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# handler(study_id, messages)
+BatchHandler = Callable[[str, list[dict[str, Any]]], Awaitable[None]]
+
+
+def event_study_id(event) -> str | None:
+    """Study an event belongs to (target study or payload study_id), if any."""
+    if str(event.target_type or "") == "study":
+        return event.target_id
+    envelope = event.payload or {}
+    data = envelope.get("payload") if isinstance(envelope.get("payload"), dict) else envelope
+    study_id = data.get("study_id") if isinstance(data, dict) else None
+    return str(study_id) if study_id else None
+
+
+def event_message(event) -> dict[str, Any]:
+    """WebSocket message for an event: {"type": ..., "data": envelope}."""
+    return {"type": str(event.type), "data": event.payload or {}}
+
+
+class EventBroker:
+    """
+    Base broker: batches outgoing messages per study and tracks local
+    handlers. Subclasses implement _send() and channel (un)subscription.
+    """
+
+    def __init__(self, batch_ms: int | None = None) -> None:
+        if batch_ms is None:
+            batch_ms = int(os.getenv("FANOUT_BATCH_MS", "20"))
+        self.batch_seconds = batch_ms / 1000
+        self._handlers: dict[str, set[BatchHandler]] = defaultdict(set)
+        self._pending: dict[str, list[dict[str, Any]]] = {}
+        self._flush_tasks: dict[str, asyncio.Task] = {}
+
+    async def publish(self, study_id: str, message: dict[str, Any]) -> None:
+        """Queue a message for a study; sent with others after the batch window."""
+        self.enqueue(study_id, message)
+
+    def enqueue(self, study_id: str, message: dict[str, Any]) -> None:
+        """Synchronous publish(); must be called from the event loop thread."""
+        batch = self._pending.get(study_id)
+        if batch is not None:
+            batch.append(message)
+            return
+        self._pending[study_id] = [message]
+        self._flush_tasks[study_id] = asyncio.get_running_loop().create_task(
+            self._flush_later(study_id)
+        )
+
+    async def _flush_later(self, study_id: str) -> None:
+        if self.batch_seconds > 0:
+            await asyncio.sleep(self.batch_seconds)
+        self._flush_tasks.pop(study_id, None)
+        messages = self._pending.pop(study_id, None)
+        if messages:
+            try:
+                await self._send(study_id, messages)
+            except Exception as exc:
+                logger.warning("Event fan-out failed for study %s: %s", study_id, exc)
+
+    async def flush(self) -> None:
+        """Send all pending batches now."""
+        tasks = list(self._flush_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._flush_tasks.clear()
+        pending, self._pending = self._pending, {}
+        for study_id, messages in pending.items():
+            await self._send(study_id, messages)
+
+    async def subscribe(self, study_id: str, handler: BatchHandler) -> None:
+        first = not self._handlers[study_id]
+        self._handlers[study_id].add(handler)
+        if first:
+            await self._subscribe_channel(study_id)
+
+    async def unsubscribe(self, study_id: str, handler: BatchHandler) -> None:
+        handlers = self._handlers.get(study_id)
+        if not handlers:
+            return
+        handlers.discard(handler)
+        if not handlers:
+            del self._handlers[study_id]
+            await self._unsubscribe_channel(study_id)
+
+    async def _deliver(self, study_id: str, messages: list[dict[str, Any]]) -> None:
+        """Hand a received batch to this worker's handlers."""
+        for handler in list(self._handlers.get(study_id, ())):
+            try:
+                await handler(study_id, messages)
+            except Exception as exc:
+                logger.warning("Fan-out handler failed for study %s: %s", study_id, exc)
+
+    async def _send(self, study_id: str, messages: list[dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    async def _subscribe_channel(self, study_id: str) -> None:
+        return None
+
+    async def _unsubscribe_channel(self, study_id: str) -> None:
+        return None
+
+    async def close(self) -> None:
+        await self.flush()
+
+
+class InMemoryBroker(EventBroker):
+    """Single-process broker: batches go straight to local handlers."""
+
+    async def _send(self, study_id: str, messages: list[dict[str, Any]]) -> None:
+        await self._deliver(study_id, messages)
+
+
+class RedisBroker(EventBroker):
+    """
+    Redis pub/sub broker.
+
+    Publishing is a PUBLISH of the JSON batch on the study's channel. Each
+    worker keeps one pub/sub connection, subscribed to the channels of the
+    studies it has sockets for, and a reader task dispatching batches.
+    """
+
+    def __init__(self, client, prefix: str = "workspace:study:", batch_ms: int | None = None) -> None:
+        super().__init__(batch_ms=batch_ms)
+        self.client = client
+        self.prefix = prefix
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self._reader: asyncio.Task | None = None
+
+    def _channel(self, study_id: str) -> str:
+        return f"{self.prefix}{study_id}"
+
+    async def _send(self, study_id: str, messages: list[dict[str, Any]]) -> None:
+        await self.client.publish(self._channel(study_id), json.dumps(messages, default=str))
+
+    async def _subscribe_channel(self, study_id: str) -> None:
+        await self._pubsub.subscribe(self._channel(study_id))
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.get_running_loop().create_task(self._read())
+
+    async def _unsubscribe_channel(self, study_id: str) -> None:
+        await self._pubsub.unsubscribe(self._channel(study_id))
+
+    async def _read(self) -> None:
+        while self._handlers:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except Exception as exc:
+                logger.warning("Redis fan-out reader error: %s", exc)
+                await asyncio.sleep(1.0)
+                continue
+            if not message or message.get("type") != "message":
+                continue
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode("utf-8")
+            try:
+                messages = json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+            await self._deliver(channel[len(self.prefix):], messages)
+
+    async def close(self) -> None:
+        await super().close()
+        if self._reader is not None:
+            self._reader.cancel()
+        await self._pubsub.aclose()
+        await self.client.aclose()
+
+
+def create_broker_from_env() -> EventBroker:
+    """
+    Create the process-wide broker.
+
+    Env:
+        REDIS_URL: Redis connection URL (enables cross-worker fan-out)
+        FANOUT_BATCH_MS: Batch window in milliseconds (default: 20)
+    """
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        try:
+            import redis.asyncio as redis
+
+            return RedisBroker(redis.from_url(redis_url))
+        except Exception as exc:
+            logger.warning("Event fan-out falling back to in-memory broker: %s", exc)
+    return InMemoryBroker()
+
+
+_broker: EventBroker | None = None
+
+
+def get_event_broker() -> EventBroker:
+    """Get the process-wide event broker."""
+    global _broker
+    if _broker is None:
+        _broker = create_broker_from_env()
+    return _broker
+
+
+def set_event_broker(broker: EventBroker | None) -> None:
+    """Replace the process-wide broker (tests, app shutdown)."""
+    global _broker
+    _broker = broker
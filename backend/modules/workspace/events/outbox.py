@@ -0,0 +1,317 @@
+"""
+Asynchronous, batched delivery of events to subscribers.
+
+In outbox mode EventBus.publish() only writes the event and an outbox row
+in the request's transaction; search indexing, notifications and
+activity/audit logging happen here, off the request path.
+
+OutboxDispatcher, per subscriber:
+1. Locks the subscriber's checkpoint row (one worker at a time)
+2. Reads up to batch_size outbox rows after the checkpoint
+3. Runs the subscriber on each event in a savepoint (a failing event is
+   logged and skipped, as with inline delivery). A subscriber with
+   handle_batch() gets the whole batch in one savepoint first, and only
+   falls back to one event at a time if the batch fails.
+4. Advances the checkpoint and commits, together with the subscriber's
+   writes
+
+A crash between 3 and 4 redelivers the batch: delivery is at-least-once,
+so subscribers must tolerate seeing an event twice.
+
+Outbox seqs are allocated at insert time but become visible at commit, so
+a gap in the sequence may be a transaction that has not committed yet.
+A subscriber stops at a gap until it has been open for gap_timeout_seconds
+(the writer rolled back), then moves past it.
+
+Env:
+    OUTBOX_BATCH_SIZE: Events per subscriber batch (default: 200)
+    OUTBOX_POLL_SECONDS: Poll interval when idle (default: 1.0)
+    OUTBOX_GAP_TIMEOUT_SECONDS: How long a seq gap blocks (default: 10)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+
+from modules.workspace.db.repos.event_outbox_repo import EventOutboxRepository
+from modules.workspace.events.bus import EventBus
+from modules.workspace.events.subscribers.registry import SUBSCRIBER_FACTORIES, SubscriberFactory
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxDispatcher:
+    """
+    Background consumer of the event outbox.
+
+    Follows the job pattern of PresenceCleanupJob: run_once() processes one
+    batch per subscriber; start()/stop() manage the background loop.
+    """
+
+    def __init__(
+        self,
+        session_maker,
+        subscribers: dict[str, SubscriberFactory] | None = None,
+        batch_size: int | None = None,
+        interval_seconds: float | None = None,
+        gap_timeout_seconds: float | None = None,
+    ) -> None:
+        """
+        Initialize dispatcher.
+
+        Args:
+            session_maker: Async session factory
+            subscribers: name -> factory(session, bus) (default: all registered)
+            batch_size: Events per subscriber batch
+            interval_seconds: Poll interval when idle
+            gap_timeout_seconds: How long a seq gap blocks a subscriber
+        """
+        self.session_maker = session_maker
+        self.subscribers = dict(SUBSCRIBER_FACTORIES if subscribers is None else subscribers)
+        self.batch_size = batch_size or int(os.getenv("OUTBOX_BATCH_SIZE", "200"))
+        self.interval_seconds = (
+            interval_seconds
+            if interval_seconds is not None
+            else float(os.getenv("OUTBOX_POLL_SECONDS", "1.0"))
+        )
+        self.gap_timeout_seconds = (
+            gap_timeout_seconds
+            if gap_timeout_seconds is not None
+            else float(os.getenv("OUTBOX_GAP_TIMEOUT_SECONDS", "10"))
+        )
+        self._wake = asyncio.Event()
+        # (subscriber, missing seq) -> monotonic time the gap was first seen
+        self._gaps: dict[tuple[str, int], float] = {}
+        self._stats: dict[str, dict[str, Any]] = {
+            name: {"last_seq": 0, "delivered": 0, "failed": 0, "pending_since": None}
+            for name in self.subscribers
+        }
+        self._head_seq = 0
+        self._last_batch_size = 0
+        self._last_batch_seconds = 0.0
+        self._backlogged = False
+        self._running = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def notify(self) -> None:
+        """Wake the loop (new outbox rows were committed)."""
+        self._wake.set()
+
+    async def run_once(self) -> int:
+        """
+        Process one batch for every subscriber.
+
+        Returns:
+            Number of events processed
+        """
+        self._backlogged = False
+        processed = 0
+        for name, factory in self.subscribers.items():
+            try:
+                processed += await self._drain(name, factory)
+            except Exception as e:
+                logger.error(f"Outbox delivery to {name} failed: {e}", exc_info=True)
+        await self._refresh(prune=processed > 0)
+        return processed
+
+    async def _drain(self, name: str, factory: SubscriberFactory) -> int:
+        async with self.session_maker() as session:
+            repo = EventOutboxRepository(session)
+            checkpoint = await repo.get_checkpoint(name)
+            if checkpoint is None:
+                if name in await repo.get_checkpoints():
+                    return 0  # another worker holds it
+                try:
+                    checkpoint = await repo.create_checkpoint(
+                        name, max(0, await repo.tail_seq() - 1)
+                    )
+                except IntegrityError:
+                    await session.rollback()
+                    return 0
+
+            rows = await repo.fetch_after(checkpoint.last_seq, self.batch_size)
+            if len(rows) == self.batch_size:
+                self._backlogged = True
+            rows = self._contiguous(name, checkpoint.last_seq, rows)
+            if not rows:
+                await session.commit()
+                return 0
+
+            # Events the subscriber publishes (mentions) go to the outbox too
+            handler = factory(session, EventBus(session, outbox=True))
+            stats = self._stats[name]
+            started = time.perf_counter()
+            events = [event for _seq, event in rows]
+            if await self._deliver_batch(name, session, handler, events):
+                stats["delivered"] += len(events)
+            else:
+                for event in events:
+                    try:
+                        async with session.begin_nested():
+                            await handler(event)
+                        stats["delivered"] += 1
+                    except Exception as e:
+                        stats["failed"] += 1
+                        logger.warning(f"Outbox subscriber {name} failed on event {event.id}: {e}")
+
+            checkpoint.last_seq = rows[-1][0]
+            await session.commit()
+
+            stats["last_seq"] = checkpoint.last_seq
+            self._last_batch_size = len(rows)
+            self._last_batch_seconds = time.perf_counter() - started
+            return len(rows)
+
+    async def _deliver_batch(self, name: str, session, handler, events: list) -> bool:
+        """Run handler.handle_batch() in one savepoint; False if absent or failed."""
+        handle_batch = getattr(handler, "handle_batch", None)
+        if handle_batch is None:
+            return False
+        try:
+            async with session.begin_nested():
+                await handle_batch(events)
+            return True
+        except Exception as e:
+            logger.warning(f"Outbox subscriber {name} failed on a batch, retrying per event: {e}")
+            return False
+
+    def _contiguous(self, name: str, last_seq: int, rows: list) -> list:
+        """Cut rows at the first seq gap that may still be an open transaction."""
+        expected = last_seq + 1
+        now = time.monotonic()
+        for index, (seq, _event) in enumerate(rows):
+            if seq != expected:
+                first_seen = self._gaps.setdefault((name, expected), now)
+                if now - first_seen < self.gap_timeout_seconds:
+                    return rows[:index]
+            self._gaps.pop((name, expected), None)
+            expected = seq + 1
+        return rows
+
+    async def _refresh(self, prune: bool) -> None:
+        """Update lag metrics; prune rows every subscriber has processed."""
+        async with self.session_maker() as session:
+            repo = EventOutboxRepository(session)
+            checkpoints = await repo.get_checkpoints()
+            self._head_seq = await repo.head_seq()
+            if prune and all(name in checkpoints for name in self.subscribers):
+                await repo.prune(min(checkpoints[name] for name in self.subscribers))
+            await session.commit()
+
+        now = time.monotonic()
+        for name, stats in self._stats.items():
+            stats["last_seq"] = checkpoints.get(name, stats["last_seq"])
+            if self._head_seq > stats["last_seq"]:
+                if stats["pending_since"] is None:
+                    stats["pending_since"] = now
+            else:
+                stats["pending_since"] = None
+
+    def metrics(self) -> dict[str, Any]:
+        """Backpressure metrics: per-subscriber lag, throughput and failures."""
+        now = time.monotonic()
+        subscribers = {
+            name: {
+                "last_seq": stats["last_seq"],
+                "lag_events": max(0, self._head_seq - stats["last_seq"]),
+                "lag_seconds": (
+                    round(now - stats["pending_since"], 3)
+                    if stats["pending_since"] is not None
+                    else 0.0
+                ),
+                "delivered": stats["delivered"],
+                "failed": stats["failed"],
+            }
+            for name, stats in self._stats.items()
+        }
+        return {
+            "running": self._running,
+            "head_seq": self._head_seq,
+            "last_batch_size": self._last_batch_size,
+            "last_batch_ms": round(self._last_batch_seconds * 1000, 1),
+            "subscribers": subscribers,
+        }
+
+    async def run_forever(self) -> None:
+        """Deliver events until stopped; idle waits end early on notify()."""
+        logger.info(
+            f"Starting outbox dispatcher "
+            f"(batch_size={self.batch_size}, interval={self.interval_seconds}s)"
+        )
+        self._running = True
+        while self._running:
+            try:
+                await self.run_once()
+                if self._backlogged:
+                    await asyncio.sleep(0)
+                    continue
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in outbox dispatcher loop: {e}", exc_info=True)
+                await asyncio.sleep(self.interval_seconds)
+        logger.info("Outbox dispatcher stopped")
+
+    def start(self) -> asyncio.Task:
+        """
+        Start the dispatcher in the background.
+
+        Returns:
+            asyncio.Task: The background task
+        """
+        if self._task is not None and not self._task.done():
+            return self._task
+        self._running = True
+        self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop the dispatcher; undelivered events stay in the outbox."""
+        self._running = False
+        if self._task is None:
+            return
+        if not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+
+_dispatcher: OutboxDispatcher | None = None
+
+
+def get_outbox_dispatcher() -> OutboxDispatcher | None:
+    """Get the process-wide dispatcher, if one was set up."""
+    return _dispatcher
+
+
+def set_outbox_dispatcher(dispatcher: OutboxDispatcher | None) -> None:
+    """Replace the process-wide dispatcher (app startup/shutdown, tests)."""
+    global _dispatcher
+    _dispatcher = dispatcher
+
+
+def outbox_delivery_active() -> bool:
+    """True when events should go through the outbox instead of inline."""
+    return _dispatcher is not None and _dispatcher.running
+
+
+def notify_dispatcher() -> None:
+    """Wake the process-wide dispatcher after an outbox commit."""
+    if _dispatcher is not None:
+        _dispatcher.notify()
@@ -13,21 +13,76 @@ from modules.workspace.events.subscribers.activity_logger import ActivityLogger
 from modules.workspace.events.subscribers.audit_logger import AuditLogger
 from modules.workspace.events.subscribers.mention_notifier import MentionNotifier
 from modules.workspace.events.subscribers.notification_creator import NotificationCreator
+from modules.workspace.events.subscribers.search_indexer import SearchIndexer
 import logging
+from typing import Any, Awaitable, Callable
 
 from modules.workspace.db.session import get_db_config
-from modules.workspace.events.subscribers.search_indexer import SearchIndexer
+
+
+# name -> factory(session, bus) returning the subscriber's event handler.
+# Shared by inline delivery (register_all_subscribers) and the outbox
+# dispatcher, which keys checkpoints by these names. A handler that also
+# has handle_batch(events) gets whole outbox batches in one call.
+SubscriberFactory = Callable[[Any, Any], Callable[[Any], Awaitable[None]]]
+
+
+def _search_indexer(session, bus):
+    return SearchIndexer(
+        DiscussionThreadRepository(session),
+        DiscussionReplyRepository(session),
+        SearchIndexRepository(session),
+        node_repo=NodeRepository(session),
+        study_repo=StudyRepository(session),
+        variation_repo=VariationRepository(session),
+    )
+
+
+def _mention_notifier(session, bus):
+    return MentionNotifier(
+        bus,
+        DiscussionThreadRepository(session),
+        DiscussionReplyRepository(session),
+        UserRepository(session),
+    ).handle_event
+
+
+def _notification_creator(session, bus):
+    return NotificationCreator(
+        NotificationRepository(session),
+        DiscussionThreadRepository(session),
+        DiscussionReplyRepository(session),
+        DiscussionReactionRepository(session),
+    ).handle_event
+
+
+def _activity_logger(session, bus):
+    return ActivityLogger(ActivityLogRepository(session)).handle_event
+
+
+def _audit_logger(session, bus):
+    return AuditLogger(AuditLogRepository(session)).handle_event
+
+
+SUBSCRIBER_FACTORIES: dict[str, SubscriberFactory] = {
+    "search_indexer": _search_indexer,
+    "mention_notifier": _mention_notifier,
+    "notification_creator": _notification_creator,
+    "activity_logger": _activity_logger,
+    "audit_logger": _audit_logger,
+}
 
 
 def register_all_subscribers(bus, session) -> None:
+    """Deliver events to every subscriber inline, each in its own session."""
     logger = logging.getLogger(__name__)
     config = get_db_config()
 
-    def _wrap(handler_factory):
+    def _wrap(factory: SubscriberFactory):
         async def _handler(event) -> None:
             async with config.async_session_maker() as sub_session:
                 try:
-                    handler = handler_factory(sub_session)
+                    handler = factory(sub_session, bus)
                     await handler(event)
                     await sub_session.commit()
                 except Exception as exc:
@@ -35,42 +90,5 @@ def register_all_subscribers(bus, session) -> None:
                     logger.warning("Subscriber failed: %s", exc)
         return _handler
 
-    bus.subscribe(
-        _wrap(
-            lambda sub_session: SearchIndexer(
-                DiscussionThreadRepository(sub_session),
-                DiscussionReplyRepository(sub_session),
-                SearchIndexRepository(sub_session),
-                node_repo=NodeRepository(sub_session),
-                study_repo=StudyRepository(sub_session),
-                variation_repo=VariationRepository(sub_session),
-            ).handle_event
-        )
-    )
-
-    bus.subscribe(
-        _wrap(
-            lambda sub_session: MentionNotifier(
-                bus,
-                DiscussionThreadRepository(sub_session),
-                DiscussionReplyRepository(sub_session),
-                UserRepository(sub_session),
-            ).handle_event
-        )
-    )
-    bus.subscribe(
-        _wrap(
-            lambda sub_session: NotificationCreator(
-                NotificationRepository(sub_session),
-                DiscussionThreadRepository(sub_session),
-                DiscussionReplyRepository(sub_session),
-                DiscussionReactionRepository(sub_session),
-            ).handle_event
-        )
-    )
-    bus.subscribe(
-        _wrap(lambda sub_session: ActivityLogger(ActivityLogRepository(sub_session)).handle_event)
-    )
-    bus.subscribe(
-        _wrap(lambda sub_session: AuditLogger(AuditLogRepository(sub_session)).handle_event)
-    )
+    for factory in SUBSCRIBER_FACTORIES.values():
+        bus.subscribe(_wrap(factory))
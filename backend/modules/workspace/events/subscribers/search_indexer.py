@@ -6,9 +6,10 @@ Indexes:
 - Studies (node title + description)
 - Chapters (title, white, black, event metadata)
 - Move annotations (analytical text)
-"""
 
-from ulid import ULID
+The *_entry() builders are shared with the full rebuild
+(jobs/search_reindex_job.py), so both produce identical entries.
+"""
 
 from modules.workspace.db.repos.discussion_reply_repo import DiscussionReplyRepository
 from modules.workspace.db.repos.discussion_thread_repo import DiscussionThreadRepository
@@ -19,8 +20,93 @@ from modules.workspace.db.repos.variation_repo import VariationRepository
 from modules.workspace.events.types import EventType
 
 
+def thread_entry(thread) -> dict:
+    """Search entry for a discussion thread (title + content)."""
+    return {
+        "target_id": thread.id,
+        "target_type": "discussion_thread",
+        "content": f"{thread.title}\n{thread.content}",
+        "author_id": thread.author_id,
+    }
+
+
+def reply_entry(reply) -> dict:
+    """Search entry for a discussion reply."""
+    return {
+        "target_id": reply.id,
+        "target_type": "discussion_reply",
+        "content": reply.content,
+        "author_id": reply.author_id,
+    }
+
+
+def study_entry(node, study) -> dict:
+    """Search entry for a study (node title + study description + tags)."""
+    content_parts = [node.title]
+    if study.description:
+        content_parts.append(study.description)
+    if study.tags:
+        content_parts.append(study.tags)
+    return {
+        "target_id": study.id,
+        "target_type": "study",
+        "content": "\n".join(content_parts),
+        "author_id": node.owner_id,
+    }
+
+
+def chapter_entry(chapter, owner_id: str | None) -> dict:
+    """Search entry for a chapter (title + PGN metadata)."""
+    content_parts = [chapter.title]
+    if chapter.white:
+        content_parts.append(f"White: {chapter.white}")
+    if chapter.black:
+        content_parts.append(f"Black: {chapter.black}")
+    if chapter.event:
+        content_parts.append(f"Event: {chapter.event}")
+    if chapter.date:
+        content_parts.append(f"Date: {chapter.date}")
+    return {
+        "target_id": chapter.id,
+        "target_type": "chapter",
+        "content": "\n".join(content_parts),
+        "author_id": owner_id,
+    }
+
+
+def annotation_entry(annotation) -> dict | None:
+    """Search entry for a move annotation (NAG + text); None without text."""
+    if not annotation.text:
+        return None
+    content_parts = []
+    if annotation.nag:
+        content_parts.append(f"NAG: {annotation.nag}")
+    content_parts.append(annotation.text)
+    return {
+        "target_id": annotation.id,
+        "target_type": "move_annotation",
+        "content": "\n".join(content_parts),
+        "author_id": annotation.author_id,
+    }
+
+
+# Delete event -> target type of the entry it removes
+_DELETED_TYPES = {
+    EventType.DISCUSSION_THREAD_DELETED: "discussion_thread",
+    EventType.DISCUSSION_REPLY_DELETED: "discussion_reply",
+    EventType.STUDY_DELETED: "study",
+    EventType.STUDY_CHAPTER_DELETED: "chapter",
+    EventType.STUDY_MOVE_ANNOTATION_DELETED: "move_annotation",
+}
+
+
 class SearchIndexer:
-    """Update search index from content events."""
+    """
+    Update search index from content events.
+
+    Inline delivery calls the indexer once per event; the outbox dispatcher
+    passes whole batches to handle_batch().
+    """
 
     def __init__(
         self,
@@ -38,175 +124,122 @@ class SearchIndexer:
         self.study_repo = study_repo
         self.variation_repo = variation_repo
 
+    async def __call__(self, event) -> None:
+        await self.handle_event(event)
+
     async def handle_event(self, event) -> None:
+        await self.handle_batch([event])
+
+    async def handle_batch(self, events) -> None:
+        """
+        Apply a batch of events with a single upsert_many.
+
+        Events are applied in order: a delete drops any entry the batch
+        built earlier for the same target.
+        """
+        pending: dict[tuple[str, str], dict] = {}
+        for event in events:
+            target_type = _DELETED_TYPES.get(event.type)
+            if target_type is not None:
+                pending.pop((event.target_id, target_type), None)
+                await self._delete_entry(event.target_id, target_type)
+                continue
+            entry = await self._entry_for(event)
+            if entry is not None:
+                pending[(entry["target_id"], entry["target_type"])] = entry
+        if pending:
+            await self.search_repo.upsert_many(pending.values())
+
+    async def _entry_for(self, event) -> dict | None:
+        """Current search entry for the event's target; None if nothing to index."""
         # Discussion events
         if event.type in {
             EventType.DISCUSSION_THREAD_CREATED,
             EventType.DISCUSSION_THREAD_UPDATED,
         }:
-            await self._index_thread(event.target_id)
-        if event.type == EventType.DISCUSSION_THREAD_DELETED:
-            await self._delete_entry(event.target_id, "discussion_thread")
+            return await self._thread_entry(event.target_id)
         if event.type in {
             EventType.DISCUSSION_REPLY_ADDED,
             EventType.DISCUSSION_REPLY_EDITED,
         }:
-            await self._index_reply(event.target_id)
-        if event.type == EventType.DISCUSSION_REPLY_DELETED:
-            await self._delete_entry(event.target_id, "discussion_reply")
+            return await self._reply_entry(event.target_id)
 
         # Study events
         if event.type in {
             EventType.STUDY_CREATED,
             EventType.STUDY_UPDATED,
         }:
-            await self._index_study(event.target_id)
-        if event.type == EventType.STUDY_DELETED:
-            await self._delete_entry(event.target_id, "study")
+            return await self._study_entry(event.target_id)
 
         # Chapter events
         if event.type in {
             EventType.STUDY_CHAPTER_CREATED,
+            EventType.STUDY_CHAPTER_IMPORTED,
             EventType.STUDY_CHAPTER_RENAMED,
         }:
-            await self._index_chapter(event.target_id)
-        if event.type == EventType.STUDY_CHAPTER_DELETED:
-            await self._delete_entry(event.target_id, "chapter")
+            return await self._chapter_entry(event.target_id)
 
         # Move annotation events
         if event.type in {
             EventType.STUDY_MOVE_ANNOTATION_ADDED,
             EventType.STUDY_MOVE_ANNOTATION_UPDATED,
         }:
-            await self._index_annotation(event.target_id)
-        if event.type == EventType.STUDY_MOVE_ANNOTATION_DELETED:
-            await self._delete_entry(event.target_id, "move_annotation")
+            return await self._annotation_entry(event.target_id)
+        return None
 
-    async def _index_thread(self, thread_id: str) -> None:
+    async def _thread_entry(self, thread_id: str) -> dict | None:
         thread = await self.thread_repo.get_by_id(thread_id)
         if not thread:
-            return
-        content = f"{thread.title}\n{thread.content}"
-        await self.search_repo.upsert(
-            entry_id=str(ULID()),
-            target_id=thread.id,
-            target_type="discussion_thread",
-            content=content,
-            author_id=thread.author_id,
-        )
-
-    async def _index_reply(self, reply_id: str) -> None:
+            return None
+        return thread_entry(thread)
+
+    async def _reply_entry(self, reply_id: str) -> dict | None:
         reply = await self.reply_repo.get_by_id(reply_id)
         if not reply:
-            return
-        await self.search_repo.upsert(
-            entry_id=str(ULID()),
-            target_id=reply.id,
-            target_type="discussion_reply",
-            content=reply.content,
-            author_id=reply.author_id,
-        )
+            return None
+        return reply_entry(reply)
 
     async def _delete_entry(self, target_id: str, target_type: str) -> None:
         await self.search_repo.delete_by_target(target_id, target_type)
 
-    async def _index_study(self, study_id: str) -> None:
-        """Index a study (node title + study description)."""
+    async def _study_entry(self, study_id: str) -> dict | None:
+        """Entry for a study (node title + study description)."""
         if not self.node_repo or not self.study_repo:
-            return
-        # Get node data
+            return None
         node = await self.node_repo.get_by_id(study_id)
         if not node:
-            return
-
-        # Get study data
+            return None
         study = await self.study_repo.get_study_by_id(study_id)
         if not study:
-            return
-
-        # Combine title and description for indexing
-        content_parts = [node.title]
-        if study.description:
-            content_parts.append(study.description)
-        if study.tags:
-            content_parts.append(study.tags)
-
-        content = "\n".join(content_parts)
-
-        await self.search_repo.upsert(
-            entry_id=str(ULID()),
-            target_id=study.id,
-            target_type="study",
-            content=content,
-            author_id=node.owner_id,
-        )
-
-    async def _index_chapter(self, chapter_id: str) -> None:
-        """Index a chapter (title + PGN metadata)."""
+            return None
+        return study_entry(node, study)
+
+    async def _chapter_entry(self, chapter_id: str) -> dict | None:
+        """Entry for a chapter (title + PGN metadata)."""
         if not self.study_repo or not self.node_repo:
-            return
+            return None
         chapter = await self.study_repo.get_chapter_by_id(chapter_id)
         if not chapter:
-            return
-
-        # Build searchable content from chapter metadata
-        content_parts = [chapter.title]
-        if chapter.white:
-            content_parts.append(f"White: {chapter.white}")
-        if chapter.black:
-            content_parts.append(f"Black: {chapter.black}")
-        if chapter.event:
-            content_parts.append(f"Event: {chapter.event}")
-        if chapter.date:
-            content_parts.append(f"Date: {chapter.date}")
-
-        content = "\n".join(content_parts)
+            return None
 
         # Get study owner for author_id
         study = await self.study_repo.get_study_by_id(chapter.study_id)
         if not study:
-            return
-
+            return None
         node = await self.node_repo.get_by_id(study.id)
         if not node:
-            return
-
-        await self.search_repo.upsert(
-            entry_id=str(ULID()),
-            target_id=chapter.id,
-            target_type="chapter",
-            content=content,
-            author_id=node.owner_id,
-        )
-
-    async def _index_annotation(self, annotation_id: str) -> None:
-        """Index a move annotation (analytical text)."""
+            return None
+
+        return chapter_entry(chapter, node.owner_id)
+
+    async def _annotation_entry(self, annotation_id: str) -> dict | None:
+        """Entry for a move annotation (analytical text)."""
         if not self.variation_repo:
-            return
+            return None
         annotation = await self.variation_repo.get_annotation_by_id(annotation_id)
         if not annotation:
-            return
-
-        # Only index if there's text content
-        if not annotation.text:
-            return
-
-        # Build content from NAG + text
-        content_parts = []
-        if annotation.nag:
-            content_parts.append(f"NAG: {annotation.nag}")
-        if annotation.text:
-            content_parts.append(annotation.text)
-
-        content = "\n".join(content_parts)
-
-        await self.search_repo.upsert(
-            entry_id=str(ULID()),
-            target_id=annotation.id,
-            target_type="move_annotation",
-            content=content,
-            author_id=annotation.author_id,
-        )
+            return None
+        return annotation_entry(annotation)
 
 
 def register_search_indexer(
@@ -2,7 +2,8 @@
 Presence cleanup background job.
 
 Periodically cleans up expired presence sessions to prevent
-database bloat and maintain accurate online user counts.
+database bloat and maintain accurate online user counts, and writes
+live sessions from the presence store to the database.
 """
 
 import asyncio
@@ -19,9 +20,10 @@ class PresenceCleanupJob:
     Background job for cleaning up expired presence sessions.
 
     This job should run periodically (e.g., every 5 minutes) to:
-    1. Remove sessions with no heartbeat for > timeout period
-    2. Publish user_left events for expired sessions
-    3. Keep the database clean
+    1. Move sessions without recent heartbeats to idle/away
+    2. Remove sessions with no heartbeat for > timeout period
+    3. Publish user_left events for expired sessions
+    4. Flush changed sessions to the database in one batch
 
     Recommended schedule: Every 5 minutes
     Default timeout: 10 minutes (sessions expire after 10min of no heartbeat)
@@ -55,9 +57,11 @@ class PresenceCleanupJob:
             Number of sessions cleaned up
         """
         try:
+            await self.presence_service.update_all_statuses()
             count = await self.presence_service.cleanup_expired_sessions(
                 timeout_minutes=self.timeout_minutes
             )
+            await self.presence_service.flush_presence()
 
             if count > 0:
                 logger.info(f"Presence cleanup: removed {count} expired sessions")
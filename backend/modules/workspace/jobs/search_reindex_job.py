@@ -0,0 +1,177 @@
+"""
+Search index rebuild / backfill job.
+
+Re-derives every search entry from the source tables (discussion threads
+and replies, studies, chapters, move annotations) using the same entry
+builders as the SearchIndexer subscriber, and optionally deletes entries
+whose target no longer exists.
+
+Sources are read in keyset-paginated pages of batch_size rows, each page
+in its own session and transaction, so memory stays bounded and the job
+can run against a live database.
+
+Usage:
+    python -m modules.workspace.jobs.search_reindex_job [--batch-size N] [--no-prune]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+from typing import Any, Callable
+
+from sqlalchemy import select
+
+from modules.workspace.db.repos.search_index_repo import SearchIndexRepository
+from modules.workspace.db.tables.discussion_replies import DiscussionReply
+from modules.workspace.db.tables.discussion_threads import DiscussionThread
+from modules.workspace.db.tables.nodes import Node
+from modules.workspace.db.tables.studies import Chapter, Study
+from modules.workspace.db.tables.variations import MoveAnnotation
+from modules.workspace.events.subscribers.search_indexer import (
+    annotation_entry,
+    chapter_entry,
+    reply_entry,
+    study_entry,
+    thread_entry,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SearchReindexJob:
+    """
+    Rebuild the search index from source data.
+
+    Each source is (target_type, key column, select statement, row -> entry).
+    """
+
+    def __init__(self, session_maker, batch_size: int = 500, prune: bool = True) -> None:
+        """
+        Initialize reindex job.
+
+        Args:
+            session_maker: Database session maker
+            batch_size: Source rows per page (and per upsert batch)
+            prune: Delete entries whose target no longer exists
+        """
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+        self.prune = prune
+
+    def _sources(self) -> list[tuple[str, Any, Any, Callable[[Any], dict | None]]]:
+        annotated = (MoveAnnotation.text.is_not(None), MoveAnnotation.text != "")
+        return [
+            (
+                "discussion_thread",
+                DiscussionThread.id,
+                select(DiscussionThread),
+                lambda row: thread_entry(row[0]),
+            ),
+            (
+                "discussion_reply",
+                DiscussionReply.id,
+                select(DiscussionReply),
+                lambda row: reply_entry(row[0]),
+            ),
+            (
+                "study",
+                Study.id,
+                select(Study, Node).join(Node, Node.id == Study.id),
+                lambda row: study_entry(row[1], row[0]),
+            ),
+            (
+                "chapter",
+                Chapter.id,
+                select(Chapter, Node.owner_id)
+                .join(Study, Study.id == Chapter.study_id)
+                .join(Node, Node.id == Study.id),
+                lambda row: chapter_entry(row[0], row[1]),
+            ),
+            (
+                "move_annotation",
+                MoveAnnotation.id,
+                select(MoveAnnotation).where(*annotated),
+                lambda row: annotation_entry(row[0]),
+            ),
+        ]
+
+    async def run_once(self) -> dict[str, dict[str, int]]:
+        """
+        Rebuild all entries.
+
+        Returns:
+            Per target type: {"indexed": n, "pruned": n}
+        """
+        stats: dict[str, dict[str, int]] = {}
+        for target_type, key, stmt, build in self._sources():
+            indexed = await self._reindex(key, stmt, build)
+            pruned = 0
+            if self.prune:
+                pruned = await self._prune(target_type, key, stmt)
+            stats[target_type] = {"indexed": indexed, "pruned": pruned}
+            logger.info(f"Search reindex {target_type}: {indexed} indexed, {pruned} pruned")
+        return stats
+
+    async def _reindex(self, key, stmt, build: Callable[[Any], dict | None]) -> int:
+        indexed = 0
+        last_key: str | None = None
+        while True:
+            page = stmt.order_by(key).limit(self.batch_size)
+            if last_key is not None:
+                page = page.where(key > last_key)
+            async with self.session_maker() as session:
+                rows = (await session.execute(page)).all()
+                if not rows:
+                    return indexed
+                entries = [entry for entry in map(build, rows) if entry is not None]
+                indexed += await SearchIndexRepository(session).upsert_many(entries)
+                await session.commit()
+            last_key = getattr(rows[-1][0], key.key)
+
+    async def _prune(self, target_type: str, key, stmt) -> int:
+        live_ids = stmt.with_only_columns(key).scalar_subquery()
+        async with self.session_maker() as session:
+            pruned = await SearchIndexRepository(session).delete_orphans(target_type, live_ids)
+            await session.commit()
+        return pruned
+
+
+def _async_database_url(url: str) -> str:
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+async def main() -> None:
+    """Run the rebuild as a standalone script (uses DATABASE_URL)."""
+    from modules.workspace.db.session import init_db
+
+    parser = argparse.ArgumentParser(description="Rebuild the workspace search index")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--no-prune",
+        action="store_true",
+        help="Only backfill; keep entries whose target no longer exists",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    config = init_db(_async_database_url(os.environ["DATABASE_URL"]))
+    job = SearchReindexJob(
+        config.async_session_maker, batch_size=args.batch_size, prune=not args.no_prune
+    )
+    try:
+        await job.run_once()
+    finally:
+        await config.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
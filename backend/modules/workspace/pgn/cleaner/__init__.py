@@ -13,6 +13,7 @@ from modules.workspace.pgn.cleaner.no_comment_pgn import export_no_comment_pgn
 from modules.workspace.pgn.cleaner.raw_pgn import export_raw_pgn
 from modules.workspace.pgn.cleaner.variation_pruner import (
     MovePath,
+    PathIndex,
     find_node_by_path,
     parse_move_path,
     format_move_path,
@@ -23,6 +24,7 @@ __all__ = [
     "export_no_comment_pgn",
     "export_raw_pgn",
     "MovePath",
+    "PathIndex",
     "find_node_by_path",
     "parse_move_path",
     "format_move_path",
@@ -20,6 +20,7 @@ Example:
 
 from modules.workspace.pgn.cleaner.variation_pruner import (
     MovePath,
+    PathIndex,
     find_node_by_path,
     prune_before_node,
 )
@@ -32,6 +33,7 @@ def clip_pgn_from_move(
     move_path: str | MovePath,
     headers: dict[str, str] | None = None,
     include_headers: bool = True,
+    path_index: PathIndex | None = None,
 ) -> str:
     """
     Clip PGN starting from a specific move.
@@ -46,6 +48,7 @@ def clip_pgn_from_move(
         move_path: Path to the move to clip from (e.g., "main.12" or "main.5.var1.2")
         headers: Optional PGN headers
         include_headers: Whether to include headers in output
+        path_index: Optional PathIndex of `root` (reused across lookups)
 
     Returns:
         PGN text starting from the specified move
@@ -64,13 +67,13 @@ def clip_pgn_from_move(
         >>> pgn = clip_pgn_from_move(root, "main.12", include_headers=False)
     """
     # Find target node
-    target = find_node_by_path(root, move_path)
+    target = find_node_by_path(root, move_path, path_index)
     if target is None:
         path_str = str(move_path) if isinstance(move_path, MovePath) else move_path
         raise ValueError(f"Node not found at path: {path_str}")
 
     # Create new tree with variations pruned before target
-    clipped_tree = prune_before_node(root, target)
+    clipped_tree = prune_before_node(root, target, path_index)
 
     # Generate PGN
     if include_headers:
@@ -83,6 +86,7 @@ def clip_pgn_from_move(
 def clip_pgn_from_move_to_clipboard(
     root: VariationNode,
     move_path: str | MovePath,
+    path_index: PathIndex | None = None,
 ) -> str:
     """
     Clip PGN for clipboard (no headers, ready to paste).
@@ -90,6 +94,7 @@ def clip_pgn_from_move_to_clipboard(
     Args:
         root: Root of the variation tree
         move_path: Path to the move to clip from
+        path_index: Optional PathIndex of `root`
 
     Returns:
         PGN movetext only (no headers)
@@ -98,7 +103,7 @@ def clip_pgn_from_move_to_clipboard(
         >>> movetext = clip_pgn_from_move_to_clipboard(root, "main.12")
         >>> # Can be pasted directly into chess software
     """
-    return clip_pgn_from_move(root, move_path, include_headers=False)
+    return clip_pgn_from_move(root, move_path, include_headers=False, path_index=path_index)
 
 
 def clip_pgn_from_node(
@@ -106,6 +111,7 @@ def clip_pgn_from_node(
     target: VariationNode,
     headers: dict[str, str] | None = None,
     include_headers: bool = True,
+    path_index: PathIndex | None = None,
 ) -> str:
     """
     Clip PGN starting from a specific node object.
@@ -117,6 +123,7 @@ def clip_pgn_from_node(
         target: Target node to clip from
         headers: Optional PGN headers
         include_headers: Whether to include headers in output
+        path_index: Optional PathIndex of `root`
 
     Returns:
         PGN text starting from the target node
@@ -126,7 +133,7 @@ def clip_pgn_from_node(
         >>> pgn = clip_pgn_from_node(root, node)
     """
     # Create new tree with variations pruned before target
-    clipped_tree = prune_before_node(root, target)
+    clipped_tree = prune_before_node(root, target, path_index)
 
     # Generate PGN
     if include_headers:
@@ -140,6 +147,7 @@ def get_clip_preview(
     root: VariationNode,
     move_path: str | MovePath,
     max_moves: int = 5,
+    path_index: PathIndex | None = None,
 ) -> dict[str, any]:
     """
     Get a preview of what will be clipped.
@@ -150,6 +158,7 @@ def get_clip_preview(
         root: Root of the variation tree
         move_path: Path to the move to clip from
         max_moves: Maximum number of moves to show in preview
+        path_index: Optional PathIndex of `root`
 
     Returns:
         Dictionary with preview information:
@@ -166,7 +175,7 @@ def get_clip_preview(
         "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6..."
     """
     # Find target node
-    target = find_node_by_path(root, move_path)
+    target = find_node_by_path(root, move_path, path_index)
     if target is None:
         path_str = str(move_path) if isinstance(move_path, MovePath) else move_path
         raise ValueError(f"Node not found at path: {path_str}")
@@ -178,11 +187,13 @@ def get_clip_preview(
     variations_removed = _count_variations_before_node(root, target)
 
     # Create clipped tree for counting kept variations
-    clipped_tree = prune_before_node(root, target)
+    clipped_tree = prune_before_node(root, target, path_index)
     variations_kept = _count_all_variations(clipped_tree)
 
     # Generate preview text
-    preview_pgn = clip_pgn_from_move(root, move_path, include_headers=False)
+    preview_pgn = clip_pgn_from_move(
+        root, move_path, include_headers=False, path_index=path_index
+    )
     preview_lines = preview_pgn.split("\n")
     preview_text = preview_lines[0][:100] + "..." if preview_lines[0] else ""
 
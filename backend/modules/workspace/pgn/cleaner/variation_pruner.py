@@ -3,11 +3,12 @@ Variation tree navigation and pruning utilities.
 
 This module provides utilities for:
 - Navigating variation trees using move paths (e.g., "main.12.var2.3")
-- Finding specific nodes in the tree
+- Finding specific nodes in the tree (PathIndex resolves paths in O(depth))
 - Pruning variations according to various rules
 - Creating subtrees from specific positions
 """
 
+from collections import deque
 from dataclasses import dataclass
 import logging
 import re
@@ -189,7 +190,9 @@ def format_move_path(segments: list[tuple[Literal["main", "var"], int]]) -> str:
 
 
 def find_node_by_path(
-    root: VariationNode | None, path: MovePath | str
+    root: VariationNode | None,
+    path: MovePath | str,
+    path_index: "PathIndex | None" = None,
 ) -> VariationNode | None:
     """
     Find a node in the variation tree by its path.
@@ -201,6 +204,8 @@ def find_node_by_path(
     Args:
         root: Root of the variation tree
         path: MovePath object or path string
+        path_index: PathIndex of `root`; when given, paths that the greedy walk
+            cannot follow are looked up in it instead of searching the tree
 
     Returns:
         The node at the specified path, or None if not found
@@ -223,6 +228,8 @@ def find_node_by_path(
         black_match = _parse_black_move_notation(path)
         if black_match:
             move_number, san = black_match
+            if path_index is not None:
+                return path_index.black_move(move_number, san)
             return _find_black_move_by_san(root, move_number, san)
         path = parse_move_path(path)
 
@@ -233,7 +240,6 @@ def find_node_by_path(
     failed = False
 
     for seg_type, index in path.segments:
-        print(f"DEBUG: Segment {seg_type}.{index} | Current: {current} | Parent: {parent}")
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
                 "Traversing path segment: %s.%s (current=%s, move=%s%s)",
@@ -311,7 +317,9 @@ def find_node_by_path(
             in_variation = True
 
     if failed:
-        return _find_node_by_path_bfs(root, path)
+        if path_index is None:
+            path_index = PathIndex(root)
+        return path_index.node(path)
 
     if current is None:
         return None
@@ -319,19 +327,6 @@ def find_node_by_path(
     return current
 
 
-def _find_node_by_path_bfs(
-    root: VariationNode, path: MovePath
-) -> VariationNode | None:
-    queue = [root]
-    while queue:
-        node = queue.pop(0)
-        node_path = get_path_to_node(root, node)
-        if node_path and node_path.segments == path.segments:
-            return node
-        queue.extend(node.children)
-    return None
-
-
 def _select_variation_child(
     current: VariationNode, parent: VariationNode | None, var_rank: int
 ) -> VariationNode | None:
@@ -383,9 +378,9 @@ def _parse_black_move_notation(path_str: str) -> tuple[int, str] | None:
 def _find_black_move_by_san(
     root: VariationNode, move_number: int, san: str
 ) -> VariationNode | None:
-    queue = [root]
+    queue = deque([root])
     while queue:
-        node = queue.pop(0)
+        node = queue.popleft()
         if (
             node.color == "black"
             and node.move_number == move_number
@@ -410,43 +405,78 @@ def get_path_to_node(
         MovePath to the target, or None if target not in tree
 
     Note:
-        This performs a breadth-first search to find the target node,
-        then reconstructs the path.
+        This builds a PathIndex of the whole tree; callers resolving more
+        than one node should build the index once and reuse it.
     """
-    # BFS to find target and track parents
-    queue = [(root, [])]
+    return PathIndex(root).path(target)
 
-    while queue:
-        node, path = queue.pop(0)
 
-        if node is target:
-            return MovePath(segments=path) if path else None
-
-        # Add children to queue
-        for child in node.children:
-            new_path = path.copy()
+class PathIndex:
+    """
+    Move path <-> node lookup tables for one variation tree.
 
-            if child.rank == 0:
-                # Main line continuation
-                # Determine move number
-                if not new_path:
-                    # First move
-                    new_path.append(("main", 1))
-                else:
-                    # Increment move count
-                    last_seg_type, last_index = new_path[-1]
-                    if last_seg_type == "main":
-                        new_path.append(("main", last_index + 1))
-                    else:
-                        new_path.append(("main", 1))
-            else:
-                # Variation
-                new_path.append(("var", child.rank))
-                new_path.append(("main", 1))
+    Built once in a single breadth-first pass, so resolving a path or the
+    path of a node afterwards is a dict lookup and walking from the root to
+    a node is O(depth). The index refers to the tree's nodes by identity:
+    build a new one if the tree is modified.
 
-            queue.append((child, new_path))
+    Paths follow get_path_to_node: a rank-0 child continues the current
+    line ("main.N" -> "main.N+1"), a rank-k child opens "vark.1". When two
+    nodes share a path, the first one in breadth-first order wins.
+    """
 
-    return None
+    def __init__(self, root: VariationNode):
+        self.root = root
+        self._nodes: dict[tuple[tuple[str, int], ...], VariationNode] = {}
+        self._paths: dict[int, tuple[tuple[str, int], ...]] = {}
+        self._parents: dict[int, VariationNode] = {}
+        self._black_moves: dict[tuple[int, str], VariationNode] = {}
+
+        queue = deque([(root, ())])
+        while queue:
+            node, segments = queue.popleft()
+            self._paths[id(node)] = segments
+            if segments:
+                self._nodes.setdefault(segments, node)
+            if node.color == "black":
+                self._black_moves.setdefault((node.move_number, node.san), node)
+            for child in node.children:
+                self._parents[id(child)] = node
+                if child.rank != 0:
+                    child_segments = segments + (("var", child.rank), ("main", 1))
+                elif segments:
+                    child_segments = segments[:-1] + (("main", segments[-1][1] + 1),)
+                else:
+                    child_segments = (("main", 1),)
+                queue.append((child, child_segments))
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def node(self, path: MovePath | str) -> VariationNode | None:
+        """Node whose get_path_to_node() path equals `path`."""
+        if isinstance(path, str):
+            path = parse_move_path(path)
+        return self._nodes.get(tuple(path.segments))
+
+    def path(self, node: VariationNode) -> MovePath | None:
+        """Path of `node`, or None for the root or a node not in the tree."""
+        segments = self._paths.get(id(node))
+        return MovePath(segments=list(segments)) if segments else None
+
+    def black_move(self, move_number: int, san: str) -> VariationNode | None:
+        """First black move (breadth-first) with this move number and SAN."""
+        return self._black_moves.get((move_number, san))
+
+    def nodes_to(self, node: VariationNode) -> list[VariationNode] | None:
+        """Nodes from the root down to `node` (inclusive), or None."""
+        if id(node) not in self._paths:
+            return None
+        nodes = [node]
+        while nodes[-1] is not self.root:
+            nodes.append(self._parents[id(nodes[-1])])
+        nodes.reverse()
+        return nodes
 
 
 def copy_tree(node: VariationNode) -> VariationNode:
@@ -492,7 +522,9 @@ def copy_tree(node: VariationNode) -> VariationNode:
 
 
 def prune_before_node(
-    root: VariationNode, target: VariationNode
+    root: VariationNode,
+    target: VariationNode,
+    path_index: PathIndex | None = None,
 ) -> VariationNode:
     """
     Create a new tree that starts from target node, removing all variations
@@ -501,6 +533,7 @@ def prune_before_node(
     Args:
         root: Root of the variation tree
         target: Target node to start from
+        path_index: PathIndex of `root`, to reuse an index built by the caller
 
     Returns:
         New tree starting from target, with mainline path preserved
@@ -514,22 +547,9 @@ def prune_before_node(
 
         All variations before Nf3 are removed, but the path to it is kept.
     """
-    def find_path_nodes(
-        node: VariationNode, target_node: VariationNode
-    ) -> list[VariationNode] | None:
-        # Iterative path finding
-        # Stack: (node, path_so_far)
-        stack = [(node, [node])]
-        while stack:
-            curr, path = stack.pop()
-            if curr is target_node:
-                return path
-            
-            for child in curr.children:
-                stack.append((child, path + [child]))
-        return None
-
-    path_nodes = find_path_nodes(root, target)
+    if path_index is None:
+        path_index = PathIndex(root)
+    path_nodes = path_index.nodes_to(target)
     if not path_nodes:
         return _copy_tree_with_normalized_ranks(target, rank=0)
 
@@ -7,6 +7,8 @@ and generates standard PGN movetext format.
 DEPRECATED: Use backend.core.real_pgn for new PGN processing.
 """
 
+from typing import Iterator
+
 from modules.workspace.pgn.serializer.to_tree import VariationNode
 
 
@@ -43,14 +45,68 @@ def _format_move_with_number(
             return san
 
 
+def _line_tokens(
+    node: VariationNode, prev_color: str | None
+) -> Iterator[str | VariationNode]:
+    """
+    Yield the PGN tokens of the line starting at `node`.
+
+    A nested variation is yielded as its first VariationNode; the caller
+    serializes it (in parentheses) before resuming this line.
+    """
+    # Alternatives to the first move of a line sit among its children with
+    # the same side to move; alternatives to a later move are its siblings.
+    first_move_alternatives = [
+        child for child in node.children
+        if child.rank > 0 and child.color == node.color
+    ]
+    skipped = {id(child) for child in first_move_alternatives}
+
+    yield _format_move_with_number(node, prev_color)
+    if node.comment:
+        yield f"{{ {node.comment} }}"
+    yield from sorted(first_move_alternatives, key=lambda x: x.rank)
+
+    current_node: VariationNode | None = node
+    current_prev_color = node.color if not first_move_alternatives else None
+
+    while current_node:
+        children = [
+            child for child in current_node.children
+            if not (current_node is node and id(child) in skipped)
+        ]
+        main_child = next((child for child in children if child.rank == 0), None)
+        alternatives = sorted(
+            (child for child in children if child is not main_child),
+            key=lambda x: x.rank,
+        )
+        if main_child is None and alternatives:
+            main_child = alternatives.pop(0)
+        if main_child is None:
+            break
+
+        # Main continuation first, then its alternatives (standard PGN order)
+        yield _format_move_with_number(main_child, current_prev_color)
+        if main_child.comment:
+            yield f"{{ {main_child.comment} }}"
+        yield from alternatives
+
+        # After a variation the next move needs its number again
+        current_prev_color = main_child.color if not alternatives else None
+        current_node = main_child
+
+
 def _serialize_node(
     node: VariationNode,
     prev_color: str | None = None,
     is_variation: bool = False,
 ) -> str:
     """
-    Recursively serialize a variation node to PGN text.
-    Iterative for main line to prevent recursion depth exceeded.
+    Serialize a variation node to PGN text.
+
+    Nested variations are handled with an explicit stack of line
+    generators writing to one token buffer, so neither line length nor
+    variation depth is bounded by the recursion limit.
 
     Args:
         node: Variation node to serialize
@@ -60,47 +116,21 @@ def _serialize_node(
     Returns:
         PGN movetext string
     """
-    full_result = []
-    
-    current_node: VariationNode | None = node
-    current_prev_color = prev_color
-    
-    while current_node:
-        # Format current move
-        move_str = _format_move_with_number(current_node, current_prev_color)
-        full_result.append(move_str)
-
-        # Add comment if present
-        if current_node.comment:
-            full_result.append(f"{{ {current_node.comment} }}")
-
-        # Process children
-        if current_node.children:
-            # Separate main line (rank=0) from alternatives
-            main_child = next(
-                (child for child in current_node.children if child.rank == 0), None
-            )
-            alternatives = [
-                child for child in current_node.children if child.rank > 0
-            ]
-
-            # Serialize alternatives first (they appear before main continuation)
-            for alt in sorted(alternatives, key=lambda x: x.rank):
-                # Pass None as prev_color so variation starts with full move number
-                # Recursion is safe here as variation depth is typically low
-                alt_text = _serialize_node(alt, None, is_variation=True)
-                full_result.append(f"( {alt_text} )")
-
-            # Proceed to main line (iterative)
-            if main_child:
-                current_prev_color = current_node.color
-                current_node = main_child
-            else:
-                current_node = None
+    tokens: list[str] = []
+    stack = [_line_tokens(node, prev_color)]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            if stack:
+                tokens.append(")")
+        elif isinstance(item, str):
+            tokens.append(item)
         else:
-            current_node = None
-
-    return " ".join(full_result)
+            # Variations start with a full move number
+            tokens.append("(")
+            stack.append(_line_tokens(item, None))
+    return " ".join(tokens)
 
 
 def tree_to_pgn(
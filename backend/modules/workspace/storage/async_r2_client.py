@@ -0,0 +1,137 @@
+"""
+Async R2 storage client.
+
+boto3 is synchronous, so every R2 round trip made directly from an async
+endpoint or service blocks the event loop. AsyncR2Client wraps an R2Client
+and runs each call on a bounded, process-wide thread pool. The wrapped
+boto3 client keeps its own HTTP connection pool sized to match, so the
+pool threads share connections instead of opening new ones.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+from modules.workspace.storage.r2_client import (
+    DEFAULT_MAX_POOL_CONNECTIONS,
+    R2Client,
+    UploadResult,
+    create_r2_client_from_env,
+)
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_storage_executor() -> ThreadPoolExecutor:
+    """
+    Return the shared thread pool used for blocking storage calls.
+
+    Env:
+        R2_IO_THREADS: Pool size (default: R2_MAX_POOL_CONNECTIONS, 32)
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("R2_IO_THREADS", str(DEFAULT_MAX_POOL_CONNECTIONS))),
+                    thread_name_prefix="r2-io",
+                )
+    return _executor
+
+
+async def run_in_storage_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking storage call on the shared pool and await its result.
+
+    Use this for helpers built on R2Client (e.g. PgnV2Repo) so they do not
+    block the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_storage_executor(), partial(func, *args, **kwargs))
+
+
+class AsyncR2Client:
+    """
+    Awaitable facade over R2Client.
+
+    Method names and signatures mirror R2Client. Exceptions raised by the
+    wrapped client (e.g. ClientError) propagate unchanged.
+    """
+
+    def __init__(self, client: R2Client):
+        """
+        Initialize async client.
+
+        Args:
+            client: Synchronous R2Client (or a compatible test double)
+        """
+        self.sync = client
+
+    async def upload_pgn(
+        self,
+        key: str,
+        content: str | bytes,
+        content_type: str = "application/x-chess-pgn",
+        metadata: dict[str, str] | None = None,
+    ) -> UploadResult:
+        return await run_in_storage_executor(
+            self.sync.upload_pgn, key, content, content_type=content_type, metadata=metadata
+        )
+
+    async def download_pgn(self, key: str) -> str:
+        return await run_in_storage_executor(self.sync.download_pgn, key)
+
+    async def download_pgn_bytes(self, key: str) -> bytes:
+        return await run_in_storage_executor(self.sync.download_pgn_bytes, key)
+
+    async def exists(self, key: str) -> bool:
+        return await run_in_storage_executor(self.sync.exists, key)
+
+    async def delete(self, key: str) -> None:
+        await run_in_storage_executor(self.sync.delete, key)
+
+    async def get_metadata(self, key: str) -> dict[str, str]:
+        return await run_in_storage_executor(self.sync.get_metadata, key)
+
+    async def get_etag(self, key: str) -> str:
+        return await run_in_storage_executor(self.sync.get_etag, key)
+
+    async def list_keys(self, prefix: str = "", max_keys: int = 1000) -> list[str]:
+        return await run_in_storage_executor(self.sync.list_keys, prefix, max_keys)
+
+    async def upload_json(
+        self,
+        key: str,
+        content: str | bytes,
+        metadata: dict[str, str] | None = None,
+    ) -> UploadResult:
+        return await run_in_storage_executor(self.sync.upload_json, key, content, metadata=metadata)
+
+    async def download_json(self, key: str) -> str:
+        return await run_in_storage_executor(self.sync.download_json, key)
+
+
+def as_async_r2_client(client: "R2Client | AsyncR2Client") -> AsyncR2Client:
+    """Wrap a synchronous client; async clients are returned unchanged."""
+    if isinstance(client, AsyncR2Client):
+        return client
+    return AsyncR2Client(client)
+
+
+def create_async_r2_client_from_env() -> AsyncR2Client:
+    """
+    Create async R2 client from environment variables.
+
+    Wraps the shared client returned by create_r2_client_from_env().
+
+    Raises:
+        ValueError: If required env vars are missing
+    """
+    return AsyncR2Client(create_r2_client_from_env())
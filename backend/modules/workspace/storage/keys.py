@@ -8,7 +8,8 @@ Key Structure:
 - raw/{upload_id}.pgn          : Original uploaded PGN files (optional retention)
 - chapters/{chapter_id}.pgn    : Normalized chapter PGN files
 - exports/{job_id}.{pgn|zip}   : Export artifacts
-- snapshots/{study_id}/{version}.json : Version snapshots
+- snapshots/{study_id}/{version}.json : Version snapshot manifests
+- snapshots/{study_id}/blobs/{sha256} : Compressed snapshot blobs (shared by versions)
 """
 
 from typing import Literal
@@ -71,6 +72,20 @@ class R2Keys:
         """
         return f"{R2KeyPrefix.CHAPTERS}/{chapter_id}.tree.json"
 
+    @staticmethod
+    def chapter_tree_ops_json(chapter_id: str) -> str:
+        """
+        Generate key for the chapter tree op journal (edits not yet compacted
+        into the tree JSON).
+
+        Args:
+            chapter_id: Unique chapter identifier
+
+        Returns:
+            Key like: chapters/chapter_abc123.tree.ops.json
+        """
+        return f"{R2KeyPrefix.CHAPTERS}/{chapter_id}.tree.ops.json"
+
     @staticmethod
     def chapter_fen_index_json(chapter_id: str) -> str:
         """
@@ -125,6 +140,20 @@ class R2Keys:
         """
         return f"{R2KeyPrefix.SNAPSHOTS}/{study_id}/{version}.json"
 
+    @staticmethod
+    def version_snapshot_blob(study_id: str, blob_hash: str) -> str:
+        """
+        Generate key for a content-addressed snapshot blob.
+
+        Args:
+            study_id: Study identifier
+            blob_hash: SHA-256 of the blob's canonical JSON
+
+        Returns:
+            Key like: snapshots/study_abc123/blobs/9f86d08...
+        """
+        return f"{R2KeyPrefix.SNAPSHOTS}/{study_id}/blobs/{blob_hash}"
+
     @staticmethod
     def list_prefix_for_study_snapshots(study_id: str) -> str:
         """
@@ -5,14 +5,22 @@ Uses S3-compatible API (boto3) to interact with Cloudflare R2.
 """
 
 import hashlib
+import os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import BinaryIO
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 
-@dataclass
+# Connections kept open per client. Matches the storage executor size so
+# every worker thread can hold a connection without waiting for the pool.
+DEFAULT_MAX_POOL_CONNECTIONS = int(os.getenv("R2_MAX_POOL_CONNECTIONS", "32"))
+
+
+@dataclass(frozen=True)
 class R2Config:
     """
     R2 connection configuration.
@@ -22,12 +30,14 @@ class R2Config:
         access_key: Access key ID
         secret_key: Secret access key
         bucket: Bucket name
+        max_pool_connections: HTTP connection pool size shared by threads
     """
 
     endpoint: str
     access_key: str
     secret_key: str
     bucket: str
+    max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS
 
 
 @dataclass
@@ -71,6 +81,7 @@ class R2Client:
             aws_access_key_id=config.access_key,
             aws_secret_access_key=config.secret_key,
             region_name="auto",  # R2 uses "auto" region
+            config=Config(max_pool_connections=config.max_pool_connections),
         )
 
     def upload_pgn(
@@ -334,10 +345,19 @@ class R2Client:
         return content_bytes.decode("utf-8")
 
 
+@lru_cache(maxsize=8)
+def _shared_r2_client(config: R2Config) -> R2Client:
+    """Return one pooled client per configuration (boto3 clients are thread-safe)."""
+    return R2Client(config)
+
+
 def create_r2_client_from_env() -> R2Client:
     """
     Create R2 client from environment variables.
 
+    Clients are shared per configuration, so repeated calls reuse the same
+    connection pool instead of opening new connections per request.
+
     Expected variables:
     - R2_ENDPOINT
     - R2_ACCESS_KEY
@@ -350,8 +370,6 @@ def create_r2_client_from_env() -> R2Client:
     Raises:
         ValueError: If required env vars are missing
     """
-    import os
-
     endpoint = os.getenv("R2_ENDPOINT")
     access_key = os.getenv("R2_ACCESS_KEY")
     secret_key = os.getenv("R2_SECRET_KEY")
@@ -370,4 +388,4 @@ def create_r2_client_from_env() -> R2Client:
         bucket=bucket,
     )
 
-    return R2Client(config)
+    return _shared_r2_client(config)
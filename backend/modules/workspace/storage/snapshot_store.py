@@ -0,0 +1,193 @@
+"""
+Content-addressed storage for version snapshots.
+
+A version snapshot is a small manifest (at R2Keys.version_snapshot) that
+references blobs by the SHA-256 of their canonical JSON:
+
+    {
+        "format": "cas/v1",
+        "version_number": 3,
+        "study_id": "...",
+        "timestamp": "...",
+        "study_data": {"hash": ..., "codec": "zstd", "size": ...},
+        "chapters": [{"id": "ch1", "hash": ..., "codec": ..., "size": ...}, ...],
+        "variations": {...},
+        "annotations": {...}
+    }
+
+Blobs live once per study under snapshots/{study_id}/blobs/{hash}, so a
+chapter that did not change between versions is stored (and uploaded)
+once. Blobs are compressed with zstd, or gzip when the zstandard package
+is not installed; the codec is recorded in each reference.
+
+Snapshots written before this format are plain SnapshotContent JSON and
+are still readable (see is_manifest).
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+from typing import Any, Iterable
+
+from modules.workspace.domain.models.version import SnapshotContent
+from modules.workspace.storage.async_r2_client import AsyncR2Client
+from modules.workspace.storage.keys import R2Keys
+
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+MANIFEST_FORMAT = "cas/v1"
+DEFAULT_CODEC = "zstd" if HAS_ZSTD else "gzip"
+
+_CONTENT_TYPES = {"zstd": "application/zstd", "gzip": "application/gzip"}
+
+
+def canonical_json(value: Any) -> bytes:
+    """Stable JSON encoding used for blob hashes."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    if codec == "gzip":
+        return gzip.compress(data, mtime=0)
+    raise ValueError(f"Unknown snapshot codec: {codec}")
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if not HAS_ZSTD:
+            raise RuntimeError("zstandard is required to read zstd snapshot blobs")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    raise ValueError(f"Unknown snapshot codec: {codec}")
+
+
+def is_manifest(data: Any) -> bool:
+    return isinstance(data, dict) and data.get("format") == MANIFEST_FORMAT
+
+
+def manifest_refs(manifest: dict[str, Any]) -> list[dict[str, Any]]:
+    """All blob references in a manifest."""
+    return [
+        manifest["study_data"],
+        *manifest["chapters"],
+        manifest["variations"],
+        manifest["annotations"],
+    ]
+
+
+def manifest_blob_keys(manifest: dict[str, Any]) -> list[str]:
+    """R2 keys of the blobs a manifest references."""
+    study_id = manifest["study_id"]
+    return [R2Keys.version_snapshot_blob(study_id, ref["hash"]) for ref in manifest_refs(manifest)]
+
+
+def build_manifest(
+    content: SnapshotContent,
+    version_number: int,
+    known: dict[str, dict[str, Any]] | None = None,
+    codec: str = DEFAULT_CODEC,
+) -> tuple[dict[str, Any], dict[str, bytes]]:
+    """
+    Split snapshot content into a manifest and its blobs.
+
+    Args:
+        content: Full study state
+        version_number: Version the manifest describes
+        known: Blob references already stored for this study, by hash
+        codec: Compression for new blobs
+
+    Returns:
+        (manifest, {hash: compressed bytes} for blobs not in `known`)
+    """
+    known = known or {}
+    new_blobs: dict[str, bytes] = {}
+
+    def ref(value: Any) -> dict[str, Any]:
+        raw = canonical_json(value)
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest in known:
+            return dict(known[digest])
+        if digest not in new_blobs:
+            new_blobs[digest] = compress(raw, codec)
+        return {"hash": digest, "codec": codec, "size": len(raw)}
+
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "version_number": version_number,
+        "study_id": content.study_id,
+        "timestamp": content.timestamp.isoformat(),
+        "study_data": ref(content.study_data),
+        "chapters": [{"id": chapter.get("id"), **ref(chapter)} for chapter in content.chapters],
+        "variations": ref(content.variations),
+        "annotations": ref(content.annotations),
+    }
+    return manifest, new_blobs
+
+
+def known_refs(manifest: dict[str, Any] | None) -> dict[str, dict[str, Any]]:
+    """Blob references of a previous manifest, by hash (for deduplication)."""
+    if not is_manifest(manifest):
+        return {}
+    return {
+        ref["hash"]: {"hash": ref["hash"], "codec": ref["codec"], "size": ref["size"]}
+        for ref in manifest_refs(manifest)
+    }
+
+
+async def upload_blobs(
+    storage: AsyncR2Client,
+    study_id: str,
+    blobs: dict[str, bytes],
+    codec: str = DEFAULT_CODEC,
+) -> int:
+    """Upload blobs concurrently; returns the number of bytes written."""
+    await asyncio.gather(
+        *(
+            storage.upload_pgn(
+                R2Keys.version_snapshot_blob(study_id, digest),
+                data,
+                content_type=_CONTENT_TYPES[codec],
+            )
+            for digest, data in blobs.items()
+        )
+    )
+    return sum(len(data) for data in blobs.values())
+
+
+async def load_blobs(
+    storage: AsyncR2Client, study_id: str, refs: Iterable[dict[str, Any]]
+) -> dict[str, Any]:
+    """Download and decode blobs concurrently; returns {hash: value}."""
+    unique = {ref["hash"]: ref for ref in refs}
+
+    async def load(ref: dict[str, Any]) -> Any:
+        data = await storage.download_pgn_bytes(R2Keys.version_snapshot_blob(study_id, ref["hash"]))
+        return json.loads(decompress(data, ref["codec"]))
+
+    values = await asyncio.gather(*(load(ref) for ref in unique.values()))
+    return dict(zip(unique, values))
+
+
+async def load_snapshot(storage: AsyncR2Client, manifest: dict[str, Any]) -> SnapshotContent:
+    """Rebuild full snapshot content from a manifest."""
+    blobs = await load_blobs(storage, manifest["study_id"], manifest_refs(manifest))
+    return SnapshotContent.from_dict(
+        {
+            "version_number": manifest["version_number"],
+            "study_id": manifest["study_id"],
+            "timestamp": manifest["timestamp"],
+            "study_data": blobs[manifest["study_data"]["hash"]],
+            "chapters": [blobs[ref["hash"]] for ref in manifest["chapters"]],
+            "variations": blobs[manifest["variations"]["hash"]],
+            "annotations": blobs[manifest["annotations"]["hash"]],
+        }
+    )
@@ -13,9 +13,11 @@ import pytest
 
 from modules.workspace.pgn.cleaner.variation_pruner import (
     MovePath,
+    PathIndex,
     parse_move_path,
     format_move_path,
     find_node_by_path,
+    get_path_to_node,
     prune_before_node,
     remove_comments,
     extract_mainline,
@@ -292,6 +294,80 @@ class TestFindNodeByPath:
         assert node is None
 
 
+class TestPathIndex:
+    """Test the precomputed move path index."""
+
+    @staticmethod
+    def _all_nodes(root):
+        nodes, stack = [], [root]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(node.children)
+        return nodes
+
+    @staticmethod
+    def _line(plies):
+        root = VariationNode(move_number=0, color="black", san="", uci="", fen="")
+        current = root
+        for ply in range(plies):
+            child = VariationNode(
+                move_number=ply // 2 + 1,
+                color="white" if ply % 2 == 0 else "black",
+                san="Nf3" if ply % 4 < 2 else "Ng1",
+                uci="",
+                fen="",
+            )
+            current.children.append(child)
+            current = child
+        return root, current
+
+    def test_index_matches_path_search(self, nested_tree, rank2_nested_tree):
+        """Index paths agree with get_path_to_node and find_node_by_path."""
+        for tree in (nested_tree, rank2_nested_tree):
+            index = PathIndex(tree)
+            for node in self._all_nodes(tree):
+                path = get_path_to_node(tree, node)
+                assert index.path(node) == path
+                if path is not None:
+                    assert index.node(path) is node
+                    assert find_node_by_path(tree, str(path), index) is find_node_by_path(
+                        tree, str(path)
+                    )
+
+    def test_black_move_lookup(self, variations_tree):
+        """Black move notation resolves through the index."""
+        index = PathIndex(variations_tree)
+        node = find_node_by_path(variations_tree, "main.1...c5", index)
+        assert node is find_node_by_path(variations_tree, "main.1...c5")
+        assert node.san == "c5"
+
+    def test_nodes_to_target(self, variations_tree):
+        """nodes_to returns the root-to-node chain."""
+        index = PathIndex(variations_tree)
+        target = find_node_by_path(variations_tree, "main.1.var1.1", index)
+        chain = index.nodes_to(target)
+        assert chain[0] is variations_tree
+        assert chain[-1] is target
+        assert index.nodes_to(VariationNode(1, "white", "e4", "e2e4", "")) is None
+
+    def test_deep_line(self):
+        """Paths in a long line resolve without per-node searches."""
+        root, last = self._line(4000)
+        index = PathIndex(root)
+
+        assert len(index) == 4001
+        assert index.node("main.4000") is last
+        assert str(index.path(last)) == "main.4000"
+        assert len(index.nodes_to(last)) == 4001
+        assert prune_before_node(root, last, index).children[0].san == "Nf3"
+
+    def test_lookup_writes_nothing_to_stdout(self, nested_tree, capsys):
+        """Path traversal does not print debug output."""
+        find_node_by_path(nested_tree, "main.2.var1.2.var1.1")
+        assert capsys.readouterr().out == ""
+
+
 # ===== PGN Clipping Tests =====
 
 
@@ -24,8 +24,9 @@ from core.db.deps import get_db
 from services.user_service import authenticate_user, create_user, get_user_by_identifier
 from services.signup_verification_service import SignupVerificationService
 from services.resend_email_service import ResendEmailService
-from core.security.jwt import create_access_token
-from core.security.current_user import get_current_user
+from core.security.jwt import create_access_token, decode_token_claims
+from core.security.current_user import get_current_user, oauth2_scheme
+from core.security.principal_cache import revoke_token
 from core.security.rate_limiter import rate_limit
 from core.log.log_api import logger
 from core.errors import UserAlreadyExistsError, get_error_response, get_http_status_code
@@ -315,13 +316,16 @@ class LogoutResponse(BaseModel):
 @router.post("/logout", response_model=LogoutResponse)
 def logout(
     current_user: User = Depends(get_current_user),
+    token: str = Depends(oauth2_scheme),
 ):
     """
     Logout current user.
 
-    Since we use JWT tokens (stateless authentication), the actual logout
-    happens on the client side by deleting the stored token.
-    This endpoint simply confirms the logout and logs the event.
+    Since we use JWT tokens (stateless authentication), the client must
+    still delete the stored token. This endpoint also revokes the token id
+    and drops this worker's cached principal. The revocation is shared with
+    every worker through Redis (REDIS_URL) until the token expires; without
+    Redis it only applies to the worker that handled the logout.
 
     The client should:
     1. Call this endpoint
@@ -339,6 +343,10 @@ def logout(
     """
     logger.info(f"Logout: {current_user.username} (id={current_user.id})")
 
+    claims = decode_token_claims(token)
+    if claims:
+        revoke_token(claims)
+
     return LogoutResponse(
         success=True,
         message="Logged out successfully",
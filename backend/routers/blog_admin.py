@@ -5,6 +5,8 @@ from fastapi import APIRouter, HTTPException
 from sqlalchemy import create_engine, text
 import os
 
+from core.security.principal_cache import invalidate_principal
+
 router = APIRouter(prefix="/api/blog-admin", tags=["Blog Admin"])
 
 
@@ -149,6 +151,8 @@ async def setup_user_permissions():
                     {"user_id": user_id}
                 )
             conn.commit()
+            for user_id in admin_ids:
+                invalidate_principal(user_id)
 
             # Step 4: Verify changes
             result = conn.execute(text("""
@@ -7,6 +7,7 @@ IMPORTANT: All chess logic is handled in the service layer.
 Frontend only triggers events through these endpoints.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from core.db.deps import get_db
@@ -62,7 +63,8 @@ async def save_move(
     Frontend only needs to send move data, all logic is here.
     """
     try:
-        success, move_id, pgn_preview = game_storage_service.save_move(
+        success, move_id, pgn_preview = await run_in_threadpool(
+            game_storage_service.save_move,
             game_id=request.game_id,
             user_id=str(current_user.id),
             move_data=request.move.dict(),
@@ -107,7 +109,8 @@ async def start_variation(
     Backend handles the variation stack using PGNWriterVari.
     """
     try:
-        variation_id = game_storage_service.start_variation(
+        variation_id = await run_in_threadpool(
+            game_storage_service.start_variation,
             game_id=request.game_id,
             user_id=str(current_user.id),
             db=db,
@@ -138,7 +141,8 @@ async def end_variation(
     Returns to the mainline.
     """
     try:
-        game_storage_service.end_variation(
+        await run_in_threadpool(
+            game_storage_service.end_variation,
             game_id=request.game_id,
             user_id=str(current_user.id),
             db=db,
@@ -165,7 +169,8 @@ async def add_comment(
     If move_id is not provided, adds comment to last move.
     """
     try:
-        game_storage_service.add_comment(
+        await run_in_threadpool(
+            game_storage_service.add_comment,
             game_id=request.game_id,
             user_id=str(current_user.id),
             comment=request.comment,
@@ -201,7 +206,8 @@ async def add_nag(
     If move_id is not provided, adds NAG to last move.
     """
     try:
-        game_storage_service.add_nag(
+        await run_in_threadpool(
+            game_storage_service.add_nag,
             game_id=request.game_id,
             user_id=str(current_user.id),
             nag=request.nag,
@@ -232,7 +238,8 @@ async def get_pgn(
     - Comments and NAGs
     """
     try:
-        pgn, move_count = game_storage_service.get_pgn(
+        pgn, move_count = await run_in_threadpool(
+            game_storage_service.get_pgn,
             game_id=game_id,
             user_id=str(current_user.id),
             db=db,
@@ -331,7 +338,8 @@ async def get_game(
     - Timestamps
     """
     try:
-        game_info = game_storage_service.get_game_info(
+        game_info = await run_in_threadpool(
+            game_storage_service.get_game_info,
             game_id=game_id,
             user_id=str(current_user.id),
             db=db,
@@ -369,7 +377,8 @@ async def delete_game(
     - In-memory session cache
     """
     try:
-        success = game_storage_service.delete_game(
+        success = await run_in_threadpool(
+            game_storage_service.delete_game,
             game_id=game_id,
             user_id=str(current_user.id),
             db=db,
@@ -4,6 +4,7 @@ Tagger Players Router - 棋手与上传 API
 import re
 import uuid
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, status, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from modules.tagger.db import get_tagger_db
@@ -70,7 +71,8 @@ async def get_player(player_id: uuid.UUID, svc: TaggerService = Depends(get_serv
 
 @router.delete("/players/{player_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_player(player_id: uuid.UUID, svc: TaggerService = Depends(get_service)):
-    if not svc.delete_player(player_id):
+    # R2 deletes and DB work are blocking; keep them off the event loop.
+    if not await run_in_threadpool(svc.delete_player, player_id):
         raise HTTPException(404, "Player not found")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -79,7 +81,7 @@ async def delete_player(player_id: uuid.UUID, svc: TaggerService = Depends(get_s
 async def recompute_player(player_id: uuid.UUID, svc: TaggerService = Depends(get_service)):
     if not svc.get_player(player_id):
         raise HTTPException(404, "Player not found")
-    uploads = svc.recompute_player(player_id)
+    uploads = await run_in_threadpool(svc.recompute_player, player_id)
     items = [svc.get_upload_status(u.id) for u in uploads]
     return UploadListResponse(uploads=[UploadResponse(**i) for i in items if i], total=len(items))
 
@@ -101,7 +103,8 @@ async def upload_pgn(
         raise HTTPException(400, "Invalid tagger mode")
     content = await file.read()
     upload_user_id = uuid.uuid4()  # TODO: 从 auth 获取
-    upload = svc.create_upload(
+    upload = await run_in_threadpool(
+        svc.create_upload,
         player_id,
         content,
         file.filename or "upload.pgn",
@@ -10,6 +10,7 @@ from typing import List, Optional
 import os
 
 from core.security.current_user import get_current_user_dep
+from core.security.principal_cache import invalidate_principal
 from models.user import User
 
 router = APIRouter(prefix="/api/admin/roles", tags=["User Role Management"])
@@ -146,6 +147,7 @@ async def update_user_role(
             raise HTTPException(status_code=404, detail="User not found")
 
         db.commit()
+        invalidate_principal(updated[0])
 
         return {
             "success": True,
@@ -183,28 +185,31 @@ async def batch_update_roles(
         )
 
     try:
-        updated_count = 0
+        updated_ids = []
 
         if request.user_ids:
             # Update by user_ids
             for user_id in request.user_ids:
                 result = db.execute(
-                    text("UPDATE users SET role = :role WHERE id = :user_id"),
+                    text("UPDATE users SET role = :role WHERE id = :user_id RETURNING id"),
                     {"role": request.new_role, "user_id": user_id}
                 )
-                updated_count += result.rowcount
+                updated_ids.extend(row[0] for row in result)
         elif request.emails:
             # Update by emails
             for email in request.emails:
                 result = db.execute(
-                    text("UPDATE users SET role = :role WHERE identifier = :email"),
+                    text("UPDATE users SET role = :role WHERE identifier = :email RETURNING id"),
                     {"role": request.new_role, "email": email}
                 )
-                updated_count += result.rowcount
+                updated_ids.extend(row[0] for row in result)
         else:
             raise HTTPException(status_code=400, detail="Must provide either user_ids or emails")
 
         db.commit()
+        for user_id in updated_ids:
+            invalidate_principal(user_id)
+        updated_count = len(updated_ids)
 
         return {
             "success": True,
@@ -238,6 +243,7 @@ async def promote_user_to_admin(
             raise HTTPException(status_code=404, detail=f"User with email {email} not found")
 
         db.commit()
+        invalidate_principal(updated[0])
 
         return {
             "success": True,
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+"""
+Performance test for tree parsers/serializers on long and branched games.
+
+Measures game -> NodeTree building (parse_pgn after python-chess has read
+the game), NodeTree -> StudyTreeDTO conversion, StudyTreeDTO -> PGN and the
+variation-tree serializer on synthetic games of 1k to 16k plies, and
+reports time per move.
+
+Each timing is the best of REPEAT runs after a warmup run. The run fails
+if the scaling exponent (slope of log time over log plies, least squares
+across all sizes) exceeds MAX_EXPONENT: about 1.0 for linear code, about
+2.0 for quadratic code.
+
+python-chess's own read_game() is shown for reference only (up to
+READ_GAME_MAX_PLIES): it copies the board's move stack at every variation,
+so it is quadratic on branched games.
+
+Usage:
+    PYTHONPATH=.:backend python backend/scripts/perf_test_tree_serializers.py
+"""
+
+import io
+import math
+import sys
+import time
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import chess
+import chess.pgn
+
+from backend.core.real_pgn.parser import game_to_tree
+from modules.workspace.pgn.serializer.to_pgn import tree_to_movetext
+from modules.workspace.pgn.serializer.to_tree import VariationNode
+from patch.backend.study.api import _tree_to_pgn
+from patch.backend.study.converter import convert_nodetree_to_dto
+
+SIZES = [1000, 2000, 4000, 8000, 16000]
+REPEAT = 3
+MAX_EXPONENT = 1.3
+READ_GAME_MAX_PLIES = 1000
+
+# Knight shuffle: always legal, so games can be made arbitrarily long
+SHUFFLE = ["g1f3", "g8f6", "f3g1", "f6g8"]
+
+
+def long_game(plies: int) -> chess.pgn.Game:
+    """Single main line of `plies` moves."""
+    game = chess.pgn.Game()
+    node = game
+    for ply in range(plies):
+        node = node.add_variation(chess.Move.from_uci(SHUFFLE[ply % 4]))
+    return game
+
+
+def branched_game(plies: int) -> chess.pgn.Game:
+    """Main line of `plies` moves with a branched 4-move side line at every move."""
+    game = chess.pgn.Game()
+    node = game
+    board = chess.Board()
+    for ply in range(plies):
+        main_move = chess.Move.from_uci(SHUFFLE[ply % 4])
+        main = node.add_variation(main_move)
+        alternative = next(m for m in board.legal_moves if m != main_move)
+        side = node.add_variation(alternative, comment="alt")
+        side_board = board.copy(stack=False)
+        side_board.push(alternative)
+        for _ in range(4):
+            moves = list(side_board.legal_moves)
+            if not moves:
+                break
+            parent = side
+            side = parent.add_variation(moves[0])
+            if len(moves) > 1:
+                parent.add_variation(moves[1])
+            side_board.push(moves[0])
+        board.push(main_move)
+        node = main
+    return game
+
+
+def variation_tree(plies: int, branched: bool) -> VariationNode:
+    """Variation tree for tree_to_movetext() (deprecated serializer)."""
+    def make(index: int, rank: int) -> VariationNode:
+        return VariationNode(
+            move_number=index // 2 + 1,
+            color="white" if index % 2 == 0 else "black",
+            san="Nf3",
+            uci="g1f3",
+            fen="",
+            rank=rank,
+        )
+
+    root = node = make(0, 0)
+    for index in range(1, plies):
+        child = make(index, 0)
+        node.children.append(child)
+        if branched:
+            side = make(index, 1)
+            node.children.append(side)
+            for depth in range(1, 5):
+                nested = make(index + depth, 0)
+                side.children.append(nested)
+                side = nested
+        node = child
+    return root
+
+
+def timed(func, *args) -> float:
+    """Best of REPEAT runs, after one warmup run."""
+    func(*args)
+    return min(timeit.repeat(lambda: func(*args), number=1, repeat=REPEAT))
+
+
+def scaling_exponent(sizes: list[int], seconds: list[float]) -> float:
+    """Least-squares slope of log(seconds) over log(sizes)."""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(value) for value in seconds]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance
+
+
+def run(label: str, builder, branched: bool) -> bool:
+    print(f"\n{label}")
+    print(
+        f"{'plies':>7} {'read_game':>10} {'build':>10} {'convert':>10} "
+        f"{'to_pgn':>10} {'variation':>10}  (us/ply)"
+    )
+    seconds: dict[str, list[float]] = {"build": [], "convert": [], "to_pgn": [], "variation": []}
+    chapter = SimpleNamespace(title="Benchmark")
+    for plies in SIZES:
+        game = builder(plies)
+        row = [f"{'-':>10}"]
+        if plies <= READ_GAME_MAX_PLIES:
+            pgn = str(game)
+            start = time.perf_counter()
+            chess.pgn.read_game(io.StringIO(pgn))
+            row = [f"{(time.perf_counter() - start) / plies * 1e6:>10.1f}"]
+        tree = game_to_tree(game)
+        dto = convert_nodetree_to_dto(tree)
+        vtree = variation_tree(plies, branched)
+        timings = {
+            "build": timed(game_to_tree, game),
+            "convert": timed(convert_nodetree_to_dto, tree),
+            "to_pgn": timed(_tree_to_pgn, dto, chapter),
+            "variation": timed(tree_to_movetext, vtree),
+        }
+        for name, value in timings.items():
+            seconds[name].append(value)
+            row.append(f"{value / plies * 1e6:>10.1f}")
+        print(f"{plies:>7} " + " ".join(row))
+
+    linear = True
+    for name, values in seconds.items():
+        exponent = scaling_exponent(SIZES, values)
+        verdict = "ok" if exponent <= MAX_EXPONENT else "NOT LINEAR"
+        print(f"  {name}: time ~ plies^{exponent:.2f} ({verdict})")
+        linear = linear and exponent <= MAX_EXPONENT
+    return linear
+
+
+def main() -> int:
+    print("=" * 60)
+    print("Tree Parser / Serializer Performance Test")
+    print("=" * 60)
+    print(f"Recursion limit: {sys.getrecursionlimit()}")
+    ok = run("Long main line", long_game, branched=False)
+    ok = run("Branched (side line at every move)", branched_game, branched=True) and ok
+    print("\nPASS: linear in game size" if ok else "\nFAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,12 +11,14 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from backend.core.config import settings
+from modules.workspace.db.repos.position_index_repo import PositionIndexRepository
 from modules.workspace.db.repos.study_repo import StudyRepository
 from modules.workspace.db.repos.variation_repo import VariationRepository
 from modules.workspace.db.tables.studies import Chapter
 from modules.workspace.pgn_v2.repo import PgnV2Repo, validate_chapter_r2_key, backfill_chapter_r2_key
 from modules.workspace.storage.r2_client import R2Client, R2Config
 from modules.workspace.domain.services.pgn_sync_service import PgnSyncService
+from modules.workspace.domain.services.position_index_service import PositionIndexService
 from modules.workspace.storage.keys import R2Keys
 
 # Configure logging
@@ -198,7 +200,12 @@ async def scan_pgn_integrity():
     async for session in get_session():
         study_repo = StudyRepository(session)
         variation_repo = VariationRepository(session) # Needed by PgnSyncService
-        pgn_sync_service = PgnSyncService(study_repo, variation_repo, r2_client)
+        pgn_sync_service = PgnSyncService(
+            study_repo,
+            variation_repo,
+            r2_client,
+            position_index=PositionIndexService(PositionIndexRepository(session)),
+        )
 
         chapters = await study_repo.get_all_chapters()
         report["total_chapters_scanned"] = len(chapters)
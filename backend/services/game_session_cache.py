@@ -0,0 +1,132 @@
+"""
+Game Session Cache
+
+Bounded in-memory cache for GameSession objects.
+
+- LRU order, evicting the least recently used session first
+- Idle TTL: sessions untouched for `idle_ttl` seconds are dropped
+- Memory budget: evicts until the estimated size fits `max_bytes`
+
+Evicted sessions are handed to `on_evict` so pending writes can be
+flushed before the session is forgotten.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+
+# Rough per-session footprint used for the memory budget.
+SESSION_BASE_BYTES = 4096
+SESSION_NODE_BYTES = 768
+
+
+def estimate_session_bytes(session) -> int:
+    """Estimate memory held by a GameSession (board state + move tree)."""
+    node_count = len(getattr(session.pgn_tree, "_fen_index", ()))
+    return SESSION_BASE_BYTES + node_count * SESSION_NODE_BYTES
+
+
+class GameSessionCache:
+    """LRU + idle-TTL cache with a memory budget"""
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        idle_ttl: float = 1800.0,
+        on_evict: Optional[Callable[[str, object], None]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self.on_evict = on_evict
+        self._entries: OrderedDict[str, tuple[object, float]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_env(cls, on_evict: Optional[Callable[[str, object], None]] = None) -> "GameSessionCache":
+        """
+        Build cache limits from environment.
+
+        Env:
+            GAME_SESSION_CACHE_MAX_ENTRIES (default: 1000)
+            GAME_SESSION_CACHE_MAX_MB (default: 64)
+            GAME_SESSION_IDLE_TTL (seconds, default: 1800)
+        """
+        return cls(
+            max_entries=int(os.getenv("GAME_SESSION_CACHE_MAX_ENTRIES", "1000")),
+            max_bytes=int(os.getenv("GAME_SESSION_CACHE_MAX_MB", "64")) * 1024 * 1024,
+            idle_ttl=float(os.getenv("GAME_SESSION_IDLE_TTL", "1800")),
+            on_evict=on_evict,
+        )
+
+    def get(self, game_id: str):
+        """Return cached session and mark it recently used, or None."""
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(game_id)
+            if entry is None:
+                return None
+            self._entries[game_id] = (entry[0], time.monotonic())
+            self._entries.move_to_end(game_id)
+            return entry[0]
+
+    def peek(self, game_id: str):
+        """Return cached session without touching LRU order or TTL."""
+        with self._lock:
+            entry = self._entries.get(game_id)
+            return entry[0] if entry else None
+
+    def put(self, game_id: str, session) -> None:
+        """Insert or refresh a session, evicting others if over budget."""
+        with self._lock:
+            self._entries[game_id] = (session, time.monotonic())
+            self._entries.move_to_end(game_id)
+            self._expire()
+            self._enforce_budget()
+
+    def pop(self, game_id: str):
+        """Remove a session without calling on_evict."""
+        with self._lock:
+            entry = self._entries.pop(game_id, None)
+            return entry[0] if entry else None
+
+    def __contains__(self, game_id: str) -> bool:
+        with self._lock:
+            return game_id in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def items(self) -> list[tuple[str, object]]:
+        with self._lock:
+            return [(game_id, entry[0]) for game_id, entry in self._entries.items()]
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._entries:
+            game_id, (session, last_used) = next(iter(self._entries.items()))
+            if last_used > cutoff:
+                break
+            self._evict(game_id)
+
+    def _enforce_budget(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._evict(next(iter(self._entries)))
+        # Keep at least the most recent session even if it alone exceeds the budget.
+        total = sum(estimate_session_bytes(entry[0]) for entry in self._entries.values())
+        while len(self._entries) > 1 and total > self.max_bytes:
+            oldest_id = next(iter(self._entries))
+            total -= estimate_session_bytes(self._entries[oldest_id][0])
+            self._evict(oldest_id)
+
+    def _evict(self, game_id: str) -> None:
+        session, _ = self._entries.pop(game_id)
+        if self.on_evict:
+            try:
+                self.on_evict(game_id, session)
+            except Exception as e:
+                print(f"Warning: Failed to flush evicted game session {game_id}: {e}")
@@ -10,11 +10,25 @@ IMPORTANT: This service handles ALL game logic:
 - R2 storage
 
 The frontend only triggers events, all logic is here.
+
+Sessions are kept in a bounded LRU/TTL cache (see game_session_cache) and
+rebuilt from the stored PGN on a miss. PGN uploads are write-behind: moves
+mark the session dirty and a background flusher uploads the latest PGN.
+A dirty session stays referenced by the write-behind queue until its
+upload succeeds, so evicting it from the cache never loses a write.
+
+Routes run in threadpool threads, so every read or change of a session
+holds its `lock` (the flusher takes it too while serializing the PGN).
 """
+import atexit
+import io
+import os
+import threading
 import uuid
 from datetime import datetime
 from typing import Optional
 
+import chess.pgn
 from sqlalchemy.orm import Session
 
 from core.chess_basic.types import Square, Move, BoardState
@@ -23,6 +37,9 @@ from core.chess_basic.pgn.common.pgn_types import NAG_SYMBOLS
 from core.chess_basic.rule.api import is_legal_move, apply_move
 from core.chess_basic.utils.fen import board_to_fen, parse_fen, get_starting_position
 from core.chess_basic.utils.san import move_to_san  # SAN conversion
+from core.chess_basic.utils.uci import parse_uci_move
+from modules.workspace.pgn.serializer.to_pgn import tree_to_pgn
+from services.game_session_cache import GameSessionCache
 from services.pgn_game_tree import PgnGameTree
 from storage.core.client import StorageClient
 from storage.core.config import StorageConfig
@@ -49,6 +66,8 @@ class GameSession:
         self.move_count = 0
         self._force_variation = False
         self._last_node = None
+        # Guards the session against concurrent requests and the flusher
+        self.lock = threading.RLock()
 
         # Set default PGN tags
         self.pgn_tree.set_tag("Event", "Casual Game")
@@ -142,6 +161,73 @@ class GameSession:
         """Generate full PGN string"""
         return self.pgn_tree.to_pgn()
 
+    def pgn_preview(self, limit: int = 100) -> str:
+        """
+        First `limit` characters of the PGN.
+
+        The header block comes first, so when it alone is longer than the
+        limit the move tree does not need to be serialized at all.
+        """
+        headers_text = tree_to_pgn(None, self.pgn_tree.headers)
+        if headers_text.rfind("\n\n") > limit:
+            return headers_text[:limit] + "..."
+        pgn_full = self.to_pgn()
+        return pgn_full[:limit] + ("..." if len(pgn_full) > limit else "")
+
+    @classmethod
+    def from_pgn(cls, game_id: str, user_id: str, pgn_string: str) -> "GameSession":
+        """
+        Rebuild a session from stored PGN.
+
+        Moves are replayed through add_move (mainline before alternatives) so
+        the variation tree, SAN and ranks match a live session. The current
+        position is the end of the mainline.
+        """
+        game = chess.pgn.read_game(io.StringIO(pgn_string))
+        session = cls(game_id, user_id)
+        if game is None:
+            return session
+
+        for key, value in game.headers.items():
+            # python-chess fills missing roster tags with "?"; don't invent them
+            if value == "?" and key not in session.pgn_tree.headers:
+                continue
+            session.pgn_tree.set_tag(key, value)
+        if "FEN" in game.headers:
+            session.state = parse_fen(game.headers["FEN"])
+            session.start_fen = board_to_fen(session.state)
+            session.pgn_tree.start_fen = session.start_fen
+
+        mainline_state = session.state
+        # (pgn node, fen before move, parent replay id, on mainline)
+        stack = [(child, session.start_fen, None, index == 0)
+                 for index, child in reversed(list(enumerate(game.variations)))]
+        replay_id = 0
+        while stack:
+            node, position_fen, parent_id, on_mainline = stack.pop()
+            replay_id += 1
+            move_id = f"replay_{replay_id}"
+            success, new_state = session.add_move(
+                move=parse_uci_move(node.move.uci()),
+                position_fen=position_fen,
+                is_variation=not on_mainline,
+                parent_move_id=parent_id,
+                move_id=move_id,
+                comment=node.comment or None,
+                nag=next(iter(node.nags), None),
+            )
+            if not success:
+                continue
+            if on_mainline:
+                mainline_state = new_state
+            new_fen = board_to_fen(new_state)
+            for index, child in reversed(list(enumerate(node.variations))):
+                stack.append((child, new_fen, move_id, on_mainline and index == 0))
+
+        session.state = mainline_state
+        session.move_count = session.pgn_tree.mainline_count()
+        return session
+
     def get_fen(self) -> str:
         """Get current position FEN"""
         return board_to_fen(self.state)
@@ -154,6 +240,9 @@ class GameStorageService:
     Manages game sessions, PGN generation, and R2 storage.
     """
 
+    # Seconds between write-behind flushes of dirty sessions to R2
+    FLUSH_INTERVAL = float(os.getenv("GAME_PGN_FLUSH_INTERVAL", "2.0"))
+
     def __init__(self):
         """Initialize service with R2 client"""
         try:
@@ -165,8 +254,23 @@ class GameStorageService:
             self.storage_client = None
             print(f"Warning: R2 storage not configured: {e}")
 
-        # In-memory session cache (game_id -> GameSession)
-        self.sessions: dict[str, GameSession] = {}
+        # Bounded session cache (game_id -> GameSession)
+        self.sessions = GameSessionCache.from_env(on_evict=self._flush_evicted)
+
+        # Write-behind state: game_id -> (R2 key, session, generation) of
+        # sessions with unsaved PGN. Entries are removed only after the upload
+        # of their latest generation succeeds.
+        self._dirty: dict[str, tuple[str, GameSession, int]] = {}
+        self._dirty_generation = 0
+        self._dirty_lock = threading.Lock()
+        # Serializes inserting rebuilt sessions, so concurrent misses share one
+        self._load_lock = threading.Lock()
+        # Held around each PGN upload and the R2 delete of delete_game()
+        # (reentrant, so delete_game() is safe on the uploading thread too)
+        self._upload_lock = threading.RLock()
+        self._flush_wakeup = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        atexit.register(self.flush_pending)
 
     def get_or_create_session(
         self,
@@ -177,11 +281,19 @@ class GameStorageService:
         """
         Get existing session or create new one
 
-        If game exists in R2, load it. Otherwise create new session.
+        If game exists in R2, rebuild it from the stored PGN. Otherwise create
+        new session.
         """
         # Check cache first
-        if game_id in self.sessions:
-            return self.sessions[game_id]
+        session = self.sessions.get(game_id)
+        if session is not None:
+            return session
+
+        # Evicted with an upload still pending: R2 is stale, reuse the session
+        with self._dirty_lock:
+            pending = self._dirty.get(game_id)
+        if pending is not None:
+            return self._cache_loaded(game_id, pending[1])
 
         # Try to load from database and R2
         game = db.query(Game).filter(Game.game_id == uuid.UUID(game_id)).first()
@@ -191,21 +303,26 @@ class GameStorageService:
             try:
                 pgn_bytes = self.storage_client.get_object(game.r2_key)
                 pgn_string = pgn_bytes.decode('utf-8')
-
-                # TODO: Parse PGN and reconstruct session
-                # For now, create new session
-                session = GameSession(game_id, user_id)
-                self.sessions[game_id] = session
-                return session
+                session = GameSession.from_pgn(game_id, user_id, pgn_string)
+                return self._cache_loaded(game_id, session)
 
             except ObjectNotFound:
                 # R2 object not found, create new session
                 pass
+            except Exception as e:
+                print(f"Warning: Failed to rebuild game {game_id} from PGN: {e}")
 
         # Create new session
-        session = GameSession(game_id, user_id)
-        self.sessions[game_id] = session
-        return session
+        return self._cache_loaded(game_id, GameSession(game_id, user_id))
+
+    def _cache_loaded(self, game_id: str, session: GameSession) -> GameSession:
+        """Cache a rebuilt session unless another request cached one first"""
+        with self._load_lock:
+            existing = self.sessions.get(game_id)
+            if existing is not None:
+                return existing
+            self.sessions.put(game_id, session)
+            return session
 
     def save_move(
         self,
@@ -234,39 +351,37 @@ class GameStorageService:
 
         move_id = f"move_{move_number}"
 
-        success, new_state = session.add_move(
-            move=move,
-            position_fen=position_fen,
-            is_variation=is_variation,
-            parent_move_id=parent_move_id,
-            move_id=move_id,
-            comment=comment,
-            nag=nag,
-        )
-
-        if not success:
-            return False, "", ""
+        with session.lock:
+            success, new_state = session.add_move(
+                move=move,
+                position_fen=position_fen,
+                is_variation=is_variation,
+                parent_move_id=parent_move_id,
+                move_id=move_id,
+                comment=comment,
+                nag=nag,
+            )
 
-        # Save to R2 and database
-        self._save_to_storage(game_id, user_id, session, db)
+            if not success:
+                return False, "", ""
 
-        # Generate PGN preview
-        pgn_full = session.to_pgn()
-        pgn_preview = pgn_full[:100] + ("..." if len(pgn_full) > 100 else "")
+            # Save to R2 and database
+            self._save_to_storage(game_id, user_id, session, db)
 
-        return True, move_id, pgn_preview
+            return True, move_id, session.pgn_preview()
 
     def start_variation(self, game_id: str, user_id: str, db: Session) -> str:
         """Start a variation branch"""
         session = self.get_or_create_session(game_id, user_id, db)
-        session.start_variation()
-        variation_id = f"var_{session.move_count}"
-        return variation_id
+        with session.lock:
+            session.start_variation()
+            return f"var_{session.move_count}"
 
     def end_variation(self, game_id: str, user_id: str, db: Session):
         """End current variation branch"""
         session = self.get_or_create_session(game_id, user_id, db)
-        session.end_variation()
+        with session.lock:
+            session.end_variation()
 
     def add_comment(
         self,
@@ -277,8 +392,9 @@ class GameStorageService:
     ):
         """Add comment to last move"""
         session = self.get_or_create_session(game_id, user_id, db)
-        session.add_comment(comment)
-        self._save_to_storage(game_id, user_id, session, db)
+        with session.lock:
+            session.add_comment(comment)
+            self._save_to_storage(game_id, user_id, session, db)
 
     def add_nag(
         self,
@@ -289,8 +405,9 @@ class GameStorageService:
     ):
         """Add NAG annotation to last move"""
         session = self.get_or_create_session(game_id, user_id, db)
-        session.add_nag(nag)
-        self._save_to_storage(game_id, user_id, session, db)
+        with session.lock:
+            session.add_nag(nag)
+            self._save_to_storage(game_id, user_id, session, db)
 
     def get_pgn(self, game_id: str, user_id: str, db: Session) -> tuple[str, int]:
         """
@@ -300,7 +417,8 @@ class GameStorageService:
             (pgn_string, move_count)
         """
         session = self.get_or_create_session(game_id, user_id, db)
-        return session.to_pgn(), session.move_count
+        with session.lock:
+            return session.to_pgn(), session.move_count
 
     def get_game_info(
         self,
@@ -318,13 +436,16 @@ class GameStorageService:
             return None
 
         session = self.get_or_create_session(game_id, user_id, db)
-        pgn = session.to_pgn()
+        with session.lock:
+            pgn = session.to_pgn()
+            move_count = session.move_count
+            current_position = session.get_fen()
 
         return {
             "game_id": str(game.game_id),
             "pgn": pgn,
-            "move_count": session.move_count,
-            "current_position": session.get_fen(),
+            "move_count": move_count,
+            "current_position": current_position,
             "player_white": game.player_white,
             "player_black": game.player_black,
             "result": game.result,
@@ -347,21 +468,24 @@ class GameStorageService:
         if not game:
             return False
 
-        # Delete from R2
-        if self.storage_client:
-            try:
-                self.storage_client.delete_object(game.r2_key)
-            except Exception as e:
-                print(f"Warning: Failed to delete from R2: {e}")
+        # Drop the pending upload and the cached session before deleting the
+        # object; waits for an upload in flight so it cannot land afterwards
+        with self._upload_lock:
+            with self._dirty_lock:
+                self._dirty.pop(game_id, None)
+            self.sessions.pop(game_id)
+
+            # Delete from R2
+            if self.storage_client:
+                try:
+                    self.storage_client.delete_object(game.r2_key)
+                except Exception as e:
+                    print(f"Warning: Failed to delete from R2: {e}")
 
         # Delete from database
         db.delete(game)
         db.commit()
 
-        # Remove from session cache
-        if game_id in self.sessions:
-            del self.sessions[game_id]
-
         return True
 
     def _parse_move(self, move_data: dict) -> Move:
@@ -394,20 +518,17 @@ class GameStorageService:
         session: GameSession,
         db: Session,
     ):
-        """Save game to R2 and update database"""
-        # Generate PGN
-        pgn_string = session.to_pgn()
+        """
+        Update database and schedule the R2 upload (write-behind)
 
+        The caller holds `session.lock`.
+        """
         # R2 key: games/{user_id}/{game_id}.pgn
         r2_key = f"games/{user_id}/{game_id}.pgn"
 
-        # Save to R2
+        # Schedule R2 upload; the flusher serializes the latest PGN
         if self.storage_client:
-            self.storage_client.put_object(
-                key=r2_key,
-                content=pgn_string.encode('utf-8'),
-                content_type="application/x-chess-pgn",
-            )
+            self._mark_dirty(game_id, r2_key, session)
 
         # Update or create database record
         game = db.query(Game).filter(Game.game_id == uuid.UUID(game_id)).first()
@@ -437,5 +558,83 @@ class GameStorageService:
         db.commit()
 
 
+    # ==================== Write-behind ====================
+
+    def _mark_dirty(self, game_id: str, r2_key: str, session: GameSession) -> None:
+        with self._dirty_lock:
+            self._dirty_generation += 1
+            self._dirty[game_id] = (r2_key, session, self._dirty_generation)
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="game-pgn-flusher", daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._flush_wakeup.wait(self.FLUSH_INTERVAL)
+            self._flush_wakeup.clear()
+            self.flush_pending()
+
+    def flush_pending(self) -> int:
+        """
+        Upload PGN for every dirty session.
+
+        An entry leaves the queue only once the upload of its latest
+        generation succeeded; changes made during an upload, and failed
+        uploads, are retried on the next flush. Games deleted since the
+        snapshot are skipped, and delete_game() waits for an upload in
+        flight, so a deleted game's PGN is never re-uploaded.
+
+        Returns:
+            Number of games uploaded
+        """
+        with self._dirty_lock:
+            game_ids = list(self._dirty)
+
+        uploaded = 0
+        for game_id in game_ids:
+            with self._upload_lock:
+                with self._dirty_lock:
+                    entry = self._dirty.get(game_id)
+                if entry is None:
+                    continue  # Uploaded by a concurrent flush, or deleted
+                r2_key, session, generation = entry
+                try:
+                    self._upload_pgn(r2_key, session)
+                except Exception as e:
+                    print(f"Warning: Failed to upload PGN for game {game_id}: {e}")
+                    continue
+            uploaded += 1
+            with self._dirty_lock:
+                current = self._dirty.get(game_id)
+                if current is not None and current[2] == generation:
+                    del self._dirty[game_id]
+        return uploaded
+
+    def _flush_evicted(self, game_id: str, session: GameSession) -> None:
+        """
+        Wake the flusher when a dirty session leaves the cache.
+
+        Runs under the cache lock, so it must not do I/O; the write-behind
+        queue still holds the session until it is uploaded.
+        """
+        with self._dirty_lock:
+            dirty = game_id in self._dirty
+        if dirty:
+            self._flush_wakeup.set()
+
+    def _upload_pgn(self, r2_key: str, session: GameSession) -> None:
+        if not self.storage_client:
+            return
+        with session.lock:
+            content = session.to_pgn().encode('utf-8')
+        self.storage_client.put_object(
+            key=r2_key,
+            content=content,
+            content_type="application/x-chess-pgn",
+        )
+
+
 # Global service instance
 game_storage_service = GameStorageService()
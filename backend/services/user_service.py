@@ -16,6 +16,7 @@ Does NOT handle:
 from sqlalchemy.orm import Session
 from models.user import User
 from core.security.password import hash_password, verify_password
+from core.security.principal_cache import invalidate_principal
 from core.log.log_service import logger
 from core.errors import UserAlreadyExistsError, InvalidCredentialsError, UserInactiveError
 import uuid
@@ -188,6 +189,8 @@ def update_user_profile(db: Session, user_id: uuid.UUID | str, update_data: dict
 
     db.commit()
     db.refresh(user)
+    # Role / active flag may have changed
+    invalidate_principal(user.id)
 
     logger.info(f"User profile updated successfully: {user.username} (id={user.id})")
     return user
@@ -24,7 +24,10 @@ Why this abstraction matters:
     - Single point of failure/success for storage operations
     - Consistent error handling
 """
+import os
+
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError, EndpointConnectionError, NoCredentialsError
 from typing import BinaryIO
 
@@ -38,6 +41,10 @@ from storage.core.errors import (
 )
 
 
+# HTTP connections kept open per client
+MAX_POOL_CONNECTIONS = int(os.getenv("STORAGE_MAX_POOL_CONNECTIONS", "32"))
+
+
 class StorageClient:
     """
     Pure R2 storage client.
@@ -77,6 +84,8 @@ class StorageClient:
                 aws_access_key_id=config.access_key_id,
                 aws_secret_access_key=config.secret_access_key,
                 region_name=config.region,
+                # Shared by all threads using this client (e.g. threadpool endpoints).
+                config=Config(max_pool_connections=MAX_POOL_CONNECTIONS),
             )
         except (NoCredentialsError, ClientError) as e:
             raise StorageUnavailable(
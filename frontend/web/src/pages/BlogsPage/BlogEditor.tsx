@@ -134,7 +134,8 @@ const BlogEditor: React.FC<BlogEditorProps> = ({
     try {
       setUploading(true);
       setError('');
-      const result = await blogApi.uploadImage(file);
+      // Resolves once the image is processed, so the URL already serves
+      const result = await blogApi.uploadImage(file, 'cover');
       setCoverImageUrl(result.url);
     } catch (err: any) {
       setError(err.message || 'Failed to upload image');
@@ -58,3 +58,27 @@ export interface BlogCategory {
   description?: string;
   article_count: number;
 }
+
+/**
+ * Uploaded blog image
+ * The URL only serves once status is "ready"
+ */
+export interface BlogImage {
+  id: string;
+  url: string;
+  filename: string;
+  size_bytes: number;
+  width: number;
+  height: number;
+  resize_mode: 'original' | 'adaptive_width';
+  image_type: 'cover' | 'content';
+  status: 'pending' | 'ready' | 'failed';
+  variants: Array<{
+    url: string;
+    storage_path: string;
+    width: number;
+    height: number;
+    content_type: string;
+    size_bytes: number;
+  }>;
+}
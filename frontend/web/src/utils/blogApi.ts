@@ -4,10 +4,16 @@
  */
 
 import { api } from '@ui/assets/api';
-import { BlogArticle, PaginatedResponse, BlogListParams, BlogCategory } from '../types/blog';
+import { BlogArticle, PaginatedResponse, BlogListParams, BlogCategory, BlogImage } from '../types/blog';
 
 const BASE_PATH = '/api/blogs';
 
+// Uploaded images are processed in the background: poll until ready
+const IMAGE_POLL_INTERVAL_MS = 500;
+const IMAGE_POLL_TIMEOUT_MS = 60_000;
+
+const wait = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
 /**
  * Blog API methods
  */
@@ -146,13 +152,40 @@ export const blogApi = {
   /**
    * Upload image to R2 storage
    * Requires Editor or Admin role
+   * Resolves once the image is processed and its URL serves;
+   * rejects if processing fails or does not finish in time
    * @param file - Image file
-   * @returns Image URL
+   * @param imageType - "cover" or "content"
+   * @returns Ready image with its URL and responsive variants
    */
-  async uploadImage(file: File): Promise<{ url: string; filename: string }> {
+  async uploadImage(file: File, imageType: BlogImage['image_type'] = 'content'): Promise<BlogImage> {
     const formData = new FormData();
     formData.append('file', file);
-    const response = await api.post(`${BASE_PATH}/upload-image`, formData);
+    formData.append('image_type', imageType);
+    let image: BlogImage = await api.post(`${BASE_PATH}/upload-image`, formData);
+
+    const deadline = Date.now() + IMAGE_POLL_TIMEOUT_MS;
+    while (image.status === 'pending') {
+      if (Date.now() >= deadline) {
+        throw new Error('Image processing timed out');
+      }
+      await wait(IMAGE_POLL_INTERVAL_MS);
+      image = await blogApi.getImage(image.id);
+    }
+    if (image.status === 'failed') {
+      throw new Error('Image processing failed');
+    }
+    return image;
+  },
+
+  /**
+   * Get an uploaded image's processing status
+   * Requires Editor or Admin role
+   * @param id - Image ID
+   * @returns Image with status "pending", "ready" or "failed"
+   */
+  async getImage(id: string): Promise<BlogImage> {
+    const response = await api.get(`${BASE_PATH}/images/${id}`);
     return response;
   },
 
@@ -1,18 +1,48 @@
+import asyncio
 import json
 import logging
-from typing import Optional
+import os
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import quote
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .models import StudyTreeDTO, TreeResponse
-from modules.workspace.storage.r2_client import R2Client, create_r2_client_from_env
+from .converter import convert_dto_to_nodetree
+from .models import StudyTreeDTO, TreeOpsRequest, TreeResponse
+from .tree_ops import (
+    TreeOpError,
+    apply_tree_ops,
+    dump_journal,
+    journal_entry,
+    parse_journal,
+    tree_hash,
+    truncate_journal,
+)
+from modules.workspace.storage.async_r2_client import AsyncR2Client, create_async_r2_client_from_env
 from modules.workspace.storage.keys import R2Keys
+from modules.workspace.domain.services.chapter_content_cache import (
+    chapter_content_cache,
+    content_token,
+    load_chapter_content,
+)
+from modules.workspace.db.repos.position_index_repo import PositionIndexRepository
 from modules.workspace.db.repos.study_repo import StudyRepository
 from modules.workspace.db.session import get_session
+from modules.workspace.db.tables.studies import Chapter
+from modules.workspace.domain.services.position_index_service import PositionIndexService
 
 router = APIRouter(prefix="/study-patch", tags=["study-patch"])
 logger = logging.getLogger(__name__)
 
+# Chapter trees loaded ahead of the one being rendered during study export
+STUDY_EXPORT_PREFETCH = int(os.getenv("STUDY_EXPORT_PREFETCH", "4"))
+
+# Journaled op batches after which the tree is re-uploaded in full
+TREE_OPS_COMPACT_EVERY = int(os.getenv("TREE_OPS_COMPACT_EVERY", "50"))
+
 logger.info("=" * 80)
 logger.info("[STUDY PATCH API] Router initialized with prefix: /study-patch")
 logger.info("[STUDY PATCH API] This module provides PGN export endpoints")
@@ -61,24 +91,47 @@ def _validate_tree_structure(tree: StudyTreeDTO) -> list[str]:
 
     return errors
 
-async def get_r2_client() -> R2Client:
-    return create_r2_client_from_env()
+async def get_r2_client() -> AsyncR2Client:
+    return create_async_r2_client_from_env()
 
 async def get_study_repo(session: AsyncSession = Depends(get_session)) -> StudyRepository:
     return StudyRepository(session)
 
+async def get_position_index(session: AsyncSession = Depends(get_session)) -> PositionIndexService:
+    return PositionIndexService(PositionIndexRepository(session))
+
+async def _index_chapter_tree(
+    position_index: PositionIndexService, chapter: Chapter, tree: StudyTreeDTO
+) -> None:
+    """Bring the chapter's cross-study position index rows in line with a saved tree."""
+    node_tree = convert_dto_to_nodetree(tree)
+    if len(node_tree.nodes) <= 1:  # Only the root
+        await position_index.clear_chapter(chapter.id)
+    else:
+        await position_index.index_chapter(chapter.study_id, chapter.id, node_tree)
+
 @router.get("/chapter/{chapter_id}/tree", response_model=TreeResponse)
 async def get_chapter_tree(
     chapter_id: str,
-    r2_client: R2Client = Depends(get_r2_client)
+    r2_client: AsyncR2Client = Depends(get_r2_client),
+    study_repo: StudyRepository = Depends(get_study_repo),
 ):
     """Get the tree.json for a chapter from R2."""
     key = R2Keys.chapter_tree_json(chapter_id)
     try:
-        if not r2_client.exists(key):
+        chapter = await study_repo.get_chapter_by_id(chapter_id)
+        if chapter is not None:
+            try:
+                cached = await load_chapter_content(chapter, r2_client, key)
+            except ValueError:
+                return TreeResponse(success=False, error="Tree not found")
+            current_hash = cached.render("hash", lambda: tree_hash(cached.tree))
+            return TreeResponse(success=True, tree=cached.tree, hash=current_hash)
+
+        if not await r2_client.exists(key):
             return TreeResponse(success=False, error="Tree not found")
         
-        content = r2_client.download_json(key)
+        content = await r2_client.download_json(key)
         tree_data = json.loads(content)
         return TreeResponse(success=True, tree=StudyTreeDTO(**tree_data))
     except Exception as e:
@@ -90,9 +143,11 @@ async def put_chapter_tree(
     chapter_id: str,
     tree: StudyTreeDTO,
     request: Request,
-    r2_client: R2Client = Depends(get_r2_client)
+    r2_client: AsyncR2Client = Depends(get_r2_client),
+    study_repo: StudyRepository = Depends(get_study_repo),
+    position_index: PositionIndexService = Depends(get_position_index),
 ):
-    """Save the tree.json for a chapter to R2."""
+    """Save the tree.json for a chapter to R2 and reindex its positions."""
     validation_errors = _validate_tree_structure(tree)
     if validation_errors:
         raise HTTPException(
@@ -107,19 +162,114 @@ async def put_chapter_tree(
     try:
         client_hash = request.headers.get("X-Tree-Hash")
         content = tree.model_dump_json()
-        r2_client.upload_json(key, content)
+        upload = await r2_client.upload_json(key, content)
+        chapter_content_cache.invalidate(chapter_id)
+        # Record the new ETag so other workers' cached copies are invalidated too.
+        chapter = await study_repo.get_chapter_by_id(chapter_id)
+        if chapter and chapter.r2_key == key:
+            # A full save supersedes any journaled op batches.
+            if chapter.tree_ops_pending:
+                await _delete_journal(r2_client, chapter_id)
+            chapter.tree_ops_pending = 0
+            chapter.pgn_hash = upload.content_hash
+            chapter.pgn_size = upload.size
+            chapter.r2_etag = upload.etag
+            chapter.last_synced_at = datetime.now(timezone.utc)
+            await study_repo.update_chapter(chapter)
+        if chapter:
+            await _index_chapter_tree(position_index, chapter, tree)
         logger.info(f"Tree saved for chapter {chapter_id} (size: {len(content)} bytes)")
         if client_hash:
             logger.info(f"Tree hash received for chapter {chapter_id}: {client_hash}")
-        return TreeResponse(success=True)
+        return TreeResponse(success=True, hash=upload.content_hash)
     except Exception as e:
         logger.error(f"Failed to save tree for chapter {chapter_id}: {e}")
         return TreeResponse(success=False, error=str(e))
 
+@router.post("/chapter/{chapter_id}/tree/ops", response_model=TreeResponse)
+async def apply_chapter_tree_ops(
+    chapter_id: str,
+    body: TreeOpsRequest,
+    r2_client: AsyncR2Client = Depends(get_r2_client),
+    study_repo: StudyRepository = Depends(get_study_repo),
+    position_index: PositionIndexService = Depends(get_position_index),
+):
+    """
+    Apply an op batch to a chapter tree.
+
+    `baseHash` must be the hash of the tree the client edited (returned by
+    GET/PUT tree and by this endpoint); otherwise 409 with the current hash.
+    The batch is appended to the chapter's R2 journal and the tree.json is
+    only rewritten every TREE_OPS_COMPACT_EVERY batches; the position index
+    is updated whenever tree.json is. The chapter row is
+    locked for the duration, so concurrent batches are serialized.
+    """
+    chapter = await study_repo.get_chapter_for_update(chapter_id)
+    if chapter is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
+
+    key = R2Keys.chapter_tree_json(chapter_id)
+    try:
+        content = await load_chapter_content(chapter, r2_client, key)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tree not found")
+    current_hash = content.render("hash", lambda: tree_hash(content.tree))
+    if body.baseHash != current_hash:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": "Tree has changed", "hash": current_hash},
+        )
+
+    try:
+        tree = apply_tree_ops(content.tree, body.ops)
+    except TreeOpError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    new_hash = tree_hash(tree)
+
+    if chapter.r2_key != key:
+        # Legacy chapter whose row does not track tree.json: plain full save.
+        await r2_client.upload_json(key, tree.model_dump_json())
+        chapter_content_cache.invalidate(chapter_id)
+        await _index_chapter_tree(position_index, chapter, tree)
+        return TreeResponse(success=True, hash=new_hash)
+
+    if chapter.tree_ops_pending + 1 >= TREE_OPS_COMPACT_EVERY:
+        upload = await r2_client.upload_json(key, tree.model_dump_json())
+        if chapter.tree_ops_pending:
+            await _delete_journal(r2_client, chapter_id)
+        chapter.tree_ops_pending = 0
+        chapter.r2_etag = upload.etag
+        chapter.pgn_size = upload.size
+        await _index_chapter_tree(position_index, chapter, tree)
+        logger.info(f"Tree compacted for chapter {chapter_id} (size: {upload.size} bytes)")
+    else:
+        journal_key = R2Keys.chapter_tree_ops_json(chapter_id)
+        entries = []
+        if chapter.tree_ops_pending:
+            entries = parse_journal(await r2_client.download_json(journal_key))
+            entries = truncate_journal(entries, current_hash)
+        entries.append(journal_entry(current_hash, new_hash, body.ops))
+        await r2_client.upload_json(journal_key, dump_journal(entries))
+        chapter.tree_ops_pending += 1
+    chapter.pgn_hash = new_hash
+    chapter.last_synced_at = datetime.now(timezone.utc)
+    await study_repo.update_chapter(chapter)
+
+    cached = chapter_content_cache.put(chapter_id, content_token(chapter), tree)
+    cached.render("hash", lambda: new_hash)
+    return TreeResponse(success=True, hash=new_hash)
+
+async def _delete_journal(r2_client: AsyncR2Client, chapter_id: str) -> None:
+    try:
+        await r2_client.delete(R2Keys.chapter_tree_ops_json(chapter_id))
+    except Exception as e:
+        # Stale entries no longer match the tree hash and are skipped on replay.
+        logger.warning(f"Failed to delete tree op journal for chapter {chapter_id}: {e}")
+
 @router.get("/chapter/{chapter_id}/pgn-export")
 async def export_chapter_pgn(
     chapter_id: str,
-    r2_client: R2Client = Depends(get_r2_client),
+    r2_client: AsyncR2Client = Depends(get_r2_client),
     study_repo: StudyRepository = Depends(get_study_repo)
 ):
     """Export the tree.json as a PGN string."""
@@ -132,35 +282,24 @@ async def export_chapter_pgn(
     logger.info(f"[EXPORT CHAPTER PGN] R2 Key: {key}")
 
     try:
-        logger.info(f"[EXPORT CHAPTER PGN] Checking if R2 key exists...")
-        exists = r2_client.exists(key)
-        logger.info(f"[EXPORT CHAPTER PGN] R2 key exists: {exists}")
-
-        if not exists:
-            logger.error(f"[EXPORT CHAPTER PGN] Tree not found for chapter {chapter_id}")
-            raise HTTPException(status_code=404, detail="Tree not found")
-
-        logger.info(f"[EXPORT CHAPTER PGN] Downloading tree from R2...")
-        content = r2_client.download_json(key)
-        logger.info(f"[EXPORT CHAPTER PGN] Downloaded content length: {len(content)}")
-
-        tree_data = json.loads(content)
-        logger.info(f"[EXPORT CHAPTER PGN] Parsed tree data, nodes count: {len(tree_data.get('nodes', {}))}")
-
-        tree = StudyTreeDTO(**tree_data)
-        logger.info(f"[EXPORT CHAPTER PGN] Created StudyTreeDTO")
-
         logger.info(f"[EXPORT CHAPTER PGN] Fetching chapter metadata from DB...")
         chapter = await study_repo.get_chapter_by_id(chapter_id)
         logger.info(f"[EXPORT CHAPTER PGN] Chapter metadata: {chapter}")
 
+        try:
+            cached = await load_chapter_content(chapter, r2_client, key)
+        except ValueError:
+            logger.error(f"[EXPORT CHAPTER PGN] Tree not found for chapter {chapter_id}")
+            raise HTTPException(status_code=404, detail="Tree not found")
+        logger.info(f"[EXPORT CHAPTER PGN] Loaded tree, nodes count: {len(cached.tree.nodes)}")
+
         # Get study info for filename
         study = await study_repo.get_study_by_id(chapter.study_id)
         study_title = getattr(study, 'title', None) or 'Study'
         chapter_title = getattr(chapter, 'title', None) or 'Chapter'
 
         logger.info(f"[EXPORT CHAPTER PGN] Converting tree to PGN...")
-        pgn = _tree_to_pgn(tree, chapter)
+        pgn = cached.pgn(chapter)
         logger.info(f"[EXPORT CHAPTER PGN] PGN generated successfully")
         logger.info(f"[EXPORT CHAPTER PGN] PGN length: {len(pgn)}")
         logger.info(f"[EXPORT CHAPTER PGN] PGN preview (first 200 chars): {pgn[:200]}")
@@ -184,64 +323,113 @@ async def export_chapter_pgn(
         logger.error(f"[EXPORT CHAPTER PGN] Error details:", exc_info=True)
         return {"success": False, "error": str(e)}
 
+async def iter_study_pgn(
+    chapters: list[Any],
+    r2_client: AsyncR2Client,
+    prefetch: int = STUDY_EXPORT_PREFETCH,
+) -> AsyncIterator[str]:
+    """
+    Yield each chapter's PGN in chapter order, separated by blank lines.
+
+    Trees are loaded (through the chapter content cache) up to `prefetch`
+    chapters ahead of the one being rendered, and rendering runs in a worker
+    thread, so storage round trips overlap with rendering. Only the
+    prefetched chapters are held in memory at any time.
+
+    Raises:
+        HTTPException: 404 if a chapter's tree is missing
+    """
+    def load(chapter):
+        key = R2Keys.chapter_tree_json(chapter.id)
+        return asyncio.ensure_future(load_chapter_content(chapter, r2_client, key))
+
+    remaining = iter(chapters)
+    pending: deque = deque()
+    for chapter in remaining:
+        pending.append((chapter, load(chapter)))
+        if len(pending) >= max(1, prefetch):
+            break
+
+    try:
+        separator = ""
+        while pending:
+            chapter, task = pending.popleft()
+            try:
+                content = await task
+            except ValueError:
+                logger.error(f"[EXPORT STUDY PGN] Tree not found for chapter {chapter.id}")
+                raise HTTPException(status_code=404, detail=f"Tree not found for chapter {chapter.id}")
+            following = next(remaining, None)
+            if following is not None:
+                pending.append((following, load(following)))
+            pgn = await asyncio.to_thread(content.pgn, chapter)
+            yield separator + pgn
+            separator = "\n\n"
+    finally:
+        for _chapter, task in pending:
+            task.cancel()
+
+
+@router.get("/study/{study_id}/pgn")
+async def stream_study_pgn(
+    study_id: str,
+    r2_client: AsyncR2Client = Depends(get_r2_client),
+    study_repo: StudyRepository = Depends(get_study_repo)
+):
+    """
+    Stream all chapters in a study as one PGN file.
+
+    Each chapter is sent as soon as it is rendered. A missing tree for the
+    first chapter is a 404; later failures end the stream early.
+    """
+    study = await study_repo.get_study_by_id(study_id)
+    study_title = getattr(study, 'title', None) or 'Study'
+    chapters = await study_repo.get_chapters_for_study(study_id, order_by_order=True)
+    filename = f"{_sanitize_filename(study_title)}.pgn"
+
+    blocks = iter_study_pgn(list(chapters or []), r2_client)
+    # Render the first chapter before responding so errors get a status code
+    first = await anext(blocks, "")
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            yield first
+            async for block in blocks:
+                yield block
+        except Exception as e:
+            logger.error(f"[EXPORT STUDY PGN] Stream aborted for study {study_id}: {e}")
+            raise
+        finally:
+            await blocks.aclose()
+
+    return StreamingResponse(
+        body(),
+        media_type="application/x-chess-pgn",
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+        },
+    )
+
+
 @router.get("/study/{study_id}/pgn-export")
 async def export_study_pgn(
     study_id: str,
-    r2_client: R2Client = Depends(get_r2_client),
+    r2_client: AsyncR2Client = Depends(get_r2_client),
     study_repo: StudyRepository = Depends(get_study_repo)
 ):
-    """Export all chapters in a study as concatenated PGN."""
-    logger.info("=" * 60)
-    logger.info(f"[EXPORT STUDY PGN] ENDPOINT CALLED")
+    """Export all chapters in a study as concatenated PGN (JSON; see /pgn to stream)."""
     logger.info(f"[EXPORT STUDY PGN] Study ID: {study_id}")
-    logger.info("=" * 60)
 
     try:
-        logger.info(f"[EXPORT STUDY PGN] Fetching study metadata...")
         study = await study_repo.get_study_by_id(study_id)
         study_title = getattr(study, 'title', None) or 'Study'
-        logger.info(f"[EXPORT STUDY PGN] Study title: {study_title}")
-
-        logger.info(f"[EXPORT STUDY PGN] Fetching chapters for study...")
         chapters = await study_repo.get_chapters_for_study(study_id, order_by_order=True)
         logger.info(f"[EXPORT STUDY PGN] Found {len(chapters) if chapters else 0} chapters")
 
-        if not chapters:
-            logger.info(f"[EXPORT STUDY PGN] No chapters found, returning empty PGN")
-            safe_title = _sanitize_filename(study_title)
-            filename = f"{safe_title}.pgn"
-            return {"success": True, "pgn": "", "filename": filename}
-
-        pgn_blocks: list[str] = []
-        for idx, chapter in enumerate(chapters):
-            logger.info(f"[EXPORT STUDY PGN] Processing chapter {idx + 1}/{len(chapters)}: {chapter.id}")
-            key = R2Keys.chapter_tree_json(chapter.id)
-            logger.info(f"[EXPORT STUDY PGN] R2 Key: {key}")
-
-            exists = r2_client.exists(key)
-            logger.info(f"[EXPORT STUDY PGN] R2 key exists: {exists}")
-
-            if not exists:
-                logger.error(f"[EXPORT STUDY PGN] Tree not found for chapter {chapter.id}")
-                raise HTTPException(status_code=404, detail=f"Tree not found for chapter {chapter.id}")
-
-            content = r2_client.download_json(key)
-            tree_data = json.loads(content)
-            tree = StudyTreeDTO(**tree_data)
-            pgn = _tree_to_pgn(tree, chapter)
-            logger.info(f"[EXPORT STUDY PGN] Chapter {idx + 1} PGN length: {len(pgn)}")
-            pgn_blocks.append(pgn)
-
-        combined_pgn = "\n\n".join(pgn_blocks)
+        combined_pgn = "".join([block async for block in iter_study_pgn(list(chapters or []), r2_client)])
         logger.info(f"[EXPORT STUDY PGN] Combined PGN length: {len(combined_pgn)}")
 
-        # Generate safe filename
-        safe_title = _sanitize_filename(study_title)
-        filename = f"{safe_title}.pgn"
-        logger.info(f"[EXPORT STUDY PGN] Generated filename: {filename}")
-        logger.info(f"[EXPORT STUDY PGN] Returning success response")
-        logger.info("=" * 60)
-
+        filename = f"{_sanitize_filename(study_title)}.pgn"
         return {"success": True, "pgn": combined_pgn, "filename": filename}
     except HTTPException as he:
         logger.error(f"[EXPORT STUDY PGN] HTTPException: {he.status_code} - {he.detail}")
@@ -300,48 +488,14 @@ def _tree_to_pgn(tree: StudyTreeDTO, chapter) -> str:
     
     header_str = "\n".join([f'[{k} "{v}"]' for k, v in headers.items()])
     
-    def build_text(node_id: str, move_num: int, is_white: bool, force_num: bool = False) -> str:
-        node = tree.nodes.get(node_id)
-        if not node or not node.san: return ""
-        
-        parts = []
-        if is_white or force_num:
-            parts.append(f"{move_num}.{'..' if not is_white else ''} {node.san}")
-        else:
-            parts.append(node.san)
-            
-        if node.comment:
-            parts.append(f"{{{node.comment}}}")
-        
-        # Side variations
-        if len(node.children) > 1:
-            for i in range(1, len(node.children)):
-                # Variations start with the same move number/color as this node
-                var_text = build_text(node.children[i], move_num, is_white, force_num=True)
-                if var_text:
-                    parts.append(f"({var_text})")
-        
-        # Continuation
-        if node.children:
-            next_is_white = not is_white
-            next_move_num = move_num if is_white else move_num + 1
-            # If we had variations or comments, we MUST force the number for the continuation if it's black's move
-            # or if it's white's move (which already has it).
-            need_force = len(node.children) > 1 or node.comment is not None
-            rest = build_text(node.children[0], next_move_num, next_is_white, force_num=need_force)
-            if rest:
-                parts.append(rest)
-            
-        return " ".join(parts)
-
     root_node = tree.nodes.get(tree.rootId)
     movetext = ""
     if root_node and root_node.children:
-        movetext = build_text(root_node.children[0], 1, True)
+        movetext = _movetext(tree, root_node.children[0], 1, True)
         # Handle root-level variations (rare but possible in PGN)
         if len(root_node.children) > 1:
             for i in range(1, len(root_node.children)):
-                var_text = build_text(root_node.children[i], 1, True)
+                var_text = _movetext(tree, root_node.children[i], 1, True)
                 if var_text:
                     movetext += f" ({var_text})"
     else:
@@ -350,3 +504,66 @@ def _tree_to_pgn(tree: StudyTreeDTO, chapter) -> str:
     if movetext == "*":
         return f"{header_str}\n\n*"
     return f"{header_str}\n\n{movetext} {headers['Result']}"
+
+
+def _movetext(
+    tree: StudyTreeDTO, node_id: str, move_num: int, is_white: bool, force_num: bool = False
+) -> str:
+    """
+    Render the line starting at `node_id`, with nested variations.
+
+    Side variations (children after the first) follow the node's own move
+    and comment, numbered like the node, then the main continuation
+    follows. Uses an explicit stack and one output buffer, so long games
+    and deep variation nesting neither recurse nor re-join strings.
+    """
+    def has_text(child_id: str) -> bool:
+        child = tree.nodes.get(child_id)
+        return bool(child and child.san)
+
+    out: list[str] = []
+    need_space = False
+    # ("visit", node_id, move_num, is_white, force_num) | ("(",) | (")",)
+    stack: list[tuple] = [("visit", node_id, move_num, is_white, force_num)]
+    while stack:
+        action = stack.pop()
+        if action[0] == "(":
+            out.append(" (" if need_space else "(")
+            need_space = False
+            continue
+        if action[0] == ")":
+            out.append(")")
+            need_space = True
+            continue
+
+        _, node_id, move_num, is_white, force_num = action
+        node = tree.nodes.get(node_id)
+        if not node or not node.san:
+            continue
+
+        tokens = []
+        if is_white or force_num:
+            tokens.append(f"{move_num}.{'..' if not is_white else ''} {node.san}")
+        else:
+            tokens.append(node.san)
+        if node.comment:
+            tokens.append(f"{{{node.comment}}}")
+        for token in tokens:
+            if need_space:
+                out.append(" ")
+            out.append(token)
+            need_space = True
+
+        # Pushed in reverse: variations run first, then the continuation.
+        if node.children and has_text(node.children[0]):
+            # After variations or a comment the continuation needs its number.
+            need_force = len(node.children) > 1 or node.comment is not None
+            next_move_num = move_num if is_white else move_num + 1
+            stack.append(("visit", node.children[0], next_move_num, not is_white, need_force))
+        for child_id in reversed(node.children[1:]):
+            if has_text(child_id):
+                stack.append((")",))
+                stack.append(("visit", child_id, move_num, is_white, True))
+                stack.append(("(",))
+
+    return "".join(out)
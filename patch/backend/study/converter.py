@@ -1,6 +1,11 @@
-from backend.core.real_pgn.models import NodeTree
+import chess
+
+from backend.core.real_pgn.models import GameMeta, NodeTree, PgnNode
 from patch.backend.study.models import StudyTreeDTO, StudyNodeDTO, TreeMetaDTO
 
+# SANs of nodes that stand for the starting position rather than a move
+_ROOT_SANS = ("", "<root>")
+
 def convert_nodetree_to_dto(node_tree: NodeTree) -> StudyTreeDTO:
     """Convert backend NodeTree to patch StudyTreeDTO."""
     
@@ -30,32 +35,105 @@ def convert_nodetree_to_dto(node_tree: NodeTree) -> StudyTreeDTO:
     )
 
 def _traverse_and_map(node_tree: NodeTree, current_id: str, parent_id: str, nodes: dict):
-    """Recursively map nodes."""
-    src_node = node_tree.nodes.get(current_id)
-    if not src_node:
-        return
-
-    # Combine comments
-    comment = src_node.comment_after or src_node.comment_before
-    if src_node.comment_before and src_node.comment_after:
-        comment = f"{src_node.comment_before} {src_node.comment_after}"
-
-    dto_node = StudyNodeDTO(
-        id=src_node.node_id,
-        parentId=parent_id,
-        san=src_node.san,
-        children=[],
-        comment=comment,
-        nags=src_node.nags
+    """
+    Map the subtree at `current_id` into `nodes`.
+
+    Iterative (explicit stack), so very long games do not hit the recursion
+    limit. A node is added to `nodes` after its whole subtree, main line
+    first, as the recursive version did.
+    """
+    # ("enter", node_id, parent_id) | ("exit", dto_node)
+    stack: list[tuple] = [("enter", current_id, parent_id)]
+    while stack:
+        action = stack.pop()
+        if action[0] == "exit":
+            nodes[action[1].id] = action[1]
+            continue
+
+        _, node_id, parent = action
+        src_node = node_tree.nodes.get(node_id)
+        if not src_node:
+            continue
+
+        # Combine comments
+        comment = src_node.comment_after or src_node.comment_before
+        if src_node.comment_before and src_node.comment_after:
+            comment = f"{src_node.comment_before} {src_node.comment_after}"
+
+        children = ([src_node.main_child] if src_node.main_child else []) + list(src_node.variations)
+        dto_node = StudyNodeDTO(
+            id=src_node.node_id,
+            parentId=parent,
+            san=src_node.san,
+            children=children,
+            comment=comment,
+            nags=src_node.nags
+        )
+
+        stack.append(("exit", dto_node))
+        for child_id in reversed(children):
+            stack.append(("enter", child_id, src_node.node_id))
+
+def convert_dto_to_nodetree(tree: StudyTreeDTO) -> NodeTree:
+    """
+    Convert patch StudyTreeDTO back to a backend NodeTree.
+
+    Moves are replayed from the starting position to fill in FEN, ply and
+    UCI. Root placeholders (the DTO root and the NodeTree root it wraps) are
+    folded into a single root node; a subtree whose move is illegal is
+    dropped. Iterative, like _traverse_and_map.
+    """
+    node_tree = NodeTree(meta=GameMeta(result=tree.meta.result))
+    root = tree.nodes.get(tree.rootId)
+    if root is None:
+        return node_tree
+
+    board = chess.Board()
+    node_tree.root_id = root.id
+    node_tree.nodes[root.id] = PgnNode(
+        node_id=root.id,
+        parent_id=None,
+        san="<root>",
+        uci="<root>",
+        ply=0,
+        move_number=0,
+        fen=board.fen(),
     )
-    
-    # Handle children
-    if src_node.main_child:
-        dto_node.children.append(src_node.main_child)
-        _traverse_and_map(node_tree, src_node.main_child, src_node.node_id, nodes)
-        
-    for var_id in src_node.variations:
-        dto_node.children.append(var_id)
-        _traverse_and_map(node_tree, var_id, src_node.node_id, nodes)
-        
-    nodes[src_node.node_id] = dto_node
+
+    # (dto node id, NodeTree parent id, board at the parent)
+    stack = [(child_id, root.id, board) for child_id in reversed(root.children)]
+    while stack:
+        node_id, parent_id, parent_board = stack.pop()
+        dto_node = tree.nodes.get(node_id)
+        if dto_node is None:
+            continue
+        if dto_node.san in _ROOT_SANS:
+            stack.extend((child_id, parent_id, parent_board) for child_id in reversed(dto_node.children))
+            continue
+
+        board = parent_board.copy(stack=False)
+        try:
+            move = board.parse_san(dto_node.san)
+        except ValueError:
+            continue
+        board.push(move)
+
+        parent = node_tree.nodes[parent_id]
+        if parent.main_child is None:
+            parent.main_child = node_id
+        else:
+            parent.variations.append(node_id)
+        node_tree.nodes[node_id] = PgnNode(
+            node_id=node_id,
+            parent_id=parent_id,
+            san=dto_node.san,
+            uci=move.uci(),
+            ply=board.ply(),
+            move_number=board.fullmove_number,
+            comment_after=dto_node.comment,
+            nags=list(dto_node.nags),
+            fen=board.fen(),
+        )
+        stack.extend((child_id, node_id, board) for child_id in reversed(dto_node.children))
+
+    return node_tree
@@ -6,8 +6,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from modules.workspace.db.tables.studies import Chapter
-from modules.workspace.storage.r2_client import R2Client, create_r2_client_from_env
+from modules.workspace.storage.async_r2_client import create_async_r2_client_from_env
 from modules.workspace.storage.keys import R2Keys
+from modules.workspace.domain.services.chapter_content_cache import chapter_content_cache
 from backend.core.real_pgn.parser import parse_pgn
 from backend.core.real_pgn.models import NodeTree
 from patch.backend.study.models import StudyTreeDTO, StudyNodeDTO, TreeMetaDTO
@@ -19,7 +20,7 @@ async def migrate_all_chapters(session: AsyncSession, batch_size: int = 10):
     """
     Migrate all chapters with .pgn r2_key to .tree.json.
     """
-    r2_client = create_r2_client_from_env()
+    r2_client = create_async_r2_client_from_env()
     
     # Fetch chapters that need migration
     # Heuristic: r2_key ends with .pgn or is null (implies standard pgn key)
@@ -44,11 +45,11 @@ async def migrate_all_chapters(session: AsyncSession, batch_size: int = 10):
             logger.info(f"Migrating chapter {chapter.id} ({current_key})...")
             
             # 1. Download PGN
-            if not r2_client.exists(current_key):
+            if not await r2_client.exists(current_key):
                 logger.warning(f"PGN not found for chapter {chapter.id} at {current_key}, skipping.")
                 continue
                 
-            pgn_text = r2_client.download_pgn(current_key)
+            pgn_text = await r2_client.download_pgn(current_key)
             
             # 2. Parse PGN to NodeTree
             # parse_pgn returns a NodeTree
@@ -60,7 +61,8 @@ async def migrate_all_chapters(session: AsyncSession, batch_size: int = 10):
             # 4. Upload Tree JSON
             new_key = R2Keys.chapter_tree_json(chapter.id)
             content = study_tree_dto.model_dump_json()
-            upload_result = r2_client.upload_json(new_key, content)
+            upload_result = await r2_client.upload_json(new_key, content)
+            chapter_content_cache.invalidate(chapter.id)
             
             # 5. Update Chapter
             chapter.r2_key = new_key
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Annotated, Dict, List, Literal, Optional, Union
 from pydantic import BaseModel, Field
 
 class StudyNodeDTO(BaseModel):
@@ -34,3 +34,55 @@ class TreeResponse(BaseModel):
     success: bool
     tree: Optional[StudyTreeDTO] = None
     error: Optional[str] = None
+    hash: Optional[str] = None
+
+class AddNodeOp(BaseModel):
+    op: Literal["add_node"]
+    id: str
+    parentId: str
+    san: str = Field(min_length=1)
+    comment: Optional[str] = None
+    nags: List[int] = []
+    index: Optional[int] = None
+
+    model_config = {
+        "extra": "forbid"
+    }
+
+class DeleteSubtreeOp(BaseModel):
+    op: Literal["delete_subtree"]
+    id: str
+
+    model_config = {
+        "extra": "forbid"
+    }
+
+class SetCommentOp(BaseModel):
+    op: Literal["set_comment"]
+    id: str
+    comment: Optional[str] = None
+
+    model_config = {
+        "extra": "forbid"
+    }
+
+class PromoteVariationOp(BaseModel):
+    op: Literal["promote_variation"]
+    id: str
+
+    model_config = {
+        "extra": "forbid"
+    }
+
+TreeOp = Annotated[
+    Union[AddNodeOp, DeleteSubtreeOp, SetCommentOp, PromoteVariationOp],
+    Field(discriminator="op"),
+]
+
+class TreeOpsRequest(BaseModel):
+    baseHash: str
+    ops: List[TreeOp] = Field(min_length=1, max_length=500)
+
+    model_config = {
+        "extra": "forbid"
+    }
@@ -0,0 +1,165 @@
+"""
+Operation-based edits to a StudyTreeDTO.
+
+Clients send small op batches (add node, delete subtree, set comment,
+promote variation) against the hash of the tree they last saw instead of
+re-uploading the whole tree. Batches that are not yet compacted into
+tree.json are kept in a per-chapter journal next to it in R2:
+
+    {"version": 1, "entries": [{"baseHash": ..., "resultHash": ..., "ops": [...]}]}
+
+The tree hash is the SHA-256 of the canonical JSON (model_dump_json), i.e.
+the same value R2 reports as content_hash when the tree is uploaded.
+"""
+
+import hashlib
+import json
+from typing import Iterable, Sequence
+
+from pydantic import TypeAdapter
+
+from patch.backend.study.models import (
+    AddNodeOp,
+    DeleteSubtreeOp,
+    PromoteVariationOp,
+    SetCommentOp,
+    StudyNodeDTO,
+    StudyTreeDTO,
+    TreeOp,
+)
+
+JOURNAL_VERSION = 1
+
+_ops_adapter = TypeAdapter(list[TreeOp])
+
+
+class TreeOpError(ValueError):
+    """An op does not apply to the tree (unknown node, duplicate id, ...)."""
+
+
+def tree_hash(tree: StudyTreeDTO) -> str:
+    """SHA-256 of the tree's canonical JSON."""
+    return hashlib.sha256(tree.model_dump_json().encode("utf-8")).hexdigest()
+
+
+def apply_tree_ops(tree: StudyTreeDTO, ops: Sequence[TreeOp]) -> StudyTreeDTO:
+    """
+    Apply ops in order and return the edited tree.
+
+    The input tree is not modified (it may be shared through the chapter
+    content cache); only the nodes an op touches are copied.
+
+    Raises:
+        TreeOpError: If any op does not apply; no partial result is returned
+    """
+    nodes = dict(tree.nodes)
+    copied: set[str] = set()
+
+    def writable(node_id: str) -> StudyNodeDTO:
+        if node_id not in nodes:
+            raise TreeOpError(f'Node "{node_id}" not found')
+        if node_id not in copied:
+            node = nodes[node_id]
+            nodes[node_id] = node.model_copy(
+                update={"children": list(node.children), "nags": list(node.nags)}
+            )
+            copied.add(node_id)
+        return nodes[node_id]
+
+    for index, op in enumerate(ops):
+        try:
+            if isinstance(op, AddNodeOp):
+                if op.id in nodes:
+                    raise TreeOpError(f'Node "{op.id}" already exists')
+                parent = writable(op.parentId)
+                position = len(parent.children) if op.index is None else op.index
+                if not 0 <= position <= len(parent.children):
+                    raise TreeOpError(f"Index {op.index} out of range")
+                parent.children.insert(position, op.id)
+                nodes[op.id] = StudyNodeDTO(
+                    id=op.id,
+                    parentId=op.parentId,
+                    san=op.san,
+                    children=[],
+                    comment=op.comment,
+                    nags=list(op.nags),
+                )
+                copied.add(op.id)
+            elif isinstance(op, DeleteSubtreeOp):
+                if op.id == tree.rootId:
+                    raise TreeOpError("Cannot delete the root node")
+                node = nodes.get(op.id)
+                if node is None:
+                    raise TreeOpError(f'Node "{op.id}" not found')
+                writable(node.parentId).children.remove(op.id)
+                stack = [op.id]
+                while stack:
+                    removed = nodes.pop(stack.pop())
+                    stack.extend(removed.children)
+            elif isinstance(op, SetCommentOp):
+                writable(op.id).comment = op.comment
+            elif isinstance(op, PromoteVariationOp):
+                node = nodes.get(op.id)
+                if node is None or node.parentId is None:
+                    raise TreeOpError(f'Node "{op.id}" is not a variation')
+                siblings = writable(node.parentId).children
+                siblings.remove(op.id)
+                siblings.insert(0, op.id)
+        except TreeOpError as exc:
+            raise TreeOpError(f"op {index} ({op.op}): {exc}") from None
+
+    return tree.model_copy(update={"nodes": nodes})
+
+
+def parse_journal(content: str | None) -> list[dict]:
+    """Return journal entries from its JSON (empty for a missing journal)."""
+    if not content:
+        return []
+    return json.loads(content).get("entries", [])
+
+
+def dump_journal(entries: Iterable[dict]) -> str:
+    return json.dumps({"version": JOURNAL_VERSION, "entries": list(entries)})
+
+
+def journal_entry(base_hash: str, result_hash: str, ops: Sequence[TreeOp]) -> dict:
+    return {
+        "baseHash": base_hash,
+        "resultHash": result_hash,
+        "ops": [op.model_dump() for op in ops],
+    }
+
+
+def truncate_journal(entries: list[dict], head_hash: str) -> list[dict]:
+    """
+    Drop entries after the one that produced `head_hash`.
+
+    Such entries were written by saves whose database commit failed; a
+    journal with no entry producing `head_hash` is fully compacted.
+    """
+    for index in range(len(entries) - 1, -1, -1):
+        if entries[index].get("resultHash") == head_hash:
+            return entries[: index + 1]
+    return []
+
+
+def replay_journal(
+    tree: StudyTreeDTO, entries: Iterable[dict], target_hash: str | None = None
+) -> StudyTreeDTO:
+    """
+    Bring a compacted tree up to date with its journal.
+
+    Entries are applied in order, each only if its baseHash matches the
+    current tree, so entries already folded into tree.json (e.g. by a
+    compaction that did not get to clear the journal) are skipped.
+    Replay stops once `target_hash` is reached.
+    """
+    current = tree_hash(tree)
+    for entry in entries:
+        if target_hash is not None and current == target_hash:
+            break
+        if entry.get("baseHash") != current:
+            continue
+        tree = apply_tree_ops(tree, _ops_adapter.validate_python(entry["ops"]))
+        current = entry["resultHash"]
+    return tree
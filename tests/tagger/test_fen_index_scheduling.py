@@ -0,0 +1,166 @@
+"""
+Tests for adaptive, priority-ordered FEN index analysis.
+"""
+
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from backend.core.tagger.analysis.fen_processor import FenIndexProcessor
+from backend.core.tagger.analysis.pipeline import AnalysisPipeline
+from backend.core.tagger.analysis.scheduler import AdaptiveConcurrency
+from backend.core.tagger.pipeline.predictor.node_predictor import NodeTagResult
+
+
+def _tree_with_variation():
+    """1. e4 (1. d4 d5) e5 2. Nf3 -- d4/d5 form a side line."""
+    return {
+        "nodes": {
+            "root": {"parent_id": None, "san": "<root>", "fen": "start", "main_child": "e4"},
+            "e4": {"parent_id": "root", "san": "e4", "uci": "e2e4", "ply": 1, "fen": "f1", "main_child": "e5"},
+            "d4": {"parent_id": "root", "san": "d4", "uci": "d2d4", "ply": 1, "fen": "f2", "main_child": "d5"},
+            "d5": {"parent_id": "d4", "san": "d5", "uci": "d7d5", "ply": 2, "fen": "f3"},
+            "e5": {"parent_id": "e4", "san": "e5", "uci": "e7e5", "ply": 2, "fen": "f4", "main_child": "nf3"},
+            "nf3": {"parent_id": "e5", "san": "Nf3", "uci": "g1f3", "ply": 3, "fen": "f5"},
+        }
+    }
+
+
+class TestPriorityOrdering:
+    """Mainline nodes are scheduled before variations."""
+
+    def test_mainline_before_variations(self):
+        entries = FenIndexProcessor().process_tree_with_moves(_tree_with_variation())
+
+        assert [e.node_id for e in entries] == ["e4", "e5", "nf3", "d4", "d5"]
+        assert [e.variation_depth for e in entries] == [0, 0, 0, 1, 1]
+
+    def test_fen_is_position_before_move(self):
+        entries = FenIndexProcessor().process_tree_with_moves(_tree_with_variation())
+        by_id = {e.node_id: e for e in entries}
+
+        assert by_id["d5"].fen == "f2"
+
+
+class TestAdaptiveConcurrency:
+    """AIMD window sizing."""
+
+    def test_grows_after_healthy_window(self):
+        controller = AdaptiveConcurrency(initial=2, maximum=4)
+        for _ in range(2):
+            controller.record(100.0)
+
+        assert controller.limit == 3
+
+    def test_halves_on_error(self):
+        controller = AdaptiveConcurrency(initial=8, maximum=8)
+        controller.record(None, error=True)
+
+        assert controller.limit == 4
+        assert controller.stats.decreases == 1
+
+    def test_shrinks_when_latency_degrades(self):
+        controller = AdaptiveConcurrency(initial=8, maximum=8)
+        controller.record(100.0)
+        for _ in range(5):
+            controller.record(1000.0)
+
+        assert controller.limit < 8
+
+    def test_respects_bounds(self):
+        controller = AdaptiveConcurrency(initial=1, minimum=1, maximum=2)
+        for _ in range(5):
+            controller.record(None, error=True)
+        assert controller.limit == 1
+
+        for _ in range(20):
+            controller.record(10.0)
+        assert controller.limit == 2
+
+
+class _FakeEnginePipeline(AnalysisPipeline):
+    """Pipeline whose engine call is replaced by a short sleep."""
+
+    def __init__(self, *args, delays=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delays = delays or {}
+        self.max_in_flight = 0
+        self._in_flight = 0
+
+    async def _analyze_entry(self, entry):
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(entry.node_id, 0.01))
+        finally:
+            self._in_flight -= 1
+        return (
+            NodeTagResult(node_id=entry.node_id, fen=entry.fen, move_uci=entry.uci, tags=["ok"]),
+            10.0,
+        )
+
+
+class TestRunFenIndex:
+    """Sliding-window scheduling in run_fen_index."""
+
+    @pytest.fixture
+    def output_dir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield Path(temp_dir)
+
+    def test_timeout_keeps_mainline_results(self, output_dir):
+        pipeline = _FakeEnginePipeline(
+            pgn_path="unused.pgn",
+            output_dir=output_dir,
+            delays={"d4": 5.0, "d5": 5.0},
+        )
+
+        results = asyncio.run(
+            pipeline.run_fen_index({}, tree_data=_tree_with_variation(), verbose=False, batch_timeout=0.3)
+        )
+        by_id = {r.node_id: r for r in results}
+
+        assert len(results) == 5
+        for node_id in ("e4", "e5", "nf3"):
+            assert by_id[node_id].error is None
+            assert by_id[node_id].tags == ["ok"]
+        assert by_id["d4"].error == "batch_timeout"
+
+    def test_window_refills_without_waiting_for_slowest(self, output_dir):
+        fen_index = {f"n{i}": "fen" for i in range(20)}
+        pipeline = _FakeEnginePipeline(
+            pgn_path="unused.pgn",
+            output_dir=output_dir,
+            delays={"n0": 0.3},
+        )
+        pipeline.MAX_CONCURRENCY = 2
+        pipeline.MAX_CONCURRENCY_CEILING = 2
+
+        results = asyncio.run(pipeline.run_fen_index(fen_index, verbose=False))
+
+        assert len(results) == 20
+        assert pipeline.max_in_flight == 2
+        # n0 is still running while the other slot drains the rest.
+        assert results[-1].node_id == "n0"
+
+    def test_save_writes_partial_checkpoints(self, output_dir):
+        fen_index = {f"n{i}": "fen" for i in range(5)}
+        pipeline = _FakeEnginePipeline(pgn_path="unused.pgn", output_dir=output_dir)
+        pipeline.CHECKPOINT_EVERY = 2
+        checkpoints = []
+        original = pipeline._write_tags_output
+
+        def _record(path, data):
+            checkpoints.append(data["metadata"]["complete"])
+            original(path, data)
+
+        pipeline._write_tags_output = _record
+        asyncio.run(pipeline.run_fen_index_and_save(fen_index, chapter_id="ch1", verbose=False))
+
+        assert checkpoints[0] is False
+        assert checkpoints[-1] is True
+        saved = json.loads((output_dir / "ch1.tags.json").read_text())
+        assert len(saved["nodes"]) == 5
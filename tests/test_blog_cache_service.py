@@ -0,0 +1,209 @@
+"""
+Test the blog cache service.
+
+Covers:
+1. Concurrent misses of a key share one loader call (single-flight)
+2. A loader exception reaches every waiter; the next miss loads again
+3. Cancelling the loading request lets a waiter load for itself
+4. Another worker's lock: wait for its result, or load after the wait
+5. Tags stay bounded by their live keys
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import pytest
+
+from modules.blogs.services.cache_service import ALL_TAG, BlogCacheService
+
+
+class FakePipeline:
+    """Queues commands and runs them in order on execute()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    async def execute(self):
+        return [
+            await getattr(self.redis, name)(*args, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+
+
+class FakeRedis:
+    """Minimal async Redis stand-in: strings and sorted sets, no expiry."""
+
+    def __init__(self):
+        self.values: dict[str, str] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+        return True
+
+    async def unlink(self, *keys):
+        return sum(
+            (self.values.pop(key, None) is not None) + (self.zsets.pop(key, None) is not None)
+            for key in keys
+        )
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        expired = [m for m, score in zset.items() if score <= float(high)]
+        for member in expired:
+            del zset[member]
+        return len(expired)
+
+    async def zrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        return sorted(m for m, score in zset.items() if score >= float(low))
+
+    async def expire(self, key, ttl):
+        return key in self.zsets
+
+
+@pytest.fixture
+def cache():
+    service = BlogCacheService()
+    service.redis_client = FakeRedis()
+    service._lock_wait_seconds = 0.2
+    service._lock_poll_seconds = 0.01
+    return service
+
+
+class GatedLoader:
+    """Loader that blocks until released, counting its calls."""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def test_concurrent_misses_share_one_load(cache):
+    loader = GatedLoader(result={"title": "Opening traps"})
+
+    tasks = [asyncio.create_task(cache.load_article("a1", loader)) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    loader.release.set()
+
+    assert await asyncio.gather(*tasks) == [{"title": "Opening traps"}] * 5
+    assert loader.calls == 1
+    assert await cache.get_article("a1") == {"title": "Opening traps"}
+    assert "blog:lock:blog:article:a1" not in cache.redis_client.values
+
+
+async def test_loader_error_reaches_every_waiter(cache):
+    loader = GatedLoader(error=RuntimeError("database down"))
+
+    tasks = [asyncio.create_task(cache.load_article("a1", loader)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    loader.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert [str(result) for result in results] == ["database down"] * 3
+    assert loader.calls == 1
+    assert cache._inflight == {}
+
+    retry = GatedLoader(result={"title": "Back"})
+    retry.release.set()
+    assert await cache.load_article("a1", retry) == {"title": "Back"}
+
+
+async def test_cancelled_loader_lets_waiter_load(cache):
+    loader = GatedLoader(result={"title": "Endgames"})
+
+    leader = asyncio.create_task(cache.load_article("a1", loader))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.create_task(cache.load_article("a1", loader))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    await asyncio.sleep(0.01)
+    loader.release.set()
+
+    assert await waiter == {"title": "Endgames"}
+    assert leader.cancelled()
+    assert loader.calls == 2
+
+
+async def test_waits_for_other_worker_holding_the_lock(cache):
+    redis = cache.redis_client
+    await redis.set("blog:lock:blog:article:a1", "1")
+    loader = GatedLoader(result={"title": "Mine"})
+    loader.release.set()
+
+    async def other_worker_finishes():
+        await asyncio.sleep(0.05)
+        await cache.set_article("a1", {"title": "Theirs"})
+
+    result, _ = await asyncio.gather(cache.load_article("a1", loader), other_worker_finishes())
+
+    assert result == {"title": "Theirs"}
+    assert loader.calls == 0
+
+
+async def test_loads_after_lock_wait_times_out(cache):
+    await cache.redis_client.set("blog:lock:blog:article:a1", "1")
+    loader = GatedLoader(result={"title": "Mine"})
+    loader.release.set()
+
+    started = time.monotonic()
+    assert await cache.load_article("a1", loader) == {"title": "Mine"}
+
+    assert loader.calls == 1
+    assert time.monotonic() - started >= cache._lock_wait_seconds
+    # The lock belongs to the other worker: left alone
+    assert "blog:lock:blog:article:a1" in cache.redis_client.values
+
+
+async def test_tags_only_keep_live_keys(cache):
+    redis = cache.redis_client
+    redis.zsets[ALL_TAG] = {"blog:article:expired": time.time() - 1}
+
+    await cache.set_article_list("openings", 1, {"items": []})
+    await cache.set_article("a1", {"title": "Live"})
+
+    assert set(redis.zsets[ALL_TAG]) == {"blog:articles:list:openings:1", "blog:article:a1"}
+
+    await cache.invalidate_article_list("openings")
+    assert await cache.get_article_list("openings", 1) is None
+    assert await cache.get_article("a1") == {"title": "Live"}
+
+    await cache.clear_all_blog_cache()
+    assert redis.values == {} and redis.zsets == {}
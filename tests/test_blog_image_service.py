@@ -0,0 +1,151 @@
+"""
+Test blog image processing.
+
+Covers:
+1. render_image() encodes the main rendition and responsive variants
+2. plan_upload() picks paths and sizes, and rejects corrupt files
+3. render_and_upload() replaces a broken process pool and retries
+"""
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import pytest
+from PIL import Image
+
+import modules.blogs.services.image_service as image_module
+from modules.blogs.services.image_service import ImageUploadService, render_image
+
+
+def _image_bytes(size=(2400, 1200), fmt="PNG", mode="RGB", **save_args) -> bytes:
+    output = io.BytesIO()
+    Image.new(mode, size, (200, 30, 30, 255)[: len(mode)]).save(output, format=fmt, **save_args)
+    return output.getvalue()
+
+
+def _animated_gif() -> bytes:
+    frames = [Image.new("RGB", (600, 300), color) for color in ("red", "green", "blue")]
+    output = io.BytesIO()
+    frames[0].save(output, format="GIF", save_all=True, append_images=frames[1:])
+    return output.getvalue()
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("R2_CDN_URL", "https://cdn.example.com")
+    return ImageUploadService()
+
+
+def test_render_adaptive_width_scales_and_adds_variants():
+    rendered = render_image(_image_bytes(), "adaptive_width", formats=("WEBP", "AVIF"))
+
+    main = rendered["main"]
+    assert (main["format"], main["width"], main["height"]) == ("WEBP", 1920, 960)
+    assert Image.open(io.BytesIO(main["data"])).size == (1920, 960)
+
+    variants = [(v["width"], v["height"], v["format"]) for v in rendered["variants"]]
+    # Full width only in the formats the main rendition is not already in
+    assert variants == [
+        (1920, 960, "AVIF"),
+        (1440, 720, "WEBP"), (1440, 720, "AVIF"),
+        (960, 480, "WEBP"), (960, 480, "AVIF"),
+        (480, 240, "WEBP"), (480, 240, "AVIF"),
+    ]
+    assert Image.open(io.BytesIO(rendered["variants"][1]["data"])).size == (1440, 720)
+
+
+def test_render_original_keeps_format_and_size():
+    rendered = render_image(_image_bytes((800, 400), "JPEG"), "original", formats=("WEBP",))
+
+    main = rendered["main"]
+    assert (main["format"], main["width"], main["height"]) == ("JPEG", 800, 400)
+    assert [(v["width"], v["format"]) for v in rendered["variants"]] == [
+        (800, "WEBP"), (480, "WEBP"),
+    ]
+
+
+def test_render_flattens_alpha_for_adaptive_webp():
+    rendered = render_image(_image_bytes((300, 100), mode="RGBA"), "adaptive_width", formats=("WEBP",))
+
+    assert Image.open(io.BytesIO(rendered["main"]["data"])).mode == "RGB"
+
+
+def test_render_animated_image_has_no_variants():
+    rendered = render_image(_animated_gif(), "original")
+
+    assert rendered["main"]["format"] == "GIF"
+    assert rendered["variants"] == []
+
+
+def test_plan_upload_paths_and_sizes(service):
+    plan = service.plan_upload(_image_bytes(), "board.png", "adaptive_width")
+
+    assert plan["filename"] == "board.webp"
+    assert plan["content_type"] == "image/webp"
+    assert (plan["width"], plan["height"]) == (1920, 960)
+    assert plan["storage_path"].startswith("blog/") and plan["storage_path"].endswith("_board.webp")
+    assert plan["url"] == f"https://cdn.example.com/{plan['storage_path']}"
+    assert service.variant_storage_path(plan["storage_path"], 960, "AVIF").endswith("_board-960w.avif")
+
+    original = service.plan_upload(_image_bytes((800, 400), "JPEG"), "photo.jpeg", "original")
+    assert (original["filename"], original["width"]) == ("photo.jpg", 800)
+
+
+@pytest.mark.parametrize("fmt", ["PNG", "JPEG"])
+def test_plan_upload_rejects_truncated_file(service, fmt):
+    data = _image_bytes((400, 200), fmt)
+
+    with pytest.raises(ValueError, match="Corrupt image file"):
+        service.plan_upload(data[: len(data) - 20], f"cut.{fmt.lower()}")
+
+
+def test_plan_upload_rejects_invalid_uploads(service):
+    with pytest.raises(ValueError, match="not allowed"):
+        service.plan_upload(_image_bytes((10, 10), "BMP"), "icon.bmp")
+    with pytest.raises(ValueError, match="Invalid image file"):
+        service.plan_upload(b"not an image", "notes.png")
+
+    service.max_size_bytes = 100
+    with pytest.raises(ValueError, match="File size exceeds"):
+        service.plan_upload(_image_bytes((400, 200)), "big.png")
+
+
+class BrokenPool:
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+async def test_render_and_upload_replaces_broken_pool(service, monkeypatch):
+    broken = BrokenPool()
+    with ThreadPoolExecutor(max_workers=1) as healthy:
+        monkeypatch.setattr(image_module, "_process_pool", broken)
+        monkeypatch.setattr(
+            image_module,
+            "ProcessPoolExecutor",
+            lambda **kwargs: healthy,
+        )
+        uploaded = []
+        monkeypatch.setattr(
+            service,
+            "upload_object",
+            lambda path, data, content_type: uploaded.append(path) or service.public_url(path),
+        )
+
+        plan = service.plan_upload(_image_bytes((600, 300)), "board.png", "adaptive_width")
+        processed = await service.render_and_upload(_image_bytes((600, 300)), plan)
+
+        assert broken.shut_down
+        assert image_module._process_pool is healthy
+    assert (processed["width"], processed["height"]) == (600, 300)
+    assert uploaded[0] == plan["storage_path"]
+    assert len(uploaded) == 1 + len(processed["variants"])
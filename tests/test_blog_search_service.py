@@ -0,0 +1,63 @@
+"""
+Test blog search paging and snippets (statement level, no PostgreSQL).
+
+Covers:
+1. The cursor round-trips a double precision rank exactly
+2. Cursor comparisons use the same double precision rank as the results
+3. Snippets are built over HTML-escaped content
+"""
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from modules.blogs.services.search_service import (
+    decode_cursor,
+    encode_cursor,
+    search_articles,
+)
+
+
+def _compiled_search(**kwargs):
+    db = MagicMock()
+    db.execute.return_value.all.return_value = []
+    search_articles(db, "sicilian najdorf", **kwargs)
+    statement = db.execute.call_args.args[0]
+    return statement.compile(dialect=postgresql.dialect())
+
+
+@pytest.mark.parametrize("rank", [0.1 + 0.2, 1 / 3, 1.0000001192092896, 2.5e-08])
+def test_cursor_round_trips_rank_exactly(rank):
+    article_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(rank, article_id)) == (rank, article_id)
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_cursor_compares_double_precision_rank():
+    compiled = _compiled_search(cursor=encode_cursor(1 / 3, uuid.uuid4()))
+    sql = str(compiled)
+
+    assert "AS DOUBLE PRECISION) AS rank" in sql
+    # Both cursor comparisons use the returned (cast) rank
+    assert sql.count("AS DOUBLE PRECISION) < %(param_1)s") == 1
+    assert sql.count("AS DOUBLE PRECISION) = %(param_1)s") == 1
+    assert compiled.params["param_1"] == 1 / 3
+
+
+def test_snippet_is_built_over_escaped_content():
+    compiled = _compiled_search()
+
+    assert "ts_headline(%(ts_headline_2)s, replace(replace(replace(blog_articles.content" in str(compiled)
+    # & is escaped first, so the entities of < and > are not escaped again
+    assert [compiled.params[f"replace_{n}"] for n in range(1, 7)] == [
+        "&", "&amp;", "<", "&lt;", ">", "&gt;",
+    ]
@@ -0,0 +1,265 @@
+"""
+Test Game Session Cache
+
+Covers the bounded GameStorageService session cache:
+- LRU / idle TTL / memory budget eviction
+- Rehydration of a GameSession from its stored PGN
+- Write-behind PGN uploads
+"""
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from core.chess_basic.utils.fen import board_to_fen
+from core.chess_basic.utils.uci import parse_uci_move
+from services.game_session_cache import GameSessionCache, estimate_session_bytes
+from services.game_storage_service import GameSession, GameStorageService
+
+
+class InMemoryStorageClient:
+    """Stand-in for StorageClient that records uploads."""
+
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+        self.put_count = 0
+
+    def put_object(self, key, content, content_type=None):
+        self.objects[key] = content
+        self.put_count += 1
+
+
+def _play(session: GameSession) -> GameSession:
+    """1. e4 (1. d4) e5 (1...c5 {sicilian}) 2. Nf3"""
+    start = board_to_fen(session.state)
+    _, after_e4 = session.add_move(parse_uci_move("e2e4"), start, False, None, "m1")
+    _, after_e5 = session.add_move(parse_uci_move("e7e5"), board_to_fen(after_e4), False, "m1", "m2")
+    session.add_move(parse_uci_move("g1f3"), board_to_fen(after_e5), False, "m2", "m3")
+    session.add_move(parse_uci_move("c7c5"), board_to_fen(after_e4), True, "m1", "m4")
+    session.add_comment("sicilian")
+    session.add_move(parse_uci_move("d2d4"), start, True, None, "m5")
+    return session
+
+
+def test_rehydrate_from_pgn_roundtrip():
+    original = _play(GameSession("g1", "u1"))
+    original.pgn_tree.set_tag("White", "Alice")
+
+    restored = GameSession.from_pgn("g1", "u1", original.to_pgn())
+
+    assert restored.to_pgn() == original.to_pgn()
+    assert restored.move_count == 3
+    assert "Nf3" in restored.to_pgn()
+    assert restored.get_fen().startswith("rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2")
+
+
+def test_pgn_preview_matches_full_pgn_prefix():
+    session = _play(GameSession("g1", "u1"))
+    full = session.to_pgn()
+
+    assert session.pgn_preview() == full[:100] + "..."
+
+
+def test_cache_evicts_least_recently_used():
+    evicted = []
+    cache = GameSessionCache(max_entries=2, on_evict=lambda game_id, _: evicted.append(game_id))
+    for game_id in ("a", "b"):
+        cache.put(game_id, GameSession(game_id, "u"))
+    cache.get("a")
+    cache.put("c", GameSession("c", "u"))
+
+    assert evicted == ["b"]
+    assert "a" in cache and "c" in cache
+
+
+def test_cache_respects_memory_budget():
+    session = _play(GameSession("a", "u"))
+    budget = estimate_session_bytes(session) * 2
+    cache = GameSessionCache(max_entries=100, max_bytes=budget)
+    for game_id in ("a", "b", "c"):
+        cache.put(game_id, _play(GameSession(game_id, "u")))
+
+    assert len(cache) == 2
+
+
+def test_cache_expires_idle_sessions():
+    cache = GameSessionCache(idle_ttl=0.01)
+    cache.put("a", GameSession("a", "u"))
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+
+
+def test_write_behind_batches_uploads():
+    service = GameStorageService()
+    service.FLUSH_INTERVAL = 3600
+    storage = InMemoryStorageClient()
+    service.storage_client = storage
+
+    session = GameSession("g1", "u1")
+    service.sessions.put("g1", session)
+    for _ in range(3):
+        service._mark_dirty("g1", "games/u1/g1.pgn", session)
+    _play(session)
+
+    assert storage.put_count == 0
+    assert service.flush_pending() == 1
+    assert storage.put_count == 1
+    assert b"Nf3" in storage.objects["games/u1/g1.pgn"]
+
+
+class FailingStorageClient(InMemoryStorageClient):
+    def put_object(self, key, content, content_type=None):
+        raise ConnectionError("r2 unavailable")
+
+
+def test_evicted_dirty_session_is_flushed():
+    service = GameStorageService()
+    service.FLUSH_INTERVAL = 3600
+    storage = InMemoryStorageClient()
+    service.storage_client = storage
+    service.sessions.max_entries = 1
+
+    session = _play(GameSession("g1", "u1"))
+    service.sessions.put("g1", session)
+    service._mark_dirty("g1", "games/u1/g1.pgn", session)
+    service.sessions.put("g2", GameSession("g2", "u1"))
+
+    # Eviction runs under the cache lock: it only wakes the flusher
+    assert service.sessions.peek("g1") is None
+    assert storage.put_count == 0
+    assert service.flush_pending() == 1
+    assert b"Nf3" in storage.objects["games/u1/g1.pgn"]
+    assert service.flush_pending() == 0
+
+
+def test_evicted_dirty_session_is_reused_until_flushed():
+    service = GameStorageService()
+    service.FLUSH_INTERVAL = 3600
+    service.sessions.max_entries = 1
+
+    session = _play(GameSession("g1", "u1"))
+    service.sessions.put("g1", session)
+    service._mark_dirty("g1", "games/u1/g1.pgn", session)
+    service.sessions.put("g2", GameSession("g2", "u1"))
+
+    # R2 does not have the latest moves yet, so the pending session is reused
+    assert service.get_or_create_session("g1", "u1", db=None) is session
+
+
+def test_failed_upload_stays_queued():
+    service = GameStorageService()
+    service.FLUSH_INTERVAL = 3600
+    service.storage_client = FailingStorageClient()
+
+    session = _play(GameSession("g1", "u1"))
+    service.sessions.put("g1", session)
+    service._mark_dirty("g1", "games/u1/g1.pgn", session)
+
+    assert service.flush_pending() == 0
+
+    storage = InMemoryStorageClient()
+    service.storage_client = storage
+    assert service.flush_pending() == 1
+    assert b"Nf3" in storage.objects["games/u1/g1.pgn"]
+
+
+def test_change_during_upload_is_flushed_again():
+    service = GameStorageService()
+    service.FLUSH_INTERVAL = 3600
+    session = GameSession("g1", "u1")
+    service.sessions.put("g1", session)
+
+    class RemarkingStorageClient(InMemoryStorageClient):
+        def put_object(self, key, content, content_type=None):
+            super().put_object(key, content, content_type)
+            if self.put_count == 1:
+                _play(session)
+                service._mark_dirty("g1", key, session)
+
+    storage = RemarkingStorageClient()
+    service.storage_client = storage
+    service._mark_dirty("g1", "games/u1/g1.pgn", session)
+
+    assert service.flush_pending() == 1
+    assert b"Nf3" not in storage.objects["games/u1/g1.pgn"]
+    assert service.flush_pending() == 1
+    assert b"Nf3" in storage.objects["games/u1/g1.pgn"]
+    assert service.flush_pending() == 0
+
+
+class BlockingStorageClient(InMemoryStorageClient):
+    """Uploads wait for `release`; deletes remove the object."""
+
+    def __init__(self):
+        super().__init__()
+        self.uploading = threading.Event()
+        self.release = threading.Event()
+
+    def put_object(self, key, content, content_type=None):
+        self.uploading.set()
+        assert self.release.wait(5)
+        super().put_object(key, content, content_type)
+
+    def delete_object(self, key):
+        self.objects.pop(key, None)
+
+
+def _game_db(r2_key: str):
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = SimpleNamespace(r2_key=r2_key)
+    return db
+
+
+def test_delete_during_flush_leaves_no_object():
+    service = GameStorageService()
+    service.FLUSH_INTERVAL = 3600
+    storage = BlockingStorageClient()
+    service.storage_client = storage
+    game_id, user_id = str(uuid.uuid4()), str(uuid.uuid4())
+    r2_key = f"games/{user_id}/{game_id}.pgn"
+
+    session = _play(GameSession(game_id, user_id))
+    service.sessions.put(game_id, session)
+    service._mark_dirty(game_id, r2_key, session)
+
+    flush = threading.Thread(target=service.flush_pending)
+    flush.start()
+    assert storage.uploading.wait(5)
+    delete = threading.Thread(target=service.delete_game, args=(game_id, user_id, _game_db(r2_key)))
+    delete.start()
+    # The delete waits for the upload in flight, then removes the object
+    time.sleep(0.05)
+    assert delete.is_alive()
+    storage.release.set()
+    flush.join(5)
+    delete.join(5)
+
+    assert r2_key not in storage.objects
+    assert service.flush_pending() == 0
+    assert service.sessions.peek(game_id) is None
+
+
+def test_flush_skips_game_deleted_after_snapshot():
+    service = GameStorageService()
+    service.FLUSH_INTERVAL = 3600
+    storage = BlockingStorageClient()
+    storage.release.set()
+    service.storage_client = storage
+    game_ids = [str(uuid.uuid4()) for _ in range(2)]
+    user_id = str(uuid.uuid4())
+    for game_id in game_ids:
+        session = GameSession(game_id, user_id)
+        service.sessions.put(game_id, session)
+        service._mark_dirty(game_id, f"games/{user_id}/{game_id}.pgn", session)
+
+    # The first upload deletes the second game before its turn comes
+    def delete_second(key, content, content_type=None):
+        BlockingStorageClient.put_object(storage, key, content, content_type)
+        service.delete_game(game_ids[1], user_id, _game_db(f"games/{user_id}/{game_ids[1]}.pgn"))
+
+    storage.put_object = delete_second
+
+    assert service.flush_pending() == 1
+    assert list(storage.objects) == [f"games/{user_id}/{game_ids[0]}.pgn"]
@@ -0,0 +1,224 @@
+"""
+Test the principal cache used by authentication dependencies.
+
+Covers:
+1. get_current_principal() only queries the database on a cache miss
+2. Role changes / deactivation invalidate the cached principal
+3. Logout revokes the token id, on every auth path and across workers
+4. The async path only opens a session on a miss
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from core.db.base import Base
+from core.errors import InvalidTokenError
+from core.security.current_user import (
+    get_current_principal,
+    get_current_principal_async,
+    get_current_user,
+    get_current_user_sync,
+)
+from core.security.jwt import create_access_token, decode_token_claims
+from core.security.principal_cache import (
+    Principal,
+    PrincipalCache,
+    principal_cache,
+    revoke_token,
+)
+from models.user import User
+from services.user_service import create_user, update_user_profile
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'users.db'}")
+    Base.metadata.create_all(engine, tables=[User.__table__])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    return create_user(
+        db=db,
+        identifier="principal@example.com",
+        identifier_type="email",
+        password="password123",
+        role="student",
+    )
+
+
+def _record_selects(engine) -> list[str]:
+    statements: list[str] = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+def test_principal_served_from_cache_after_first_load(engine, db, user):
+    token = create_access_token(str(user.id))
+    statements = _record_selects(engine)
+
+    first = get_current_principal(token=token, db=db)
+    second = get_current_principal(token=token, db=db)
+
+    assert first == second
+    assert first.id == str(user.id) and first.role == "student" and first.is_active
+    assert len(statements) == 1
+
+
+def test_role_change_and_deactivation_invalidate(db, user):
+    token = create_access_token(str(user.id))
+    get_current_principal(token=token, db=db)
+
+    update_user_profile(db, user.id, {"role": "teacher"})
+    assert get_current_principal(token=token, db=db).role == "teacher"
+
+    update_user_profile(db, user.id, {"is_active": False})
+    with pytest.raises(HTTPException) as exc:
+        get_current_principal(token=token, db=db)
+    assert exc.value.status_code == 401
+
+
+def test_logout_revokes_token(db, user):
+    token = create_access_token(str(user.id))
+    other_token = create_access_token(str(user.id))
+    get_current_user(token=token, db=db)
+
+    revoke_token(decode_token_claims(token))
+
+    with pytest.raises(HTTPException) as exc:
+        get_current_principal(token=token, db=db)
+    assert exc.value.detail == "Token has been revoked"
+    with pytest.raises(HTTPException):
+        get_current_user(token=token, db=db)
+    assert get_current_principal(token=other_token, db=db).id == str(user.id)
+
+
+def test_logout_revokes_token_on_blog_and_workspace_routes(db, user, monkeypatch):
+    # The workspace test suite enables its auth bypass for the session
+    monkeypatch.delenv("WORKSPACE_TEST_AUTH", raising=False)
+    from modules.blogs.auth import get_current_user as get_blog_user
+    from modules.workspace.api.deps import get_current_user as get_workspace_user
+
+    token = create_access_token(str(user.id))
+    assert get_blog_user(token=token, db=db).id == user.id
+    assert get_workspace_user(token=token, x_user_id=None, db=db).id == user.id
+
+    revoke_token(decode_token_claims(token))
+
+    for authenticate in (
+        lambda: get_blog_user(token=token, db=db),
+        lambda: get_workspace_user(token=token, x_user_id=None, db=db),
+    ):
+        with pytest.raises(HTTPException) as exc:
+            authenticate()
+        assert exc.value.detail == "Token has been revoked"
+    with pytest.raises(InvalidTokenError):
+        get_current_user_sync(token, db)
+
+
+class FakeRedis:
+    """Minimal sync Redis stand-in: SET with EX, EXISTS."""
+
+    def __init__(self):
+        self.values: dict[str, tuple[str, int]] = {}
+
+    def set(self, key, value, ex=None):
+        self.values[key] = (value, ex)
+
+    def exists(self, key):
+        return int(key in self.values)
+
+
+def test_revocation_is_shared_through_redis():
+    redis = FakeRedis()
+    worker_a = PrincipalCache(redis_client=redis)
+    worker_b = PrincipalCache(redis_client=redis)
+
+    worker_a.revoke_token("jti-1", time.time() + 60)
+
+    assert worker_b.is_revoked("jti-1")
+    assert not worker_b.is_revoked("jti-2")
+    (_, ttl), = redis.values.values()
+    assert 0 < ttl <= 60
+
+
+async def test_async_revocation_check_runs_off_the_event_loop():
+    loop_thread = threading.get_ident()
+    threads = []
+
+    class RecordingRedis(FakeRedis):
+        def exists(self, key):
+            threads.append(threading.get_ident())
+            return super().exists(key)
+
+    redis = RecordingRedis()
+    PrincipalCache(redis_client=redis).revoke_token("jti-1", time.time() + 60)
+    worker = PrincipalCache(redis_client=redis)
+
+    assert await worker.is_revoked_async("jti-1")
+    assert not await worker.is_revoked_async("jti-2")
+    assert len(threads) == 2 and loop_thread not in threads
+
+
+def test_expired_token_is_not_written_to_redis():
+    redis = FakeRedis()
+    PrincipalCache(redis_client=redis).revoke_token("jti-1", time.time() - 1)
+    assert redis.values == {}
+
+
+async def test_async_path_opens_session_only_on_miss(tmp_path, engine, user):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+    session_maker = async_sessionmaker(async_engine)
+    opened: list[int] = []
+
+    def session_factory():
+        opened.append(1)
+        return session_maker()
+
+    token = create_access_token(str(user.id))
+    try:
+        first = await get_current_principal_async(token, session_factory)
+        second = await get_current_principal_async(token, session_factory)
+    finally:
+        await async_engine.dispose()
+
+    assert first == second and first.id == str(user.id)
+    assert len(opened) == 1
+
+
+def test_zero_ttl_disables_caching():
+    cache = PrincipalCache(ttl_seconds=0)
+
+    cache.put(Principal(id="u1", is_active=True, role="student"))
+    assert cache.get("u1") is None and len(cache) == 0
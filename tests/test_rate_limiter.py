@@ -0,0 +1,126 @@
+"""
+Test rate limiter backends.
+
+Covers:
+1. In-memory limiter keeps a bounded number of keys
+2. SQLite backend shares buckets between limiter instances (workers)
+3. Token buckets refill over the window
+4. Backend selection from environment
+5. allow_async() shares buckets with allow() and runs store I/O off the loop
+"""
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import pytest
+
+import core.security.rate_limiter as rate_limiter_module
+from core.security.rate_limiter import (
+    RateLimiter,
+    SQLiteRateLimiter,
+    create_rate_limiter_from_env,
+)
+
+
+@pytest.fixture(autouse=True)
+def enable_rate_limits(monkeypatch):
+    monkeypatch.delenv("DISABLE_RATE_LIMIT", raising=False)
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.delenv("RATE_LIMIT_SQLITE_PATH", raising=False)
+
+
+def test_memory_limiter_enforces_window():
+    limiter = RateLimiter()
+
+    assert limiter.allow("1.2.3.4", 2, 60)
+    assert limiter.allow("1.2.3.4", 2, 60)
+    assert not limiter.allow("1.2.3.4", 2, 60)
+    assert limiter.allow("5.6.7.8", 2, 60)
+
+
+def test_memory_limiter_bounds_tracked_keys():
+    limiter = RateLimiter(max_keys=3)
+
+    for i in range(10):
+        limiter.allow(f"ip-{i}", 5, 60)
+
+    assert len(limiter) == 3
+    # Oldest keys were evicted, most recent ones kept
+    assert limiter.allow("ip-9", 2, 60) and not limiter.allow("ip-9", 2, 60)
+
+
+def test_disable_env_allows_everything(monkeypatch):
+    limiter = RateLimiter()
+    monkeypatch.setenv("DISABLE_RATE_LIMIT", "1")
+
+    assert all(limiter.allow("k", 1, 60) for _ in range(5))
+
+
+def test_sqlite_buckets_are_shared_between_workers(tmp_path):
+    path = str(tmp_path / "ratelimit.db")
+    worker_a = SQLiteRateLimiter(path)
+    worker_b = SQLiteRateLimiter(path)
+
+    results = [limiter.allow("login:1.2.3.4", 4, 300) for limiter in (worker_a, worker_b) * 3]
+
+    assert results == [True, True, True, True, False, False]
+
+
+def test_sqlite_bucket_refills_over_window(tmp_path, monkeypatch):
+    limiter = SQLiteRateLimiter(str(tmp_path / "ratelimit.db"))
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limiter_module.time, "time", lambda: clock[0])
+
+    assert limiter.allow("k", 2, 60) and limiter.allow("k", 2, 60)
+    assert not limiter.allow("k", 2, 60)
+
+    clock[0] += 30  # half a window refills one token
+    assert limiter.allow("k", 2, 60)
+    assert not limiter.allow("k", 2, 60)
+
+
+def test_sqlite_reset_clears_key(tmp_path):
+    limiter = SQLiteRateLimiter(str(tmp_path / "ratelimit.db"))
+    limiter.allow("k", 1, 60)
+
+    limiter.reset("k")
+
+    assert limiter.allow("k", 1, 60)
+
+
+def test_factory_selects_backend(tmp_path, monkeypatch):
+    assert type(create_rate_limiter_from_env()) is RateLimiter
+
+    monkeypatch.setenv("RATE_LIMIT_SQLITE_PATH", str(tmp_path / "ratelimit.db"))
+    assert isinstance(create_rate_limiter_from_env(), SQLiteRateLimiter)
+
+    # Unreachable Redis falls back to the next backend
+    monkeypatch.setenv("REDIS_URL", "redis://127.0.0.1:1/0")
+    assert isinstance(create_rate_limiter_from_env(), SQLiteRateLimiter)
+
+
+async def test_allow_async_shares_memory_buckets():
+    limiter = RateLimiter()
+
+    assert await limiter.allow_async("user-1", 2, 60)
+    assert limiter.allow("user-1", 2, 60)
+    assert not await limiter.allow_async("user-1", 2, 60)
+
+
+async def test_allow_async_runs_sqlite_off_the_event_loop(tmp_path, monkeypatch):
+    limiter = SQLiteRateLimiter(str(tmp_path / "buckets.db"))
+    loop_thread = threading.get_ident()
+    take = limiter._take
+    threads = []
+
+    def recording_take(*args):
+        threads.append(threading.get_ident())
+        return take(*args)
+
+    monkeypatch.setattr(limiter, "_take", recording_take)
+
+    assert await limiter.allow_async("user-1", 1, 60)
+    assert not await limiter.allow_async("user-1", 1, 60)
+    assert threads and loop_thread not in threads
@@ -0,0 +1,225 @@
+"""
+test_core_session_store.py
+会话存储测试
+
+CoreFacade session store tests.
+"""
+
+import logging
+import time
+
+import pytest
+
+from backend.core.orchestration.core_facade import CoreFacade
+from backend.core.orchestration.policies import SessionMode, StandardGamePolicy
+from backend.core.orchestration.session_store import (
+    InMemorySessionStore,
+    SessionConflictError,
+    SessionSnapshot,
+    create_session_store_from_env,
+    register_policy_type,
+    restore_session,
+    snapshot_session,
+)
+
+
+class CasualPolicy(StandardGamePolicy):
+    """可按名称重建 Rebuildable custom policy"""
+
+    def allows_takebacks(self) -> bool:
+        return True
+
+
+class HandicapPolicy(StandardGamePolicy):
+    """带构造参数 Custom policy with constructor state"""
+
+    def __init__(self, takebacks: int):
+        self.takebacks = takebacks
+
+
+class TestSessionSnapshot:
+    """快照序列化 Snapshot serialization"""
+
+    def test_roundtrip_replays_moves(self):
+        facade = CoreFacade()
+        facade.create_session("s1", mode=SessionMode.ANALYSIS)
+        facade.set_pgn_players("s1", "Alice", "Bob")
+        for uci in ("e2e4", "e7e5", "g1f3"):
+            facade.submit_move_uci("s1", uci)
+
+        snapshot = snapshot_session(facade.get_session("s1"), version=3)
+        restored = restore_session(SessionSnapshot.from_json(snapshot.to_json()))
+
+        assert restored.get_fen() == facade.get_fen("s1")
+        assert "Alice" in restored.get_pgn()
+        assert type(restored.policy).__name__ == "AnalysisPolicy"
+
+    def test_snapshot_is_compact(self):
+        facade = CoreFacade()
+        facade.create_session("s1")
+        facade.submit_move_uci("s1", "e2e4")
+
+        data = snapshot_session(facade.get_session("s1")).to_json()
+
+        assert '"m":"e2e4"' in data
+        assert len(data) < 300
+
+
+class TestCoreFacadeSharedStore:
+    """多进程共享存储 Shared store across facades (workers)"""
+
+    def test_session_visible_to_other_worker(self):
+        store = InMemorySessionStore()
+        worker_a = CoreFacade(store=store)
+        worker_b = CoreFacade(store=store)
+
+        worker_a.create_session("game")
+        worker_a.submit_move_uci("game", "e2e4")
+
+        assert worker_b.get_fen("game") == worker_a.get_fen("game")
+        assert worker_b.list_sessions() == ["game"]
+
+    def test_stale_hot_entry_is_rehydrated(self):
+        store = InMemorySessionStore()
+        worker_a = CoreFacade(store=store)
+        worker_b = CoreFacade(store=store)
+
+        worker_a.create_session("game")
+        worker_b.get_session("game")
+        worker_a.submit_move_uci("game", "e2e4")
+
+        assert worker_b.get_fen("game") == worker_a.get_fen("game")
+
+    def test_duplicate_id_rejected_across_workers(self):
+        store = InMemorySessionStore()
+        CoreFacade(store=store).create_session("game")
+
+        with pytest.raises(ValueError):
+            CoreFacade(store=store).create_session("game")
+
+    def test_put_is_compare_and_set(self):
+        store = InMemorySessionStore()
+        CoreFacade(store=store).create_session("game")
+        snapshot = store.get("game")
+        snapshot.version = 2
+
+        assert not store.put("game", snapshot, expected_version=5)
+        assert store.put("game", snapshot, expected_version=1)
+        assert store.get_version("game") == 2
+        assert not store.put("missing", snapshot, expected_version=1)
+
+    def test_lost_race_is_replayed_on_newer_state(self):
+        store = InMemorySessionStore()
+        worker_a = CoreFacade(store=store)
+        worker_b = CoreFacade(store=store)
+        worker_a.create_session("game")
+        worker_a.submit_move_uci("game", "e2e4")
+        calls = []
+
+        def mutate(session):
+            calls.append(session.get_fen())
+            if len(calls) == 1:
+                # Worker A writes between B's load and B's write
+                worker_a.submit_move_uci("game", "e7e5")
+            session.set_pgn_tag("White", "Bob")
+
+        worker_b._mutate("game", mutate)
+
+        assert len(calls) == 2
+        assert calls[0] != calls[1]
+        assert store.get_version("game") == 4
+        assert worker_a.get_fen("game") == worker_b.get_fen("game")
+        assert "Bob" in worker_a.get_pgn("game")
+        assert store.get("game").moves == ["e2e4", "e7e5"]
+
+    def test_persistent_conflict_raises(self):
+        store = InMemorySessionStore()
+        worker_a = CoreFacade(store=store)
+        worker_b = CoreFacade(store=store)
+        worker_a.create_session("game")
+
+        def mutate(session):
+            worker_a.set_pgn_event("game", "Interfering")
+
+        with pytest.raises(SessionConflictError):
+            worker_b._mutate("game", mutate)
+
+    def test_close_removes_everywhere(self):
+        store = InMemorySessionStore()
+        worker_a = CoreFacade(store=store)
+        worker_b = CoreFacade(store=store)
+        worker_a.create_session("game")
+        worker_b.get_session("game")
+
+        worker_a.close_session("game")
+
+        with pytest.raises(ValueError):
+            worker_b.get_session("game")
+
+
+class TestBoundedMemory:
+    """内存上界 Bounded memory"""
+
+    def test_hot_tier_is_lru_bounded(self):
+        facade = CoreFacade(hot_capacity=2)
+        for session_id in ("a", "b", "c"):
+            facade.create_session(session_id)
+
+        assert list(facade._active_sessions) == ["b", "c"]
+        # Evicted sessions are rebuilt on demand.
+        assert facade.get_session("a") is not None
+
+    def test_idle_sessions_expire(self):
+        facade = CoreFacade(store=InMemorySessionStore(idle_ttl=0))
+        facade.create_session("game")
+        time.sleep(0.01)
+
+        with pytest.raises(ValueError):
+            facade.get_session("game")
+        assert facade.list_sessions() == []
+
+
+class TestCustomPolicies:
+    """自定义策略 Custom policies must be rebuildable from a snapshot"""
+
+    def test_registered_policy_roundtrips(self):
+        register_policy_type(CasualPolicy)
+        facade = CoreFacade(store=InMemorySessionStore())
+        facade.create_session("game", custom_policy=CasualPolicy())
+        facade.submit_move_uci("game", "e2e4")
+
+        restored = restore_session(snapshot_session(facade.get_session("game")))
+
+        assert isinstance(restored.policy, CasualPolicy)
+        assert restored.get_fen() == facade.get_fen("game")
+
+    def test_unregistered_policy_rejected_at_create(self):
+        store = InMemorySessionStore()
+
+        with pytest.raises(ValueError, match="not registered"):
+            CoreFacade(store=store).create_session("game", custom_policy=HandicapPolicy(2))
+        assert store.keys() == []
+
+    def test_policy_needing_arguments_cannot_be_registered(self):
+        with pytest.raises(ValueError, match="without arguments"):
+            register_policy_type(HandicapPolicy)
+
+
+class TestStoreFromEnv:
+    """环境配置 Store chosen from the environment"""
+
+    def test_facade_defaults_to_env_store(self, monkeypatch):
+        monkeypatch.delenv("REDIS_URL", raising=False)
+
+        assert isinstance(CoreFacade()._store, InMemorySessionStore)
+
+    def test_unreachable_redis_falls_back_with_warning(self, monkeypatch, caplog):
+        pytest.importorskip("redis")
+        monkeypatch.setenv("REDIS_URL", "redis://127.0.0.1:1/0")
+
+        with caplog.at_level(logging.WARNING):
+            store = create_session_store_from_env(idle_ttl=60)
+
+        assert isinstance(store, InMemorySessionStore)
+        assert store.idle_ttl == 60
+        assert "falling back to memory" in caplog.text
@@ -127,3 +127,35 @@ def test_show_dto_builder():
     # Assert presence of variation_end
     assert any(t["t"] == "variation_end" for t in tokens)
 
+
+
+def test_game_deeper_than_recursion_limit():
+    """
+    Games longer than the interpreter's recursion limit go through the parser,
+    the DTO converter and the PGN exporter, which all walk the tree iteratively.
+    """
+    import sys
+    from types import SimpleNamespace
+
+    from patch.backend.study.api import _tree_to_pgn
+    from patch.backend.study.converter import convert_nodetree_to_dto
+
+    plies = sys.getrecursionlimit() * 3
+    shuffle = ["Nf3", "Nf6", "Ng1", "Ng8"]
+    moves = []
+    for ply in range(plies):
+        if ply % 2 == 0:
+            moves.append(f"{ply // 2 + 1}.")
+        moves.append(shuffle[ply % 4])
+    pgn = " ".join(moves) + " (" + f"{plies // 2}... Nc6" + ") *"
+
+    tree = parse_pgn(pgn)
+    assert len(tree.nodes) == plies + 2  # root, main line, one side move
+
+    dto = convert_nodetree_to_dto(tree)
+    assert len(dto.nodes) == len(tree.nodes) + 1  # plus the DTO "root"
+
+    exported = _tree_to_pgn(dto, SimpleNamespace(title="Long"))
+    assert exported.count("(") == 1
+    assert f"({plies // 2}... Nc6)" in exported
+    assert exported.endswith("Ng8 *")
@@ -0,0 +1,109 @@
+"""
+Tests for the executor-backed async R2 client.
+
+Storage calls run against moto's in-process S3 stand-in.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+moto = pytest.importorskip("moto")
+
+from modules.workspace.storage.async_r2_client import (
+    AsyncR2Client,
+    as_async_r2_client,
+    create_async_r2_client_from_env,
+)
+from modules.workspace.storage.r2_client import R2Client, R2Config, create_r2_client_from_env
+
+BUCKET = "catachess-test"
+
+
+@pytest.fixture
+def r2_client():
+    with moto.mock_aws():
+        client = R2Client(
+            R2Config(
+                endpoint="https://s3.us-east-1.amazonaws.com",
+                access_key="testing",
+                secret_key="testing",
+                bucket=BUCKET,
+            )
+        )
+        client.s3.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+class _SlowClient:
+    """Blocking client double that sleeps like a network round trip."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def exists(self, key: str) -> bool:
+        time.sleep(self.delay)
+        return True
+
+
+async def test_roundtrip_against_s3_stand_in(r2_client):
+    storage = AsyncR2Client(r2_client)
+
+    upload = await storage.upload_json("chapters/c1.tree.json", '{"rootId": "root"}')
+
+    assert await storage.exists("chapters/c1.tree.json")
+    assert await storage.download_json("chapters/c1.tree.json") == '{"rootId": "root"}'
+    assert await storage.get_etag("chapters/c1.tree.json") == upload.etag
+    assert await storage.list_keys("chapters/") == ["chapters/c1.tree.json"]
+
+    await storage.delete("chapters/c1.tree.json")
+    assert not await storage.exists("chapters/c1.tree.json")
+
+
+async def test_client_errors_propagate(r2_client):
+    from botocore.exceptions import ClientError
+
+    with pytest.raises(ClientError):
+        await AsyncR2Client(r2_client).download_pgn("missing.pgn")
+
+
+async def test_calls_do_not_block_event_loop():
+    storage = AsyncR2Client(_SlowClient(delay=0.2))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    tick_task = asyncio.create_task(ticker())
+    started = time.monotonic()
+    results = await asyncio.gather(*(storage.exists(f"k{i}") for i in range(4)))
+    elapsed = time.monotonic() - started
+    tick_task.cancel()
+
+    assert results == [True] * 4
+    assert elapsed < 0.6
+    assert ticks >= 10
+
+
+def test_as_async_is_idempotent(r2_client):
+    storage = as_async_r2_client(r2_client)
+
+    assert as_async_r2_client(storage) is storage
+    assert storage.sync is r2_client
+
+
+def test_env_clients_share_connection_pool(monkeypatch):
+    monkeypatch.setenv("R2_ENDPOINT", "https://r2.example.com")
+    monkeypatch.setenv("R2_ACCESS_KEY", "key")
+    monkeypatch.setenv("R2_SECRET_KEY", "secret")
+    monkeypatch.setenv("R2_BUCKET", "bucket")
+
+    client = create_r2_client_from_env()
+
+    assert create_r2_client_from_env() is client
+    assert create_async_r2_client_from_env().sync is client
+    assert client.s3.meta.config.max_pool_connections == client.config.max_pool_connections
@@ -0,0 +1,167 @@
+"""
+Tests for the chapter tree / rendered PGN read-through cache.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from modules.workspace.domain.services.chapter_content_cache import (
+    ChapterContentCache,
+    chapter_content_cache,
+    load_chapter_content,
+)
+from modules.workspace.domain.services.pgn_clip_service import PgnClipService
+from modules.workspace.storage.async_r2_client import AsyncR2Client
+from modules.workspace.storage.keys import R2Keys
+
+TREE = {
+    "version": "v1",
+    "rootId": "root",
+    "nodes": {
+        "root": {"id": "root", "parentId": None, "san": "", "children": ["a"]},
+        "a": {"id": "a", "parentId": "root", "san": "e4", "children": ["b"], "comment": "best"},
+        "b": {"id": "b", "parentId": "a", "san": "e5", "children": []},
+    },
+    "meta": {"result": "*"},
+}
+
+
+class CountingR2Client:
+    """Blocking R2 double that counts round trips."""
+
+    def __init__(self, trees: dict[str, dict]):
+        self.trees = trees
+        self.calls = 0
+
+    def download_json(self, key: str) -> str:
+        self.calls += 1
+        return json.dumps(self.trees[key])
+
+
+def _chapter(chapter_id: str = "ch1", etag: str | None = "etag-1", **fields) -> SimpleNamespace:
+    values = dict(
+        id=chapter_id,
+        study_id="study-1",
+        title="Chapter 1",
+        event=None,
+        white=None,
+        black=None,
+        date=None,
+        result="*",
+        r2_key=R2Keys.chapter_tree_json(chapter_id),
+        r2_etag=etag,
+        pgn_hash=None,
+    )
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    chapter_content_cache.clear()
+    yield
+    chapter_content_cache.clear()
+
+
+@pytest.fixture
+def r2():
+    return CountingR2Client({R2Keys.chapter_tree_json("ch1"): TREE})
+
+
+async def test_repeat_reads_make_no_storage_calls(r2):
+    chapter = _chapter()
+    key = R2Keys.chapter_tree_json("ch1")
+
+    first = await load_chapter_content(chapter, AsyncR2Client(r2), key)
+    second = await load_chapter_content(chapter, AsyncR2Client(r2), key)
+
+    assert r2.calls == 1
+    assert second is first
+    assert second.pgn(chapter) is first.pgn(chapter)
+    assert "1. e4 {best} 1... e5 *" in first.pgn(chapter)
+
+
+async def test_new_etag_is_a_miss(r2):
+    key = R2Keys.chapter_tree_json("ch1")
+    await load_chapter_content(_chapter(etag="etag-1"), AsyncR2Client(r2), key)
+    await load_chapter_content(_chapter(etag="etag-2"), AsyncR2Client(r2), key)
+
+    assert r2.calls == 2
+
+
+async def test_invalidate_forces_reload(r2):
+    chapter = _chapter()
+    key = R2Keys.chapter_tree_json("ch1")
+    await load_chapter_content(chapter, AsyncR2Client(r2), key)
+
+    chapter_content_cache.invalidate("ch1")
+    await load_chapter_content(chapter, AsyncR2Client(r2), key)
+
+    assert r2.calls == 2
+
+
+async def test_chapters_without_token_are_not_cached(r2):
+    chapter = _chapter(etag=None)
+    key = R2Keys.chapter_tree_json("ch1")
+    await load_chapter_content(chapter, AsyncR2Client(r2), key)
+    await load_chapter_content(chapter, AsyncR2Client(r2), key)
+
+    assert r2.calls == 2
+    assert len(chapter_content_cache) == 0
+
+
+async def test_header_changes_rerender_pgn(r2):
+    key = R2Keys.chapter_tree_json("ch1")
+    content = await load_chapter_content(_chapter(), AsyncR2Client(r2), key)
+
+    assert '[White "Carlsen"]' in content.pgn(_chapter(white="Carlsen"))
+    assert '[White "?"]' in content.pgn(_chapter())
+
+
+def test_cache_is_lru_bounded():
+    cache = ChapterContentCache(max_entries=2)
+    for chapter_id in ("a", "b", "c"):
+        cache.put(chapter_id, "t", tree=None)
+
+    assert cache.get("a", "t") is None
+    assert cache.get("c", "t") is not None
+
+
+class _StudyRepo:
+    def __init__(self, chapter):
+        self.chapter = chapter
+
+    async def get_chapter_by_id(self, chapter_id):
+        return self.chapter
+
+
+class _EventRepo:
+    async def get_latest_version(self, target_id):
+        return 0
+
+
+class _EventBus:
+    async def publish(self, command):
+        return None
+
+
+async def test_clip_service_exports_share_cached_tree(r2):
+    def make_service():
+        return PgnClipService(
+            study_repo=_StudyRepo(_chapter()),
+            variation_repo=None,
+            event_repo=_EventRepo(),
+            event_bus=_EventBus(),
+            r2_client=r2,
+        )
+
+    no_comment = await make_service().export_no_comments("ch1", actor_id="u1")
+    raw = await make_service().export_raw("ch1", actor_id="u1")
+    again = await make_service().export_no_comments("ch1", actor_id="u1")
+
+    assert r2.calls == 1
+    assert "best" not in no_comment.pgn_text
+    assert "e4" in raw.pgn_text
+    assert again.pgn_text == no_comment.pgn_text
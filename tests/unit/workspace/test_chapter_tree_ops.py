@@ -0,0 +1,285 @@
+"""
+Tests for op-based chapter tree saves with an R2 journal and compaction,
+and for the position index kept in line with saved trees.
+"""
+
+import hashlib
+import json
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+from starlette.requests import Request
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from modules.workspace.db.base import Base
+from modules.workspace.db.repos.position_index_repo import PositionIndexRepository
+from modules.workspace.db.repos.study_repo import StudyRepository
+from modules.workspace.db.tables.position_index import PositionIndex
+from modules.workspace.db.tables.studies import Chapter, Study
+from modules.workspace.domain.services.chapter_content_cache import chapter_content_cache
+from modules.workspace.domain.services.position_index_service import PositionIndexService
+from modules.workspace.storage.async_r2_client import AsyncR2Client
+from modules.workspace.storage.keys import R2Keys
+from modules.workspace.storage.r2_client import UploadResult
+from patch.backend.study import api
+from patch.backend.study.converter import convert_dto_to_nodetree
+from patch.backend.study.models import StudyTreeDTO, TreeOpsRequest
+from patch.backend.study.tree_ops import (
+    TreeOpError,
+    apply_tree_ops,
+    journal_entry,
+    replay_journal,
+    tree_hash,
+    truncate_journal,
+)
+
+TREE = {
+    "version": "v1",
+    "rootId": "root",
+    "nodes": {
+        "root": {"id": "root", "parentId": None, "san": "", "children": ["a"]},
+        "a": {"id": "a", "parentId": "root", "san": "e4", "children": ["b", "c"]},
+        "b": {"id": "b", "parentId": "a", "san": "e5", "children": []},
+        "c": {"id": "c", "parentId": "a", "san": "c5", "children": []},
+    },
+    "meta": {"result": "*"},
+}
+TREE_KEY = R2Keys.chapter_tree_json("ch1")
+JOURNAL_KEY = R2Keys.chapter_tree_ops_json("ch1")
+
+
+class MemoryR2Client:
+    """Blocking in-memory R2 double recording uploaded keys."""
+
+    def __init__(self, objects: dict[str, str]):
+        self.objects = objects
+        self.uploads: list[str] = []
+
+    def upload_json(self, key, content, metadata=None) -> UploadResult:
+        self.objects[key] = content
+        self.uploads.append(key)
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        return UploadResult(key=key, etag=digest[:16], size=len(data), content_hash=digest)
+
+    def download_json(self, key: str) -> str:
+        if key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        return self.objects[key]
+
+    def delete(self, key: str) -> None:
+        self.objects.pop(key, None)
+
+
+def _ops(base_hash: str, *ops: dict) -> TreeOpsRequest:
+    return TreeOpsRequest(baseHash=base_hash, ops=list(ops))
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    chapter_content_cache.clear()
+    yield
+    chapter_content_cache.clear()
+
+
+@pytest.fixture
+async def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ops.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Base.metadata.create_all(
+                sync_conn, tables=[Study.__table__, Chapter.__table__, PositionIndex.__table__]
+            )
+        )
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with maker() as session:
+        session.add(Study(id="s1", chapter_count=1))
+        session.add(
+            Chapter(id="ch1", study_id="s1", title="Ch 1", order=0, r2_key=TREE_KEY, r2_etag="etag-0")
+        )
+        await session.commit()
+    yield maker
+    await engine.dispose()
+
+
+@pytest.fixture
+def r2():
+    return MemoryR2Client({TREE_KEY: StudyTreeDTO(**TREE).model_dump_json()})
+
+
+async def _save(session_maker, r2, body: TreeOpsRequest):
+    async with session_maker() as session:
+        response = await api.apply_chapter_tree_ops(
+            "ch1", body, AsyncR2Client(r2), StudyRepository(session), _position_index(session)
+        )
+        await session.commit()
+    return response
+
+
+async def _put(session_maker, r2, tree: StudyTreeDTO):
+    request = Request({"type": "http", "headers": []})
+    async with session_maker() as session:
+        response = await api.put_chapter_tree(
+            "ch1", tree, request, AsyncR2Client(r2), StudyRepository(session), _position_index(session)
+        )
+        await session.commit()
+    return response
+
+
+def _position_index(session) -> PositionIndexService:
+    return PositionIndexService(PositionIndexRepository(session))
+
+
+async def _indexed_nodes(session_maker) -> set[str]:
+    async with session_maker() as session:
+        return set(await PositionIndexRepository(session).get_chapter_keys("ch1"))
+
+
+async def _get(session_maker, r2):
+    async with session_maker() as session:
+        return await api.get_chapter_tree("ch1", AsyncR2Client(r2), StudyRepository(session))
+
+
+def test_apply_ops_edits_copy_of_tree():
+    tree = StudyTreeDTO(**TREE)
+    edited = apply_tree_ops(
+        tree,
+        _ops(
+            "",
+            {"op": "add_node", "id": "d", "parentId": "b", "san": "Nf3"},
+            {"op": "set_comment", "id": "a", "comment": "King's pawn"},
+            {"op": "promote_variation", "id": "c"},
+            {"op": "delete_subtree", "id": "b"},
+        ).ops,
+    )
+
+    assert edited.nodes["a"].children == ["c"]
+    assert edited.nodes["a"].comment == "King's pawn"
+    assert "b" not in edited.nodes and "d" not in edited.nodes
+    assert tree.model_dump() == StudyTreeDTO(**TREE).model_dump()
+
+    with pytest.raises(TreeOpError, match="op 0"):
+        apply_tree_ops(tree, _ops("", {"op": "delete_subtree", "id": "root"}).ops)
+    with pytest.raises(TreeOpError, match="already exists"):
+        apply_tree_ops(tree, _ops("", {"op": "add_node", "id": "b", "parentId": "a", "san": "d5"}).ops)
+
+
+async def test_ops_are_journaled_and_replayed_on_cold_load(session_maker, r2):
+    base = (await _get(session_maker, r2)).hash
+    first = await _save(
+        session_maker, r2, _ops(base, {"op": "add_node", "id": "d", "parentId": "b", "san": "Nf3"})
+    )
+    second = await _save(
+        session_maker, r2, _ops(first.hash, {"op": "set_comment", "id": "d", "comment": "Main"})
+    )
+
+    assert r2.uploads == [JOURNAL_KEY, JOURNAL_KEY]
+    assert len(json.loads(r2.objects[JOURNAL_KEY])["entries"]) == 2
+
+    chapter_content_cache.clear()
+    loaded = await _get(session_maker, r2)
+    assert loaded.hash == second.hash
+    assert loaded.tree.nodes["d"].comment == "Main"
+    assert loaded.tree.nodes["b"].children == ["d"]
+
+
+async def test_stale_base_hash_is_a_conflict(session_maker, r2):
+    base = (await _get(session_maker, r2)).hash
+    saved = await _save(session_maker, r2, _ops(base, {"op": "promote_variation", "id": "c"}))
+
+    with pytest.raises(HTTPException) as exc:
+        await _save(session_maker, r2, _ops(base, {"op": "delete_subtree", "id": "c"}))
+
+    assert exc.value.status_code == 409
+    assert exc.value.detail["hash"] == saved.hash
+
+
+async def test_invalid_op_is_rejected_without_writing(session_maker, r2):
+    base = (await _get(session_maker, r2)).hash
+
+    with pytest.raises(HTTPException) as exc:
+        await _save(session_maker, r2, _ops(base, {"op": "set_comment", "id": "zz", "comment": "x"}))
+
+    assert exc.value.status_code == 400
+    assert r2.uploads == []
+
+
+async def test_journal_is_compacted_into_tree(session_maker, r2, monkeypatch):
+    monkeypatch.setattr(api, "TREE_OPS_COMPACT_EVERY", 3)
+    current = (await _get(session_maker, r2)).hash
+    for index in range(3):
+        op = {"op": "set_comment", "id": "a", "comment": f"v{index}"}
+        current = (await _save(session_maker, r2, _ops(current, op))).hash
+
+    assert r2.uploads == [JOURNAL_KEY, JOURNAL_KEY, TREE_KEY]
+    assert JOURNAL_KEY not in r2.objects
+    assert tree_hash(StudyTreeDTO(**json.loads(r2.objects[TREE_KEY]))) == current
+    async with session_maker() as session:
+        chapter = await StudyRepository(session).get_chapter_by_id("ch1")
+    assert chapter.tree_ops_pending == 0
+    assert chapter.pgn_hash == current
+
+
+async def test_full_save_reindexes_positions(session_maker, r2):
+    saved = await _put(session_maker, r2, StudyTreeDTO(**TREE))
+    assert saved.success
+    assert await _indexed_nodes(session_maker) == {"a", "b", "c"}
+
+    empty = {"version": "v1", "rootId": "root", "meta": {"result": "*"},
+             "nodes": {"root": {"id": "root", "parentId": None, "san": "", "children": []}}}
+    assert (await _put(session_maker, r2, StudyTreeDTO(**empty))).success
+    assert await _indexed_nodes(session_maker) == set()
+
+
+async def test_op_saves_reindex_on_compaction(session_maker, r2, monkeypatch):
+    monkeypatch.setattr(api, "TREE_OPS_COMPACT_EVERY", 2)
+    current = (await _get(session_maker, r2)).hash
+    current = (await _save(
+        session_maker, r2, _ops(current, {"op": "add_node", "id": "d", "parentId": "b", "san": "Nf3"})
+    )).hash
+    # Journaled only: the index follows tree.json
+    assert await _indexed_nodes(session_maker) == set()
+
+    await _save(session_maker, r2, _ops(current, {"op": "delete_subtree", "id": "c"}))
+    assert await _indexed_nodes(session_maker) == {"a", "b", "d"}
+
+
+def test_dto_to_nodetree_replays_moves():
+    data = json.loads(json.dumps(TREE))
+    data["nodes"]["c"]["san"] = "Ke2"  # Illegal for Black here: dropped
+    data["nodes"]["b"]["children"] = ["d"]
+    data["nodes"]["d"] = {"id": "d", "parentId": "b", "san": "Nf3", "children": []}
+    tree = StudyTreeDTO(**data)
+
+    node_tree = convert_dto_to_nodetree(tree)
+
+    assert set(node_tree.nodes) == {"root", "a", "b", "d"}
+    assert node_tree.nodes["a"].main_child == "b" and node_tree.nodes["a"].variations == []
+    d = node_tree.nodes["d"]
+    assert (d.uci, d.ply, d.move_number) == ("g1f3", 3, 2)
+    assert d.fen == "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2"
+
+
+def test_replay_skips_compacted_and_orphaned_entries():
+    tree = StudyTreeDTO(**TREE)
+    base = tree_hash(tree)
+    ops_a = _ops(base, {"op": "set_comment", "id": "a", "comment": "A"}).ops
+    tree_a = apply_tree_ops(tree, ops_a)
+    ops_b = _ops(base, {"op": "set_comment", "id": "b", "comment": "B"}).ops
+    tree_b = apply_tree_ops(tree_a, ops_b)
+    orphan_ops = _ops(base, {"op": "delete_subtree", "id": "c"}).ops
+    entries = [
+        journal_entry(base, tree_hash(tree_a), ops_a),
+        journal_entry(tree_hash(tree_a), tree_hash(tree_b), ops_b),
+        journal_entry(tree_hash(tree_b), "orphan", orphan_ops),
+    ]
+
+    assert tree_hash(replay_journal(tree, entries, tree_hash(tree_b))) == tree_hash(tree_b)
+    # tree.json already compacted to tree_a: the first entry no longer applies
+    assert tree_hash(replay_journal(tree_a, entries, tree_hash(tree_b))) == tree_hash(tree_b)
+    assert truncate_journal(entries, tree_hash(tree_b)) == entries[:2]
+    assert truncate_journal(entries, "unknown") == []
@@ -0,0 +1,154 @@
+"""
+Tests for ETag / If-None-Match handling on chapter and study reads.
+"""
+
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Response
+
+from modules.workspace.api.conditional import etag_matches, make_etag
+from modules.workspace.api.endpoints.studies import get_chapter_pgn
+from modules.workspace.domain.services.chapter_content_cache import chapter_content_cache
+from modules.workspace.storage.async_r2_client import AsyncR2Client
+from modules.workspace.storage.keys import R2Keys
+
+TREE = {
+    "version": "v1",
+    "rootId": "root",
+    "nodes": {
+        "root": {"id": "root", "parentId": None, "san": "", "children": ["a"]},
+        "a": {"id": "a", "parentId": "root", "san": "e4", "children": []},
+    },
+    "meta": {"result": "*"},
+}
+
+
+class CountingR2Client:
+    """Blocking R2 double that counts round trips."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def download_json(self, key: str) -> str:
+        self.calls += 1
+        return json.dumps(TREE)
+
+
+class _NodeService:
+    async def get_node(self, node_id, actor_id):
+        return SimpleNamespace(id=node_id)
+
+
+class _StudyRepo:
+    def __init__(self, chapter):
+        self.chapter = chapter
+
+    async def get_chapter_by_id(self, chapter_id):
+        return self.chapter
+
+
+def _chapter(**fields) -> SimpleNamespace:
+    values = dict(
+        id="ch1",
+        study_id="study-1",
+        title="Chapter 1",
+        event=None,
+        white=None,
+        black=None,
+        date=None,
+        result="*",
+        r2_key=R2Keys.chapter_tree_json("ch1"),
+        r2_etag="etag-1",
+        pgn_hash="hash-1",
+        pgn_size=120,
+        last_synced_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    chapter_content_cache.clear()
+    yield
+    chapter_content_cache.clear()
+
+
+async def _get_pgn(chapter, r2, if_none_match=None):
+    response = Response()
+    result = await get_chapter_pgn(
+        study_id="study-1",
+        chapter_id="ch1",
+        response=response,
+        user_id="u1",
+        study_repo=_StudyRepo(chapter),
+        node_service=_NodeService(),
+        r2_client=AsyncR2Client(r2),
+        if_none_match=if_none_match,
+    )
+    return result, response
+
+
+def test_etag_is_strong_and_stable():
+    etag = make_etag("chapter", 1, None)
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("chapter", 1, None)
+    assert etag != make_etag("chapter", 2, None)
+
+
+@pytest.mark.parametrize(
+    "header,expected",
+    [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"x", "abc"', True),
+        ("*", True),
+        ('"abcd"', False),
+    ],
+)
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+async def test_matching_if_none_match_skips_storage():
+    r2 = CountingR2Client()
+    chapter = _chapter()
+
+    body, response = await _get_pgn(chapter, r2)
+    etag = response.headers["ETag"]
+    assert "e4" in body.pgn_text
+    assert "must-revalidate" in response.headers["Cache-Control"]
+
+    chapter_content_cache.clear()
+    not_modified, _ = await _get_pgn(chapter, r2, if_none_match=etag)
+
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+    assert r2.calls == 1
+
+
+async def test_changed_content_or_headers_change_etag():
+    r2 = CountingR2Client()
+    _, original = await _get_pgn(_chapter(), r2)
+    etag = original.headers["ETag"]
+
+    body, _ = await _get_pgn(_chapter(r2_etag="etag-2"), r2, if_none_match=etag)
+    assert "e4" in body.pgn_text
+
+    body, _ = await _get_pgn(_chapter(white="Carlsen"), r2, if_none_match=etag)
+    assert '[White "Carlsen"]' in body.pgn_text
+
+
+async def test_chapters_without_token_get_no_etag():
+    r2 = CountingR2Client()
+    chapter = _chapter(r2_etag=None, pgn_hash=None)
+
+    body, response = await _get_pgn(chapter, r2, if_none_match='"anything"')
+
+    assert "e4" in body.pgn_text
+    assert "ETag" not in response.headers
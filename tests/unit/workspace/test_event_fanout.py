@@ -0,0 +1,168 @@
+"""
+Tests for cross-worker event fan-out to WebSocket clients.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from fastapi.websockets import WebSocketState
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from modules.workspace.api.websocket import presence_ws
+from modules.workspace.api.websocket.presence_ws import ConnectionManager
+from modules.workspace.db.base import Base
+from modules.workspace.db.tables.events import Event
+from modules.workspace.events.bus import EventBus
+from modules.workspace.events.fanout import InMemoryBroker, set_event_broker
+from modules.workspace.events.types import EventType
+
+
+class FakeWebSocket:
+    def __init__(self, block: bool = False) -> None:
+        self.client_state = WebSocketState.CONNECTED
+        self.sent: list[dict] = []
+        self.closed_with: int | None = None
+        self._block = block
+
+    async def accept(self) -> None:
+        return None
+
+    async def send_json(self, message: dict) -> None:
+        if self._block:
+            await asyncio.Event().wait()
+        self.sent.append(message)
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+        self.client_state = WebSocketState.DISCONNECTED
+
+
+@pytest.fixture
+def broker():
+    broker = InMemoryBroker(batch_ms=0)
+    set_event_broker(broker)
+    yield broker
+    set_event_broker(None)
+
+
+@pytest.fixture
+async def managers(broker):
+    created: list[ConnectionManager] = []
+
+    def make() -> ConnectionManager:
+        created.append(ConnectionManager(broker))
+        return created[-1]
+
+    yield make
+    for manager in created:
+        await manager.close()
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Base.metadata.create_all(sync_conn, tables=[Event.__table__])
+        )
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _publish_cursor(bus: EventBus, study_id: str = "study-1") -> None:
+    await bus.publish(
+        event_type=EventType.PRESENCE_CURSOR_MOVED,
+        actor_id="u1",
+        target_id=study_id,
+        target_type="study",
+        payload={"study_id": study_id, "move_path": "main.1"},
+    )
+
+
+async def test_events_reach_sockets_on_every_worker_after_commit(broker, managers, session):
+    # Two managers sharing a broker stand in for two workers.
+    worker_a, worker_b = managers(), managers()
+    ws_a, ws_b = FakeWebSocket(), FakeWebSocket()
+    await worker_a.connect(ws_a, "study-1")
+    await worker_b.connect(ws_b, "study-1")
+    bus = EventBus(session)
+
+    await _publish_cursor(bus)
+    await _settle()
+    assert ws_a.sent == [] and ws_b.sent == []
+
+    await session.commit()
+    await broker.flush()
+    await _settle()
+
+    for ws in (ws_a, ws_b):
+        assert [m["type"] for m in ws.sent] == [str(EventType.PRESENCE_CURSOR_MOVED)]
+        assert ws.sent[0]["data"]["target_id"] == "study-1"
+
+
+async def test_rolled_back_events_are_not_fanned_out(broker, managers, session):
+    manager = managers()
+    ws = FakeWebSocket()
+    await manager.connect(ws, "study-1")
+    bus = EventBus(session)
+
+    await _publish_cursor(bus)
+    await session.rollback()
+    await session.commit()
+    await broker.flush()
+    await _settle()
+
+    assert ws.sent == []
+
+
+async def test_messages_for_a_study_are_batched():
+    broker = InMemoryBroker(batch_ms=10)
+    batches: list[list[dict]] = []
+
+    async def handler(study_id, messages):
+        batches.append(messages)
+
+    await broker.subscribe("study-1", handler)
+    for i in range(5):
+        await broker.publish("study-1", {"type": "t", "data": {"i": i}})
+    await asyncio.sleep(0.05)
+
+    assert len(batches) == 1 and len(batches[0]) == 5
+
+
+async def test_slow_client_does_not_stall_broadcast(managers, monkeypatch):
+    monkeypatch.setattr(presence_ws, "SEND_QUEUE_SIZE", 2)
+    manager = managers()
+    slow, fast = FakeWebSocket(block=True), FakeWebSocket()
+    await manager.connect(slow, "study-1")
+    await manager.connect(fast, "study-1")
+
+    for i in range(10):
+        await asyncio.wait_for(
+            manager.broadcast_to_study("study-1", {"type": "t", "data": {"i": i}}), 0.1
+        )
+        await _settle()
+
+    assert len(fast.sent) == 10
+    assert slow.closed_with == 1013
+    assert manager.active_connections["study-1"] == {fast}
+
+
+async def test_last_socket_unsubscribes_from_broker(broker, managers):
+    manager = managers()
+    ws = FakeWebSocket()
+    await manager.connect(ws, "study-1")
+
+    await manager.disconnect(ws, "study-1")
+
+    assert "study-1" not in manager.active_connections
+    assert not broker._handlers.get("study-1")
@@ -0,0 +1,205 @@
+"""
+Tests for outbox-based, batched event delivery.
+"""
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from modules.workspace.db.base import Base
+from modules.workspace.db.tables.event_outbox import EventOutbox, SubscriberCheckpoint
+from modules.workspace.db.tables.events import Event
+from modules.workspace.events.bus import EventBus
+from modules.workspace.events.outbox import OutboxDispatcher
+from modules.workspace.events.types import EventType
+
+
+@pytest.fixture
+async def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'outbox.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Base.metadata.create_all(
+                sync_conn,
+                tables=[
+                    Event.__table__,
+                    EventOutbox.__table__,
+                    SubscriberCheckpoint.__table__,
+                ],
+            )
+        )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _publish(session_maker, count: int, event_type=EventType.NODE_SOFT_DELETED) -> list[str]:
+    async with session_maker() as session:
+        bus = EventBus(session, outbox=True)
+        ids = [
+            (
+                await bus.publish(
+                    event_type=event_type,
+                    actor_id="u1",
+                    target_id=f"node-{i}",
+                    payload={"i": i},
+                )
+            ).id
+            for i in range(count)
+        ]
+        await session.commit()
+    return ids
+
+
+def _recorder(seen: list[str], fail_on: set[str] = frozenset()):
+    def factory(session, bus):
+        async def handle(evt) -> None:
+            if evt.target_id in fail_on:
+                raise RuntimeError("boom")
+            seen.append(evt.target_id)
+        return handle
+    return factory
+
+
+async def test_outbox_publish_defers_subscribers_and_skips_lookup(session_maker):
+    called = []
+    statements: list[str] = []
+    async with session_maker() as session:
+        engine = session.bind.sync_engine
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(engine, "before_cursor_execute", listener)
+        bus = EventBus(session, outbox=True)
+        bus.subscribe(lambda evt: called.append(evt))
+        await bus.publish(event_type=EventType.NODE_SOFT_DELETED, actor_id="u1", target_id="n1")
+        await session.commit()
+        event.remove(engine, "before_cursor_execute", listener)
+
+        rows = (await session.execute(select(func.count()).select_from(EventOutbox))).scalar_one()
+
+    assert called == []
+    assert rows == 1
+    assert not any(sql.lstrip().upper().startswith("SELECT") for sql in statements)
+
+
+async def test_dispatcher_delivers_batches_per_subscriber(session_maker):
+    ids = await _publish(session_maker, 5)
+    seen_a, seen_b = [], []
+    dispatcher = OutboxDispatcher(
+        session_maker,
+        subscribers={"a": _recorder(seen_a), "b": _recorder(seen_b)},
+        batch_size=3,
+    )
+
+    assert await dispatcher.run_once() == 6
+    assert seen_a == ["node-0", "node-1", "node-2"]
+    assert dispatcher.metrics()["subscribers"]["a"]["lag_events"] == 2
+
+    assert await dispatcher.run_once() == 4
+    assert seen_a == seen_b == [f"node-{i}" for i in range(5)]
+    metrics = dispatcher.metrics()
+    assert metrics["subscribers"]["b"]["lag_events"] == 0
+    assert metrics["subscribers"]["b"]["delivered"] == 5
+    assert len(ids) == 5
+
+    async with session_maker() as session:
+        remaining = (await session.execute(select(func.count()).select_from(EventOutbox))).scalar_one()
+    assert remaining == 0
+
+
+async def test_failed_event_is_counted_and_skipped(session_maker):
+    await _publish(session_maker, 3)
+    seen = []
+    dispatcher = OutboxDispatcher(
+        session_maker, subscribers={"flaky": _recorder(seen, fail_on={"node-1"})}
+    )
+
+    await dispatcher.run_once()
+
+    assert seen == ["node-0", "node-2"]
+    stats = dispatcher.metrics()["subscribers"]["flaky"]
+    assert stats["failed"] == 1 and stats["lag_events"] == 0
+
+
+class BatchRecorder:
+    """Subscriber with handle_batch(); fails batches containing fail_on targets."""
+
+    def __init__(self, fail_on: set[str] = frozenset()):
+        self.fail_on = fail_on
+        self.batches: list[list[str]] = []
+        self.singles: list[str] = []
+
+    async def __call__(self, evt) -> None:
+        if evt.target_id in self.fail_on:
+            raise RuntimeError("boom")
+        self.singles.append(evt.target_id)
+
+    async def handle_batch(self, events) -> None:
+        targets = [evt.target_id for evt in events]
+        if self.fail_on & set(targets):
+            raise RuntimeError("boom")
+        self.batches.append(targets)
+
+
+async def test_batch_subscriber_gets_whole_batch(session_maker):
+    await _publish(session_maker, 3)
+    subscriber = BatchRecorder()
+    dispatcher = OutboxDispatcher(session_maker, subscribers={"batch": lambda session, bus: subscriber})
+
+    assert await dispatcher.run_once() == 3
+
+    assert subscriber.batches == [["node-0", "node-1", "node-2"]]
+    assert subscriber.singles == []
+    assert dispatcher.metrics()["subscribers"]["batch"]["delivered"] == 3
+
+
+async def test_failed_batch_falls_back_to_single_events(session_maker):
+    await _publish(session_maker, 3)
+    subscriber = BatchRecorder(fail_on={"node-1"})
+    dispatcher = OutboxDispatcher(session_maker, subscribers={"batch": lambda session, bus: subscriber})
+
+    await dispatcher.run_once()
+
+    assert subscriber.batches == []
+    assert subscriber.singles == ["node-0", "node-2"]
+    stats = dispatcher.metrics()["subscribers"]["batch"]
+    assert stats["delivered"] == 2 and stats["failed"] == 1
+
+
+async def test_sequence_gap_blocks_until_timeout(session_maker):
+    await _publish(session_maker, 3)
+    async with session_maker() as session:
+        await session.execute(EventOutbox.__table__.delete().where(EventOutbox.seq == 2))
+        await session.commit()
+    seen = []
+    dispatcher = OutboxDispatcher(
+        session_maker, subscribers={"s": _recorder(seen)}, gap_timeout_seconds=60
+    )
+
+    await dispatcher.run_once()
+    assert seen == ["node-0"]
+
+    dispatcher.gap_timeout_seconds = 0
+    await dispatcher.run_once()
+    assert seen == ["node-0", "node-2"]
+
+
+async def test_events_published_by_subscribers_go_through_outbox(session_maker):
+    await _publish(session_maker, 1)
+    seen = []
+
+    def republisher(session, bus):
+        async def handle(evt) -> None:
+            seen.append(evt.type)
+            if evt.type == EventType.NODE_SOFT_DELETED:
+                await bus.publish(
+                    event_type=EventType.NODE_RESTORED, actor_id="u1", target_id=evt.target_id
+                )
+        return handle
+
+    dispatcher = OutboxDispatcher(session_maker, subscribers={"r": republisher})
+    await dispatcher.run_once()
+    await dispatcher.run_once()
+
+    assert seen == [EventType.NODE_SOFT_DELETED, EventType.NODE_RESTORED]
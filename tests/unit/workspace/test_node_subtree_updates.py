@@ -0,0 +1,139 @@
+"""
+Tests for set-based subtree updates in NodeRepository.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from modules.workspace.db.base import Base
+from modules.workspace.db.repos.node_repo import NodeRepository
+from modules.workspace.db.tables.nodes import Node
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Base.metadata.create_all(sync_conn, tables=[Node.__table__])
+        )
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def repo(session):
+    return NodeRepository(session)
+
+
+async def _tree(session) -> None:
+    """ws / a / b / c (deep chain) plus ws / a / d and a sibling folder ws / e."""
+    layout = {
+        "ws": None,
+        "a": "ws",
+        "b": "a",
+        "c": "b",
+        "d": "a",
+        "e": "ws",
+    }
+    paths: dict[str, str] = {}
+    for node_id, parent in layout.items():
+        paths[node_id] = f"{paths[parent] if parent else '/'}{node_id}/"
+        session.add(
+            Node(
+                id=node_id,
+                node_type="workspace" if parent is None else "folder",
+                title=node_id,
+                owner_id="u1",
+                visibility="private",
+                parent_id=parent,
+                path=paths[node_id],
+                depth=paths[node_id].count("/") - 2,
+                version=1,
+            )
+        )
+    await session.commit()
+
+
+async def _paths(session) -> dict[str, tuple[str, int, datetime | None]]:
+    session.expire_all()
+    rows = (await session.execute(select(Node))).scalars().all()
+    return {n.id: (n.path, n.depth, n.deleted_at) for n in rows}
+
+
+async def test_move_rewrites_descendants_in_one_statement(session, repo):
+    await _tree(session)
+    statements: list[str] = []
+    sync_engine = session.bind.sync_engine
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", record)
+    updated = await repo.move_descendants("/ws/a/", "/ws/e/a/", depth_delta=1)
+    event.remove(sync_engine, "before_cursor_execute", record)
+
+    assert updated == 3
+    assert len(statements) == 1 and statements[0].startswith("UPDATE nodes")
+    paths = await _paths(session)
+    assert paths["b"][:2] == ("/ws/e/a/b/", 3)
+    assert paths["c"][:2] == ("/ws/e/a/b/c/", 4)
+    assert paths["d"][:2] == ("/ws/e/a/d/", 3)
+    # The moved node itself and unrelated nodes are untouched by this call.
+    assert paths["a"][:2] == ("/ws/a/", 1)
+    assert paths["e"][:2] == ("/ws/e/", 1)
+
+
+async def test_move_up_the_tree_reduces_depth(session, repo):
+    await _tree(session)
+
+    await repo.move_descendants("/ws/a/b/", "/b/", depth_delta=-2)
+
+    assert (await _paths(session))["c"][:2] == ("/b/c/", 1)
+
+
+async def test_restore_only_revives_nodes_deleted_with_ancestor(session, repo):
+    await _tree(session)
+    earlier = datetime(2026, 1, 1, tzinfo=UTC)
+    d = await session.get(Node, "d")
+    d.deleted_at = earlier
+    await session.flush()
+
+    deleted_at = earlier + timedelta(days=1)
+    assert await repo.soft_delete_descendants("/ws/a/", deleted_at) == 2
+    paths = await _paths(session)
+    assert paths["b"][2] is not None and paths["c"][2] is not None
+    assert paths["a"][2] is None and paths["e"][2] is None
+
+    # Restore uses the timestamp as read back from the database.
+    assert await repo.restore_descendants("/ws/a/", paths["b"][2]) == 2
+    paths = await _paths(session)
+    assert paths["b"][2] is None and paths["c"][2] is None
+    assert paths["d"][2] is not None
+
+
+async def test_like_wildcards_in_ids_do_not_overmatch(session, repo):
+    for node_id, path in (("a_", "/a_/"), ("ab", "/ab/"), ("x", "/a_/x/"), ("y", "/ab/y/")):
+        session.add(
+            Node(
+                id=node_id,
+                node_type="folder",
+                title=node_id,
+                owner_id="u1",
+                visibility="private",
+                path=path,
+                depth=path.count("/") - 2,
+                version=1,
+            )
+        )
+    await session.commit()
+
+    assert await repo.move_descendants("/a_/", "/z/", depth_delta=0) == 1
+    assert (await _paths(session))["y"][0] == "/ab/y/"
@@ -0,0 +1,177 @@
+"""
+Tests for effective-permission resolution and the resolved-permission cache.
+"""
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from modules.workspace.db.base import Base
+from modules.workspace.db.repos.acl_repo import ACLRepository, readable_node_condition
+from modules.workspace.db.tables.acl import ACL
+from modules.workspace.db.tables.nodes import Node
+from modules.workspace.domain.models.types import Permission
+from modules.workspace.domain.policies.permission_cache import resolved_permission_cache
+
+OWNER = "owner-1"
+USER = "student-1"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    resolved_permission_cache.clear()
+    yield
+    resolved_permission_cache.clear()
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Base.metadata.create_all(
+                sync_conn, tables=[Node.__table__, ACL.__table__]
+            )
+        )
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+async def _tree(session) -> dict[str, Node]:
+    """ws / folder / sub / study, plus ws / other."""
+    layout = {"ws": None, "folder": "ws", "sub": "folder", "study": "sub", "other": "ws"}
+    nodes: dict[str, Node] = {}
+    for node_id, parent in layout.items():
+        path = f"{nodes[parent].path if parent else '/'}{node_id}/"
+        nodes[node_id] = Node(
+            id=node_id,
+            node_type="workspace" if parent is None else "folder",
+            title=node_id,
+            owner_id=OWNER,
+            visibility="private",
+            parent_id=parent,
+            path=path,
+            depth=path.count("/") - 2,
+            version=1,
+        )
+        session.add(nodes[node_id])
+    await session.commit()
+    return nodes
+
+
+async def _grant(session, object_id: str, permission: str, inherit: bool = True) -> ACL:
+    acl = ACL(
+        id=f"acl-{object_id}",
+        object_id=object_id,
+        user_id=USER,
+        permission=permission,
+        inherit_to_children=inherit,
+        granted_by=OWNER,
+    )
+    session.add(acl)
+    await session.commit()
+    return acl
+
+
+def _count_statements(session) -> list[str]:
+    statements: list[str] = []
+    event.listen(
+        session.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+async def test_grant_on_folder_applies_to_descendants(session):
+    nodes = await _tree(session)
+    await _grant(session, "folder", "editor")
+    repo = ACLRepository(session)
+
+    acl = await repo.get_effective_acl(nodes["study"], USER)
+
+    assert acl is not None and acl.permission == Permission.EDITOR
+    assert acl.object_id == "folder"
+    assert await repo.get_effective_acl(nodes["other"], USER) is None
+    assert await repo.get_effective_acl(nodes["ws"], USER) is None
+
+
+async def test_nearest_grant_wins(session):
+    nodes = await _tree(session)
+    await _grant(session, "folder", "editor")
+    await _grant(session, "sub", "viewer")
+
+    acl = await ACLRepository(session).get_effective_acl(nodes["study"], USER)
+
+    assert acl.permission == Permission.VIEWER
+
+
+async def test_non_inheriting_grant_only_applies_to_its_node(session):
+    nodes = await _tree(session)
+    await _grant(session, "folder", "viewer", inherit=False)
+    repo = ACLRepository(session)
+
+    assert (await repo.get_effective_acl(nodes["folder"], USER)).permission == Permission.VIEWER
+    assert await repo.get_effective_acl(nodes["sub"], USER) is None
+
+
+async def test_cache_serves_later_requests_with_only_a_version_query(session):
+    nodes = await _tree(session)
+    await _grant(session, "folder", "editor")
+    await ACLRepository(session).get_effective_acl(nodes["study"], USER)
+
+    statements = _count_statements(session)
+    repo = ACLRepository(session)
+    acl = await repo.get_effective_acl(nodes["study"], USER)
+    await repo.get_effective_acl(nodes["study"], USER)
+
+    assert acl.permission == Permission.EDITOR
+    assert len(statements) == 1
+
+
+async def test_role_change_and_revoke_invalidate_cache(session):
+    nodes = await _tree(session)
+    acl = await _grant(session, "folder", "editor")
+    assert (await ACLRepository(session).get_effective_acl(nodes["study"], USER)).permission == (
+        Permission.EDITOR
+    )
+
+    repo = ACLRepository(session)
+    acl.permission = "viewer"
+    await repo.update_acl(acl)
+    await session.commit()
+    assert (await ACLRepository(session).get_effective_acl(nodes["study"], USER)).permission == (
+        Permission.VIEWER
+    )
+
+    repo = ACLRepository(session)
+    await repo.delete_acl(acl)
+    await session.commit()
+    assert await ACLRepository(session).get_effective_acl(nodes["study"], USER) is None
+
+
+async def test_moved_node_is_resolved_against_new_path(session):
+    nodes = await _tree(session)
+    await _grant(session, "folder", "editor")
+    repo = ACLRepository(session)
+    assert await repo.get_effective_acl(nodes["study"], USER) is not None
+
+    nodes["study"].parent_id = "other"
+    nodes["study"].path = "/ws/other/study/"
+    await session.commit()
+
+    assert await ACLRepository(session).get_effective_acl(nodes["study"], USER) is None
+
+
+async def test_readable_node_condition_includes_inherited_grants(session):
+    await _tree(session)
+    await _grant(session, "folder", "viewer")
+    await _grant(session, "other", "viewer", inherit=False)
+
+    rows = await session.execute(select(Node.id).where(readable_node_condition(USER)))
+
+    assert set(rows.scalars()) == {"folder", "sub", "study", "other"}
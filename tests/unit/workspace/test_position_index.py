@@ -0,0 +1,147 @@
+"""
+Tests for the cross-study position index.
+"""
+
+import chess
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from backend.core.real_pgn.parser import parse_pgn
+from modules.workspace.db.base import Base
+from modules.workspace.db.repos.position_index_repo import PositionIndexRepository
+from modules.workspace.db.tables.acl import ACL
+from modules.workspace.db.tables.nodes import Node
+from modules.workspace.db.tables.position_index import PositionIndex
+from modules.workspace.db.tables.studies import Chapter
+from modules.workspace.domain.services.position_index_service import (
+    PositionIndexService,
+    position_key,
+    tree_positions,
+)
+
+OWNER = "coach-1"
+
+# Same position after 2...e6 / 2...Nf6, reached by different move orders.
+QGD_FEN = "rnbqkb1r/pppp1ppp/4pn2/8/2PP4/8/PP2PPPP/RNBQKBNR w KQkq - 0 3"
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Base.metadata.create_all(
+                sync_conn,
+                tables=[Node.__table__, ACL.__table__, Chapter.__table__, PositionIndex.__table__],
+            )
+        )
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def service(session):
+    return PositionIndexService(PositionIndexRepository(session))
+
+
+async def _add_study(session, study_id: str, owner_id: str, chapter_ids: list[str]) -> None:
+    session.add(
+        Node(
+            id=study_id,
+            node_type="study",
+            title=f"Study {study_id}",
+            owner_id=owner_id,
+            visibility="private",
+            path=f"/{study_id}/",
+            depth=0,
+            version=1,
+        )
+    )
+    for order, chapter_id in enumerate(chapter_ids):
+        session.add(
+            Chapter(
+                id=chapter_id,
+                study_id=study_id,
+                title=f"Chapter {chapter_id}",
+                order=order,
+                r2_key=f"chapters/{chapter_id}.tree.json",
+            )
+        )
+    await session.flush()
+
+
+def test_position_key_ignores_move_counters_and_fits_bigint():
+    board = chess.Board(QGD_FEN)
+    key = position_key(QGD_FEN)
+
+    assert key == position_key(board.fen().replace(" 0 3", " 7 42"))
+    assert -(2**63) <= key < 2**63
+    assert key != position_key(chess.STARTING_FEN)
+
+
+def test_tree_positions_skip_root():
+    tree = parse_pgn("1. e4 e5 (1... c5) 2. Nf3 *")
+
+    positions = tree_positions(tree)
+
+    assert len(positions) == 4
+    assert tree.root_id not in {node_id for node_id, _, _ in positions}
+
+
+async def test_finds_transpositions_across_studies(session, service):
+    await _add_study(session, "s1", OWNER, ["c1"])
+    await _add_study(session, "s2", OWNER, ["c2"])
+    await service.index_chapter("s1", "c1", parse_pgn("1. d4 Nf6 2. c4 e6 3. Nc3 *"))
+    await service.index_chapter("s2", "c2", parse_pgn("1. c4 e6 2. d4 Nf6 *"))
+
+    results = await service.find_position(QGD_FEN, OWNER)
+
+    assert results.total == 2
+    assert {(hit.chapter_id, hit.ply) for hit in results.results} == {("c1", 4), ("c2", 4)}
+    assert results.results[0].study_title.startswith("Study ")
+
+
+async def test_results_respect_study_permissions(session, service):
+    await _add_study(session, "mine", OWNER, ["c1"])
+    await _add_study(session, "shared", "other-coach", ["c2"])
+    await _add_study(session, "private", "other-coach", ["c3"])
+    session.add(
+        ACL(id="acl-1", object_id="shared", user_id=OWNER, permission="viewer", granted_by="other-coach")
+    )
+    for study_id, chapter_id in (("mine", "c1"), ("shared", "c2"), ("private", "c3")):
+        await service.index_chapter(study_id, chapter_id, parse_pgn("1. d4 Nf6 2. c4 e6 *"))
+
+    results = await service.find_position(QGD_FEN, OWNER)
+
+    assert sorted(hit.study_id for hit in results.results) == ["mine", "shared"]
+
+
+async def test_reindex_only_writes_changed_nodes(session, service):
+    await _add_study(session, "s1", OWNER, ["c1"])
+    tree = parse_pgn("1. d4 Nf6 2. c4 e6 *")
+
+    assert await service.index_chapter("s1", "c1", tree) == (4, 0)
+    assert await service.index_chapter("s1", "c1", tree) == (0, 0)
+
+    # Drop the last move and add a sideline: one delete, one insert.
+    last = next(node for node in tree.nodes.values() if node.san == "e6")
+    parent = tree.nodes[last.parent_id]
+    parent.main_child = None
+    del tree.nodes[last.node_id]
+    sideline = parse_pgn("1. d4 Nf6 2. c4 g6 *")
+    g6 = next(node for node in sideline.nodes.values() if node.san == "g6")
+    g6.parent_id = parent.node_id
+    parent.main_child = g6.node_id
+    tree.nodes[g6.node_id] = g6
+
+    assert await service.index_chapter("s1", "c1", tree) == (1, 1)
+    assert (await service.find_position(QGD_FEN, OWNER)).total == 0
+
+
+async def test_invalid_fen_raises_value_error(service):
+    with pytest.raises(ValueError):
+        await service.find_position("not a fen", OWNER)
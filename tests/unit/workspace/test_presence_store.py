@@ -0,0 +1,187 @@
+"""
+Tests for in-memory presence tracking with batched persistence.
+"""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from modules.workspace.collaboration.presence_store import (
+    DatabasePresenceStore,
+    InMemoryPresenceStore,
+    create_presence_store_from_env,
+)
+from modules.workspace.db.base import Base
+from modules.workspace.db.repos.presence_repo import PresenceRepository
+from modules.workspace.db.tables.presence_sessions import PresenceSessionTable
+from modules.workspace.domain.models.types import PresenceStatus
+from modules.workspace.domain.services.presence_service import PresenceService
+from modules.workspace.events.types import EventType
+
+
+@pytest.fixture
+async def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'presence.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Base.metadata.create_all(
+                sync_conn, tables=[PresenceSessionTable.__table__]
+            )
+        )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db_session(session_maker):
+    async with session_maker() as session:
+        yield session
+
+
+@pytest.fixture
+def event_bus():
+    bus = MagicMock()
+    bus.publish = AsyncMock()
+    return bus
+
+
+def _service(session, event_bus, repo=None):
+    return PresenceService(
+        session=session,
+        presence_repo=repo or PresenceRepository(session),
+        event_bus=event_bus,
+        store=InMemoryPresenceStore(ttl_seconds=600),
+    )
+
+
+def _published(event_bus) -> list:
+    return [call.args[0].type for call in event_bus.publish.await_args_list]
+
+
+async def _rows(session) -> dict[tuple[str, str], PresenceSessionTable]:
+    result = await session.execute(select(PresenceSessionTable))
+    return {(row.user_id, row.study_id): row for row in result.scalars().all()}
+
+
+async def test_heartbeats_touch_only_the_store(event_bus):
+    repo = MagicMock(spec=PresenceRepository)
+    service = _service(MagicMock(), event_bus, repo=repo)
+
+    for ply in range(50):
+        model = await service.heartbeat("u1", "s1", "ch1", f"main.{ply + 1}")
+
+    assert model.move_path == "main.50"
+    assert _published(event_bus) == [EventType.PRESENCE_USER_JOINED]
+    assert repo.method_calls == []
+    assert [user.user_id for user in await service.get_online_users("s1")] == ["u1"]
+
+
+async def test_idle_and_active_transitions(event_bus):
+    service = _service(MagicMock(), event_bus)
+    model = await service.heartbeat("u1", "s1")
+    model.last_heartbeat = datetime.now(UTC) - timedelta(seconds=60)
+    await service.store.put(model)
+
+    updated = await service.update_all_statuses()
+    assert [m.status for m in updated] == [PresenceStatus.IDLE]
+    assert await service.update_all_statuses() == []
+
+    model = await service.heartbeat("u1", "s1")
+    assert model.status == PresenceStatus.ACTIVE
+    assert _published(event_bus) == [
+        EventType.PRESENCE_USER_JOINED,
+        EventType.PRESENCE_USER_IDLE,
+        EventType.PRESENCE_USER_ACTIVE,
+    ]
+
+
+async def test_flush_batches_upserts_and_deletes(db_session, event_bus):
+    # Row left by a previous process for the same user and study
+    db_session.add(
+        PresenceSessionTable(
+            id="old", user_id="u1", study_id="s1", status="idle",
+            last_heartbeat=datetime.now(UTC) - timedelta(minutes=1),
+        )
+    )
+    await db_session.commit()
+    service = _service(db_session, event_bus)
+
+    for user in ("u1", "u2", "u3"):
+        await service.heartbeat(user, "s1", "ch1", "main.1")
+    first = await service.heartbeat("u1", "s1", "ch2", "main.7")
+    assert await service.flush_presence() == 3
+    assert await service.flush_presence() == 0
+
+    await service.leave_study("u2", "s1")
+    assert await service.flush_presence() == 1
+
+    rows = await _rows(db_session)
+    assert set(rows) == {("u1", "s1"), ("u3", "s1")}
+    assert rows[("u1", "s1")].id == first.id
+    assert rows[("u1", "s1")].move_path == "main.7"
+    assert rows[("u1", "s1")].status == "active"
+
+
+async def test_cleanup_expires_store_sessions_and_stale_rows(db_session, event_bus):
+    db_session.add(
+        PresenceSessionTable(
+            id="orphan", user_id="u9", study_id="s1", status="active",
+            last_heartbeat=datetime.now(UTC) - timedelta(hours=1),
+        )
+    )
+    await db_session.commit()
+    service = _service(db_session, event_bus)
+    await service.heartbeat("u1", "s1")
+    stale = await service.heartbeat("u2", "s1")
+    stale.last_heartbeat = datetime.now(UTC) - timedelta(minutes=15)
+    await service.store.put(stale)
+
+    assert await service.cleanup_expired_sessions(timeout_minutes=10) == 1
+    await service.flush_presence()
+
+    assert _published(event_bus)[-1] == EventType.PRESENCE_USER_LEFT
+    assert event_bus.publish.await_args.args[0].payload["reason"] == "timeout"
+    assert set(await _rows(db_session)) == {("u1", "s1")}
+
+
+async def test_database_store_is_shared_between_workers(session_maker, event_bus):
+    # Two workers without Redis: each has its own store over the same table
+    workers = [
+        PresenceService(
+            session=MagicMock(),
+            presence_repo=MagicMock(spec=PresenceRepository),
+            event_bus=event_bus,
+            store=DatabasePresenceStore(session_maker, ttl_seconds=600),
+        )
+        for _ in range(2)
+    ]
+
+    await workers[0].heartbeat("u1", "s1", "ch1", "main.1")
+    model = await workers[1].heartbeat("u1", "s1", "ch1", "main.2")
+
+    assert model.move_path == "main.2"
+    assert _published(event_bus) == [EventType.PRESENCE_USER_JOINED]
+    online = await workers[0].get_online_users("s1")
+    assert [(user.user_id, user.move_path) for user in online] == [("u1", "main.2")]
+    assert workers[0].store.pending == 0
+
+    await workers[1].leave_study("u1", "s1")
+    await workers[0].leave_study("u1", "s1")
+    assert _published(event_bus)[-1] == EventType.PRESENCE_USER_LEFT
+    assert _published(event_bus).count(EventType.PRESENCE_USER_LEFT) == 1
+    assert await workers[0].get_online_users("s1") == []
+
+
+def test_store_without_redis_defaults_to_database(monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.delenv("PRESENCE_STORE", raising=False)
+    assert isinstance(create_presence_store_from_env(), DatabasePresenceStore)
+
+    monkeypatch.setenv("PRESENCE_STORE", "memory")
+    assert isinstance(create_presence_store_from_env(), InMemoryPresenceStore)
@@ -0,0 +1,193 @@
+"""
+Tests for bulk search index upserts, batched indexing of events and the
+full rebuild job.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from modules.workspace.db.base import Base
+from modules.workspace.db.repos.discussion_reply_repo import DiscussionReplyRepository
+from modules.workspace.db.repos.discussion_thread_repo import DiscussionThreadRepository
+from modules.workspace.db.repos.node_repo import NodeRepository
+from modules.workspace.db.repos.search_index_repo import SearchIndexRepository
+from modules.workspace.db.repos.study_repo import StudyRepository
+from modules.workspace.db.tables.discussion_replies import DiscussionReply
+from modules.workspace.db.tables.discussion_threads import DiscussionThread
+from modules.workspace.db.tables.nodes import Node
+from modules.workspace.db.tables.search_index import SearchIndex
+from modules.workspace.db.tables.studies import Chapter, Study
+from modules.workspace.db.tables.variations import MoveAnnotation, Variation
+from modules.workspace.events.subscribers.search_indexer import SearchIndexer
+from modules.workspace.events.types import EventType
+from modules.workspace.jobs.search_reindex_job import SearchReindexJob
+
+
+@pytest.fixture
+async def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'search.db'}")
+    tables = [
+        SearchIndex,
+        DiscussionThread,
+        DiscussionReply,
+        Node,
+        Study,
+        Chapter,
+        Variation,
+        MoveAnnotation,
+    ]
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Base.metadata.create_all(
+                sync_conn, tables=[table.__table__ for table in tables]
+            )
+        )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _entries(session) -> dict[tuple[str, str], str]:
+    result = await session.execute(
+        select(SearchIndex.target_id, SearchIndex.target_type, SearchIndex.content)
+    )
+    return {(target_id, target_type): content for target_id, target_type, content in result}
+
+
+async def test_upsert_many_inserts_and_updates_in_one_statement_per_batch(session_maker):
+    async with session_maker() as session:
+        repo = SearchIndexRepository(session)
+        await repo.upsert_many(
+            {"target_id": f"t{i}", "target_type": "discussion_thread", "content": f"v1 {i}"}
+            for i in range(3)
+        )
+        statements: list[str] = []
+        engine = session.bind.sync_engine
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(engine, "before_cursor_execute", listener)
+        written = await repo.upsert_many(
+            [
+                {"target_id": "t0", "target_type": "discussion_thread", "content": "v2 0"},
+                {"target_id": "t3", "target_type": "discussion_thread", "content": "v2 3"},
+            ]
+        )
+        event.remove(engine, "before_cursor_execute", listener)
+
+        assert written == 2
+        assert len(statements) == 1 and "ON CONFLICT" in statements[0]
+        entries = await _entries(session)
+    assert len(entries) == 4
+    assert entries[("t0", "discussion_thread")] == "v2 0"
+
+
+async def test_upsert_keeps_one_entry_per_target(session_maker):
+    async with session_maker() as session:
+        repo = SearchIndexRepository(session)
+        first = await repo.upsert("e1", "s1", "study", "Old title", author_id="u1")
+        second = await repo.upsert("e2", "s1", "study", "New title", author_id="u1")
+        count = (await session.execute(select(func.count()).select_from(SearchIndex))).scalar_one()
+
+    assert count == 1
+    assert second.id == first.id == "e1"
+    assert second.content == "New title"
+
+
+async def test_reindex_backfills_and_prunes(session_maker):
+    async with session_maker() as session:
+        session.add(
+            Node(
+                id="s1",
+                node_type="study",
+                title="Sicilian Najdorf",
+                owner_id="u1",
+                visibility="private",
+                path="/s1/",
+                depth=0,
+                version=1,
+            )
+        )
+        session.add(Study(id="s1", description="Main lines", chapter_count=1))
+        session.add(
+            Chapter(id="c1", study_id="s1", title="6.Bg5", order=0, r2_key="k1", white="Fischer")
+        )
+        for i in range(5):
+            session.add(
+                DiscussionThread(
+                    id=f"t{i}",
+                    target_id="s1",
+                    target_type="study",
+                    author_id="u2",
+                    title=f"Thread {i}",
+                    content="body",
+                    thread_type="question",
+                )
+            )
+        await SearchIndexRepository(session).upsert_many(
+            [{"target_id": "gone", "target_type": "discussion_thread", "content": "stale"}]
+        )
+        await session.commit()
+
+    stats = await SearchReindexJob(session_maker, batch_size=2).run_once()
+
+    assert stats["discussion_thread"] == {"indexed": 5, "pruned": 1}
+    assert stats["study"]["indexed"] == 1 and stats["chapter"]["indexed"] == 1
+    async with session_maker() as session:
+        entries = await _entries(session)
+    assert ("gone", "discussion_thread") not in entries
+    assert entries[("s1", "study")] == "Sicilian Najdorf\nMain lines"
+    assert entries[("c1", "chapter")] == "6.Bg5\nWhite: Fischer"
+
+
+async def test_indexer_batch_writes_one_upsert(session_maker):
+    async with session_maker() as session:
+        session.add(
+            Node(
+                id="s1",
+                node_type="study",
+                title="Sicilian Najdorf",
+                owner_id="u1",
+                visibility="private",
+                path="/s1/",
+                depth=0,
+                version=1,
+            )
+        )
+        session.add(Study(id="s1", chapter_count=3))
+        for i in range(3):
+            session.add(Chapter(id=f"c{i}", study_id="s1", title=f"Game {i}", order=i, r2_key=f"k{i}"))
+        await session.commit()
+
+    events = [
+        SimpleNamespace(type=EventType.STUDY_CHAPTER_IMPORTED, target_id=f"c{i}") for i in range(3)
+    ]
+    events.append(SimpleNamespace(type=EventType.STUDY_CHAPTER_DELETED, target_id="c1"))
+    async with session_maker() as session:
+        search_repo = SearchIndexRepository(session)
+        indexer = SearchIndexer(
+            DiscussionThreadRepository(session),
+            DiscussionReplyRepository(session),
+            search_repo,
+            node_repo=NodeRepository(session),
+            study_repo=StudyRepository(session),
+        )
+        upserts: list[list[str]] = []
+        upsert_many = search_repo.upsert_many
+
+        async def recording_upsert_many(entries):
+            entries = list(entries)
+            upserts.append([entry["target_id"] for entry in entries])
+            return await upsert_many(entries)
+
+        search_repo.upsert_many = recording_upsert_many
+        await indexer.handle_batch(events)
+        await session.commit()
+        entries = await _entries(session)
+
+    # The chapter deleted later in the batch is not written back
+    assert upserts == [["c0", "c2"]]
+    assert entries == {("c0", "chapter"): "Game 0", ("c2", "chapter"): "Game 2"}
@@ -0,0 +1,194 @@
+"""
+Tests for SQL-side permission filtering in workspace search.
+"""
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from modules.workspace.db.base import Base
+from modules.workspace.db.repos.acl_repo import ACLRepository
+from modules.workspace.db.repos.node_repo import NodeRepository
+from modules.workspace.db.repos.search_index_repo import SearchIndexRepository
+from modules.workspace.db.tables.acl import ACL
+from modules.workspace.db.tables.nodes import Node
+from modules.workspace.db.tables.search_index import SearchIndex
+from modules.workspace.domain.services.search_service import SearchService
+
+OWNER = "owner-1"
+VIEWER = "viewer-1"
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: Base.metadata.create_all(
+                sync_conn,
+                tables=[Node.__table__, ACL.__table__, SearchIndex.__table__],
+            )
+        )
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(session):
+    """Record SQL statements executed through the session's engine."""
+    executed: list[str] = []
+    sync_engine = session.bind.sync_engine
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def service(session):
+    return SearchService(
+        SearchIndexRepository(session),
+        NodeRepository(session),
+        ACLRepository(session),
+    )
+
+
+async def _seed(session, count: int, shared: set[int]) -> None:
+    """Create `count` owner studies matching "opening"; share some with VIEWER."""
+    for i in range(count):
+        node_id = f"study-{i:02d}"
+        session.add(
+            Node(
+                id=node_id,
+                node_type="study",
+                title=f"Study {i:02d}",
+                owner_id=OWNER,
+                visibility="private",
+                path=f"/{node_id}/",
+                depth=0,
+                version=1,
+            )
+        )
+        session.add(
+            SearchIndex(
+                id=f"idx-{i:02d}",
+                target_id=node_id,
+                target_type="study",
+                content=f"opening notes {i}",
+            )
+        )
+        if i in shared:
+            session.add(
+                ACL(
+                    id=f"acl-{i:02d}",
+                    object_id=node_id,
+                    user_id=VIEWER,
+                    permission="viewer",
+                    granted_by=OWNER,
+                )
+            )
+    await session.flush()
+
+
+async def test_pagination_counts_only_visible_results(session, service):
+    await _seed(session, count=12, shared={1, 4, 5, 8, 11})
+
+    first = await service.search("opening", VIEWER, page=1, page_size=3)
+    second = await service.search("opening", VIEWER, page=2, page_size=3)
+
+    assert first.total == 5
+    assert first.has_more is True
+    assert len(first.results) == 3
+    assert len(second.results) == 2
+    assert second.has_more is False
+    seen = {r.target_id for r in first.results + second.results}
+    assert seen == {f"study-{i:02d}" for i in (1, 4, 5, 8, 11)}
+
+
+async def test_query_count_is_independent_of_candidates(session, service, statements):
+    await _seed(session, count=30, shared=set(range(0, 30, 2)))
+
+    statements.clear()
+    results = await service.search("opening", VIEWER, page=1, page_size=10)
+
+    assert len(results.results) == 10
+    assert results.total == 15
+    assert not any("FROM acl" in s and "WHERE acl.object_id = ?" in s for s in statements)
+    assert len(statements) <= 4
+
+
+async def test_title_matches_fill_after_index_hits_without_duplicates(session, service):
+    await _seed(session, count=3, shared={0, 1, 2})
+    session.add(
+        Node(
+            id="folder-x",
+            node_type="folder",
+            title="Opening folder",
+            owner_id=OWNER,
+            visibility="private",
+            path="/folder-x/",
+            depth=0,
+            version=1,
+        )
+    )
+    session.add(
+        ACL(id="acl-x", object_id="folder-x", user_id=VIEWER, permission="viewer", granted_by=OWNER)
+    )
+    # A title match that also has an index hit must not appear twice.
+    session.add(
+        Node(
+            id="study-dup",
+            node_type="study",
+            title="Opening repertoire",
+            owner_id=VIEWER,
+            visibility="private",
+            path="/study-dup/",
+            depth=0,
+            version=1,
+        )
+    )
+    session.add(
+        SearchIndex(id="idx-dup", target_id="study-dup", target_type="study", content="opening ideas")
+    )
+    await session.flush()
+
+    page1 = await service.search("opening", VIEWER, page=1, page_size=4)
+    page2 = await service.search("opening", VIEWER, page=2, page_size=4)
+
+    ids = [r.target_id for r in page1.results + page2.results]
+    assert page1.total == 5
+    assert len(ids) == len(set(ids)) == 5
+    assert ids[-1] == "folder-x"
+
+
+async def test_search_metadata_paginates_readable_nodes(session, service):
+    await _seed(session, count=6, shared={2, 3})
+
+    page1 = await service.search_metadata("Study", VIEWER, page=1, page_size=1)
+    page2 = await service.search_metadata("Study", VIEWER, page=2, page_size=1)
+    other = await service.search_metadata("Study", "stranger")
+
+    assert page1.total == 2 and page1.has_more is True
+    assert [r.target_id for r in page1.results + page2.results] == ["study-02", "study-03"]
+    assert page2.has_more is False
+    assert other.total == 0 and other.results == []
+
+
+async def test_deleted_nodes_are_hidden(session, service):
+    from datetime import UTC, datetime
+
+    await _seed(session, count=2, shared={0, 1})
+    node = await session.get(Node, "study-00")
+    node.deleted_at = datetime.now(UTC)
+    await session.flush()
+
+    results = await service.search("opening", VIEWER)
+
+    assert [r.target_id for r in results.results] == ["study-01"]
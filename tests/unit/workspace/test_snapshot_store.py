@@ -0,0 +1,188 @@
+"""
+Tests for content-addressed, deduplicated version snapshots.
+"""
+
+import json
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from modules.workspace.domain.models.version import CreateVersionCommand, SnapshotContent
+from modules.workspace.domain.services.version_service import VersionService
+from modules.workspace.storage.keys import R2Keys
+from modules.workspace.storage.r2_client import UploadResult
+from modules.workspace.storage.snapshot_store import build_manifest, known_refs
+
+
+class MemoryR2Client:
+    """Blocking in-memory R2 double counting blob reads and writes."""
+
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+        self.blob_uploads: list[str] = []
+        self.blob_downloads: list[str] = []
+
+    def _put(self, key, content) -> UploadResult:
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        self.objects[key] = data
+        return UploadResult(key=key, etag="etag", size=len(data), content_hash=key)
+
+    def upload_json(self, key, content, metadata=None) -> UploadResult:
+        return self._put(key, content)
+
+    def upload_pgn(self, key, content, content_type="application/x-chess-pgn", metadata=None):
+        self.blob_uploads.append(key)
+        return self._put(key, content)
+
+    def download_json(self, key: str) -> str:
+        return self.objects[key].decode("utf-8")
+
+    def download_pgn_bytes(self, key: str) -> bytes:
+        self.blob_downloads.append(key)
+        return self.objects[key]
+
+
+class MemoryVersionRepo:
+    """In-memory stand-in for VersionRepository."""
+
+    def __init__(self):
+        self.versions: dict[int, SimpleNamespace] = {}
+        self.snapshots: dict[str, SimpleNamespace] = {}
+
+    async def get_latest_version_number(self, study_id: str) -> int:
+        return max(self.versions, default=0)
+
+    async def create_version(self, version_id, **fields):
+        version = SimpleNamespace(id=version_id, created_at=datetime.now(UTC), **fields)
+        self.versions[version.version_number] = version
+        return version
+
+    async def create_snapshot(self, snapshot_id, version_id, r2_key, size_bytes, content_hash, metadata):
+        snapshot = SimpleNamespace(
+            id=snapshot_id,
+            version_id=version_id,
+            r2_key=r2_key,
+            size_bytes=size_bytes,
+            content_hash=content_hash,
+            meta_data=metadata,
+            created_at=datetime.now(UTC),
+        )
+        self.snapshots[version_id] = snapshot
+        return snapshot
+
+    async def get_version_by_number(self, study_id: str, version_number: int):
+        return self.versions.get(version_number)
+
+    async def get_snapshot_by_version_id(self, version_id: str):
+        return self.snapshots.get(version_id)
+
+
+def _content(chapters: list[dict], variations: list[dict] | None = None) -> SnapshotContent:
+    return SnapshotContent(
+        version_number=0,
+        study_id="study_1",
+        study_data={"title": "Najdorf"},
+        chapters=chapters,
+        variations=variations or [],
+        annotations=[],
+    )
+
+
+def _chapters(count: int) -> list[dict]:
+    return [{"id": f"ch{i}", "title": f"Chapter {i}", "moves": ["e4", "c5"] * 20} for i in range(count)]
+
+
+@pytest.fixture
+def r2():
+    return MemoryR2Client()
+
+
+@pytest.fixture
+def service(r2):
+    session = MagicMock()
+    session.commit = AsyncMock()
+    bus = MagicMock()
+    bus.publish = AsyncMock()
+    service = VersionService(session, r2, bus)
+    service.repo = MemoryVersionRepo()
+    return service
+
+
+async def _snapshot(service, content: SnapshotContent):
+    return await service.create_snapshot(
+        CreateVersionCommand(study_id="study_1", created_by="u1"), content
+    )
+
+
+def test_manifest_reuses_known_blobs():
+    first, first_blobs = build_manifest(_content(_chapters(3)), 1)
+    chapters = _chapters(3)
+    chapters[1]["title"] = "Renamed"
+    second, second_blobs = build_manifest(_content(chapters), 2, known_refs(first))
+
+    # study_data, 3 chapters and the (equal) empty variation/annotation lists
+    assert len(first_blobs) == 5
+    assert list(second_blobs) == [second["chapters"][1]["hash"]]
+    assert second["chapters"][0] == first["chapters"][0]
+
+
+async def test_unchanged_chapters_are_uploaded_once(service, r2):
+    await _snapshot(service, _content(_chapters(10)))
+    uploads_after_first = len(r2.blob_uploads)
+    chapters = _chapters(10)
+    chapters[4]["moves"].append("Nf3")
+    version = await _snapshot(service, _content(chapters))
+
+    assert len(r2.blob_uploads) == uploads_after_first + 1
+    assert version.snapshot.metadata["new_blob_count"] == 1
+    manifest = json.loads(r2.objects[R2Keys.version_snapshot("study_1", 2)])
+    assert manifest["format"] == "cas/v1"
+
+    restored = await service.get_snapshot_content("study_1", 2)
+    assert restored.chapters == chapters
+    assert restored.study_data == {"title": "Najdorf"}
+
+
+async def test_compare_downloads_only_changed_blobs(service, r2):
+    await _snapshot(service, _content(_chapters(20)))
+    chapters = _chapters(20)
+    chapters[3]["title"] = "Changed"
+    chapters.append({"id": "new", "title": "Added"})
+    await _snapshot(service, _content(chapters, variations=[{"id": "v1"}]))
+    r2.blob_downloads.clear()
+
+    comparison = await service.compare_versions("study_1", 1, 2)
+
+    # chapter 3 on both sides, the added chapter, both variation lists
+    assert len(r2.blob_downloads) == 5
+    assert comparison.changes == {
+        "additions_count": 2,
+        "deletions_count": 0,
+        "modifications_count": 1,
+    }
+    assert comparison.modifications[0]["id"] == "ch3"
+    assert {item["type"] for item in comparison.additions} == {"chapter", "variation"}
+
+
+async def test_legacy_snapshots_stay_readable(service, r2):
+    legacy = _content(_chapters(2))
+    r2.objects["legacy.json"] = json.dumps(legacy.to_dict()).encode("utf-8")
+    service.repo.versions[1] = SimpleNamespace(
+        id="v-legacy",
+        study_id="study_1",
+        version_number=1,
+        created_by="u1",
+        created_at=datetime.now(UTC),
+        change_summary=None,
+        snapshot_key="legacy.json",
+        is_rollback=False,
+    )
+    chapters = _chapters(2)
+    chapters[0]["title"] = "Changed"
+    await _snapshot(service, _content(chapters))
+
+    assert (await service.get_snapshot_content("study_1", 1)).chapters == legacy.chapters
+    comparison = await service.compare_versions("study_1", 1, 2)
+    assert [item["id"] for item in comparison.modifications] == ["ch0"]
@@ -0,0 +1,144 @@
+"""
+Tests for the streaming whole-study PGN export.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from modules.workspace.domain.services.chapter_content_cache import chapter_content_cache
+from modules.workspace.storage.async_r2_client import AsyncR2Client
+from modules.workspace.storage.keys import R2Keys
+from patch.backend.study.api import iter_study_pgn, stream_study_pgn
+
+
+def _tree(san: str) -> dict:
+    return {
+        "version": "v1",
+        "rootId": "root",
+        "nodes": {
+            "root": {"id": "root", "parentId": None, "san": "", "children": ["a"]},
+            "a": {"id": "a", "parentId": "root", "san": san, "children": []},
+        },
+        "meta": {"result": "*"},
+    }
+
+
+class SlowR2Client:
+    """Blocking R2 double with latency that tracks concurrent downloads."""
+
+    def __init__(self, trees: dict[str, dict], delay: float = 0.05):
+        self.trees = trees
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def download_json(self, key: str) -> str:
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if key not in self.trees:
+                from botocore.exceptions import ClientError
+
+                raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+            return json.dumps(self.trees[key])
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _chapter(index: int) -> SimpleNamespace:
+    chapter_id = f"ch{index}"
+    return SimpleNamespace(
+        id=chapter_id,
+        study_id="study-1",
+        title=f"Chapter {index}",
+        event=None,
+        white=None,
+        black=None,
+        date=None,
+        result="*",
+        r2_key=R2Keys.chapter_tree_json(chapter_id),
+        r2_etag=f"etag-{index}",
+        pgn_hash=None,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    chapter_content_cache.clear()
+    yield
+    chapter_content_cache.clear()
+
+
+def _study(count: int, delay: float = 0.05):
+    chapters = [_chapter(i) for i in range(count)]
+    sans = ["e4", "d4", "c4", "Nf3"]
+    r2 = SlowR2Client(
+        {chapter.r2_key: _tree(sans[i % len(sans)]) for i, chapter in enumerate(chapters)},
+        delay=delay,
+    )
+    return chapters, r2
+
+
+async def test_chapters_stream_in_order_with_bounded_prefetch():
+    chapters, r2 = _study(8)
+
+    blocks = [block async for block in iter_study_pgn(chapters, AsyncR2Client(r2), prefetch=3)]
+
+    assert len(blocks) == 8
+    assert '[Event "Chapter 0"]' in blocks[0] and not blocks[0].startswith("\n")
+    assert all(block.startswith("\n\n[Event") for block in blocks[1:])
+    assert [b.split('"')[1] for b in blocks] == [f"Chapter {i}" for i in range(8)]
+    assert 1 < r2.max_active <= 3
+
+
+async def test_repeat_export_reuses_cached_content():
+    chapters, r2 = _study(4, delay=0)
+    client = AsyncR2Client(r2)
+
+    first = "".join([b async for b in iter_study_pgn(chapters, client)])
+    second = "".join([b async for b in iter_study_pgn(chapters, client)])
+
+    assert first == second
+    assert r2.calls == 4
+
+
+async def test_missing_first_tree_is_404_before_streaming():
+    chapters, r2 = _study(2, delay=0)
+    del r2.trees[chapters[0].r2_key]
+    repo = SimpleNamespace(
+        get_study_by_id=lambda study_id: asyncio.sleep(0, SimpleNamespace(title="Najdorf")),
+        get_chapters_for_study=lambda study_id, order_by_order: asyncio.sleep(0, chapters),
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        await stream_study_pgn("study-1", AsyncR2Client(r2), repo)
+    assert exc.value.status_code == 404
+
+
+async def test_stream_endpoint_returns_pgn_attachment():
+    chapters, r2 = _study(3, delay=0)
+    repo = SimpleNamespace(
+        get_study_by_id=lambda study_id: asyncio.sleep(0, SimpleNamespace(title="Najdorf")),
+        get_chapters_for_study=lambda study_id, order_by_order: asyncio.sleep(0, chapters),
+    )
+
+    response = await stream_study_pgn("study-1", AsyncR2Client(r2), repo)
+
+    assert isinstance(response, StreamingResponse)
+    assert response.media_type == "application/x-chess-pgn"
+    assert "Najdorf.pgn" in response.headers["content-disposition"]
+    body = "".join([chunk async for chunk in response.body_iterator])
+    assert body.count("[Event ") == 3
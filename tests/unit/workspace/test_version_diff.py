@@ -0,0 +1,120 @@
+"""
+Tests for the structural version diff and its streaming endpoint.
+"""
+
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from modules.workspace.api.endpoints.versions import stream_version_diff
+from modules.workspace.domain.models.version import SnapshotContent
+from modules.workspace.domain.services.version_diff import diff_snapshots, iter_changes
+
+
+def _move(move_id: str, parent_id: str | None, san: str, rank: int = 0) -> dict:
+    return {"id": move_id, "chapter_id": "ch1", "parent_id": parent_id, "san": san, "rank": rank}
+
+
+def _snapshot(variations: list[dict], annotations: list[dict] | None = None, chapters=None):
+    return SnapshotContent(
+        version_number=1,
+        study_id="study_1",
+        study_data={},
+        chapters=chapters or [{"id": "ch1", "title": "Najdorf"}],
+        variations=variations,
+        annotations=annotations or [],
+    )
+
+
+BASE = [
+    _move("m1", None, "e4"),
+    _move("m2", "m1", "c5"),
+    _move("m3", "m1", "e5", rank=1),
+    _move("m4", "m3", "Nf3"),
+    _move("m5", "m4", "Nc6"),
+]
+
+
+def test_moves_added_removed_and_reranked():
+    variations = [dict(move) for move in BASE[:3]]
+    variations[1]["rank"] = 1
+    variations[2]["rank"] = 0
+    variations += [_move("n1", "m2", "Nf3"), _move("n2", "n1", "d6"), _move("n3", "n1", "Nc6", 1)]
+
+    comparison = diff_snapshots(1, 2, _snapshot(BASE), _snapshot(variations))
+
+    assert comparison.additions == [
+        {"type": "variation", "data": variations[3], "subtree_size": 3}
+    ]
+    assert comparison.deletions == [{"type": "variation", "data": BASE[3], "subtree_size": 2}]
+    assert [(m["id"], m["fields"]) for m in comparison.modifications] == [
+        ("m2", ["rank"]),
+        ("m3", ["rank"]),
+    ]
+    assert comparison.changes == {
+        "additions_count": 1,
+        "deletions_count": 1,
+        "modifications_count": 2,
+    }
+
+
+def test_annotation_and_chapter_edits_name_changed_fields():
+    notes = [
+        {"id": "a1", "move_id": "m1", "nag": "!", "text": "Best", "version": 1},
+        {"id": "a2", "move_id": "m2", "nag": None, "text": "Sicilian", "version": 1},
+    ]
+    edited = [
+        {"id": "a1", "move_id": "m1", "nag": "!!", "text": "Best", "version": 2},
+        {"id": "a2", "move_id": "m2", "nag": None, "text": "Sicilian", "version": 2},
+    ]
+    chapters = [{"id": "ch1", "title": "Najdorf 6.Bg5"}]
+
+    changes = list(
+        iter_changes(_snapshot(BASE, notes), _snapshot(BASE, edited, chapters=chapters))
+    )
+
+    assert [(c["op"], c["type"], c["id"], c["fields"]) for c in changes] == [
+        ("modify", "chapter", "ch1", ["title"]),
+        ("modify", "annotation", "a1", ["nag"]),
+    ]
+
+
+def test_long_added_line_is_one_record():
+    plies = 50_000
+    line = [_move("x0", "m1", "Nc3")]
+    line += [_move(f"x{i}", f"x{i - 1}", "Nb1" if i % 2 else "Nc3") for i in range(1, plies)]
+
+    changes = list(iter_changes(_snapshot(BASE), _snapshot(BASE + line)))
+
+    assert len(changes) == 1
+    assert changes[0]["subtree_size"] == plies
+
+
+class FakeVersionService:
+    def __init__(self, from_snapshot, to_snapshot):
+        self.snapshots = {1: from_snapshot, 2: to_snapshot}
+
+    async def iter_version_changes(self, study_id, from_version, to_version):
+        if from_version not in self.snapshots or to_version not in self.snapshots:
+            raise ValueError(f"Version {from_version} not found")
+        for change in iter_changes(self.snapshots[from_version], self.snapshots[to_version]):
+            yield change
+
+
+async def test_stream_endpoint_writes_ndjson():
+    service = FakeVersionService(_snapshot(BASE), _snapshot(BASE[:3]))
+
+    response = await stream_version_diff("study_1", 1, service, compare_with=2)
+    lines = [line async for line in response.body_iterator]
+
+    assert response.media_type == "application/x-ndjson"
+    assert [json.loads(line)["op"] for line in lines] == ["delete"]
+
+
+async def test_stream_endpoint_missing_version_is_404():
+    service = FakeVersionService(_snapshot(BASE), _snapshot(BASE))
+
+    with pytest.raises(HTTPException) as exc:
+        await stream_version_diff("study_1", 7, service, compare_with=2)
+    assert exc.value.status_code == 404
@@ -8,6 +8,7 @@ event publishing, and cleanup.
 import pytest
 from datetime import datetime, UTC, timedelta
 
+from workspace.collaboration.presence_store import InMemoryPresenceStore
 from workspace.db.repos.presence_repo import PresenceRepository
 from workspace.domain.services.presence_service import PresenceService
 from workspace.events.bus import EventBus
@@ -26,7 +27,8 @@ async def presence_service(session, presence_repo, event_bus):
     return PresenceService(
         session=session,
         presence_repo=presence_repo,
-        event_bus=event_bus
+        event_bus=event_bus,
+        store=InMemoryPresenceStore(),
     )
 
 
@@ -130,23 +132,15 @@ class TestPresenceIntegration:
         await presence_service.heartbeat("user1", "study1", "chapter1")
         await session.commit()
 
-        # Create expired session by directly manipulating DB
-        from workspace.db.tables.presence_sessions import PresenceSessionTable
-        expired_session = PresenceSessionTable(
-            id="expired1",
-            user_id="user2",
-            study_id="study1",
-            chapter_id="chapter1",
-            move_path=None,
-            status="active",
-            last_heartbeat=datetime.now(UTC) - timedelta(minutes=15)
-        )
-        session.add(expired_session)
-        await session.commit()
+        # Create expired session by backdating its last heartbeat
+        expired = await presence_service.heartbeat("user2", "study1", "chapter1")
+        expired.last_heartbeat = datetime.now(UTC) - timedelta(minutes=15)
+        await presence_service.store.put(expired)
+        await presence_service.flush_presence()
 
-        # Verify both sessions exist
+        # The expired session is no longer listed, but still stored
         all_users = await presence_service.get_online_users("study1")
-        assert len(all_users) == 2
+        assert len(all_users) == 1
 
         # Run cleanup (10 minute timeout)
         count = await presence_service.cleanup_expired_sessions(timeout_minutes=10)
@@ -107,6 +107,22 @@ def test_nested_variations():
     assert "Bc4" in movetext
 
 
+def test_variation_follows_the_move_it_replaces():
+    """Alternatives are written after the main move they replace (valid PGN)."""
+    pgn_text = """
+[Event "Test"]
+[White "W"]
+[Black "B"]
+
+1. e4 (1. d4 d5) e5 (1...c5 2. Nf3) 2. Nf3
+"""
+    tree = pgn_to_tree(pgn_text)
+    movetext = tree_to_movetext(tree)
+
+    assert movetext == "1. e4 ( 1. d4 d5 ) 1...e5 ( 1...c5 2. Nf3 ) 2. Nf3"
+    assert tree_to_movetext(pgn_to_tree(movetext)) == movetext
+
+
 def test_nag_formatting():
     """Test that NAGs are formatted correctly."""
     pgn_text = """
@@ -354,3 +370,31 @@ def test_complex_game():
     assert "Best move" in pgn
     assert "c5" in pgn
     assert "Sicilian" in pgn
+
+
+def test_game_deeper_than_recursion_limit():
+    """Test that very long games serialize without recursion."""
+    import sys
+
+    plies = sys.getrecursionlimit() * 3
+    root = node = VariationNode(move_number=1, color="white", san="Nf3", uci="g1f3", fen="")
+    for index in range(1, plies):
+        child = VariationNode(
+            move_number=index // 2 + 1,
+            color="white" if index % 2 == 0 else "black",
+            san="Nf3" if index % 2 == 0 else "Nf6",
+            uci="",
+            fen="",
+        )
+        node.children.append(child)
+        if index == plies - 1:
+            node.children.append(
+                VariationNode(move_number=child.move_number, color=child.color, san="a6", uci="", fen="", rank=1)
+            )
+        node = child
+
+    movetext = tree_to_movetext(root)
+
+    assert movetext.startswith("1. Nf3 Nf6 2. Nf3")
+    assert movetext.count("Nf") == plies
+    assert movetext.endswith(f"Nf6 ( {plies // 2}...a6 )")